@@ -953,6 +953,8 @@ def register_commands(cli) -> None:
         help="Comma-separated list of service names to exclude from dependency resolution (e.g., db,redis). Useful when deploying workers that connect to remote services.",
     )
     @click.option("--use-staging-certificates", is_flag=True, default=False, help="Use Let's Encrypt staging certificates (doesn't count against rate limits)")
+    @click.option("--delta", is_flag=True, default=False, help="Only upload package chunks the server doesn't already have (falls back to a full transfer)")
+    @click.option("--stream", is_flag=True, default=False, help="Upload the package while it is exported, without writing a local package file")
     @add_json_option
     @add_verbose_option
     def droplet_push(
@@ -974,6 +976,8 @@ def register_commands(cli) -> None:
         exclude_deps: Optional[str],
         json: bool,
         use_staging_certificates: bool,
+        delta: bool,
+        stream: bool,
     ):
         start_time = time.time()
         try:
@@ -1111,6 +1115,8 @@ def register_commands(cli) -> None:
                 debug=debug,
                 containers=containers,
                 exclude_deps=exclude_deps_list,
+                delta=delta,
+                stream=stream,
             )
             elapsed_time = time.time() - start_time
             if not success:
@@ -11,6 +11,7 @@ import click
 from dockertree.cli.helpers import add_json_option, add_verbose_option, command_wrapper
 from dockertree.commands.packages import PackageCommands
 from dockertree.exceptions import DockertreeCommandError
+from dockertree.utils.compression import COMPRESSION_FORMATS, DEFAULT_COMPRESSION
 from dockertree.utils.json_output import JSONOutput
 from dockertree.utils.logging import error_exit, log_success
 from dockertree.utils.validation import check_prerequisites, check_prerequisites_no_git, check_setup_or_prompt
@@ -26,15 +27,18 @@ def register_commands(cli) -> None:
     @click.argument("branch_name")
     @click.option("--output-dir", type=click.Path(), default="./packages", help="Output directory for packages (default: ./packages)")
     @click.option("--include-code/--no-code", default=True, help="Include git archive of code in package (default: True)")
-    @click.option("--compressed/--no-compress", default=True, help="Compress package to .tar.gz format (default: True)")
+    @click.option("--compressed/--no-compress", default=True, help="Compress package into a single archive (default: True)")
+    @click.option("--compression", type=click.Choice(COMPRESSION_FORMATS), default=DEFAULT_COMPRESSION, show_default=True, help="Archive compression (zstd and pigz use all CPU cores when installed)")
+    @click.option("--level", type=int, default=None, help="Compression level (gzip 1-9, default 6; zstd 1-19, default 3)")
     @click.option("--skip-volumes", is_flag=True, default=False, help="Skip volume backup (fallback when volume backup fails)")
     @click.option("--use-staging-certificates", is_flag=True, default=False, help="Use Let's Encrypt staging certificates (doesn't count against rate limits)")
     @add_json_option
     @add_verbose_option
     @command_wrapper(require_setup=True, require_prerequisites=True)
-    def export_package(branch_name: str, output_dir: str, include_code: bool, compressed: bool, skip_volumes: bool, json: bool, use_staging_certificates: bool):
+    def export_package(branch_name: str, output_dir: str, include_code: bool, compressed: bool, compression: str, level: int, skip_volumes: bool, json: bool, use_staging_certificates: bool):
         package_commands = PackageCommands()
-        success = package_commands.export(branch_name, Path(output_dir), include_code, compressed, skip_volumes, use_staging_certificates)
+        success = package_commands.export(branch_name, Path(output_dir), include_code, compressed, skip_volumes, use_staging_certificates,
+                                          compression=compression, compression_level=level)
         if not success:
             raise DockertreeCommandError(f"Failed to export package for {branch_name}")
         log_success(f"Package exported successfully for {branch_name}")
@@ -92,18 +96,19 @@ def register_commands(cli) -> None:
 
     @packages.command("list")
     @click.option("--package-dir", type=click.Path(), default="./packages", help="Package directory to search (default: ./packages)")
+    @click.option("--verify", is_flag=True, default=False, help="Verify package checksums (reads every package in full)")
     @add_json_option
     @add_verbose_option
-    def list_packages(package_dir: str, json: bool):
+    def list_packages(package_dir: str, verify: bool, json: bool):
         try:
             check_setup_or_prompt()
             check_prerequisites()
             package_commands = PackageCommands()
             if json:
-                packages_data = package_commands.list_packages_json(Path(package_dir))
+                packages_data = package_commands.list_packages_json(Path(package_dir), verify=verify)
                 JSONOutput.print_json(packages_data)
             else:
-                package_commands.list_packages(Path(package_dir))
+                package_commands.list_packages(Path(package_dir), verify=verify)
         except Exception as exc:
             if json:
                 JSONOutput.print_error(f"Error listing packages: {exc}")
@@ -132,4 +137,17 @@ def register_commands(cli) -> None:
             else:
                 error_exit(f"Error validating package: {exc}")
 
-
+    @packages.command("rebuild")
+    @click.argument("manifest_file", type=click.Path(exists=True))
+    @click.option("--output", type=click.Path(), help="Package file to write (default: original package name next to the chunk store)")
+    @add_json_option
+    @add_verbose_option
+    @command_wrapper(require_setup=False, require_prerequisites=False)
+    def rebuild_package(manifest_file: str, output: str, json: bool):
+        """Rebuild a package uploaded by 'dockertree push --delta'."""
+        package_commands = PackageCommands()
+        success = package_commands.rebuild_package(Path(manifest_file), Path(output) if output else None)
+        if not success:
+            raise DockertreeCommandError(f"Failed to rebuild package from {manifest_file}")
+        if json:
+            return JSONOutput.success("Package rebuilt", {"manifest_file": manifest_file})
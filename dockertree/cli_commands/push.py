@@ -12,6 +12,7 @@ import click
 from dockertree.cli.helpers import add_json_option, add_verbose_option, command_wrapper
 from dockertree.commands.push import PushManager
 from dockertree.exceptions import DockertreeCommandError
+from dockertree.utils.compression import COMPRESSION_FORMATS, DEFAULT_COMPRESSION
 from dockertree.utils.json_output import JSONOutput
 from dockertree.utils.logging import error_exit, log_success
 from dockertree.utils.validation import check_prerequisites, check_setup_or_prompt
@@ -42,6 +43,10 @@ def register_commands(cli) -> None:
     @click.option("--exclude-deps", multiple=True, help="Services to exclude from dependencies (can be specified multiple times)")
     @click.option("--vpc-uuid", help="VPC UUID for VPC deployment")
     @click.option("--use-staging-certificates", is_flag=True, default=False, help="Use Let's Encrypt staging certificates (doesn't count against rate limits)")
+    @click.option("--compression", type=click.Choice(COMPRESSION_FORMATS), default=DEFAULT_COMPRESSION, show_default=True, help="Package compression (zstd and pigz use all CPU cores when installed)")
+    @click.option("--level", type=int, default=None, help="Compression level (gzip 1-9, default 6; zstd 1-19, default 3)")
+    @click.option("--delta", is_flag=True, default=False, help="Only upload package chunks the server doesn't already have (requires dockertree on the server)")
+    @click.option("--stream", is_flag=True, default=False, help="Upload the package while it is exported, without writing a local package file")
     @add_json_option
     @add_verbose_option
     @command_wrapper(require_setup=True, require_prerequisites=True)
@@ -70,6 +75,10 @@ def register_commands(cli) -> None:
         vpc_uuid: Optional[str],
         json: bool,
         use_staging_certificates: bool,
+        compression: str,
+        level: Optional[int],
+        delta: bool,
+        stream: bool,
     ):
         """Push package to remote server for deployment.
         
@@ -117,6 +126,10 @@ def register_commands(cli) -> None:
                 droplet_info=None,  # Will be set if droplet is created
                 central_droplet_info=None,  # Will be set if VPC deployment
                 use_staging_certificates=use_staging_certificates,
+                compression=compression,
+                compression_level=level,
+                delta=delta,
+                stream=stream,
             )
             
             if not success:
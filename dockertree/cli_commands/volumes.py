@@ -35,25 +35,30 @@ def register_commands(cli) -> None:
         volume_manager.list_volumes()
 
     @volumes.command("size")
+    @click.option("--refresh", is_flag=True, default=False,
+                  help="Recompute sizes instead of using sizes cached in the last minute")
     @add_json_option
     @add_verbose_option
     @command_wrapper()
-    def volumes_size(json: bool):
+    def volumes_size(refresh: bool, json: bool):
         volume_manager = VolumeManager()
         if json:
-            return volume_manager.get_volume_sizes_json()
-        volume_manager.show_volume_sizes()
+            return volume_manager.get_volume_sizes_json(refresh=refresh)
+        volume_manager.show_volume_sizes(refresh=refresh)
 
     @volumes.command("backup")
     @click.argument("branch_name")
-    @click.option("--backup-dir", type=click.Path(), help="Directory to save backup (default: ./backups)")
+    @click.option("--backup-dir", type=click.Path(),
+                  help="Directory to save backup (default: ./backups, or .dockertree/backups with --incremental)")
+    @click.option("--incremental", is_flag=True, default=False,
+                  help="Only store data changed since earlier backups, in a chunk store")
     @add_json_option
     @add_verbose_option
     @command_wrapper()
-    def volumes_backup(branch_name: str, backup_dir: Optional[str], json: bool):
+    def volumes_backup(branch_name: str, backup_dir: Optional[str], incremental: bool, json: bool):
         volume_manager = VolumeManager()
         backup_path = Path(backup_dir) if backup_dir else None
-        success = volume_manager.backup_volumes(branch_name, backup_path)
+        success = volume_manager.backup_volumes(branch_name, backup_path, incremental=incremental)
         if not success:
             raise DockertreeCommandError(f"Failed to backup volumes for {branch_name}")
         log_success(f"Successfully backed up volumes for {branch_name}")
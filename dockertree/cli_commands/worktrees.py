@@ -12,6 +12,7 @@ from pathlib import Path
 from typing import Optional
 
 from dockertree.cli.helpers import add_json_option, add_verbose_option, command_wrapper
+from dockertree.config.settings import BULK_MAX_WORKERS
 from dockertree.commands.push.push_manager import PushManager
 from dockertree.commands.utility import UtilityManager
 from dockertree.commands.worktree import WorktreeManager
@@ -21,6 +22,21 @@ from dockertree.utils.logging import error_exit, log_info, log_success, log_warn
 from dockertree.utils.pattern_matcher import has_wildcard
 
 
+def add_parallel_option(func):
+    """Add the --parallel option of commands that can act on several worktrees."""
+    return click.option(
+        "--parallel",
+        type=click.IntRange(min=1),
+        default=BULK_MAX_WORKERS,
+        show_default=True,
+        help="Worktrees processed at the same time when several match",
+    )(func)
+
+
+def _bulk_results(worktree_manager: WorktreeManager) -> list:
+    return [result.to_dict() for result in worktree_manager.last_bulk_results]
+
+
 def register_commands(cli) -> None:
     """Register worktree management commands."""
 
@@ -59,14 +75,26 @@ def register_commands(cli) -> None:
         help="Run containers in detached mode (default: True)",
     )
     @click.option("--profile", help="Docker Compose profile to use (e.g., worker)")
+    @add_parallel_option
     @add_json_option
     @add_verbose_option
     @command_wrapper()
-    def up(branch_name: str, detach: bool, profile: Optional[str], json: bool):
-        """Start the worktree environment for the specified branch."""
+    def up(branch_name: str, detach: bool, profile: Optional[str], parallel: int, json: bool):
+        """Start the worktree environment for the specified branch (supports wildcards)."""
         if not detach:
             raise DockertreeCommandError("Usage: dockertree <worktree_name> up -d")
         worktree_manager = WorktreeManager()
+        if has_wildcard(branch_name):
+            success = worktree_manager.start_worktrees_by_pattern(branch_name, profile=profile, max_workers=parallel)
+            if not success:
+                raise DockertreeCommandError(f"Failed to start worktrees matching pattern: {branch_name}")
+            log_success(f"Started worktrees matching pattern: {branch_name}")
+            if json:
+                return JSONOutput.success(
+                    f"Started worktrees matching pattern: {branch_name}",
+                    {"pattern": branch_name, "profile": profile, "results": _bulk_results(worktree_manager)},
+                )
+            return
         success = worktree_manager.start_worktree(branch_name, profile=profile)
         if not success:
             raise DockertreeCommandError(f"Failed to start worktree environment for {branch_name}")
@@ -75,17 +103,34 @@ def register_commands(cli) -> None:
             access_url = worktree_manager.env_manager.get_access_url(branch_name)
             return JSONOutput.success(
                 f"Worktree environment started for {branch_name}",
-                {"branch_name": branch_name, "url": access_url, "profile": profile},
+                {
+                    "branch_name": branch_name,
+                    "url": access_url,
+                    "profile": profile,
+                    "readiness": worktree_manager.last_readiness,
+                },
             )
 
     @cli.command()
     @click.argument("branch_name")
+    @add_parallel_option
     @add_json_option
     @add_verbose_option
     @command_wrapper()
-    def down(branch_name: str, json: bool):
-        """Stop the worktree environment for the specified branch."""
+    def down(branch_name: str, parallel: int, json: bool):
+        """Stop the worktree environment for the specified branch (supports wildcards)."""
         worktree_manager = WorktreeManager()
+        if has_wildcard(branch_name):
+            success = worktree_manager.stop_worktrees_by_pattern(branch_name, max_workers=parallel)
+            if not success:
+                raise DockertreeCommandError(f"Failed to stop worktrees matching pattern: {branch_name}")
+            log_success(f"Stopped worktrees matching pattern: {branch_name}")
+            if json:
+                return JSONOutput.success(
+                    f"Stopped worktrees matching pattern: {branch_name}",
+                    {"pattern": branch_name, "results": _bulk_results(worktree_manager)},
+                )
+            return
         success = worktree_manager.stop_worktree(branch_name)
         if not success:
             raise DockertreeCommandError(f"Failed to stop worktree environment for {branch_name}")
@@ -102,17 +147,20 @@ def register_commands(cli) -> None:
         delete_branch: bool,
         action: str,
         json: bool,
+        parallel: int = BULK_MAX_WORKERS,
     ):
         worktree_manager = WorktreeManager()
         if has_wildcard(branch_name):
-            success = worktree_manager.remove_worktrees_by_pattern(branch_name, force, delete_branch=delete_branch)
+            success = worktree_manager.remove_worktrees_by_pattern(
+                branch_name, force, delete_branch=delete_branch, max_workers=parallel
+            )
             if not success:
                 raise DockertreeCommandError(f"Failed to remove worktrees matching pattern: {branch_name}")
             log_success(f"Successfully removed worktrees matching pattern: {branch_name}")
             if json:
                 return JSONOutput.success(
                     f"Successfully removed worktrees matching pattern: {branch_name}",
-                    {"pattern": branch_name, "action": action},
+                    {"pattern": branch_name, "action": action, "results": _bulk_results(worktree_manager)},
                 )
         else:
             success = worktree_manager.remove_worktree(branch_name, force, delete_branch=delete_branch)
@@ -128,21 +176,23 @@ def register_commands(cli) -> None:
     @cli.command()
     @click.argument("branch_name")
     @click.option("--force", is_flag=True, help="Force deletion even with unmerged changes (skip confirmation)")
+    @add_parallel_option
     @add_json_option
     @add_verbose_option
     @command_wrapper()
-    def delete(branch_name: str, force: bool, json: bool):
+    def delete(branch_name: str, force: bool, parallel: int, json: bool):
         """Delete worktree and Git branch completely."""
-        return _handle_pattern_operation(branch_name, force, True, "delete", json)
+        return _handle_pattern_operation(branch_name, force, True, "delete", json, parallel)
 
     @cli.command()
     @click.option("--force", is_flag=True, help="Force deletion without confirmation")
+    @add_parallel_option
     @add_verbose_option
     @command_wrapper()
-    def delete_all(force: bool):
+    def delete_all(force: bool, parallel: int):
         """Delete all worktrees, containers, volumes, and Git branches."""
         worktree_manager = WorktreeManager()
-        success = worktree_manager.remove_all_worktrees(force)
+        success = worktree_manager.remove_all_worktrees(force, max_workers=parallel)
         if not success:
             raise DockertreeCommandError("Failed to remove all worktrees")
         log_success("Removed all worktrees")
@@ -150,21 +200,23 @@ def register_commands(cli) -> None:
     @cli.command()
     @click.argument("branch_name")
     @click.option("--force", is_flag=True, help="Force removal even with unmerged changes (skip confirmation)")
+    @add_parallel_option
     @add_json_option
     @add_verbose_option
     @command_wrapper()
-    def remove(branch_name: str, force: bool, json: bool):
+    def remove(branch_name: str, force: bool, parallel: int, json: bool):
         """Remove worktree and containers/volumes but keep the Git branch."""
-        return _handle_pattern_operation(branch_name, force, False, "remove", json)
+        return _handle_pattern_operation(branch_name, force, False, "remove", json, parallel)
 
     @cli.command()
     @click.option("--force", is_flag=True, help="Force removal without confirmation")
+    @add_parallel_option
     @add_verbose_option
     @command_wrapper()
-    def remove_all(force: bool):
+    def remove_all(force: bool, parallel: int):
         """Remove all worktrees and containers/volumes but keep Git branches."""
         worktree_manager = WorktreeManager()
-        success = worktree_manager.remove_all_worktrees(force, delete_branch=False)
+        success = worktree_manager.remove_all_worktrees(force, delete_branch=False, max_workers=parallel)
         if not success:
             raise DockertreeCommandError("Failed to remove all worktrees")
         log_success("Removed all worktrees (branches preserved)")
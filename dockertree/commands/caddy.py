@@ -12,7 +12,8 @@ from ..config.settings import get_project_root, get_script_dir
 from ..core.docker_manager import DockerManager
 from ..utils.path_utils import get_env_compose_file_path
 from ..utils.logging import log_info, log_success, log_warning, log_error
-from ..utils.validation import validate_container_running, validate_container_exists, validate_volume_exists
+from ..utils.validation import validate_container_running, validate_container_exists, get_existing_volumes
+from ..utils.volume_inventory import invalidate_volume_inventory
 
 
 class CaddyManager:
@@ -36,11 +37,14 @@ class CaddyManager:
         caddyfile_path = str(self.caddyfile)
         script_dir = get_script_dir()
         monitor_script_path = str(script_dir / "scripts" / "caddy-docker-monitor.py")
+        caddy_routes_path = str(script_dir / "scripts" / "caddy_routes.py")
         
         return template_content.replace(
             '{CADDYFILE_PATH}', caddyfile_path
         ).replace(
             '{MONITOR_SCRIPT_PATH}', monitor_script_path
+        ).replace(
+            '{CADDY_ROUTES_PATH}', caddy_routes_path
         )
     
     def start_global_caddy(self) -> bool:
@@ -130,10 +134,11 @@ class CaddyManager:
     def _ensure_caddy_volumes(self) -> bool:
         """Ensure Caddy volumes exist before starting compose."""
         volumes = ["dockertree_caddy_data", "dockertree_caddy_config"]
+        existing = get_existing_volumes(volumes)
         success = True
         
         for volume_name in volumes:
-            if not validate_volume_exists(volume_name):
+            if volume_name not in existing:
                 log_info(f"Creating volume: {volume_name}")
                 try:
                     subprocess.run(
@@ -145,6 +150,8 @@ class CaddyManager:
                     log_error(f"Failed to create volume {volume_name}: {e}")
                     success = False
         
+        if len(existing) < len(volumes):
+            invalidate_volume_inventory()
         return success
     
     def _handle_existing_container(self, container_name: str) -> bool:
@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 from ..core.package_manager import PackageManager
+from ..utils.compression import DEFAULT_COMPRESSION
 from ..utils.logging import log_info, log_success, log_warning, log_error, print_plain
 
 
@@ -21,7 +22,8 @@ class PackageCommands:
     
     def export(self, branch_name: str, output_dir: Path, 
               include_code: bool, compressed: bool, skip_volumes: bool = False,
-              use_staging_certificates: bool = False) -> bool:
+              use_staging_certificates: bool = False, compression: str = DEFAULT_COMPRESSION,
+              compression_level: Optional[int] = None) -> bool:
         """Export package - CLI interface with logging.
         
         Args:
@@ -31,6 +33,8 @@ class PackageCommands:
             compressed: Whether to compress the final package
             skip_volumes: Whether to skip volume backup (fallback option)
             use_staging_certificates: Whether to set USE_STAGING_CERTIFICATES=1 in env.dockertree
+            compression: Archive compression ("gzip", "zstd" or "none")
+            compression_level: Compression level (defaults per format)
             
         Returns:
             True if export succeeded, False otherwise
@@ -48,7 +52,8 @@ class PackageCommands:
                 log_warning("Failed to set USE_STAGING_CERTIFICATES flag, but continuing with export...")
         
         result = self.package_manager.export_package(
-            branch_name, output_dir, include_code, compressed, skip_volumes
+            branch_name, output_dir, include_code, compressed, skip_volumes,
+            compression=compression, compression_level=compression_level
         )
         
         if result.get("success"):
@@ -141,18 +146,19 @@ class PackageCommands:
             log_error(f"Failed to import package: {result.get('error')}")
             return False
     
-    def list_packages(self, package_dir: Path) -> List[Dict]:
+    def list_packages(self, package_dir: Path, verify: bool = False) -> List[Dict]:
         """List available packages.
         
         Args:
             package_dir: Directory to search for packages
+            verify: Verify package checksums (reads every package in full)
             
         Returns:
             List of package information dictionaries
         """
         log_info(f"Listing packages in: {package_dir}")
         
-        packages = self.package_manager.list_packages(package_dir)
+        packages = self.package_manager.list_packages(package_dir, verify=verify)
         
         if not packages:
             print_plain("No packages found")
@@ -169,7 +175,10 @@ class PackageCommands:
             print_plain(f"   Branch: {metadata.get('branch_name', 'unknown')}")
             print_plain(f"   Created: {metadata.get('created_at', 'unknown')}")
             print_plain(f"   Size: {size_mb:.1f} MB")
-            print_plain(f"   Valid: {'✅' if package.get('valid') else '❌'}")
+            if package.get('valid') is None:
+                print_plain("   Valid: not verified (use --verify)")
+            else:
+                print_plain(f"   Valid: {'✅' if package.get('valid') else '❌'}")
             if metadata.get('include_code'):
                 print_plain(f"   Code: 📝 Included")
             else:
@@ -212,6 +221,23 @@ class PackageCommands:
         
         return is_valid
     
+    def rebuild_package(self, manifest_file: Path, output_file: Optional[Path] = None) -> bool:
+        """Rebuild a package from a delta push manifest.
+        
+        Args:
+            manifest_file: Package manifest uploaded by a delta push
+            output_file: Package file to write (default: next to the chunk store)
+            
+        Returns:
+            True if the package was rebuilt, False otherwise
+        """
+        result = self.package_manager.rebuild_package(manifest_file, output_file)
+        if not result.get("success"):
+            log_error(result.get("error"))
+            return False
+        print_plain(f"📦 Package: {result['package_path']}")
+        return True
+    
     def get_package_info(self, package_file: Path) -> Dict:
         """Get detailed package information.
         
@@ -241,16 +267,17 @@ class PackageCommands:
             "metadata": metadata
         }
     
-    def list_packages_json(self, package_dir: Path) -> List[Dict]:
+    def list_packages_json(self, package_dir: Path, verify: bool = False) -> List[Dict]:
         """List packages as JSON for programmatic use.
         
         Args:
             package_dir: Directory to search for packages
+            verify: Verify package checksums (reads every package in full)
             
         Returns:
             List of package information dictionaries
         """
-        return self.package_manager.list_packages(package_dir)
+        return self.package_manager.list_packages(package_dir, verify=verify)
     
     def validate_package_json(self, package_file: Path) -> Dict:
         """Validate package and return JSON result.
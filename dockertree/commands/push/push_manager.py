@@ -4,18 +4,22 @@ Push manager for dockertree deployment operations.
 This module orchestrates the complete push workflow: export, transfer, and remote import.
 """
 
+import functools
 import subprocess
 import socket
 import re
 import shlex
 from pathlib import Path
-from typing import Optional, Dict, Tuple, List
+from typing import Callable, Optional, Dict, Tuple, List
 
 from ...core.package_manager import PackageManager
 from ...core.dns_manager import DNSManager, parse_domain, is_domain
 from ...core.droplet_manager import DropletManager, DropletInfo
 from ...core.environment_manager import EnvironmentManager
 from ...core import dns_providers  # noqa: F401 - trigger registration
+from ...config.settings import DOCKERTREE_DIR, BACKUPS_DIR
+from ...utils.chunk_store import ChunkStore
+from ...utils.compression import DEFAULT_COMPRESSION
 from ...utils.logging import log_info, log_success, log_warning, log_error, print_plain
 from ...utils.path_utils import detect_execution_context, get_worktree_branch_name
 from ...utils.confirmation import confirm_action
@@ -343,7 +347,11 @@ class PushManager:
                     vpc_uuid: Optional[str] = None,
                     droplet_info: Optional[DropletInfo] = None,
                     central_droplet_info: Optional[DropletInfo] = None,
-                    use_staging_certificates: bool = False) -> bool:
+                    use_staging_certificates: bool = False,
+                    compression: str = DEFAULT_COMPRESSION,
+                    compression_level: Optional[int] = None,
+                    delta: bool = False,
+                    stream: bool = False) -> bool:
         """Export and push package to remote server via SCP.
         
         Args:
@@ -363,6 +371,12 @@ class PushManager:
             exclude_deps: Optional list of services to exclude from dependencies
             droplet_info: Droplet info if droplet was created
             central_droplet_info: Central droplet info for VPC deployments
+            compression: Package compression ("gzip", "zstd" or "none")
+            compression_level: Compression level (defaults per format)
+            delta: Only upload package chunks the server doesn't already have,
+                falling back to a full transfer if that fails
+            stream: Upload the package while it is exported, without a local
+                package file (ignored with delta)
             
         Returns:
             True if successful, False otherwise
@@ -527,19 +541,29 @@ class PushManager:
                 if not env_manager.set_staging_certificate_flag(branch_name, value=True):
                     log_warning("Failed to set USE_STAGING_CERTIFICATES flag, but continuing with export...")
             
-            # Export package only if not already on server
-            if not package_already_on_server:
+            export_package = functools.partial(
+                self.package_manager.export_package,
+                branch_name=branch_name,
+                output_dir=output_dir,
+                include_code=True,  # Always include code for deployments
+                compressed=True,    # Always compress for faster transfer
+                container_filter=container_filter,
+                exclude_deps=exclude_deps,
+                droplet_info=droplet_info,
+                central_droplet_info=central_droplet_info,
+                compression=compression,
+                compression_level=compression_level
+            )
+            if stream and delta:
+                log_warning("Delta transfers need a local package, exporting before transfer")
+                stream = False
+            
+            # Export package only if not already on server (streamed exports run during transfer)
+            if stream and not package_already_on_server:
+                log_info("Streaming mode: package will be exported while it is transferred")
+            elif not package_already_on_server:
                 log_info("Worktree validated, proceeding with export...")
-                export_result = self.package_manager.export_package(
-                    branch_name=branch_name,
-                    output_dir=output_dir,
-                    include_code=True,  # Always include code for deployments
-                    compressed=True,    # Always compress for faster transfer
-                    container_filter=container_filter,
-                    exclude_deps=exclude_deps,
-                    droplet_info=droplet_info,
-                    central_droplet_info=central_droplet_info
-                )
+                export_result = export_package()
                 
                 if not export_result.get("success"):
                     log_error(f"Failed to export package: {export_result.get('error')}")
@@ -596,14 +620,27 @@ class PushManager:
                 log_info("Server preparation skipped (--prepare-server not specified)")
             
             # Transfer package via SCP (skip if already on server in resume mode)
-            if not (resume and package_already_on_server):
+            if stream and not package_already_on_server:
+                log_info(f"Streaming package to {scp_target_obj.server}...")
+                remote_file_path = self._stream_package(export_package, scp_target_obj)
+                if not remote_file_path:
+                    log_error("Failed to stream package to remote server")
+                    return False
+                log_success(f"Package pushed successfully to {scp_target_obj}")
+            elif not (resume and package_already_on_server):
                 if not package_path:
                     log_error("Package path not available for transfer")
                     return False
                 log_info(f"Starting transfer to {scp_target_obj.server}...")
                 log_info(f"Source: {package_path}")
                 log_info(f"Destination: {scp_target_obj}")
-                if not self.transfer.transfer_package(package_path, scp_target_obj):
+                transferred = False
+                if delta:
+                    store = ChunkStore(self.project_root / DOCKERTREE_DIR / BACKUPS_DIR)
+                    transferred = self.transfer.transfer_package_delta(package_path, scp_target_obj, store) is not None
+                    if not transferred:
+                        log_warning("Delta transfer failed, falling back to full transfer...")
+                if not transferred and not self.transfer.transfer_package(package_path, scp_target_obj):
                     log_error("Failed to transfer package to remote server")
                     return False
                 
@@ -613,7 +650,7 @@ class PushManager:
                 log_info(f"Package already on server, skipping transfer")
             
             # Determine remote package path for import
-            if resume and package_already_on_server and remote_file_path:
+            if (resume and package_already_on_server or stream) and remote_file_path:
                 remote_package_path = remote_file_path
             elif package_path:
                 remote_package_path = scp_target_obj.get_remote_file_path(package_path.name)
@@ -718,6 +755,28 @@ class PushManager:
             self.transfer.cleanup()
             self.ssh.cleanup()
     
+    def _stream_package(self, export_package: Callable[..., Dict], scp_target: SCPTarget) -> Optional[str]:
+        """Export a package straight into a streaming upload to the server.
+        
+        Export, compression and transfer run concurrently, so no local package
+        file is written.
+        
+        Args:
+            export_package: PackageManager.export_package with its arguments bound
+            scp_target: SCP target object
+            
+        Returns:
+            Remote path of the package, or None on failure
+        """
+        def write_package(output_stream) -> Optional[str]:
+            export_result = export_package(output_stream=output_stream)
+            if not export_result.get("success"):
+                log_error(f"Failed to export package: {export_result.get('error')}")
+                return None
+            return export_result.get("package_name")
+        
+        return self.transfer.stream_package(scp_target, write_package)
+    
     def _check_server_requirements(self, username: str, server: str) -> None:
         """Run a basic non-fatal check for required tools on the server."""
         try:
@@ -56,7 +56,7 @@ class ServerPreparer:
         """
         try:
             log_info(f"Preparing server: {username}@{server}")
-            log_info("This will install: curl, git, Python 3.11+, Docker, and dockertree")
+            log_info("This will install: curl, git, zstd, pigz, Python 3.11+, Docker, and dockertree")
             
             # Add SSH host key before connection
             log_info("Adding SSH host key...")
@@ -2,16 +2,29 @@
 File transfer management for dockertree push operations.
 
 This module handles transferring packages to remote servers using
-rsync (preferred) or SCP (fallback).
+rsync (preferred) or SCP (fallback), as a delta of content-addressed
+chunks the server does not have yet, or streamed while it is exported.
 """
 
+import io
+import json
+import secrets
+import shlex
 import subprocess
+import tarfile
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Set
 
+from ...utils.checksum import CHECKSUM_SHA256, HashingWriter, new_hasher
+from ...utils.chunk_store import ChunkStore, build_package_manifest, get_manifest_chunks
+from ...utils.compression import strip_archive_extension
 from ...utils.ssh_manager import SSHConnectionManager, SCPTarget
 from ...utils.ssh_utils import add_ssh_host_key
-from ...utils.logging import log_info, log_success, log_error, log_warning
+from ...utils.logging import log_info, log_success, log_error, log_warning, format_size
+
+# Remote chunk store used by delta pushes, next to the pushed packages
+REMOTE_CHUNK_STORE_DIR = ".dockertree-chunks"
 
 
 class TransferManager:
@@ -141,6 +154,202 @@ class TransferManager:
             log_error(f"Unexpected error during transfer: {e}")
             return False
     
+    def transfer_package_delta(self, package_path: Path, scp_target: SCPTarget,
+                               store: ChunkStore) -> Optional[str]:
+        """Transfer only the package chunks the remote server does not have yet.
+        
+        The package is split into chunks in the local chunk store and described
+        by a manifest. Chunks missing from the remote chunk store (kept in
+        ``.dockertree-chunks`` next to the remote packages) are streamed over the
+        shared SSH connection together with the manifest, and the package is
+        then rebuilt on the server with ``dockertree packages rebuild``.
+        
+        Args:
+            package_path: Path to package file
+            scp_target: SCP target object
+            store: Local chunk store
+            
+        Returns:
+            Remote path of the rebuilt package, or None if the delta transfer
+            failed (callers fall back to transfer_package)
+        """
+        try:
+            add_ssh_host_key(scp_target.server)
+            
+            log_info("Splitting package into chunks...")
+            manifest = build_package_manifest(package_path, store)
+            chunks = get_manifest_chunks(manifest)
+            
+            remote_store = self.get_remote_store_dir(scp_target)
+            remote_chunks = self.list_remote_chunks(scp_target, remote_store)
+            if remote_chunks is None:
+                return None
+            missing = [digest for digest in chunks if digest not in remote_chunks]
+            upload_bytes = sum(store.chunk_path(digest).stat().st_size for digest in missing)
+            log_info(f"{len(chunks) - len(missing)} of {len(chunks)} chunks already on server, "
+                     f"uploading {len(missing)} ({format_size(upload_bytes)} of "
+                     f"{format_size(package_path.stat().st_size)} package)")
+            
+            manifest_name = f"{strip_archive_extension(package_path.name)}.json"
+            if not self.upload_chunks(scp_target, store, missing, manifest, manifest_name, remote_store):
+                return None
+            
+            remote_file_path = scp_target.get_remote_file_path(package_path.name)
+            remote_manifest = f"{remote_store}/manifests/packages/{manifest_name}"
+            rebuild_cmd = " ".join(shlex.quote(part) for part in [
+                "dockertree", "packages", "rebuild", remote_manifest, "--output", remote_file_path
+            ])
+            result = subprocess.run(
+                self.ssh.build_ssh_command(scp_target.username, scp_target.server, shlex.quote(rebuild_cmd)),
+                capture_output=True, text=True, check=False
+            )
+            if result.returncode != 0:
+                log_warning(f"Failed to rebuild package on server: {(result.stderr or result.stdout).strip()}")
+                return None
+            
+            log_success(f"Package transferred as delta: {package_path.name} -> {remote_file_path}")
+            return remote_file_path
+        except (OSError, ValueError, tarfile.TarError) as e:
+            log_warning(f"Delta transfer failed: {e}")
+            return None
+    
+    def stream_package(self, scp_target: SCPTarget,
+                       write_package: Callable[[BinaryIO], Optional[str]]) -> Optional[str]:
+        """Upload a package while it is being written, without a local package file.
+        
+        write_package is called with the stdin of an SSH session (over the
+        shared ControlMaster connection) that saves the stream to a temporary
+        file on the server and checksums it as it arrives. Once the server's
+        checksum matches the one computed locally, the file is renamed to the
+        package name returned by write_package.
+        
+        Args:
+            scp_target: SCP target object
+            write_package: Writes the package to the given stream and returns
+                its file name, or None on failure
+            
+        Returns:
+            Remote path of the package, or None if the upload failed
+        """
+        add_ssh_host_key(scp_target.server)
+        
+        partial_path = scp_target.get_remote_file_path(f".dockertree-stream-{secrets.token_hex(4)}.part")
+        command = f"set -o pipefail && tee {shlex.quote(partial_path)} | sha256sum"
+        process = subprocess.Popen(
+            self.ssh.build_ssh_command(scp_target.username, scp_target.server, shlex.quote(command)),
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        hasher = new_hasher(CHECKSUM_SHA256)
+        writer = HashingWriter(process.stdin, hasher)
+        package_name = None
+        try:
+            package_name = write_package(writer)
+        except (OSError, ValueError) as e:
+            log_error(f"Failed to stream package: {e}")
+        finally:
+            if package_name is None:
+                process.kill()
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+        stdout, stderr = process.communicate()
+        
+        if package_name is None or process.returncode != 0:
+            if package_name is not None:
+                log_error(f"Streaming upload failed: {stderr.decode(errors='replace').strip() or f'exit code {process.returncode}'}")
+            self._remove_remote_file(scp_target, partial_path)
+            return None
+        
+        remote_digest = stdout.decode(errors="replace").split(" ", 1)[0].strip()
+        if remote_digest != hasher.hexdigest():
+            log_error("Streamed package checksum mismatch on server")
+            self._remove_remote_file(scp_target, partial_path)
+            return None
+        
+        remote_file_path = scp_target.get_remote_file_path(package_name)
+        result = subprocess.run(
+            self.ssh.build_ssh_command(
+                scp_target.username, scp_target.server,
+                shlex.quote(f"mv {shlex.quote(partial_path)} {shlex.quote(remote_file_path)}")
+            ),
+            capture_output=True, text=True, check=False, timeout=60
+        )
+        if result.returncode != 0:
+            log_error(f"Failed to move streamed package into place: {result.stderr.strip()}")
+            self._remove_remote_file(scp_target, partial_path)
+            return None
+        
+        log_success(f"Package streamed successfully ({format_size(writer.bytes_written)}): "
+                    f"{package_name} -> {remote_file_path}")
+        return remote_file_path
+    
+    def _remove_remote_file(self, target: SCPTarget, remote_file_path: str) -> None:
+        """Remove a remote file (best effort)."""
+        try:
+            subprocess.run(
+                self.ssh.build_ssh_command(target.username, target.server,
+                                           shlex.quote(f"rm -f {shlex.quote(remote_file_path)}")),
+                capture_output=True, check=False, timeout=30
+            )
+        except (OSError, subprocess.SubprocessError):
+            pass
+    
+    def get_remote_store_dir(self, target: SCPTarget) -> str:
+        """Get the remote chunk store directory for a target."""
+        remote_dir = self._infer_remote_directory(target.remote_path) or "."
+        return f"{remote_dir.rstrip('/')}/{REMOTE_CHUNK_STORE_DIR}"
+    
+    def list_remote_chunks(self, target: SCPTarget, remote_store: str) -> Optional[Set[str]]:
+        """List the chunks already in the remote chunk store.
+        
+        Returns:
+            Set of chunk checksums (empty if the store doesn't exist yet), or None on error
+        """
+        command = f"find {shlex.quote(remote_store + '/chunks')} -type f 2>/dev/null | sed 's|.*/||' || true"
+        result = subprocess.run(
+            self.ssh.build_ssh_command(target.username, target.server, shlex.quote(command)),
+            capture_output=True, text=True, check=False, timeout=120
+        )
+        if result.returncode != 0:
+            log_warning(f"Failed to list remote chunks: {result.stderr.strip()}")
+            return None
+        return {line.strip() for line in result.stdout.splitlines() if line.strip()}
+    
+    def upload_chunks(self, target: SCPTarget, store: ChunkStore, digests: List[str],
+                      manifest: Dict[str, Any], manifest_name: str, remote_store: str) -> bool:
+        """Stream chunks and a package manifest into the remote chunk store as one tar stream.
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        command = f"mkdir -p {shlex.quote(remote_store)} && tar xf - -C {shlex.quote(remote_store)}"
+        process = subprocess.Popen(
+            self.ssh.build_ssh_command(target.username, target.server, shlex.quote(command)),
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
+        try:
+            with tarfile.open(fileobj=process.stdin, mode="w|") as tar:
+                for digest in digests:
+                    tar.add(store.chunk_path(digest), arcname=f"chunks/{digest[:2]}/{digest}")
+                # Written last, so a manifest on the server implies its chunks are there
+                data = json.dumps(manifest).encode("utf-8")
+                info = tarfile.TarInfo(f"manifests/packages/{manifest_name}")
+                info.size = len(data)
+                info.mtime = int(time.time())
+                tar.addfile(info, io.BytesIO(data))
+        except (OSError, tarfile.TarError) as e:
+            log_warning(f"Failed to upload chunks: {e}")
+            process.kill()
+        finally:
+            if not process.stdin.closed:
+                process.stdin.close()
+        stderr = process.stderr.read().decode(errors="replace")
+        if process.wait() != 0:
+            log_warning(f"Failed to upload chunks: {stderr.strip() or f'exit code {process.returncode}'}")
+            return False
+        return True
+    
     def ensure_remote_dir(self, target: SCPTarget) -> bool:
         """Create the remote directory with mkdir -p (best effort).
         
@@ -203,7 +412,7 @@ class TransferManager:
                 return remote_path.rstrip('/')
             # Heuristic: common archive/file suffixes
             lower = remote_path.lower()
-            archive_suffixes = ('.tar.gz', '.tgz', '.tar', '.zip')
+            archive_suffixes = ('.tar.gz', '.tgz', '.tar.zst', '.tar', '.zip')
             if any(lower.endswith(suf) for suf in archive_suffixes):
                 return str(Path(remote_path).parent)
             # If there is a dot in the last path segment, assume it's a file
@@ -233,7 +442,7 @@ class TransferManager:
             cmd = self.ssh.build_ssh_command(
                 target.username,
                 target.server,
-                f'find {target.remote_path} -maxdepth 1 -type f -name "*{branch_name}*.dockertree-package.tar.gz" 2>/dev/null | head -1',
+                f'find {target.remote_path} -maxdepth 1 -type f -name "*{branch_name}*.dockertree-package.tar*" 2>/dev/null | head -1',
                 use_control_master=True
             )
             
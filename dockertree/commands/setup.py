@@ -10,7 +10,7 @@ import yaml
 from pathlib import Path
 from typing import Optional, Dict, Any
 
-from ..config.settings import get_project_root, DOCKERTREE_DIR, get_worktree_dir
+from ..config.settings import get_project_root, DOCKERTREE_DIR, get_worktree_dir, clear_config_cache
 from ..utils.logging import log_info, log_success, log_warning, log_error
 from ..utils.validation import check_prerequisites
 from ..utils.caddy_config import ensure_caddy_labels_and_network
@@ -1067,6 +1067,8 @@ services:
                 with open(config_file, 'w') as f:
                     yaml.dump(config, f, default_flow_style=False, sort_keys=False)
                 log_success(f"Created config file: {config_file}")
+            # The new config may change the project root and project name
+            clear_config_cache()
             
             # Copy README.md to .dockertree directory
             if not self._copy_readme_file():
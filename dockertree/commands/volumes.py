@@ -48,10 +48,10 @@ class VolumeManager:
         
         return result
     
-    def show_volume_sizes(self) -> None:
+    def show_volume_sizes(self, refresh: bool = False) -> None:
         """Show volume sizes."""
         print_plain("Volume sizes:")
-        sizes = self.docker_manager.get_volume_sizes()
+        sizes = self.docker_manager.get_volume_sizes(refresh=refresh)
         
         if not sizes:
             print_plain("No worktree volumes found")
@@ -60,17 +60,31 @@ class VolumeManager:
         for volume, size in sizes.items():
             print_plain(f"  {volume}: {size}")
     
-    def get_volume_sizes_json(self) -> dict:
+    def get_volume_sizes_json(self, refresh: bool = False) -> dict:
         """Get volume sizes as JSON."""
-        sizes = self.docker_manager.get_volume_sizes()
+        sizes = self.docker_manager.get_volume_sizes(refresh=refresh)
         return {"volumes": sizes}
     
-    def backup_volumes(self, branch_name: str, backup_dir: Optional[Path] = None) -> bool:
-        """Backup worktree volumes."""
+    def backup_volumes(self, branch_name: str, backup_dir: Optional[Path] = None,
+                       incremental: bool = False) -> bool:
+        """Backup worktree volumes.
+        
+        Incremental backups are written to the chunk store in backup_dir
+        (default: .dockertree/backups) and produce a manifest that can be
+        passed to restore_volumes() like a backup file.
+        """
         if not branch_name:
             log_error("Branch name required for backup")
             return False
         
+        if incremental:
+            manifest = self.docker_manager.backup_volumes_incremental(branch_name, backup_dir)
+            if manifest:
+                log_success(f"Backup manifest created: {manifest}")
+                return True
+            log_error("Failed to create incremental backup")
+            return False
+        
         if backup_dir is None:
             backup_dir = Path.cwd() / "backups"
         
@@ -167,6 +181,8 @@ class VolumeManager:
         all_volumes = self.docker_manager.list_volumes()
         orphaned_count = 0
         
+        # Group orphaned volumes by branch so each branch's volumes are removed together
+        orphaned: Dict[str, List[str]] = {}
         for volume in all_volumes:
             # Extract branch name from volume name
             # Only check worktree-specific volumes (caddy volumes are intentionally excluded)
@@ -178,8 +194,11 @@ class VolumeManager:
             
             if branch_name and branch_name not in active_branches:
                 log_info(f"Found orphaned volume: {volume} (branch: {branch_name})")
-                if self.docker_manager.remove_volumes(branch_name):
-                    orphaned_count += 1
+                orphaned.setdefault(branch_name, []).append(volume)
+        
+        for branch_name, volumes in orphaned.items():
+            if self.docker_manager.remove_volumes(branch_name):
+                orphaned_count += len(volumes)
         
         if orphaned_count > 0:
             log_success(f"Cleaned up {orphaned_count} orphaned volume(s)")
@@ -6,14 +6,17 @@ This module provides commands for creating, starting, stopping, and removing wor
 
 import os
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, List
 
-from ..config.settings import get_project_root, get_script_dir, COMPOSE_WORKTREE
+from rich.table import Table
+
+from ..config.settings import get_project_root, get_script_dir, COMPOSE_WORKTREE, BULK_MAX_WORKERS
+from ..core.bulk_operations import BulkResult, run_bulk
 from ..core.worktree_orchestrator import WorktreeOrchestrator
 from ..core.docker_manager import DockerManager as CoreDockerManager
 from ..core.git_manager import GitManager as CoreGitManager
 from ..core.environment_manager import EnvironmentManager as CoreEnvironmentManager
-from ..utils.logging import log_info, log_success, log_warning, log_error
+from ..utils.logging import console, is_mcp_mode, log_info, log_success, log_warning, log_error
 from ..utils.path_utils import (
     get_compose_override_path, 
     get_worktree_branch_name,
@@ -44,6 +47,10 @@ class WorktreeManager:
         self.git_manager = None
         self.docker_manager = None
         self.env_manager = None
+        # Readiness timings of the last start_worktree call (see core.readiness)
+        self.last_readiness: Optional[Dict[str, Any]] = None
+        # Per-branch results of the last bulk operation
+        self.last_bulk_results: List[BulkResult] = []
 
     def _ensure_orchestrator(self) -> None:
         """Lazily create the orchestrator and dependent managers.
@@ -127,6 +134,7 @@ class WorktreeManager:
         if result['success']:
             data = result['data']
             domain_name = data['domain_name']
+            self.last_readiness = data.get('readiness')
             
             # CLI-specific: Pretty logging and output formatting
             log_success("Worktree environment started successfully")
@@ -139,6 +147,9 @@ class WorktreeManager:
             else:
                 log_warning("⚠️ Caddy routing configuration may have failed")
             
+            if self.last_readiness and self.last_readiness.get('ready'):
+                log_info(f"⏱️ Ready in {self.last_readiness['seconds']:.1f}s")
+            
             return True
         else:
             log_error(result['error'])
@@ -221,8 +232,15 @@ class WorktreeManager:
         pruned_count = self.git_manager.prune_worktrees()
         return pruned_count
     
-    def remove_all_worktrees(self, force: bool = False, delete_branch: bool = True) -> bool:
-        """Remove all worktrees, containers, and volumes."""
+    def remove_all_worktrees(self, force: bool = False, delete_branch: bool = True,
+                             max_workers: int = BULK_MAX_WORKERS) -> bool:
+        """Remove all worktrees, containers, and volumes.
+        
+        Args:
+            force: Force removal even with unmerged changes
+            delete_branch: Whether to delete the git branches as well
+            max_workers: Worktrees removed at the same time
+        """
         self._ensure_orchestrator()
         # Ensure we're in the main repository directory
         ensure_main_repo()
@@ -253,37 +271,9 @@ class WorktreeManager:
         
         log_info(f"Found {len(filtered_worktrees)} worktree(s) to remove")
         
-        # Track results
-        success_count = 0
-        failure_count = 0
-        failed_branches = []
-        
-        # Process each worktree
-        for path, commit, branch in filtered_worktrees:
-            log_info(f"Removing worktree: {branch}")
-            try:
-                # Use existing remove_worktree method for each worktree
-                if self.remove_worktree(branch, force, delete_branch):
-                    success_count += 1
-                    log_success(f"Successfully removed worktree: {branch}")
-                else:
-                    failure_count += 1
-                    failed_branches.append(branch)
-                    log_error(f"Failed to remove worktree: {branch}")
-            except Exception as e:
-                failure_count += 1
-                failed_branches.append(branch)
-                log_error(f"Error removing worktree {branch}: {e}")
-        
-        # Summary
-        if failure_count == 0:
-            log_success(f"Successfully removed all {success_count} worktree(s)")
-            return True
-        else:
-            log_warning(f"Removed {success_count} worktree(s), failed to remove {failure_count} worktree(s)")
-            if failed_branches:
-                log_warning(f"Failed branches: {', '.join(failed_branches)}")
-            return failure_count == 0  # Return True only if all succeeded
+        branches = [branch for path, commit, branch in filtered_worktrees]
+        return self._run_bulk(branches, lambda branch: self.remove_worktree(branch, force, delete_branch),
+                              "removed", "remove", max_workers)
     
     def get_worktree_info(self, branch_name: str) -> dict:
         """Get information about a worktree - CLI interface."""
@@ -300,13 +290,15 @@ class WorktreeManager:
                 "error": result['error']
             }
     
-    def remove_worktrees_by_pattern(self, pattern: str, force: bool = False, delete_branch: bool = True) -> bool:
+    def remove_worktrees_by_pattern(self, pattern: str, force: bool = False, delete_branch: bool = True,
+                                    max_workers: int = BULK_MAX_WORKERS) -> bool:
         """Remove worktrees matching a wildcard pattern.
         
         Args:
             pattern: Wildcard pattern to match branch names
             force: Force removal even with unmerged changes
             delete_branch: Whether to delete the git branch as well
+            max_workers: Worktrees removed at the same time
             
         Returns:
             True if all operations succeeded, False if any failed
@@ -343,33 +335,82 @@ class WorktreeManager:
             log_info("Operation cancelled by user")
             return True
         
-        # Track results
-        success_count = 0
-        failure_count = 0
-        failed_branches = []
-        
-        # Process each matching branch
-        for branch_name in matching_branches:
-            log_info(f"Removing worktree: {branch_name}")
-            try:
-                if self.remove_worktree(branch_name, force, delete_branch):
-                    success_count += 1
-                    log_success(f"Successfully removed worktree: {branch_name}")
-                else:
-                    failure_count += 1
-                    failed_branches.append(branch_name)
-                    log_error(f"Failed to remove worktree: {branch_name}")
-            except Exception as e:
-                failure_count += 1
-                failed_branches.append(branch_name)
-                log_error(f"Error removing worktree {branch_name}: {e}")
-        
-        # Summary
-        if failure_count == 0:
-            log_success(f"Successfully removed all {success_count} worktree(s)")
+        return self._run_bulk(matching_branches,
+                              lambda branch: self.remove_worktree(branch, force, delete_branch),
+                              "removed", "remove", max_workers)
+    
+    def _matching_worktree_branches(self, pattern: str) -> List[str]:
+        """Branches with a worktree that match a wildcard pattern (excluding the current branch)."""
+        branches = [branch for path, commit, branch in self.git_manager.list_worktrees() if branch]
+        return get_matching_branches(pattern, branches, self.git_manager.get_current_branch())
+    
+    def start_worktrees_by_pattern(self, pattern: str, profile: Optional[str] = None,
+                                   max_workers: int = BULK_MAX_WORKERS) -> bool:
+        """Start the worktrees matching a wildcard pattern concurrently.
+        
+        Returns:
+            True if all worktrees started, False if any failed
+        """
+        self._ensure_orchestrator()
+        branches = self._matching_worktree_branches(pattern)
+        if not branches:
+            log_info(f"No worktrees found matching pattern: {pattern}")
             return True
-        else:
-            log_warning(f"Removed {success_count} worktree(s), failed to remove {failure_count} worktree(s)")
-            if failed_branches:
-                log_warning(f"Failed branches: {', '.join(failed_branches)}")
-            return failure_count == 0  # Return True only if all succeeded
+        
+        # Start the global proxy once rather than racing to start it from every worktree
+        from .caddy import CaddyManager
+        caddy_manager = CaddyManager()
+        if not caddy_manager.is_caddy_running() and not caddy_manager.start_global_caddy():
+            log_error("Failed to start global Caddy")
+            return False
+        
+        return self._run_bulk(branches, lambda branch: self.start_worktree(branch, profile=profile),
+                              "started", "start", max_workers)
+    
+    def stop_worktrees_by_pattern(self, pattern: str, max_workers: int = BULK_MAX_WORKERS) -> bool:
+        """Stop the worktrees matching a wildcard pattern concurrently.
+        
+        Returns:
+            True if all worktrees stopped, False if any failed
+        """
+        self._ensure_orchestrator()
+        branches = self._matching_worktree_branches(pattern)
+        if not branches:
+            log_info(f"No worktrees found matching pattern: {pattern}")
+            return True
+        return self._run_bulk(branches, self.stop_worktree, "stopped", "stop", max_workers)
+    
+    def _run_bulk(self, branches: List[str], operation, action: str, verb: str, max_workers: int) -> bool:
+        """Run a per-branch operation on a worker pool and print a results table.
+        
+        Returns:
+            True if the operation succeeded for every branch
+        """
+        workers = max(1, min(max_workers, len(branches)))
+        log_info(f"Processing {len(branches)} worktree(s), {workers} at a time")
+        results = run_bulk(branches, operation, action, max_workers=workers)
+        self.last_bulk_results = results
+        self._print_bulk_results(results)
+        
+        failed = [result.branch for result in results if not result.success]
+        succeeded = len(results) - len(failed)
+        if not failed:
+            log_success(f"Successfully {action} all {succeeded} worktree(s)")
+            return True
+        log_warning(f"{action.capitalize()} {succeeded} worktree(s), failed to {verb} {len(failed)} worktree(s)")
+        log_warning(f"Failed branches: {', '.join(failed)}")
+        return False
+    
+    def _print_bulk_results(self, results: List[BulkResult]) -> None:
+        """Print one row per branch with its outcome and duration."""
+        if is_mcp_mode():
+            return
+        table = Table(show_header=True, header_style="bold", box=None, padding=(0, 1))
+        table.add_column("Branch", style="cyan", no_wrap=True)
+        table.add_column("Result", min_width=8)
+        table.add_column("Time", justify="right")
+        table.add_column("Details", style="dim white", overflow="ellipsis")
+        for result in results:
+            outcome = f"[green]{result.action}[/green]" if result.success else f"[red]{result.action}[/red]"
+            table.add_row(result.branch, outcome, f"{result.seconds:.1f}s", result.message)
+        console.print(table)
@@ -6,9 +6,18 @@ the dockertree CLI application.
 """
 
 import os
+import threading
 import yaml
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Mapping, Tuple
+
+try:
+    # libyaml-backed parser, several times faster than the pure Python one
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 # Version information
 VERSION = "0.9.4"
@@ -19,6 +28,7 @@ AUTHOR = "Dockertree Contributors"
 CADDY_NETWORK = "dockertree_caddy_proxy"
 COMPOSE_OVERRIDE_DIR = "dockertree"
 DOCKERTREE_DIR = ".dockertree"
+BACKUPS_DIR = "backups"  # Incremental backup chunk store, inside DOCKERTREE_DIR
 
 # File paths
 COMPOSE_OVERRIDE = f"{COMPOSE_OVERRIDE_DIR}/config/docker-compose.dockertree.yml"
@@ -31,6 +41,22 @@ MEDIA_VOLUME_SUFFIX = "media_files"
 CADDY_DATA_VOLUME_SUFFIX = "caddy_data"
 CADDY_CONFIG_VOLUME_SUFFIX = "caddy_config"
 
+# Maximum number of volumes copied at the same time when creating a worktree
+VOLUME_COPY_MAX_WORKERS = 3
+
+# Maximum number of volumes restored at the same time
+VOLUME_RESTORE_MAX_WORKERS = 3
+
+# Image of the helper container volume data is copied, archived and inspected in
+# (pinned, so every step runs the same tar and busybox; override with DOCKERTREE_VOLUME_HELPER_IMAGE)
+VOLUME_HELPER_IMAGE = "alpine:3.20"
+
+# Default number of worktrees removed, started or stopped at the same time (--parallel)
+BULK_MAX_WORKERS = 4
+
+# Seconds to wait for started containers to be healthy and the app to answer
+READINESS_TIMEOUT = 60
+
 # Protected branches that cannot be deleted
 PROTECTED_BRANCHES = {"main", "master", "develop", "production", "staging"}
 
@@ -49,6 +75,111 @@ DEFAULT_ENV_VARS = {
     "CADDY_EMAIL": "admin@example.com",
 }
 
+# Project configuration cache
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True)
+class ProjectConfig:
+    """Parsed .dockertree/config.yml (read-only).
+
+    Attributes:
+        path: Config file the values were read from, None if there is no
+            readable config file
+        data: Full config, as nested read-only mappings and tuples
+    """
+    path: Optional[Path]
+    data: Mapping[str, Any]
+
+    @property
+    def project_name(self) -> Optional[str]:
+        return self.data.get("project_name")
+
+    @property
+    def worktree_dir(self) -> str:
+        return self.data.get("worktree_dir", "worktrees")
+
+    @property
+    def caddy_network(self) -> str:
+        return self.data.get("caddy_network", CADDY_NETWORK)
+
+    def get_value(self, path_keys: List[str], default: Any = None) -> Any:
+        """Get a nested value, or default when any key along the path is missing."""
+        node: Any = self.data
+        for key in path_keys:
+            if not isinstance(node, Mapping) or key not in node:
+                return default
+            node = node[key]
+        return node
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a mutable copy of the config."""
+        return _thaw(self.data)
+
+
+_EMPTY_CONFIG = ProjectConfig(path=None, data=MappingProxyType({}))
+_config_cache: Dict[Path, Tuple[Tuple[int, int, int], ProjectConfig]] = {}
+_project_roots: Dict[Path, Path] = {}
+_cache_lock = threading.Lock()
+
+
+def load_project_config(project_root: Optional[Path] = None) -> ProjectConfig:
+    """Load a project's .dockertree/config.yml, parsing it at most once per change.
+
+    Parsed configs are cached by file and reused until the file's mtime,
+    size or inode changes.
+
+    Args:
+        project_root: Project root (default: get_project_root())
+
+    Returns:
+        The parsed config; an empty config if the file is missing or invalid
+    """
+    if project_root is None:
+        project_root = get_project_root()
+    config_path = Path(project_root) / DOCKERTREE_DIR / "config.yml"
+    try:
+        stat = config_path.stat()
+    except OSError:
+        return _EMPTY_CONFIG
+    stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    
+    with _cache_lock:
+        cached = _config_cache.get(config_path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    
+    try:
+        with open(config_path) as f:
+            data = yaml.load(f, Loader=_YamlLoader) or {}
+    except Exception:
+        return _EMPTY_CONFIG
+    config = ProjectConfig(path=config_path, data=_freeze(data if isinstance(data, dict) else {}))
+    with _cache_lock:
+        _config_cache[config_path] = (stamp, config)
+    return config
+
+
+def clear_config_cache() -> None:
+    """Forget cached configs and project roots (e.g. after setup writes a config)."""
+    with _cache_lock:
+        _config_cache.clear()
+        _project_roots.clear()
+
+
 # Deployment defaults helpers (Phase 2)
 def _get_config_value(path_keys: list[str], default: Optional[str] = None) -> Optional[str]:
     """Safely read a nested value from .dockertree/config.yml.
@@ -61,17 +192,7 @@ def _get_config_value(path_keys: list[str], default: Optional[str] = None) -> Op
         String value or default
     """
     try:
-        config_path = get_project_root() / DOCKERTREE_DIR / "config.yml"
-        if not config_path.exists():
-            return default
-        import yaml  # local import to avoid top-level dependency at import time
-        with open(config_path) as f:
-            cfg = yaml.safe_load(f) or {}
-        node: Any = cfg
-        for key in path_keys:
-            if not isinstance(node, dict) or key not in node:
-                return default
-            node = node[key]
+        node = load_project_config().get_value(path_keys, default)
         if isinstance(node, (str, int, float)):
             return str(node)
         return default
@@ -114,13 +235,9 @@ def get_deployment_ssh_key() -> Optional[str]:
 # Configuration loading functions
 def get_project_config() -> Dict[str, Any]:
     """Load project configuration from .dockertree/config.yml"""
-    config_path = get_project_root() / DOCKERTREE_DIR / "config.yml"
-    if config_path.exists():
-        try:
-            with open(config_path) as f:
-                return yaml.safe_load(f) or {}
-        except Exception:
-            pass
+    config = load_project_config()
+    if config.path is not None:
+        return config.to_dict()
     return get_default_config()
 
 def get_default_config() -> Dict[str, Any]:
@@ -143,8 +260,11 @@ def get_default_config() -> Dict[str, Any]:
 
 def get_project_name() -> str:
     """Get project name from config or fallback to directory name"""
-    config = get_project_config()
-    return config.get("project_name", get_project_root().name)
+    project_root = get_project_root()
+    config = load_project_config(project_root)
+    if config.path is None:
+        return project_root.name
+    return config.data.get("project_name", project_root.name)
 
 def sanitize_project_name(name: str) -> str:
     """Sanitize project name for use in Docker resource names.
@@ -181,8 +301,7 @@ def sanitize_hostname(name: str) -> str:
 
 def get_worktree_dir() -> str:
     """Get worktree directory from config"""
-    config = get_project_config()
-    return config.get("worktree_dir", "worktrees")
+    return load_project_config().worktree_dir
 
 # Docker Compose command detection
 def get_compose_command() -> str:
@@ -206,6 +325,22 @@ def get_project_root() -> Path:
     """Get the project root directory, supporting fractal worktree execution."""
     current = Path.cwd()
     
+    # Reuse the root found for this directory while it still has its config
+    # and no config was created in the current directory since
+    with _cache_lock:
+        cached = _project_roots.get(current)
+    if cached is not None and (cached / ".dockertree" / "config.yml").exists() and (
+            cached == current or not (current / ".dockertree" / "config.yml").exists()):
+        return cached
+    
+    root = _find_project_root(current)
+    if (root / ".dockertree" / "config.yml").exists():
+        with _cache_lock:
+            _project_roots[current] = root
+    return root
+
+
+def _find_project_root(current: Path) -> Path:
     # First: Check if we're IN a worktree with its own .dockertree/config.yml (fractal mode)
     if (current / ".dockertree" / "config.yml").exists():
         return current
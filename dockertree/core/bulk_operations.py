@@ -0,0 +1,75 @@
+"""
+Bulk worktree operations for dockertree CLI.
+
+Removing, starting or stopping many worktrees used to process branches one
+after another, so cleaning up dozens of preview branches took as long as the
+sum of every ``compose down``, volume removal and git cleanup. run_bulk runs a
+per-branch operation on a worker pool instead. The operations themselves
+serialize their git metadata changes (WorktreeOrchestrator holds a lock
+around ``git worktree remove`` and ``git branch -d``, which take repository-wide
+locks), so only the Docker work overlaps.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Sequence, Union
+
+from ..config.settings import BULK_MAX_WORKERS
+
+# Operation run per branch; returns success, or an orchestrator result ({"success", "data"/"error"})
+BulkOperation = Callable[[str], Union[bool, Dict[str, Any]]]
+
+
+@dataclass
+class BulkResult:
+    """Outcome of a bulk operation for one branch."""
+    branch: str
+    success: bool
+    action: str
+    message: str
+    seconds: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "branch": self.branch,
+            "success": self.success,
+            "action": self.action,
+            "message": self.message,
+            "seconds": round(self.seconds, 2),
+        }
+
+
+def _run_one(branch: str, operation: BulkOperation, action: str) -> BulkResult:
+    start = time.monotonic()
+    try:
+        result = operation(branch)
+    except Exception as e:
+        return BulkResult(branch, False, "error", str(e), time.monotonic() - start)
+    seconds = time.monotonic() - start
+    if isinstance(result, bool):
+        return BulkResult(branch, result, action if result else "failed", "", seconds)
+    if result.get("success"):
+        data = result.get("data") or {}
+        return BulkResult(branch, True, data.get("action") or action, data.get("message", ""), seconds)
+    return BulkResult(branch, False, "failed", result.get("error", "Unknown error"), seconds)
+
+
+def run_bulk(branches: Sequence[str], operation: BulkOperation, action: str = "done",
+             max_workers: int = BULK_MAX_WORKERS) -> List[BulkResult]:
+    """Run an operation for each branch on a worker pool.
+
+    Args:
+        branches: Branches to process
+        operation: Operation to run per branch (exceptions count as failures)
+        action: Action reported for branches the operation succeeded for
+        max_workers: Branches processed at the same time (1 runs them in order)
+
+    Returns:
+        One result per branch, in the order of branches
+    """
+    workers = max(1, min(max_workers, len(branches)))
+    if workers == 1:
+        return [_run_one(branch, operation, action) for branch in branches]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk") as executor:
+        return list(executor.map(lambda branch: _run_one(branch, operation, action), branches))
@@ -6,14 +6,18 @@ API Documentation: https://docs.digitalocean.com/reference/api/api-reference/#ta
 """
 
 import requests
-import time
 import socket
 from datetime import datetime
 from typing import Optional, Tuple, List, Dict, Any
 from ..dns_manager import DNSProvider
 from ..droplet_manager import DropletProvider, DropletInfo
+from ..readiness import FAILED, PENDING, READY, wait_until_ready
 from ...utils.logging import log_info, log_warning, log_error, log_success
 
+# Droplet polling backs off from 1 to 5 seconds (API rate limits)
+DROPLET_POLL_INITIAL_DELAY = 1.0
+DROPLET_POLL_MAX_DELAY = 5.0
+
 
 class DigitalOceanProvider(DNSProvider, DropletProvider):
     """Digital Ocean DNS and Droplet provider implementation."""
@@ -728,55 +732,38 @@ class DigitalOceanProvider(DNSProvider, DropletProvider):
         Returns:
             True if droplet is ready, False if timeout
         """
-        start_time = time.time()
-        last_status_log = 0
-        last_logged_status = None
         log_info(f"Waiting for droplet {droplet_id} to be ready (timeout: {timeout}s)...")
+        logged_status = [None]
         
-        droplet = None
-        ssh_ready = False
-        while time.time() - start_time < timeout:
-            elapsed = int(time.time() - start_time)
+        def probe():
             droplet = self.get_droplet(droplet_id)
             if not droplet:
-                log_warning(f"Droplet {droplet_id} not found")
-                return False
-            
+                return {"droplet": (FAILED, "not found")}
+            if droplet.status != logged_status[0]:
+                log_info(f"Droplet status: {droplet.status}")
+                logged_status[0] = droplet.status
             if droplet.status in ['off', 'archive']:
-                log_error(f"Droplet {droplet_id} is in {droplet.status} status")
-                return False
-            
-            # Log status updates every 15 seconds or on status change
-            if elapsed - last_status_log >= 15 or droplet.status != last_logged_status:
-                log_info(f"Droplet status: {droplet.status} (elapsed: {elapsed}s)")
-                last_logged_status = droplet.status
-                last_status_log = elapsed
-            
-            if droplet.status == 'active':
-                # If SSH check is enabled and we have an IP, verify SSH
-                if check_ssh and droplet.ip_address:
-                    if self._check_ssh_ready(droplet.ip_address):
-                        if not ssh_ready:
-                            log_info(f"Droplet is active, checking SSH connectivity...")
-                            log_success(f"SSH is ready on {droplet.ip_address}")
-                            ssh_ready = True
-                        log_success(f"Droplet {droplet_id} is ready (status: {droplet.status}, SSH: ready)")
-                        return True
-                    # SSH not ready yet, continue waiting
-                    if not ssh_ready:
-                        if elapsed - last_status_log >= 10:  # Log SSH wait every 10 seconds
-                            log_info(f"Droplet is active, waiting for SSH to be ready on {droplet.ip_address}...")
-                            last_status_log = elapsed
-                        ssh_ready = False
+                return {"droplet": (FAILED, f"droplet is in {droplet.status} status")}
+            if droplet.status != 'active':
+                return {"droplet": (PENDING, droplet.status)}
+            statuses = {"droplet": (READY, "active")}
+            # Without an IP yet there is no SSH to wait for
+            if check_ssh and droplet.ip_address:
+                if self._check_ssh_ready(droplet.ip_address):
+                    statuses["ssh"] = (READY, f"SSH is ready on {droplet.ip_address}")
                 else:
-                    # No SSH check or no IP yet
-                    log_success(f"Droplet {droplet_id} is ready (status: {droplet.status})")
-                    return True
-            
-            # Wait a bit before checking again
-            time.sleep(5)
+                    statuses["ssh"] = (PENDING, f"waiting for SSH on {droplet.ip_address}")
+            return statuses
         
-        log_warning(f"Timeout waiting for droplet {droplet_id} to be ready (waited {timeout}s)")
+        report = wait_until_ready([probe], timeout, initial_delay=DROPLET_POLL_INITIAL_DELAY,
+                                  max_delay=DROPLET_POLL_MAX_DELAY)
+        if report.ready:
+            log_success(f"Droplet {droplet_id} is ready after {report.seconds:.0f}s")
+            return True
+        if any(result.state == FAILED for result in report.results.values()):
+            log_error(f"Droplet {droplet_id} did not become ready: {report.describe()}")
+            return False
+        log_warning(f"Timeout waiting for droplet {droplet_id} to be ready (waited {timeout}s): {report.describe()}")
         return False
     
     def list_regions(self) -> List[Dict[str, Any]]:
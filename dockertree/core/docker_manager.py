@@ -5,11 +5,19 @@ This module provides Docker operations including network creation, volume manage
 container lifecycle, and compose file execution.
 """
 
+import functools
+import itertools
 import subprocess
 import shutil
+import tarfile
+import threading
+import time
 import yaml
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from ..config.settings import (
     CADDY_NETWORK, 
@@ -19,14 +27,71 @@ from ..config.settings import (
     DEFAULT_ENV_VARS,
     get_project_root,
     get_project_name,
-    sanitize_project_name
+    sanitize_project_name,
+    VOLUME_COPY_MAX_WORKERS,
+    VOLUME_RESTORE_MAX_WORKERS,
+    READINESS_TIMEOUT,
+    DOCKERTREE_DIR,
+    BACKUPS_DIR,
+    load_project_config
+)
+from ..utils.logging import (
+    log_info, log_success, log_warning, log_error, show_progress,
+    format_elapsed_time, format_size, format_throughput, TransferProgress
 )
-from ..utils.logging import log_info, log_success, log_warning, log_error, show_progress
 from ..utils.validation import (
-    validate_docker_running, validate_network_exists, validate_volume_exists,
+    validate_docker_running, validate_network_exists, get_existing_volumes,
     get_containers_using_volume, are_containers_running, get_postgres_container_for_volume
 )
+from ..utils.docker_client import get_docker_client
+from ..utils.volume_inventory import get_volume_inventory, invalidate_volume_inventory
+from ..utils.checksum import (
+    DEFAULT_CHECKSUM_ALGORITHM, HashingReader, TreeChecksum, is_checksum_algorithm_available, new_hasher
+)
+from ..utils.chunk_store import (
+    CHUNK_SIZE, MANIFEST_FORMAT, MANIFEST_VERSION, ChunkStore,
+    entry_from_member, is_chunk_manifest, load_manifest, member_from_entry
+)
+from ..utils.compression import (
+    COMPRESSION_GZIP, DEFAULT_COMPRESSION, detect_compression, iter_archive_members,
+    open_archive_reader, open_archive_writer
+)
+from ..utils.seekable_archive import read_archive_index
+from ..utils.volume_archive import (
+    normalize_member_name, relocate_member, get_relative_link_target,
+    locate_volume_member, is_legacy_volume_member, is_volume_member, CHECKSUM_ALGORITHM_HEADER,
+    LAYOUT_CHUNKED, LAYOUT_LEGACY, LAYOUT_STREAMED
+)
 from ..core.git_manager import GitManager
+from ..core.volume_clone import VolumeCloneBackend, select_clone_backend
+from ..core.readiness import ReadinessReport, compose_probe, wait_until_ready
+from ..core.volume_sizes import get_volume_size_engine
+from ..core.volume_helper import (
+    VolumeHelper, VolumeMounts, open_volume_helper, remove_orphaned_helpers, volume_command, volume_path
+)
+
+
+# Copies from a source volume run one at a time per process, so concurrent
+# worktree creation (bulk ``up``) cannot restart a source database while
+# another worktree is still copying its volume
+_source_volume_locks: Dict[str, threading.Lock] = {}
+_source_volume_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _source_volumes_locked(volume_names: Iterable[str]) -> Iterator[None]:
+    """Hold the copy locks of several source volumes (taken in name order)."""
+    with _source_volume_locks_guard:
+        locks = [_source_volume_locks.setdefault(name, threading.Lock()) for name in sorted(set(volume_names))]
+    acquired = []
+    try:
+        for lock in locks:
+            lock.acquire()
+            acquired.append(lock)
+        yield
+    finally:
+        for lock in reversed(acquired):
+            lock.release()
 
 
 class DockerManager:
@@ -46,6 +111,11 @@ class DockerManager:
         else:
             self.project_root = Path(project_root).resolve()
         self.compose_cmd = get_compose_command()
+        self._clone_backend: Optional[VolumeCloneBackend] = None
+        self._clone_backend_detected = False
+        self._clone_backend_lock = threading.Lock()
+        self._volume_helper: Optional[VolumeHelper] = None
+        self._volume_helper_lock = threading.RLock()
         if validate:
             self._validate_docker()
         else:
@@ -84,8 +154,10 @@ class DockerManager:
         """Copy volume data from source to target using file-level copy.
         
         This method works for all volume types (PostgreSQL, Redis, media, etc.).
-        The caller is responsible for ensuring containers are stopped before calling
-        this method to ensure data consistency.
+        When a copy-on-write clone backend is available (see core.volume_clone),
+        the data is cloned instead of copied. The caller is responsible for
+        ensuring containers are stopped before calling this method to ensure
+        data consistency.
         
         Args:
             source_volume: Source volume name
@@ -98,7 +170,7 @@ class DockerManager:
         log_info(f"Copying volume {source_volume} to {target_volume}...")
         
         # Check if source volume exists
-        if not validate_volume_exists(source_volume):
+        if not get_volume_inventory().exists(source_volume):
             log_warning(f"Source volume {source_volume} does not exist, creating empty target volume")
             return self._create_volume(target_volume)
         
@@ -106,9 +178,64 @@ class DockerManager:
         if not self._create_volume(target_volume):
             return False
         
+        # Prefer a copy-on-write clone when the Docker data root supports it
+        clone_backend = self._get_clone_backend()
+        if clone_backend and clone_backend.clone(source_volume, target_volume):
+            return True
+        
         # Use generic file copy for all volume types
         return self._copy_volume_files(source_volume, target_volume)
     
+    def _get_clone_backend(self) -> Optional[VolumeCloneBackend]:
+        """Get the copy-on-write clone backend for this host, detecting it on first use.
+        
+        Returns:
+            Available clone backend, or None when volumes must be copied file by file
+        """
+        with self._clone_backend_lock:
+            if not self._clone_backend_detected:
+                self._clone_backend = select_clone_backend()
+                self._clone_backend_detected = True
+            return self._clone_backend
+    
+    @contextmanager
+    def _volume_helper_session(self, volumes: VolumeMounts, steps_per_volume: int = 1) -> Iterator[Optional[VolumeHelper]]:
+        """Run the volume steps of a batch in one helper container (see core.volume_helper).
+        
+        Steps for volumes the helper does not mount, or every step if it cannot
+        be started, run in a container of their own. Batches of a single step
+        do not start a helper, and sessions inside a session reuse its helper.
+        Sessions opened from other threads (e.g. concurrent bulk jobs sharing
+        this manager) wait for the current one to end, so a helper is never
+        stopped while another batch still uses it.
+        
+        Args:
+            volumes: Volumes the batch uses
+            steps_per_volume: Container steps run for each volume
+            
+        Yields:
+            The helper of the session, or None
+        """
+        with self._volume_helper_lock:
+            if self._volume_helper is not None or len(volumes) * steps_per_volume < 2:
+                yield self._volume_helper
+                return
+            with open_volume_helper(volumes) as helper:
+                self._volume_helper = helper
+                try:
+                    yield helper
+                finally:
+                    self._volume_helper = None
+    
+    def _volume_command(self, args: List[str], volumes: VolumeMounts, interactive: bool = False) -> List[str]:
+        """Build the command running a volume step, in the session's helper container if it mounts the volumes."""
+        return volume_command(args, volumes, self._volume_helper, interactive)
+    
+    def _containers_using_volume(self, volume_name: str) -> List[str]:
+        """Find the containers using a volume, apart from the session's helper container."""
+        helper_name = self._volume_helper.container_name if self._volume_helper is not None else None
+        return [name for name in get_containers_using_volume(volume_name) if name != helper_name]
+    
     def _get_postgres_container_name(self, branch_name: str) -> Optional[str]:
         """Get PostgreSQL container name for a branch.
         
@@ -123,14 +250,8 @@ class DockerManager:
         container_name = f"{project_name}-{branch_name}-db"
         
         # Verify container exists
-        result = subprocess.run(
-            ["docker", "ps", "-a", "--filter", f"name={container_name}", "--format", "{{.Names}}"],
-            capture_output=True,
-            text=True,
-            check=False
-        )
-        
-        if result.stdout.strip() == container_name:
+        containers = get_docker_client().list_containers(all=True, filters={"name": [container_name]})
+        if any(container.name == container_name for container in containers or []):
             return container_name
         return None
     
@@ -158,13 +279,8 @@ class DockerManager:
             return None
         
         # Check if container is running
-        result = subprocess.run(
-            ["docker", "ps", "--filter", f"name={postgres_container}", "--format", "{{.Names}}"],
-            capture_output=True,
-            text=True,
-            check=False
-        )
-        is_running = result.stdout.strip() == postgres_container
+        containers = get_docker_client().list_containers(filters={"name": [postgres_container]})
+        is_running = any(container.name == postgres_container for container in containers or [])
         
         if not is_running:
             log_info(f"Container {postgres_container} is already stopped")
@@ -217,7 +333,7 @@ class DockerManager:
             return False
     
     def _copy_volume_files(self, source_volume: str, target_volume: str) -> bool:
-        """Copy volume files using Alpine container (works for all volume types).
+        """Copy volume files in a helper container (works for all volume types).
         
         This is a generic file copy method that works for PostgreSQL, Redis, media files,
         and any other volume type. The container must be stopped before calling this method
@@ -230,14 +346,28 @@ class DockerManager:
         Returns:
             True if copy succeeded, False otherwise
         """
+        start_time = time.monotonic()
         try:
-            subprocess.run([
-                "docker", "run", "--rm",
-                "-v", f"{source_volume}:/source:ro",
-                "-v", f"{target_volume}:/dest",
-                "alpine", "sh", "-c", "cp -r /source/* /dest/ 2>/dev/null || true"
-            ], check=True, capture_output=True)
-            log_success(f"Volume files copied successfully: {source_volume} -> {target_volume}")
+            source, dest = volume_path(source_volume), volume_path(target_volume)
+            result = subprocess.run(self._volume_command([
+                "sh", "-c", f"cp -r {source}/* {dest}/ 2>/dev/null || true; du -sb {dest} 2>/dev/null | cut -f1"
+            ], {source_volume: True, target_volume: False}), check=True, capture_output=True, text=True)
+            elapsed = time.monotonic() - start_time
+            
+            # The copy container prints the size of the copied data so throughput can be reported
+            try:
+                copied_bytes = int(str(result.stdout).strip())
+            except (TypeError, ValueError):
+                copied_bytes = None
+            
+            if copied_bytes is not None:
+                log_success(
+                    f"Volume files copied successfully: {source_volume} -> {target_volume} "
+                    f"({format_size(copied_bytes)} in {format_elapsed_time(elapsed)}, "
+                    f"{format_throughput(copied_bytes, elapsed)})"
+                )
+            else:
+                log_success(f"Volume files copied successfully: {source_volume} -> {target_volume}")
             return True
         except subprocess.CalledProcessError as e:
             log_error(f"Failed to copy volume files: {e}")
@@ -255,12 +385,16 @@ class DockerManager:
         except subprocess.CalledProcessError as e:
             log_error(f"Failed to create volume {volume_name}: {e}")
             return False
+        finally:
+            invalidate_volume_inventory()
     
     def create_worktree_volumes(self, branch_name: str, project_name: str = None, force_copy: bool = False) -> bool:
         """Create worktree-specific volumes, copying only if needed.
         
-        For PostgreSQL volumes, this method will stop the original database container
-        before copying to ensure data consistency, then restart it after copying.
+        Volumes are copied concurrently (see _copy_volumes_concurrently). For PostgreSQL
+        volumes, this method will stop the original database container before copying
+        to ensure data consistency, then restart it as soon as the PostgreSQL copy
+        finishes rather than waiting for the remaining volumes.
         
         Note: Only creates postgres, redis, and media volumes. Caddy volumes 
         are shared globally across all worktrees and should not be copied.
@@ -279,7 +413,7 @@ class DockerManager:
         # If project_name is provided, use it as-is (assumed to be sanitized)
         
         # Check if all volumes already exist
-        all_volumes_exist = all(validate_volume_exists(vol_name) for vol_name in volume_names.values())
+        all_volumes_exist = len(get_volume_inventory().existing(volume_names.values())) == len(set(volume_names.values()))
         
         if all_volumes_exist and not force_copy:
             # Volumes already exist - do NOT overwrite them (non-destructive)
@@ -293,27 +427,96 @@ class DockerManager:
         else:
             log_info(f"Creating worktree-specific volumes for {branch_name}")
         
-        # For PostgreSQL volumes, stop the original container before copying
-        original_db_container = None
-        if 'postgres' in project_volumes:
-            source_postgres_volume = project_volumes['postgres']
-            original_db_container = self._ensure_containers_stopped_for_volume_operation(
-                source_postgres_volume, project_name, "volume copy"
-            )
-            log_info("PostgreSQL volumes will be copied safely to prevent database corruption")
+        # Worktrees created concurrently copy the same source volumes one after
+        # another: the stop/copy/restart of the source database must not overlap
+        with _source_volumes_locked(project_volumes.values()):
+            # For PostgreSQL volumes, stop the original container before copying
+            original_db_container = None
+            if 'postgres' in project_volumes:
+                source_postgres_volume = project_volumes['postgres']
+                original_db_container = self._ensure_containers_stopped_for_volume_operation(
+                    source_postgres_volume, project_name, "volume copy"
+                )
+                log_info("PostgreSQL volumes will be copied safely to prevent database corruption")
+            
+            copy_jobs = [
+                (volume_type, source_volume, volume_names[volume_type])
+                for volume_type, source_volume in project_volumes.items()
+            ]
+            # The stopped database container is restarted by the postgres job itself,
+            # so it is down only for the duration of its own copy
+            restart_after = {'postgres': original_db_container} if original_db_container else {}
+            success = self._copy_volumes_concurrently(copy_jobs, project_name, restart_after)
         
+        if success:
+            log_success(f"Worktree volumes created for {branch_name}")
+        return success
+    
+    def _copy_volumes_concurrently(self, copy_jobs: List[Tuple[str, str, str]], project_name: str,
+                                   restart_after: Optional[Dict[str, str]] = None,
+                                   max_workers: int = VOLUME_COPY_MAX_WORKERS) -> bool:
+        """Copy several volumes at once with bounded concurrency.
+        
+        Jobs are started in the given order, so the PostgreSQL copy (listed first by
+        get_source_volume_names()) gets a worker slot before the larger media volumes.
+        
+        Args:
+            copy_jobs: List of (volume_type, source_volume, target_volume) tuples
+            project_name: Sanitized project name passed through to copy_volume()
+            restart_after: Mapping of volume type to a container that must be restarted
+                as soon as that volume's copy finishes (successfully or not)
+            max_workers: Upper bound on simultaneous copy containers
+            
+        Returns:
+            True if every volume was copied, False otherwise
+        """
+        if not copy_jobs:
+            return True
+        
+        restart_after = restart_after or {}
+        total = len(copy_jobs)
+        completed = 0
         success = True
-        for volume_type, source_volume in project_volumes.items():
-            target_volume = volume_names[volume_type]
-            if not self.copy_volume(source_volume, target_volume, project_name):
-                success = False
+        start_time = time.monotonic()
         
-        # Restart the original database container if we stopped it
-        if original_db_container:
-            self._restart_container(original_db_container)
+        def run_job(volume_type: str, source_volume: str, target_volume: str) -> bool:
+            try:
+                return self.copy_volume(source_volume, target_volume, project_name)
+            finally:
+                container = restart_after.get(volume_type)
+                if container:
+                    self._restart_container(container)
+        
+        workers = max(1, min(max_workers, total))
+        log_info(f"Copying {total} volume(s) with up to {workers} parallel worker(s)")
+        
+        # Copies that are not cloned share one helper container
+        helper_volumes: VolumeMounts = {}
+        if self._get_clone_backend() is None:
+            existing = get_volume_inventory().existing(source for _, source, _ in copy_jobs)
+            helper_volumes = {source: True for _, source, _ in copy_jobs if source in existing}
+            helper_volumes.update({target: False for _, source, target in copy_jobs if source in existing})
+        
+        with self._volume_helper_session(helper_volumes), \
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix="volume-copy") as executor:
+            futures = {
+                executor.submit(run_job, volume_type, source_volume, target_volume): (volume_type, target_volume)
+                for volume_type, source_volume, target_volume in copy_jobs
+            }
+            for future in as_completed(futures):
+                volume_type, target_volume = futures[future]
+                completed += 1
+                try:
+                    copied = future.result()
+                except Exception as e:
+                    log_error(f"Failed to copy {volume_type} volume {target_volume}: {e}")
+                    copied = False
+                if not copied:
+                    success = False
+                status = "done" if copied else "failed"
+                log_info(f"[{completed}/{total}] {volume_type} volume {target_volume}: {status}")
         
-        if success:
-            log_success(f"Worktree volumes created for {branch_name}")
+        log_info(f"Volume copy finished in {format_elapsed_time(time.monotonic() - start_time)}")
         return success
     
     def remove_volumes(self, branch_name: str) -> bool:
@@ -326,10 +529,15 @@ class DockerManager:
         log_info(f"Removing worktree-specific volumes for {branch_name}")
         
         volume_names = get_volume_names(branch_name)
+        existing = get_volume_inventory().existing(volume_names.values())
         success = True
         
+        if existing:
+            # A killed command's helper container would keep the volumes in use
+            remove_orphaned_helpers()
+        
         for volume_type, volume_name in volume_names.items():
-            if validate_volume_exists(volume_name):
+            if volume_name in existing:
                 try:
                     subprocess.run(
                         ["docker", "volume", "rm", volume_name],
@@ -343,20 +551,93 @@ class DockerManager:
             else:
                 log_warning(f"Volume {volume_name} not found")
         
+        if existing:
+            invalidate_volume_inventory()
         return success
     
-    def backup_volumes(self, branch_name: str, backup_dir: Path) -> Optional[Path]:
-        """Backup worktree volumes to a tar file using file-level copy for all volumes.
+    def backup_volumes(self, branch_name: str, backup_dir: Path,
+                       volume_names: Optional[List[str]] = None,
+                       compression: str = DEFAULT_COMPRESSION,
+                       compression_level: Optional[int] = None,
+                       hasher=None) -> Optional[Path]:
+        """Backup worktree volumes to a single compressed tar file.
+        
+        Each volume is streamed out of a helper container and written into the
+        backup as a ``<volume_name>/`` directory, so no per-volume temporary
+        archives are created and data is only compressed once. Stops containers
+        safely before backup, then restarts them if they were running.
         
-        Stops containers safely before backup, then restarts them if they were running.
-        All volumes (including PostgreSQL) are backed up using file-level copy.
+        Args:
+            branch_name: Branch name for the worktree
+            backup_dir: Directory to write ``backup_<branch>.tar`` into
+            volume_names: Volumes to back up. Defaults to all worktree volumes.
+            compression: Archive compression ("gzip", "zstd" or "none")
+            compression_level: Compression level (defaults per format)
+            hasher: Optional hash object fed with the backup file's bytes as
+                they are written (see checksum.new_hasher)
+            
+        Returns:
+            Path to the backup file, or None on failure
         """
         backup_file = backup_dir / f"backup_{branch_name}.tar"
-        volume_names = get_volume_names(branch_name)
+        if volume_names is None:
+            volume_names = list(get_volume_names(branch_name).values())
         
         log_info(f"Backing up volumes for {branch_name} to {backup_file}")
+        backup_dir.mkdir(parents=True, exist_ok=True)
         
-        # Check if worktree is running before backup
+        try:
+            with open_archive_writer(backup_file, compression, compression_level, hasher=hasher) as tar:
+                checksums = self.backup_volumes_to_archive(branch_name, volume_names, tar)
+        except (OSError, ValueError, tarfile.TarError) as e:
+            log_error(f"Failed to create backup: {e}")
+            checksums = None
+        
+        if checksums is None:
+            if backup_file.exists():
+                backup_file.unlink()
+            return None
+        
+        log_success(f"Backup created: {backup_file}")
+        return backup_file
+    
+    def backup_volumes_to_archive(self, branch_name: str, volume_names: List[str],
+                                  tar: tarfile.TarFile, arc_prefix: str = "",
+                                  checksum_algorithm: str = DEFAULT_CHECKSUM_ALGORITHM) -> Optional[Dict[str, str]]:
+        """Stream worktree volumes into an open tar archive.
+        
+        Stops the worktree containers while volumes are read and restarts them
+        in the background afterwards if they were running.
+        
+        Args:
+            branch_name: Branch name for the worktree
+            volume_names: Volumes to back up (missing volumes are skipped)
+            tar: Archive opened for writing
+            arc_prefix: Directory inside the archive to place volumes under
+            checksum_algorithm: Algorithm for the volume tree checksums
+            
+        Returns:
+            Dictionary of volume name to tree checksum, or None on failure
+        """
+        with self._worktree_stopped(branch_name):
+            checksums = {}
+            existing = get_volume_inventory().existing(volume_names)
+            with self._volume_helper_session({name: True for name in volume_names if name in existing}):
+                for volume_name in volume_names:
+                    if volume_name not in existing:
+                        log_warning(f"Volume {volume_name} not found, skipping")
+                        continue
+                    
+                    arcname = f"{arc_prefix}/{volume_name}" if arc_prefix else volume_name
+                    checksum = self._stream_volume_to_archive(volume_name, tar, arcname, checksum_algorithm)
+                    if checksum is None:
+                        return None
+                    checksums[volume_name] = checksum
+            return checksums
+    
+    @contextmanager
+    def _worktree_stopped(self, branch_name: str) -> Iterator[None]:
+        """Stop a running worktree while volumes are read, restarting it in the background afterwards."""
         was_running = self._is_worktree_running(branch_name)
         if was_running:
             log_info(f"Worktree containers are running, stopping them safely before backup...")
@@ -368,53 +649,14 @@ class DockerManager:
             else:
                 log_success("Containers stopped successfully")
         
-        # Create backup directory
-        backup_dir.mkdir(parents=True, exist_ok=True)
-        temp_backup_dir = backup_dir / "temp_backup"
-        temp_backup_dir.mkdir(exist_ok=True)
-        
         try:
-            # Backup each volume using file-level copy (all volumes, including PostgreSQL)
-            for volume_type, volume_name in volume_names.items():
-                if not validate_volume_exists(volume_name):
-                    log_warning(f"Volume {volume_name} not found, skipping")
-                    continue
-                
-                log_info(f"Backing up volume: {volume_name} ({volume_type})")
-                
-                # Use file-level backup for all volumes
-                volume_backup = temp_backup_dir / f"{volume_name}.tar.gz"
-                
-                try:
-                    subprocess.run([
-                        "docker", "run", "--rm",
-                        "-v", f"{volume_name}:/data",
-                        "-v", f"{temp_backup_dir.absolute()}:/backup",
-                        "alpine", "tar", "czf", f"/backup/{volume_name}.tar.gz", "-C", "/data", "."
-                    ], check=True, capture_output=True, text=True)
-                    log_success(f"Volume backup created: {volume_name}.tar.gz")
-                except subprocess.CalledProcessError as e:
-                    log_error(f"Failed to backup volume {volume_name}: {e}")
-                    if e.stderr:
-                        log_error(f"Error details: {e.stderr}")
-                    continue
-            
-            # Create combined backup
-            subprocess.run([
-                "tar", "czf", str(backup_file), "-C", str(temp_backup_dir), "."
-            ], check=True, capture_output=True)
-            
-            # Cleanup temp directory
-            shutil.rmtree(temp_backup_dir)
-            
-            log_success(f"Backup created: {backup_file}")
-            
+            yield
+        finally:
             # Restart containers if they were running before
             if was_running:
                 log_info("Restarting worktree containers in background...")
                 from ..core.worktree_orchestrator import WorktreeOrchestrator
                 orchestrator = WorktreeOrchestrator(project_root=self.project_root)
-                import threading
                 
                 def start_in_background():
                     start_result = orchestrator.start_worktree(branch_name)
@@ -425,26 +667,187 @@ class DockerManager:
                 
                 thread = threading.Thread(target=start_in_background, daemon=True)
                 thread.start()
+    
+    def _open_volume_stream(self, volume_name: str) -> subprocess.Popen:
+        """Run ``tar cf`` in a helper container, writing an uncompressed tar of a volume to stdout."""
+        return subprocess.Popen(self._volume_command(
+            ["tar", "cf", "-", "-C", volume_path(volume_name), "."], {volume_name: True}
+        ), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    
+    def _stream_volume_to_archive(self, volume_name: str, tar: tarfile.TarFile, arcname: str,
+                                  checksum_algorithm: str = DEFAULT_CHECKSUM_ALGORITHM) -> Optional[str]:
+        """Stream one volume's files from a helper container into a tar archive.
+        
+        The container writes an uncompressed tar of the volume to stdout. Its
+        members are re-emitted under ``arcname/`` and checksummed on the way
+        through, so the data is read exactly once.
+        
+        Args:
+            volume_name: Volume to back up
+            tar: Archive opened for writing
+            arcname: Directory name for the volume inside the archive
+            checksum_algorithm: Algorithm for the tree checksum
             
-            return backup_file
-            
-        except subprocess.CalledProcessError as e:
-            log_error(f"Failed to create backup: {e}")
-            # Cleanup temp directory
-            if temp_backup_dir.exists():
-                shutil.rmtree(temp_backup_dir)
+        Returns:
+            Tree checksum of the volume contents, or None on failure
+        """
+        log_info(f"Backing up volume: {volume_name}")
+        start_time = time.monotonic()
+        process = self._open_volume_stream(volume_name)
+        
+        tree = TreeChecksum(checksum_algorithm)
+        total_bytes = 0
+        try:
+            with tarfile.open(fileobj=process.stdout, mode="r|") as source:
+                for member in source:
+                    relative_name = normalize_member_name(member.name)
+                    if member.issym() or member.islnk():
+                        tree.add_link(relative_name, get_relative_link_target(member))
+                    relocate_member(member, f"{arcname}/{relative_name}" if relative_name else arcname, arcname)
+                    if member.isfile():
+                        reader = HashingReader(source.extractfile(member), checksum_algorithm)
+                        tar.addfile(member, reader)
+                        tree.add_file(relative_name, reader.hexdigest())
+                        total_bytes += member.size
+                    else:
+                        tar.addfile(member)
+            stderr = process.stderr.read().decode(errors="replace")
+            returncode = process.wait()
+        except (OSError, tarfile.TarError) as e:
+            process.kill()
+            process.wait()
+            log_error(f"Failed to backup volume {volume_name}: {e}")
+            return None
+        
+        if returncode != 0:
+            log_error(f"Failed to backup volume {volume_name}")
+            if stderr.strip():
+                log_error(f"Error details: {stderr.strip()}")
+            return None
+        
+        elapsed = time.monotonic() - start_time
+        log_success(
+            f"Volume backed up: {volume_name} ({format_size(total_bytes)} "
+            f"in {format_elapsed_time(elapsed)}, {format_throughput(total_bytes, elapsed)})"
+        )
+        return tree.hexdigest()
+    
+    def backup_volumes_incremental(self, branch_name: str, store_dir: Optional[Path] = None,
+                                   volume_names: Optional[List[str]] = None) -> Optional[Path]:
+        """Back up worktree volumes incrementally into a content-addressed chunk store.
+        
+        Volume files are split into chunks that are stored once under their
+        checksum, so only chunks that changed since any earlier backup are
+        written. The backup itself is a manifest that restore_volumes() accepts
+        in place of a backup file.
+        
+        Args:
+            branch_name: Branch name for the worktree
+            store_dir: Chunk store directory (default: .dockertree/backups)
+            volume_names: Volumes to back up. Defaults to all worktree volumes.
             
-            # Try to restart containers if they were running
-            if was_running:
-                log_info("Attempting to restart containers after backup failure...")
-                try:
-                    from ..core.worktree_orchestrator import WorktreeOrchestrator
-                    orchestrator = WorktreeOrchestrator(project_root=self.project_root)
-                    orchestrator.start_worktree(branch_name)
-                except Exception as restart_error:
-                    log_error(f"Failed to restart containers: {restart_error}")
+        Returns:
+            Path to the backup manifest, or None on failure
+        """
+        store = ChunkStore(store_dir or self.project_root / DOCKERTREE_DIR / BACKUPS_DIR)
+        if volume_names is None:
+            volume_names = list(get_volume_names(branch_name).values())
+        
+        log_info(f"Backing up volumes for {branch_name} incrementally to {store.root}")
+        start_time = time.monotonic()
+        volumes = {}
+        with self._worktree_stopped(branch_name):
+            existing = get_volume_inventory().existing(volume_names)
+            with self._volume_helper_session({name: True for name in volume_names if name in existing}):
+                for volume_name in volume_names:
+                    if volume_name not in existing:
+                        log_warning(f"Volume {volume_name} not found, skipping")
+                        continue
+                    volume = self._chunk_volume(volume_name, store)
+                    if volume is None:
+                        return None
+                    volumes[volume_name] = volume
+        
+        manifest = {
+            "format": MANIFEST_FORMAT,
+            "version": MANIFEST_VERSION,
+            "branch_name": branch_name,
+            "created_at": datetime.now().isoformat(),
+            "checksum_algorithm": store.algorithm,
+            "chunk_size": CHUNK_SIZE,
+            "volumes": volumes
+        }
+        try:
+            manifest_path = store.write_manifest(branch_name, manifest)
+        except OSError as e:
+            log_error(f"Failed to write backup manifest: {e}")
+            return None
+        
+        total_bytes = sum(volume["bytes"] for volume in volumes.values())
+        new_bytes = sum(volume["new_bytes"] for volume in volumes.values())
+        log_success(
+            f"Incremental backup created: {manifest_path} ({format_size(new_bytes)} new of "
+            f"{format_size(total_bytes)} in {format_elapsed_time(time.monotonic() - start_time)})"
+        )
+        return manifest_path
+    
+    def _chunk_volume(self, volume_name: str, store: ChunkStore) -> Optional[Dict[str, Any]]:
+        """Stream one volume's files from a helper container into a chunk store.
+        
+        Args:
+            volume_name: Volume to back up
+            store: Chunk store to write new chunks into
             
+        Returns:
+            Manifest entry for the volume, or None on failure
+        """
+        log_info(f"Backing up volume: {volume_name}")
+        start_time = time.monotonic()
+        process = self._open_volume_stream(volume_name)
+        
+        tree = TreeChecksum(store.algorithm)
+        entries = []
+        total_bytes = new_bytes = 0
+        try:
+            with tarfile.open(fileobj=process.stdout, mode="r|") as source:
+                for member in source:
+                    relative_name = normalize_member_name(member.name)
+                    if member.issym() or member.islnk():
+                        member.linkname = get_relative_link_target(member)
+                        tree.add_link(relative_name, member.linkname)
+                    chunks = []
+                    if member.isfile():
+                        file_hasher = new_hasher(store.algorithm)
+                        chunks, written = store.put_stream(source.extractfile(member), file_hasher)
+                        tree.add_file(relative_name, file_hasher.hexdigest())
+                        total_bytes += member.size
+                        new_bytes += written
+                    entries.append(entry_from_member(member, relative_name or ".", chunks))
+            stderr = process.stderr.read().decode(errors="replace")
+            returncode = process.wait()
+        except (OSError, tarfile.TarError) as e:
+            process.kill()
+            process.wait()
+            log_error(f"Failed to backup volume {volume_name}: {e}")
+            return None
+        
+        if returncode != 0:
+            log_error(f"Failed to backup volume {volume_name}")
+            if stderr.strip():
+                log_error(f"Error details: {stderr.strip()}")
             return None
+        
+        elapsed = time.monotonic() - start_time
+        log_success(
+            f"Volume backed up: {volume_name} ({format_size(new_bytes)} new of {format_size(total_bytes)} "
+            f"in {format_elapsed_time(elapsed)}, {format_throughput(total_bytes, elapsed)})"
+        )
+        return {
+            "checksum": tree.hexdigest(),
+            "bytes": total_bytes,
+            "new_bytes": new_bytes,
+            "entries": entries
+        }
     
     def get_volumes_for_service(self, branch_name: str, service_name: str) -> List[str]:
         """Get list of volume names associated with a specific service.
@@ -489,15 +892,7 @@ class DockerManager:
         service_config = services[service_name]
         
         # Get project name for volume prefix
-        project_name = None
-        config_path = self.project_root / ".dockertree" / "config.yml"
-        if config_path.exists():
-            try:
-                with open(config_path) as f:
-                    config = yaml.safe_load(f) or {}
-                    project_name = config.get("project_name")
-            except Exception:
-                pass
+        project_name = load_project_config(self.project_root).project_name
         
         if not project_name:
             project_name = self.project_root.name
@@ -575,18 +970,14 @@ class DockerManager:
         log_info("Ensuring containers are stopped before volume restoration...")
         try:
             from ..config.settings import sanitize_project_name
-            import yaml
             
             # Get project name from config file in worktree's project root
             # Worktree path structure: <project_root>/worktrees/<branch_name>
             # So project root is worktree_path.parent.parent
             project_root = worktree_path.parent.parent
-            config_file = project_root / ".dockertree" / "config.yml"
-            
-            if config_file.exists():
-                with open(config_file) as f:
-                    config = yaml.safe_load(f) or {}
-                    project_name = config.get("project_name", project_root.name)
+            config = load_project_config(project_root)
+            if config.path is not None:
+                project_name = config.data.get("project_name", project_root.name)
             else:
                 # Fallback to directory name
                 project_name = project_root.name
@@ -620,7 +1011,9 @@ class DockerManager:
             log_warning(f"Could not stop containers before restore: {e}")
             return False
     
-    def restore_volumes(self, branch_name: str, backup_file: Path) -> bool:
+    def restore_volumes(self, branch_name: str, backup_file: Path, layout: Optional[str] = None,
+                        member_handler: Optional[Callable[[tarfile.TarFile, tarfile.TarInfo], None]] = None,
+                        volume_checksums: Optional[Dict[str, str]] = None) -> bool:
         """Restore worktree volumes from a backup file using file-level restore for all volumes.
         
         Stops containers safely before restore, then restarts them if they were running.
@@ -629,8 +1022,15 @@ class DockerManager:
         Args:
             branch_name: Branch name for the worktree
             backup_file: Path to backup file. Can be either:
-                - A package file (.dockertree-package.tar.gz) containing nested backup_test.tar
-                - A direct backup file (backup_test.tar) containing volume backups
+                - A package file (.dockertree-package.tar.gz) containing volume directories
+                  or a nested backup_test.tar
+                - A direct backup file (backup_test.tar) containing volume directories
+                  or per-volume .tar.gz backups
+            layout: Backup layout, if already known (detected from the file otherwise)
+            member_handler: Called with the archive and each member outside the
+                volume directories, in the same pass (streamed layout only)
+            volume_checksums: Filled with the tree checksum of every volume
+                directory read (streamed layout only)
         """
         if not backup_file.exists():
             log_error(f"Backup file {backup_file} not found")
@@ -655,260 +1055,18 @@ class DockerManager:
         restore_temp_dir = backup_file.parent / "restore_temp"
         
         try:
-            # Extract backup
-            log_info(f"Extracting backup archive to temporary directory...")
-            restore_temp_dir.mkdir(exist_ok=True)
-            
-            # Check if this is a package file (.dockertree-package.tar.gz) or a direct backup file
-            is_package_file = backup_file.name.endswith('.dockertree-package.tar.gz')
-            
-            if is_package_file:
-                # Extract the package file to get the nested backup_test.tar
-                log_info("Detected package file, extracting to find nested backup archive...")
-                extract_result = subprocess.run([
-                    "tar", "xzf", str(backup_file), "-C", str(restore_temp_dir)
-                ], check=True, capture_output=True, text=True)
-                
-                if extract_result.stderr:
-                    log_info(f"Extraction output: {extract_result.stderr}")
-                
-                # Find the nested backup_test.tar file
-                nested_backup_tar = None
-                for pattern in [f"**/backup_{branch_name}.tar", "**/backup_*.tar"]:
-                    matches = list(restore_temp_dir.glob(pattern))
-                    if matches:
-                        nested_backup_tar = matches[0]
-                        break
-                
-                if nested_backup_tar and nested_backup_tar.exists():
-                    log_info(f"Found nested backup archive: {nested_backup_tar.name}")
-                    # Extract the nested tar to get the actual volume backup files
-                    nested_extract_result = subprocess.run([
-                        "tar", "xzf", str(nested_backup_tar), "-C", str(restore_temp_dir)
-                    ], check=True, capture_output=True, text=True)
-                    
-                    if nested_extract_result.stderr:
-                        log_info(f"Nested extraction output: {nested_extract_result.stderr}")
-                    
-                    log_success("Nested backup archive extracted successfully")
-                else:
-                    log_warning("No nested backup archive found in package file")
-                    # Try to find volume backups directly in extracted package
+            layout = layout or self._detect_backup_layout(backup_file)
+            if layout == LAYOUT_CHUNKED:
+                log_info("Detected incremental backup manifest, restoring from chunk store...")
+                restored_count, skipped_count, failed_count, total_backups = \
+                    self._restore_chunked_volumes(backup_file, volume_names)
+            elif layout == LAYOUT_STREAMED:
+                log_info("Detected streamed volume layout, restoring directly from archive...")
+                restored_count, skipped_count, failed_count, total_backups = \
+                    self._restore_streamed_volumes(backup_file, volume_names, member_handler, volume_checksums)
             else:
-                # Direct backup file - extract it directly
-                log_info("Detected direct backup file, extracting...")
-                extract_result = subprocess.run([
-                    "tar", "xzf", str(backup_file), "-C", str(restore_temp_dir)
-                ], check=True, capture_output=True, text=True)
-                
-                if extract_result.stderr:
-                    log_info(f"Extraction output: {extract_result.stderr}")
-            
-            log_success("Backup archive extracted successfully")
-            
-            # List available backups (only .tar.gz format for file-level restore)
-            available_tar_backups = list(restore_temp_dir.glob("*.tar.gz"))
-            log_info(f"Found {len(available_tar_backups)} file backup(s) in archive")
-            for backup in available_tar_backups:
-                backup_size_mb = backup.stat().st_size / (1024 * 1024)
-                log_info(f"  - {backup.name} ({backup_size_mb:.2f} MB)")
-            
-            # Create mapping of backup files to volume types
-            # Backup files may have different project names, so we need to match by volume type suffix
-            # Volume types map to suffixes: postgres -> postgres_data, redis -> redis_data, media -> media_files
-            volume_type_suffixes = {
-                "postgres": "postgres_data",
-                "redis": "redis_data", 
-                "media": "media_files"
-            }
-            backup_map_tar = {}
-            log_info(f"Creating backup file mapping...")
-            for backup_file in available_tar_backups:
-                # Remove extension (.tar.gz)
-                backup_name = backup_file.stem  # Remove .tar.gz
-                
-                log_info(f"Processing backup file: {backup_file.name}")
-                for volume_type, volume_name in volume_names.items():
-                    # Check if this backup matches the expected volume type by suffix
-                    expected_suffix = f"_{volume_type_suffixes.get(volume_type, volume_type)}"
-                    if backup_name.endswith(expected_suffix):
-                        # File-level backup
-                        if volume_type not in backup_map_tar:
-                            backup_map_tar[volume_type] = backup_file
-                            log_info(f"Mapped file backup {backup_file.name} to volume type {volume_type}")
-                        break
-            
-            if backup_map_tar:
-                log_info(f"Successfully mapped {len(backup_map_tar)} file backup(s) to volume types")
-            else:
-                log_warning("No backup files could be mapped to volume types - this may indicate a naming mismatch")
-            
-            # Restore each volume
-            restored_count = 0
-            skipped_count = 0
-            failed_count = 0
-            
-            for volume_type, volume_name in volume_names.items():
-                # Try to find file-level backup
-                tar_backup = None
-                # Try exact match first
-                tar_backup = restore_temp_dir / f"{volume_name}.tar.gz"
-                if not tar_backup.exists() and volume_type in backup_map_tar:
-                    tar_backup = backup_map_tar[volume_type]
-                    log_info(f"Using mapped file backup: {tar_backup.name} for volume {volume_name}")
-                
-                # Use file-level restore for all volumes
-                if tar_backup and tar_backup.exists():
-                    backup_to_use = tar_backup
-                else:
-                    log_warning(f"Volume backup for {volume_name} not found in backup archive")
-                    log_warning(f"  Expected filename: {volume_name}.tar.gz")
-                    skipped_count += 1
-                    continue
-                
-                if backup_to_use.exists():
-                    backup_size_mb = backup_to_use.stat().st_size / (1024 * 1024)
-                    log_info(f"Restoring volume: {volume_name} ({volume_type}, {backup_size_mb:.2f} MB)")
-                    
-                    # Check if volume already exists
-                    if validate_volume_exists(volume_name):
-                        # For PostgreSQL volumes, check if it only contains empty initialization
-                        # (PostgreSQL creates empty database on first start, which we want to overwrite)
-                        should_remove_volume = False
-                        
-                        if volume_type == "postgres":
-                            # Check if PostgreSQL volume only has initialization files (empty database)
-                            try:
-                                pg_check = subprocess.run([
-                                    "docker", "run", "--rm",
-                                    "-v", f"{volume_name}:/data",
-                                    "alpine", "sh", "-c", "test -f /data/PG_VERSION && test -d /data/base && find /data/base -mindepth 2 -type f 2>/dev/null | head -1 | grep -q . && echo 'has_data' || echo 'empty_init'"
-                                ], check=False, capture_output=True, text=True, timeout=5)
-                                
-                                if pg_check.stdout.strip() == "empty_init":
-                                    log_warning(f"PostgreSQL volume {volume_name} exists but only contains empty initialization")
-                                    log_info("Will remove empty volume to allow restoration of actual data...")
-                                    should_remove_volume = True
-                            except Exception as e:
-                                log_warning(f"Could not check PostgreSQL volume contents: {e}")
-                        
-                        # Check volume size for other volume types
-                        if not should_remove_volume:
-                            try:
-                                vol_size_check = subprocess.run([
-                                    "docker", "run", "--rm",
-                                    "-v", f"{volume_name}:/data",
-                                    "alpine", "sh", "-c", "du -sb /data 2>/dev/null | cut -f1 || echo 0"
-                                ], check=False, capture_output=True, text=True, timeout=5)
-                                vol_size_bytes = int(vol_size_check.stdout.strip() or "0")
-                                
-                                if vol_size_bytes < 10000:  # Less than 10KB is likely empty
-                                    log_warning(f"Volume {volume_name} exists but appears empty ({vol_size_bytes} bytes)")
-                                    should_remove_volume = True
-                            except Exception as e:
-                                log_warning(f"Could not check volume size: {e}")
-                        
-                        # Remove volume if it's empty or only has empty initialization
-                        if should_remove_volume:
-                            log_info("Removing empty/initialized volume to allow restoration...")
-                            containers = get_containers_using_volume(volume_name)
-                            if containers:
-                                log_warning(f"Volume {volume_name} is in use by containers: {', '.join(containers)}")
-                                log_warning("Stopping containers to allow volume removal...")
-                                # Try to stop containers using this volume
-                                for container in containers:
-                                    try:
-                                        subprocess.run(["docker", "stop", container], 
-                                                      check=False, capture_output=True, timeout=10)
-                                        log_info(f"Stopped container: {container}")
-                                    except Exception as e:
-                                        log_warning(f"Could not stop container {container}: {e}")
-                                
-                                # Re-check if volume is still in use
-                                containers = get_containers_using_volume(volume_name)
-                                if containers:
-                                    log_warning(f"Volume {volume_name} still in use, skipping restoration")
-                                    skipped_count += 1
-                                    continue
-                            
-                            # Remove empty/initialized volume
-                            try:
-                                subprocess.run(["docker", "volume", "rm", volume_name], 
-                                              check=True, capture_output=True, timeout=10)
-                                log_success(f"Removed empty/initialized volume: {volume_name}")
-                            except subprocess.CalledProcessError as e:
-                                log_error(f"Failed to remove volume {volume_name}: {e}")
-                                if e.stderr:
-                                    log_error(f"Error: {e.stderr}")
-                                skipped_count += 1
-                                continue
-                        else:
-                            # Volume has actual data - check if containers are using it
-                            containers = get_containers_using_volume(volume_name)
-                            if containers:
-                                log_warning(f"Volume {volume_name} already exists with data and is in use by containers")
-                                log_warning("Skipping restoration of this volume to avoid data loss")
-                                skipped_count += 1
-                                continue
-                            else:
-                                # Volume has data but no containers - safe to overwrite
-                                log_info(f"Volume {volume_name} exists with data but no containers are using it")
-                                log_info("Removing existing volume to restore from backup...")
-                                try:
-                                    subprocess.run(["docker", "volume", "rm", volume_name], 
-                                                  check=True, capture_output=True, timeout=10)
-                                    log_success(f"Removed existing volume: {volume_name}")
-                                except subprocess.CalledProcessError as e:
-                                    log_error(f"Failed to remove volume {volume_name}: {e}")
-                                    skipped_count += 1
-                                    continue
-                    
-                    # File-level restore for all volumes
-                    # Create volume first
-                    log_info(f"Creating volume: {volume_name}")
-                    if not self._create_volume(volume_name):
-                        log_error(f"Failed to create volume: {volume_name}")
-                        failed_count += 1
-                        continue
-                    log_success(f"Volume created: {volume_name}")
-                    
-                    # Restore data using tar
-                    backup_filename = backup_to_use.name
-                    log_info(f"Restoring data to volume {volume_name} from backup {backup_filename}...")
-                    try:
-                        restore_result = subprocess.run([
-                            "docker", "run", "--rm",
-                            "-v", f"{volume_name}:/data",
-                            "-v", f"{restore_temp_dir.absolute()}:/backup",
-                            "alpine", "sh", "-c", f"cd /data && rm -rf * .[^.]* 2>/dev/null || true && tar xzf /backup/{backup_filename}"
-                        ], check=True, capture_output=True, text=True, timeout=300)
-                        
-                        if restore_result.stderr:
-                            # tar may output warnings to stderr that are not errors
-                            if "Removing leading" in restore_result.stderr:
-                                log_info(f"tar output: {restore_result.stderr.strip()}")
-                        
-                        # Verify volume has data
-                        try:
-                            verify_result = subprocess.run([
-                                "docker", "run", "--rm",
-                                "-v", f"{volume_name}:/data",
-                                "alpine", "sh", "-c", "du -sh /data | cut -f1"
-                            ], check=True, capture_output=True, text=True, timeout=10)
-                            volume_data_size = verify_result.stdout.strip()
-                            log_success(f"Volume {volume_name} restored successfully (data size: {volume_data_size})")
-                            restored_count += 1
-                        except subprocess.TimeoutExpired:
-                            log_warning(f"Timeout verifying volume {volume_name}, but restoration may have succeeded")
-                            restored_count += 1
-                        except subprocess.CalledProcessError as e:
-                            log_error(f"Failed to verify volume {volume_name}: {e}")
-                            failed_count += 1
-                    except subprocess.CalledProcessError as e:
-                        log_error(f"Failed to restore volume {volume_name}: {e}")
-                        if e.stderr:
-                            log_error(f"Error details: {e.stderr}")
-                        failed_count += 1
+                restored_count, skipped_count, failed_count, total_backups = \
+                    self._restore_legacy_volumes(backup_file, branch_name, volume_names, restore_temp_dir)
             
             # Summary
             log_info(f"Volume restoration summary:")
@@ -924,15 +1082,15 @@ class DockerManager:
                 return False
             
             # Warn if no volumes were restored but backups were expected
-            total_backups = len(available_tar_backups)
             if restored_count == 0 and total_backups > 0:
                 log_warning(f"No volumes were restored despite {total_backups} backup file(s) being found")
                 log_warning("This may indicate a volume name mismatch between source and target projects")
                 log_warning("Volumes will be created empty when containers start")
             
             # Cleanup
-            log_info("Cleaning up temporary extraction directory...")
-            shutil.rmtree(restore_temp_dir)
+            if restore_temp_dir.exists():
+                log_info("Cleaning up temporary extraction directory...")
+                shutil.rmtree(restore_temp_dir)
             
             if restored_count > 0:
                 log_success(f"Volumes restored for {branch_name} ({restored_count} volume(s))")
@@ -944,7 +1102,6 @@ class DockerManager:
                 log_info("Restarting worktree containers in background...")
                 from ..core.worktree_orchestrator import WorktreeOrchestrator
                 orchestrator = WorktreeOrchestrator(project_root=self.project_root)
-                import threading
                 
                 def start_in_background():
                     start_result = orchestrator.start_worktree(branch_name)
@@ -999,6 +1156,710 @@ class DockerManager:
             
             return False
     
+    def _detect_backup_layout(self, backup_file: Path) -> str:
+        """Detect whether a backup or package stores volumes as streamed directories.
+        
+        Reads member headers until the first volume entry is found, so streamed
+        archives (which store volumes first) are identified without reading the
+        volume data.
+        
+        Args:
+            backup_file: Backup or package archive
+            
+        Returns:
+            LAYOUT_CHUNKED, LAYOUT_STREAMED or LAYOUT_LEGACY
+        """
+        if is_chunk_manifest(backup_file):
+            return LAYOUT_CHUNKED
+        try:
+            with open_archive_reader(backup_file) as archive:
+                for member in archive:
+                    if is_legacy_volume_member(member.name):
+                        return LAYOUT_LEGACY
+                    if locate_volume_member(member.name) is not None:
+                        return LAYOUT_STREAMED
+        except (OSError, TypeError, tarfile.TarError) as e:
+            log_warning(f"Could not inspect backup archive layout: {e}")
+        return LAYOUT_LEGACY
+    
+    def _prepare_volume_for_restore(self, volume_type: str, volume_name: str) -> str:
+        """Make sure a volume exists and is safe to overwrite before restoring into it.
+        
+        Existing volumes that are empty (or only hold an empty PostgreSQL
+        initialization) or unused are removed and recreated. Volumes with data
+        that are in use by containers are left alone. Volumes mounted by the
+        session's helper container cannot be removed; they are kept and emptied
+        by the restore step instead.
+        
+        Args:
+            volume_type: Volume type ("postgres", "redis" or "media")
+            volume_name: Target volume name
+            
+        Returns:
+            "ready" if the volume can be restored into, "skipped" or "failed" otherwise
+        """
+        # The helper container created the volume if it did not exist
+        held = self._volume_helper is not None and self._volume_helper.mounts(volume_name, writable=True)
+        
+        # Check if volume already exists
+        if get_volume_inventory().exists(volume_name):
+            # For PostgreSQL volumes, check if it only contains empty initialization
+            # (PostgreSQL creates empty database on first start, which we want to overwrite)
+            should_remove_volume = False
+            has_pg_data, vol_size_bytes = self._inspect_volume_for_restore(volume_name)
+            
+            if volume_type == "postgres" and has_pg_data is False:
+                log_warning(f"PostgreSQL volume {volume_name} exists but only contains empty initialization")
+                log_info("Will remove empty volume to allow restoration of actual data...")
+                should_remove_volume = True
+            
+            # Check volume size for other volume types
+            if not should_remove_volume and vol_size_bytes is not None and vol_size_bytes < 10000:
+                # Less than 10KB is likely empty
+                log_warning(f"Volume {volume_name} exists but appears empty ({vol_size_bytes} bytes)")
+                should_remove_volume = True
+            
+            # Remove volume if it's empty or only has empty initialization
+            if should_remove_volume:
+                if not held:
+                    log_info("Removing empty/initialized volume to allow restoration...")
+                containers = self._containers_using_volume(volume_name)
+                if containers:
+                    log_warning(f"Volume {volume_name} is in use by containers: {', '.join(containers)}")
+                    log_warning("Stopping containers to allow volume removal...")
+                    # Try to stop containers using this volume
+                    for container in containers:
+                        try:
+                            subprocess.run(["docker", "stop", container], 
+                                          check=False, capture_output=True, timeout=10)
+                            log_info(f"Stopped container: {container}")
+                        except Exception as e:
+                            log_warning(f"Could not stop container {container}: {e}")
+                    
+                    # Re-check if volume is still in use
+                    containers = self._containers_using_volume(volume_name)
+                    if containers:
+                        log_warning(f"Volume {volume_name} still in use, skipping restoration")
+                        return "skipped"
+                
+                if held:
+                    log_info(f"Volume {volume_name} will be emptied before restoring")
+                    return "ready"
+                
+                # Remove empty/initialized volume
+                try:
+                    subprocess.run(["docker", "volume", "rm", volume_name], 
+                                  check=True, capture_output=True, timeout=10)
+                    invalidate_volume_inventory()
+                    log_success(f"Removed empty/initialized volume: {volume_name}")
+                except subprocess.CalledProcessError as e:
+                    log_error(f"Failed to remove volume {volume_name}: {e}")
+                    if e.stderr:
+                        log_error(f"Error: {e.stderr}")
+                    return "skipped"
+            else:
+                # Volume has actual data - check if containers are using it
+                containers = self._containers_using_volume(volume_name)
+                if containers:
+                    log_warning(f"Volume {volume_name} already exists with data and is in use by containers")
+                    log_warning("Skipping restoration of this volume to avoid data loss")
+                    return "skipped"
+                # Volume has data but no containers - safe to overwrite
+                log_info(f"Volume {volume_name} exists with data but no containers are using it")
+                if held:
+                    log_info("Existing data will be replaced by the backup")
+                    return "ready"
+                log_info("Removing existing volume to restore from backup...")
+                try:
+                    subprocess.run(["docker", "volume", "rm", volume_name], 
+                                  check=True, capture_output=True, timeout=10)
+                    invalidate_volume_inventory()
+                    log_success(f"Removed existing volume: {volume_name}")
+                except subprocess.CalledProcessError as e:
+                    log_error(f"Failed to remove volume {volume_name}: {e}")
+                    return "skipped"
+        
+        # Create volume first
+        log_info(f"Creating volume: {volume_name}")
+        if not self._create_volume(volume_name):
+            log_error(f"Failed to create volume: {volume_name}")
+            return "failed"
+        log_success(f"Volume created: {volume_name}")
+        return "ready"
+    
+    def _inspect_volume_for_restore(self, volume_name: str) -> Tuple[Optional[bool], Optional[int]]:
+        """Inspect an existing volume's contents in a single helper container.
+        
+        Returns:
+            Tuple of (whether it holds PostgreSQL data files beyond an empty
+            initialization, size in bytes); either is None if the check failed
+        """
+        data = volume_path(volume_name)
+        script = (
+            f"if test -f {data}/PG_VERSION && test -d {data}/base && "
+            f"find {data}/base -mindepth 2 -type f 2>/dev/null | head -1 | grep -q .; "
+            "then echo has_data; else echo empty_init; fi; "
+            f"du -sb {data} 2>/dev/null | cut -f1 || echo 0"
+        )
+        try:
+            result = subprocess.run(self._volume_command(["sh", "-c", script], {volume_name: True}),
+                                    check=False, capture_output=True, text=True, timeout=10)
+        except Exception as e:
+            log_warning(f"Could not check volume {volume_name} contents: {e}")
+            return None, None
+        lines = result.stdout.split()
+        has_pg_data = {"has_data": True, "empty_init": False}.get(lines[0]) if lines else None
+        try:
+            size = int(lines[1]) if len(lines) > 1 else None
+        except ValueError:
+            size = None
+        if has_pg_data is None or size is None:
+            log_warning(f"Could not check volume {volume_name} contents: {result.stderr.strip() or 'no output'}")
+        return has_pg_data, size
+    
+    def _run_volume_restores(self, jobs: List[Tuple[str, Callable[[TransferProgress], str]]],
+                             alongside: Optional[Callable[[], None]] = None,
+                             max_workers: int = VOLUME_RESTORE_MAX_WORKERS) -> Tuple[int, int, int]:
+        """Run volume restores concurrently, with a combined progress display.
+        
+        Each job checks and prepares its target volume and untars into it, so a
+        backup with several volumes takes about as long as its largest volume
+        instead of the sum of all of them.
+        
+        Args:
+            jobs: List of (target volume name, restore function) tuples; the
+                function reports progress and returns "restored", "skipped" or "failed"
+            alongside: Run in the calling thread while the jobs run (e.g. to
+                extract the rest of a package)
+            max_workers: Upper bound on volumes restored at the same time
+            
+        Returns:
+            Tuple of (restored, skipped, failed)
+        """
+        counts = {"restored": 0, "skipped": 0, "failed": 0}
+        workers = max(1, min(max_workers, len(jobs)))
+        if jobs:
+            log_info(f"Restoring {len(jobs)} volume(s) with up to {workers} parallel worker(s)")
+        
+        with TransferProgress("Restoring volumes") as progress, \
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix="volume-restore") as executor:
+            futures = {executor.submit(job, progress): volume_name for volume_name, job in jobs}
+            if alongside is not None:
+                alongside()
+            for future in as_completed(futures):
+                try:
+                    status = future.result()
+                except Exception as e:
+                    log_error(f"Failed to restore volume {futures[future]}: {e}")
+                    status = "failed"
+                counts[status] += 1
+        
+        if counts["restored"]:
+            log_info(
+                f"Restored {format_size(progress.bytes)} into {counts['restored']} volume(s) in "
+                f"{format_elapsed_time(progress.elapsed)} ({format_throughput(progress.bytes, progress.elapsed)})"
+            )
+        return counts["restored"], counts["skipped"], counts["failed"]
+    
+    def _pipe_members_to_volume(self, volume_dir: str, volume_name: str,
+                                members: Iterable[Tuple[tarfile.TarFile, tarfile.TarInfo, str]],
+                                tree: Optional[TreeChecksum], progress: TransferProgress,
+                                total: Optional[int] = None) -> str:
+        """Stream archive members of one volume directory into a helper container.
+        
+        Members are piped into ``tar x`` running in a container with the target
+        volume mounted, so nothing is extracted to the host.
+        
+        Args:
+            volume_dir: Volume directory the members belong to
+            volume_name: Target volume
+            members: Tuples of (archive, member, path relative to the volume root)
+            tree: Tree checksum to add the members to as they are piped, if any
+            progress: Progress display
+            total: Size of the volume's data, if known
+            
+        Returns:
+            "restored" or "failed"
+        """
+        task = progress.add(volume_name, total)
+        start_time = time.monotonic()
+        restored_bytes = 0
+        error = None
+        process = self._open_restore_container(volume_name)
+        writer = tarfile.open(fileobj=process.stdin, mode="w|")
+        for archive, member, relative_name in members:
+            if tree is not None and (member.issym() or member.islnk()):
+                tree.add_link(relative_name, get_relative_link_target(member, volume_dir))
+            if error is not None:
+                # Keep checksumming, so the checksum still covers the whole volume
+                if tree is not None and member.isfile():
+                    tree.add_fileobj(relative_name, archive.extractfile(member))
+                continue
+            
+            relocate_member(member, relative_name or ".")
+            # Restore numeric ownership; user names differ between images
+            member.uname = member.gname = ""
+            try:
+                if member.isfile():
+                    source = archive.extractfile(member)
+                    if tree is not None:
+                        source = HashingReader(source, tree.algorithm)
+                    writer.addfile(member, source)
+                    if tree is not None:
+                        tree.add_file(relative_name, source.hexdigest())
+                    restored_bytes += member.size
+                    progress.advance(task, member.size)
+                else:
+                    writer.addfile(member)
+            except (OSError, tarfile.TarError) as e:
+                log_error(f"Failed to stream data to volume {volume_name}: {e}")
+                error = e
+        try:
+            writer.close()
+            process.stdin.close()
+        except (OSError, tarfile.TarError) as e:
+            log_error(f"Failed to stream data to volume {volume_name}: {e}")
+            error = error or e
+        
+        stderr = process.stderr.read().decode(errors="replace")
+        if process.wait() != 0 or error is not None:
+            log_error(f"Failed to restore volume {volume_name}")
+            if stderr.strip():
+                log_error(f"Error details: {stderr.strip()}")
+            return "failed"
+        elapsed = time.monotonic() - start_time
+        log_success(
+            f"Volume {volume_name} restored successfully ({format_size(restored_bytes)} "
+            f"in {format_elapsed_time(elapsed)}, {format_throughput(restored_bytes, elapsed)})"
+        )
+        return "restored"
+    
+    def _restore_streamed_volumes(self, backup_file: Path, volume_names: Dict[str, str],
+                                  member_handler: Optional[Callable[[tarfile.TarFile, tarfile.TarInfo], None]] = None,
+                                  volume_checksums: Optional[Dict[str, str]] = None) -> Tuple[int, int, int, int]:
+        """Restore volumes stored as directories, streaming each one into a helper container.
+        
+        Volumes are matched to targets by type suffix, since the source project
+        name may differ, and volumes without a target are not read. In seekable
+        archives every volume is read from its own frames, so all volumes are
+        checked, prepared and restored in parallel (see _run_volume_restores);
+        other archives are read in a single pass, one volume after the other.
+        
+        Args:
+            backup_file: Backup or package archive with the streamed layout
+            volume_names: Mapping of volume type to target volume name
+            member_handler: Called with the archive and each member outside the
+                volume directories (e.g. to extract the rest of a package)
+            volume_checksums: Filled with the tree checksum of every volume
+                directory with a target, computed from the data as it is piped
+                (volumes skipped while preparing are read and checksummed too)
+            
+        Returns:
+            Tuple of (restored, skipped, failed, volumes found in archive)
+        """
+        skipped_count = 0
+        unmatched_dirs = set()
+        trees: Dict[str, TreeChecksum] = {}
+        
+        def wanted(name: str) -> bool:
+            nonlocal skipped_count
+            location = locate_volume_member(name)
+            if location is None:
+                return member_handler is not None
+            volume_dir = location[0]
+            if self._match_restore_target(volume_dir, volume_names) is not None:
+                return True
+            if volume_dir not in unmatched_dirs:
+                unmatched_dirs.add(volume_dir)
+                log_warning(f"No target volume matches {volume_dir} in backup archive, skipping")
+                skipped_count += 1
+            return False
+        
+        def restore_dir(volume_dir: str, members: Iterable[Tuple[tarfile.TarFile, tarfile.TarInfo, str]],
+                        algorithm: Optional[str], progress: TransferProgress, total: Optional[int] = None) -> str:
+            volume_type, volume_name = self._match_restore_target(volume_dir, volume_names)
+            tree = None
+            if algorithm is not None:
+                tree = trees[volume_dir] = TreeChecksum(algorithm)
+            log_info(f"Restoring volume: {volume_name} ({volume_type}) from {volume_dir}")
+            status = self._prepare_volume_for_restore(volume_type, volume_name)
+            if status != "ready":
+                for archive, member, relative_name in members:
+                    if tree is not None and member.isfile():
+                        tree.add_fileobj(relative_name, archive.extractfile(member))
+                    elif tree is not None and (member.issym() or member.islnk()):
+                        tree.add_link(relative_name, get_relative_link_target(member, volume_dir))
+                return "failed" if status == "failed" else "skipped"
+            return self._pipe_members_to_volume(volume_dir, volume_name, members, tree, progress, total)
+        
+        def checksum_algorithm(pax_headers: Dict[str, str]) -> Optional[str]:
+            if volume_checksums is None:
+                return None
+            algorithm = pax_headers.get(CHECKSUM_ALGORITHM_HEADER, DEFAULT_CHECKSUM_ALGORITHM)
+            # An unavailable algorithm is reported when the checksums are verified
+            return algorithm if is_checksum_algorithm_available(algorithm) else None
+        
+        index = read_archive_index(backup_file) if detect_compression(backup_file) == COMPRESSION_GZIP else None
+        if index is not None:
+            volume_dirs = []
+            for name in index.names():
+                location = locate_volume_member(name)
+                if location is not None and location[0] not in volume_dirs and wanted(name):
+                    volume_dirs.append(location[0])
+            found_count = len(volume_dirs) + len(unmatched_dirs)
+            algorithm = checksum_algorithm(index.pax_headers)
+            
+            def volume_job(volume_dir: str) -> Callable[[TransferProgress], str]:
+                in_volume = functools.partial(is_volume_member, volume_dir=volume_dir)
+                members = (
+                    (archive, member, locate_volume_member(member.name)[1])
+                    for archive, member in index.iter_members(in_volume)
+                )
+                return lambda progress: restore_dir(volume_dir, members, algorithm, progress, index.size(in_volume))
+            
+            def handle_other_members() -> None:
+                for archive, member in index.iter_members(lambda name: locate_volume_member(name) is None):
+                    member_handler(archive, member)
+            
+            jobs = [(self._match_restore_target(volume_dir, volume_names)[1], volume_job(volume_dir))
+                    for volume_dir in volume_dirs]
+            with self._volume_helper_session({volume_name: False for volume_name, _ in jobs}, steps_per_volume=2):
+                restored_count, restore_skipped, failed_count = self._run_volume_restores(
+                    jobs, alongside=handle_other_members if member_handler is not None else None
+                )
+            skipped_count += restore_skipped
+            seen_dirs = set(volume_dirs)
+        else:
+            restored_count = failed_count = 0
+            seen_dirs = set()
+            statuses = {"restored": 0, "skipped": 0, "failed": 0}
+            
+            def located_members() -> Iterator[Tuple[tarfile.TarFile, tarfile.TarInfo, Optional[str], str]]:
+                for archive, member in iter_archive_members(backup_file, wanted):
+                    location = locate_volume_member(member.name)
+                    volume_dir, relative_name = location if location is not None else (None, "")
+                    yield archive, member, volume_dir, relative_name
+            
+            algorithm = None
+            with TransferProgress("Restoring volumes") as progress:
+                for volume_dir, group in itertools.groupby(located_members(), key=lambda item: item[2]):
+                    if volume_dir is None:
+                        for archive, member, _, _ in group:
+                            member_handler(archive, member)
+                        continue
+                    if volume_dir in seen_dirs:
+                        log_warning(f"Volume directory {volume_dir} is not contiguous in archive, skipping remainder")
+                        continue
+                    seen_dirs.add(volume_dir)
+                    first = next(group)
+                    if algorithm is None:
+                        # Global headers are only available once the first member is read
+                        algorithm = checksum_algorithm(first[0].pax_headers)
+                    members = ((archive, member, relative_name)
+                               for archive, member, _, relative_name in itertools.chain([first], group))
+                    statuses[restore_dir(volume_dir, members, algorithm, progress)] += 1
+            restored_count, failed_count = statuses["restored"], statuses["failed"]
+            skipped_count += statuses["skipped"]
+            found_count = len(seen_dirs) + len(unmatched_dirs)
+        
+        if volume_checksums is not None:
+            volume_checksums.update({name: tree.hexdigest() for name, tree in trees.items()})
+        
+        matched_names = set()
+        for volume_dir in seen_dirs:
+            target = self._match_restore_target(volume_dir, volume_names)
+            if target is not None:
+                matched_names.add(target[1])
+        for volume_name in volume_names.values():
+            if volume_name not in matched_names:
+                log_warning(f"Volume backup for {volume_name} not found in backup archive")
+                skipped_count += 1
+        
+        return restored_count, skipped_count, failed_count, found_count
+    
+    def _match_restore_target(self, source_volume: str, volume_names: Dict[str, str]) -> Optional[Tuple[str, str]]:
+        """Match a backed-up volume to a target volume by type suffix.
+        
+        Args:
+            source_volume: Volume (directory) name in the backup
+            volume_names: Mapping of volume type to target volume name
+            
+        Returns:
+            Tuple of (volume type, target volume name), or None if no target matches
+        """
+        volume_type_suffixes = {
+            "postgres": "postgres_data",
+            "redis": "redis_data", 
+            "media": "media_files"
+        }
+        for volume_type, volume_name in volume_names.items():
+            if source_volume.endswith(f"_{volume_type_suffixes.get(volume_type, volume_type)}"):
+                return volume_type, volume_name
+        return None
+    
+    def _open_restore_container(self, volume_name: str) -> subprocess.Popen:
+        """Run a helper container step that empties a volume and extracts a tar stream from stdin into it."""
+        data = volume_path(volume_name)
+        return subprocess.Popen(self._volume_command(
+            ["sh", "-c", f"cd {data} && rm -rf * .[^.]* 2>/dev/null; tar xf - -C {data}"],
+            {volume_name: False}, interactive=True
+        ), stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    
+    def _restore_chunked_volumes(self, manifest_path: Path,
+                                 volume_names: Dict[str, str]) -> Tuple[int, int, int, int]:
+        """Restore volumes from an incremental backup manifest and its chunk store.
+        
+        Each volume's files are reassembled from stored chunks (verifying every
+        chunk's checksum) and streamed into ``tar x`` in a helper container.
+        
+        Args:
+            manifest_path: Manifest written by backup_volumes_incremental()
+            volume_names: Mapping of volume type to target volume name
+            
+        Returns:
+            Tuple of (restored, skipped, failed, volumes found in manifest)
+        """
+        manifest = load_manifest(manifest_path)
+        store = ChunkStore.for_manifest(manifest_path, manifest.get("checksum_algorithm", DEFAULT_CHECKSUM_ALGORITHM))
+        skipped_count = 0
+        matched_names = set()
+        
+        def restore_volume(volume_type: str, volume_name: str, source_volume: str, volume: Dict[str, Any],
+                           progress: TransferProgress) -> str:
+            log_info(f"Restoring volume: {volume_name} ({volume_type}) from {source_volume}")
+            status = self._prepare_volume_for_restore(volume_type, volume_name)
+            if status != "ready":
+                return "failed" if status == "failed" else "skipped"
+            
+            task = progress.add(volume_name, volume.get("bytes"))
+            start_time = time.monotonic()
+            process = self._open_restore_container(volume_name)
+            error = None
+            try:
+                with tarfile.open(fileobj=process.stdin, mode="w|") as writer:
+                    for entry in volume["entries"]:
+                        member = member_from_entry(entry)
+                        if member.isfile():
+                            writer.addfile(member, store.open_chunks(entry["chunks"]))
+                            progress.advance(task, member.size)
+                        else:
+                            writer.addfile(member)
+            except (OSError, ValueError, tarfile.TarError) as e:
+                error = e
+            finally:
+                if not process.stdin.closed:
+                    process.stdin.close()
+            stderr = process.stderr.read().decode(errors="replace")
+            if process.wait() != 0 or error is not None:
+                log_error(f"Failed to restore volume {volume_name}" + (f": {error}" if error else ""))
+                if stderr.strip():
+                    log_error(f"Error details: {stderr.strip()}")
+                return "failed"
+            
+            elapsed = time.monotonic() - start_time
+            log_success(
+                f"Volume {volume_name} restored successfully ({format_size(volume.get('bytes', 0))} "
+                f"in {format_elapsed_time(elapsed)}, {format_throughput(volume.get('bytes', 0), elapsed)})"
+            )
+            return "restored"
+        
+        jobs = []
+        for source_volume, volume in manifest["volumes"].items():
+            target = self._match_restore_target(source_volume, volume_names)
+            if target is None:
+                log_warning(f"No target volume matches {source_volume} in backup manifest, skipping")
+                skipped_count += 1
+                continue
+            volume_type, volume_name = target
+            matched_names.add(volume_name)
+            jobs.append((volume_name, functools.partial(restore_volume, volume_type, volume_name, source_volume, volume)))
+        
+        with self._volume_helper_session({volume_name: False for volume_name, _ in jobs}, steps_per_volume=2):
+            restored_count, restore_skipped, failed_count = self._run_volume_restores(jobs)
+        skipped_count += restore_skipped
+        
+        for volume_name in volume_names.values():
+            if volume_name not in matched_names:
+                log_warning(f"Volume backup for {volume_name} not found in backup manifest")
+                skipped_count += 1
+        
+        return restored_count, skipped_count, failed_count, len(manifest["volumes"])
+    
+    def _restore_legacy_volumes(self, backup_file: Path, branch_name: str, volume_names: Dict[str, str],
+                                restore_temp_dir: Path) -> Tuple[int, int, int, int]:
+        """Restore volumes from a backup that nests one .tar.gz archive per volume.
+        
+        Args:
+            backup_file: Backup or package archive with the legacy layout
+            branch_name: Branch name for the worktree
+            volume_names: Mapping of volume type to target volume name
+            restore_temp_dir: Temporary directory to extract the archive into
+            
+        Returns:
+            Tuple of (restored, skipped, failed, volume backups found in archive)
+        """
+        # Extract backup
+        log_info(f"Extracting backup archive to temporary directory...")
+        restore_temp_dir.mkdir(exist_ok=True)
+        
+        # Check if this is a package file (.dockertree-package.tar.gz) or a direct backup file
+        is_package_file = backup_file.name.endswith('.dockertree-package.tar.gz')
+        
+        if is_package_file:
+            # Extract the package file to get the nested backup_test.tar
+            log_info("Detected package file, extracting to find nested backup archive...")
+            extract_result = subprocess.run([
+                "tar", "xzf", str(backup_file), "-C", str(restore_temp_dir)
+            ], check=True, capture_output=True, text=True)
+            
+            if extract_result.stderr:
+                log_info(f"Extraction output: {extract_result.stderr}")
+            
+            # Find the nested backup_test.tar file
+            nested_backup_tar = None
+            for pattern in [f"**/backup_{branch_name}.tar", "**/backup_*.tar"]:
+                matches = list(restore_temp_dir.glob(pattern))
+                if matches:
+                    nested_backup_tar = matches[0]
+                    break
+            
+            if nested_backup_tar and nested_backup_tar.exists():
+                log_info(f"Found nested backup archive: {nested_backup_tar.name}")
+                # Extract the nested tar to get the actual volume backup files
+                nested_extract_result = subprocess.run([
+                    "tar", "xzf", str(nested_backup_tar), "-C", str(restore_temp_dir)
+                ], check=True, capture_output=True, text=True)
+                
+                if nested_extract_result.stderr:
+                    log_info(f"Nested extraction output: {nested_extract_result.stderr}")
+                
+                log_success("Nested backup archive extracted successfully")
+            else:
+                log_warning("No nested backup archive found in package file")
+                # Try to find volume backups directly in extracted package
+        else:
+            # Direct backup file - extract it directly
+            log_info("Detected direct backup file, extracting...")
+            extract_result = subprocess.run([
+                "tar", "xzf", str(backup_file), "-C", str(restore_temp_dir)
+            ], check=True, capture_output=True, text=True)
+            
+            if extract_result.stderr:
+                log_info(f"Extraction output: {extract_result.stderr}")
+        
+        log_success("Backup archive extracted successfully")
+        
+        # List available backups (only .tar.gz format for file-level restore)
+        available_tar_backups = list(restore_temp_dir.glob("*.tar.gz"))
+        log_info(f"Found {len(available_tar_backups)} file backup(s) in archive")
+        for backup in available_tar_backups:
+            backup_size_mb = backup.stat().st_size / (1024 * 1024)
+            log_info(f"  - {backup.name} ({backup_size_mb:.2f} MB)")
+        
+        # Create mapping of backup files to volume types
+        # Backup files may have different project names, so we need to match by volume type suffix
+        # Volume types map to suffixes: postgres -> postgres_data, redis -> redis_data, media -> media_files
+        volume_type_suffixes = {
+            "postgres": "postgres_data",
+            "redis": "redis_data", 
+            "media": "media_files"
+        }
+        backup_map_tar = {}
+        log_info(f"Creating backup file mapping...")
+        for available_backup in available_tar_backups:
+            # Remove extension (.tar.gz)
+            backup_name = available_backup.stem  # Remove .tar.gz
+            
+            log_info(f"Processing backup file: {available_backup.name}")
+            for volume_type, volume_name in volume_names.items():
+                # Check if this backup matches the expected volume type by suffix
+                expected_suffix = f"_{volume_type_suffixes.get(volume_type, volume_type)}"
+                if backup_name.endswith(expected_suffix):
+                    # File-level backup
+                    if volume_type not in backup_map_tar:
+                        backup_map_tar[volume_type] = available_backup
+                        log_info(f"Mapped file backup {available_backup.name} to volume type {volume_type}")
+                    break
+        
+        if backup_map_tar:
+            log_info(f"Successfully mapped {len(backup_map_tar)} file backup(s) to volume types")
+        else:
+            log_warning("No backup files could be mapped to volume types - this may indicate a naming mismatch")
+        
+        # Restore the volumes concurrently
+        skipped_count = 0
+        
+        def restore_volume(volume_name: str, volume_type: str, tar_backup: Path, progress: TransferProgress) -> str:
+            backup_size_mb = tar_backup.stat().st_size / (1024 * 1024)
+            log_info(f"Restoring volume: {volume_name} ({volume_type}, {backup_size_mb:.2f} MB)")
+            
+            status = self._prepare_volume_for_restore(volume_type, volume_name)
+            if status == "skipped":
+                return "skipped"
+            if status == "failed":
+                return "failed"
+            
+            # Restore data using tar
+            task = progress.add(volume_name, tar_backup.stat().st_size)
+            backup_filename = tar_backup.name
+            log_info(f"Restoring data to volume {volume_name} from backup {backup_filename}...")
+            data = volume_path(volume_name)
+            try:
+                # The backup is piped in, so the step runs the same with or without a helper container
+                with open(tar_backup, "rb") as backup_stream:
+                    restore_result = subprocess.run(self._volume_command(
+                        ["sh", "-c", f"cd {data} && rm -rf * .[^.]* 2>/dev/null || true && tar xzf - -C {data}"],
+                        {volume_name: False}, interactive=True
+                    ), stdin=backup_stream, check=True, capture_output=True, text=True, timeout=300)
+                progress.advance(task, tar_backup.stat().st_size)
+                
+                if restore_result.stderr:
+                    # tar may output warnings to stderr that are not errors
+                    if "Removing leading" in restore_result.stderr:
+                        log_info(f"tar output: {restore_result.stderr.strip()}")
+                
+                # Verify volume has data
+                try:
+                    verify_result = subprocess.run(self._volume_command(
+                        ["sh", "-c", f"du -sh {data} | cut -f1"], {volume_name: True}
+                    ), check=True, capture_output=True, text=True, timeout=10)
+                    volume_data_size = verify_result.stdout.strip()
+                    log_success(f"Volume {volume_name} restored successfully (data size: {volume_data_size})")
+                    return "restored"
+                except subprocess.TimeoutExpired:
+                    log_warning(f"Timeout verifying volume {volume_name}, but restoration may have succeeded")
+                    return "restored"
+                except subprocess.CalledProcessError as e:
+                    log_error(f"Failed to verify volume {volume_name}: {e}")
+                    return "failed"
+            except subprocess.CalledProcessError as e:
+                log_error(f"Failed to restore volume {volume_name}: {e}")
+                if e.stderr:
+                    log_error(f"Error details: {e.stderr}")
+                return "failed"
+        
+        jobs = []
+        for volume_type, volume_name in volume_names.items():
+            # Try exact match first
+            tar_backup = restore_temp_dir / f"{volume_name}.tar.gz"
+            if not tar_backup.exists() and volume_type in backup_map_tar:
+                tar_backup = backup_map_tar[volume_type]
+                log_info(f"Using mapped file backup: {tar_backup.name} for volume {volume_name}")
+            
+            # Use file-level restore for all volumes
+            if not tar_backup.exists():
+                log_warning(f"Volume backup for {volume_name} not found in backup archive")
+                log_warning(f"  Expected filename: {volume_name}.tar.gz")
+                skipped_count += 1
+                continue
+            jobs.append((volume_name, functools.partial(restore_volume, volume_name, volume_type, tar_backup)))
+        
+        with self._volume_helper_session({volume_name: False for volume_name, _ in jobs}, steps_per_volume=2):
+            restored_count, restore_skipped, failed_count = self._run_volume_restores(jobs)
+        skipped_count += restore_skipped
+        
+        return restored_count, skipped_count, failed_count, len(available_tar_backups)
+    
     def _build_compose_base_command(self) -> List[str]:
         """Build the base docker compose command array.
         
@@ -1131,6 +1992,9 @@ class DockerManager:
         except subprocess.CalledProcessError as e:
             self._handle_compose_error(e)
             return False
+        finally:
+            # Compose may have created or removed volumes
+            invalidate_volume_inventory()
 
     def run_compose_command_with_profile(self, compose_file: Path, compose_override: Path,
                                        command: List[str], env_file: Optional[Path] = None,
@@ -1174,6 +2038,8 @@ class DockerManager:
             log_error(f"Command executed: {' '.join(cmd)}")
             log_error(f"Working directory: {working_dir}")
             return False
+        finally:
+            invalidate_volume_inventory()
 
     def start_services(self, compose_file: Path, env_file: Optional[Path] = None,
                       project_name: Optional[str] = None, working_dir: Optional[Path] = None) -> bool:
@@ -1192,48 +2058,31 @@ class DockerManager:
         """Stop services using docker compose."""
         return self.run_compose_command(compose_file, ["down"], env_file, project_name, working_dir)
     
-    def get_volume_sizes(self) -> Dict[str, str]:
-        """Get sizes of all worktree volumes."""
-        sizes = {}
-        try:
-            result = subprocess.run([
-                "docker", "volume", "ls", "-q"
-            ], capture_output=True, text=True, check=True)
-            
-            volumes = result.stdout.strip().split('\n')
-            for volume in volumes:
-                if volume and any(suffix in volume for suffix in ["_postgres_data", "_redis_data", "_media_files"]):
-                    try:
-                        size_result = subprocess.run([
-                            "docker", "run", "--rm", "-v", f"{volume}:/data",
-                            "alpine", "du", "-sh", "/data"
-                        ], capture_output=True, text=True, check=True)
-                        size = size_result.stdout.split()[0]
-                        sizes[volume] = size
-                    except subprocess.CalledProcessError:
-                        sizes[volume] = "unknown"
-            
-        except subprocess.CalledProcessError:
-            pass
-        
-        return sizes
+    def get_volume_sizes(self, refresh: bool = False) -> Dict[str, str]:
+        """Get sizes of all worktree volumes.
+        
+        Sizes come from the volume mountpoints (when the Docker data root is
+        readable) or the daemon's usage data, and are cached for a short time
+        (see core.volume_sizes).
+        
+        Args:
+            refresh: Recompute sizes instead of using cached ones
+            
+        Returns:
+            Dictionary of volume name to readable size ("unknown" if it could not be determined)
+        """
+        sizes = get_volume_size_engine().get_sizes(self.list_volumes(), refresh=refresh)
+        return {
+            volume: format_size(size) if size is not None else "unknown"
+            for volume, size in sizes.items()
+        }
     
     def list_volumes(self) -> List[str]:
         """List all worktree volumes."""
-        volumes = []
-        try:
-            result = subprocess.run([
-                "docker", "volume", "ls", "-q"
-            ], capture_output=True, text=True, check=True)
-            
-            for volume in result.stdout.strip().split('\n'):
-                if volume and any(suffix in volume for suffix in ["_postgres_data", "_redis_data", "_media_files"]):
-                    volumes.append(volume)
-                    
-        except subprocess.CalledProcessError:
-            pass
-        
-        return volumes
+        return [
+            volume for volume in get_docker_client().list_volume_names() or []
+            if any(suffix in volume for suffix in ["_postgres_data", "_redis_data", "_media_files"])
+        ]
     
     def run_compose_passthrough(self, branch_name: str, compose_args: List[str]) -> bool:
         """Run docker compose command with automatic override file resolution.
@@ -1284,16 +2133,7 @@ class DockerManager:
             project_root_from_worktree = project_root_from_worktree.parent
         
         # Get project name from the project root we found
-        import yaml
-        project_name = None
-        config_path = project_root_from_worktree / DOCKERTREE_DIR / "config.yml"
-        if config_path.exists():
-            try:
-                with open(config_path) as f:
-                    config = yaml.safe_load(f) or {}
-                    project_name = config.get("project_name")
-            except Exception:
-                pass
+        project_name = load_project_config(project_root_from_worktree).project_name
         
         # Fallback to project root directory name if config doesn't have project_name
         if not project_name:
@@ -1409,6 +2249,22 @@ class DockerManager:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    def wait_for_containers_ready(self, compose_project_name: str,
+                                  timeout: float = READINESS_TIMEOUT) -> ReadinessReport:
+        """Wait until a compose project's containers are running and healthy.
+        
+        Containers without a healthcheck count as ready once running, and
+        one-off containers once they exited with status 0.
+        
+        Args:
+            compose_project_name: Compose project name (project-branch format)
+            timeout: Seconds to wait at most
+            
+        Returns:
+            Readiness report with the time each service took to become ready
+        """
+        return wait_until_ready([compose_probe(compose_project_name)], timeout)
+
     def _is_worktree_running(self, branch_name: str) -> bool:
         """Check if worktree containers are currently running.
         
@@ -1424,20 +2280,11 @@ class DockerManager:
             project_name = sanitize_project_name(get_project_name())
             compose_project_name = f"{project_name}-{branch_name}"
             
-            # Get running containers for this project
-            result = subprocess.run([
-                "docker", "ps", 
-                "--filter", f"label=com.docker.compose.project={compose_project_name}",
-                "--format", "{{.Names}}"
-            ], capture_output=True, text=True, check=False)
-            
-            # If Docker is not running, return False
-            if result.returncode != 0:
-                return False
-            
-            # Check if any containers are running
-            running_containers = [line.strip() for line in result.stdout.strip().split('\n') if line.strip()]
-            return len(running_containers) > 0
+            # Get running containers for this project (None if Docker is not running)
+            running_containers = get_docker_client().list_containers(
+                filters={"label": [f"com.docker.compose.project={compose_project_name}"]}
+            )
+            return bool(running_containers)
         except Exception as e:
             log_warning(f"Failed to check if worktree is running: {e}")
             return False
@@ -1450,31 +2297,21 @@ class DockerManager:
             project_name = sanitize_project_name(get_project_name())
             compose_project_name = f"{project_name}-{branch_name}"
             
-            # Get containers for this project
-            result = subprocess.run([
-                "docker", "ps", "-a", 
-                "--filter", f"label=com.docker.compose.project={compose_project_name}",
-                "--format", "{{.Names}}|{{.Status}}|{{.Ports}}|{{.Image}}"
-            ], capture_output=True, text=True, check=False)
-            
-            # If Docker is not running, return empty list
-            if result.returncode != 0:
-                return []
-            
-            containers = []
-            for line in result.stdout.strip().split('\n'):
-                if line:
-                    parts = line.split('|')
-                    if len(parts) >= 4:
-                        containers.append({
-                            "name": parts[0],
-                            "status": parts[1],
-                            "state": "running" if "Up" in parts[1] else "stopped",
-                            "ports": parts[2],
-                            "image": parts[3]
-                        })
-            
-            return containers
+            # Get containers for this project (None if Docker is not running)
+            project_containers = get_docker_client().list_containers(
+                all=True, filters={"label": [f"com.docker.compose.project={compose_project_name}"]}
+            )
+            
+            return [
+                {
+                    "name": container.name,
+                    "status": container.status,
+                    "state": "running" if container.running else "stopped",
+                    "ports": container.ports,
+                    "image": container.image
+                }
+                for container in project_containers or []
+            ]
         except Exception as e:
             log_warning(f"Failed to get containers: {e}")
             return []
@@ -1483,13 +2320,13 @@ class DockerManager:
         """Get volumes for a worktree asynchronously."""
         try:
             from ..config.settings import get_volume_names
-            from ..utils.validation import validate_volume_exists
             
             volume_names = get_volume_names(branch_name)
+            existing = get_existing_volumes(volume_names.values())
             volumes = []
             
             for volume_type, volume_name in volume_names.items():
-                if validate_volume_exists(volume_name):
+                if volume_name in existing:
                     volumes.append({
                         "name": volume_name,
                         "type": volume_type,
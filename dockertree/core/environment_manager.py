@@ -6,9 +6,8 @@ configuration management for worktree environments.
 """
 
 import os
-import socket
 from pathlib import Path
-from typing import Dict, Optional, Set
+from typing import Dict, Optional
 
 from ..config.settings import (
     generate_env_compose_content, 
@@ -17,6 +16,7 @@ from ..config.settings import (
     get_project_root,
     get_worktree_paths,
     get_worktree_dir,
+    load_project_config,
 )
 from ..utils.logging import log_info, log_success, log_warning
 from ..utils.path_utils import (
@@ -26,6 +26,7 @@ from ..utils.path_utils import (
 )
 from ..utils.caddy_config import ensure_caddy_labels_and_network, update_allowed_hosts_in_compose, update_vite_allowed_hosts_in_compose
 from ..core.dns_manager import is_domain
+from ..core.port_index import PortIndex
 
 HOST_PORT_RANGES: Dict[str, tuple[int, int]] = {
     "DOCKERTREE_DB_HOST_PORT": (55432, 56431),
@@ -49,6 +50,7 @@ class EnvironmentManager:
             self.project_root = get_project_root()
         else:
             self.project_root = Path(project_root).resolve()
+        self.port_index = PortIndex(self.project_root, HOST_PORT_RANGES)
 
     def _build_host_port_section(self, branch_name: str) -> str:
         """Build host port assignments for env.dockertree."""
@@ -60,29 +62,31 @@ class EnvironmentManager:
 
     def _calculate_host_ports(self, branch_name: str) -> Dict[str, int]:
         """Assign deterministic host ports for key services."""
-        used_ports = self._collect_used_host_ports()
+        # Ports already written to the branch's env.dockertree are kept
         existing_ports = self._read_existing_host_ports(branch_name)
+        assigned = self.port_index.allocate(branch_name, existing_ports, seed=self._scan_host_port_assignments)
 
-        # Reserve existing ports so we don't reassign them
-        for var, value in existing_ports.items():
-            used_ports.setdefault(var, set()).add(value)
-
-        assigned: Dict[str, int] = {}
-        for var, port_range in HOST_PORT_RANGES.items():
-            if var in existing_ports:
-                assigned[var] = existing_ports[var]
-                continue
-
-            allocated = self._allocate_host_port(var, used_ports.get(var, set()), port_range, branch_name)
-            assigned[var] = allocated
-            if allocated > 0:
-                used_ports.setdefault(var, set()).add(allocated)
+        for var, port in assigned.items():
+            if port == 0:
+                start, end = HOST_PORT_RANGES[var]
+                log_warning(
+                    f"No free ports available in range {start}-{end} for {var}. "
+                    "Falling back to Docker auto-assignment."
+                )
+            elif existing_ports.get(var) != port:
+                log_info(f"Assigned {var}={port} for branch {branch_name}")
 
         return assigned
 
-    def _collect_used_host_ports(self) -> Dict[str, Set[int]]:
-        """Scan existing worktrees to understand which host ports are taken."""
-        used: Dict[str, Set[int]] = {var: set() for var in HOST_PORT_RANGES}
+    def release_host_ports(self, branch_name: str) -> None:
+        """Free the host ports assigned to a branch (when its worktree is removed)."""
+        released = self.port_index.release(branch_name)
+        if released:
+            log_info(f"Released host ports {', '.join(str(port) for port in released.values())} of {branch_name}")
+
+    def _scan_host_port_assignments(self) -> Dict[str, Dict[str, int]]:
+        """Scan existing worktrees for their host ports (seeds and rebuilds the port index)."""
+        assignments: Dict[str, Dict[str, int]] = {}
         directories_to_scan = []
 
         worktree_root = self.project_root / get_worktree_dir()
@@ -99,10 +103,10 @@ class EnvironmentManager:
                     continue
                 env_file = candidate / ".dockertree" / "env.dockertree"
                 env_ports = self._extract_host_ports(env_file)
-                for var, value in env_ports.items():
-                    used.setdefault(var, set()).add(value)
+                if env_ports:
+                    assignments.setdefault(candidate.name, env_ports)
 
-        return used
+        return assignments
 
     def _read_existing_host_ports(self, branch_name: str) -> Dict[str, int]:
         """Read previously assigned host ports for a branch if env.dockertree exists."""
@@ -141,39 +145,6 @@ class EnvironmentManager:
             extracted[var] = value
         return extracted
 
-    def _allocate_host_port(
-        self,
-        var_name: str,
-        used_ports: Set[int],
-        port_range: tuple[int, int],
-        branch_name: str,
-    ) -> int:
-        """Find the first available host port in the configured range."""
-        start, end = port_range
-        for port in range(start, end + 1):
-            if port in used_ports:
-                continue
-            if self._is_port_available(port):
-                log_info(f"Assigned {var_name}={port} for branch {branch_name}")
-                return port
-
-        log_warning(
-            f"No free ports available in range {start}-{end} for {var_name}. "
-            "Falling back to Docker auto-assignment."
-        )
-        return 0
-
-    @staticmethod
-    def _is_port_available(port: int) -> bool:
-        """Check if a host port is available on the current machine."""
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            try:
-                sock.bind(("", port))
-            except OSError:
-                return False
-        return True
-    
     def create_worktree_env(self, branch_name: str, worktree_path: Path, 
                            source_env_path: Optional[Path] = None,
                            domain: Optional[str] = None) -> bool:
@@ -242,8 +213,7 @@ class EnvironmentManager:
             branch_name: Branch name
             domain: Optional domain override (subdomain.domain.tld)
         """
-        from ..config.settings import DOCKERTREE_DIR, sanitize_project_name, get_allowed_hosts_for_worktree, DEFAULT_ENV_VARS
-        import yaml
+        from ..config.settings import sanitize_project_name, get_allowed_hosts_for_worktree, DEFAULT_ENV_VARS
         
         env_file = worktree_path / ".env"
         
@@ -252,15 +222,7 @@ class EnvironmentManager:
             return True
         
         # Get project name from config in self.project_root (not current directory)
-        project_name = None
-        config_path = self.project_root / DOCKERTREE_DIR / "config.yml"
-        if config_path.exists():
-            try:
-                with open(config_path) as f:
-                    config = yaml.safe_load(f) or {}
-                    project_name = config.get("project_name")
-            except Exception:
-                pass
+        project_name = load_project_config(self.project_root).project_name
         
         # Fallback to project root directory name if config doesn't have project_name
         if not project_name:
@@ -316,19 +278,10 @@ CADDY_EMAIL={DEFAULT_ENV_VARS['CADDY_EMAIL']}
     
     def _generate_env_compose_content(self, branch_name: str) -> str:
         """Generate env.dockertree content for a worktree using self.project_root."""
-        from ..config.settings import DOCKERTREE_DIR, sanitize_project_name, get_allowed_hosts_for_worktree
-        import yaml
+        from ..config.settings import sanitize_project_name, get_allowed_hosts_for_worktree
         
         # Get project name from config in self.project_root
-        project_name = None
-        config_path = self.project_root / DOCKERTREE_DIR / "config.yml"
-        if config_path.exists():
-            try:
-                with open(config_path) as f:
-                    config = yaml.safe_load(f) or {}
-                    project_name = config.get("project_name")
-            except Exception:
-                pass
+        project_name = load_project_config(self.project_root).project_name
         
         # Fallback to project root directory name if config doesn't have project_name
         if not project_name:
@@ -652,22 +605,13 @@ CSRF_TRUSTED_ORIGINS={site_domain}
         Returns:
             Environment file content with domain overrides
         """
-        from ..config.settings import DOCKERTREE_DIR, sanitize_project_name
+        from ..config.settings import sanitize_project_name
         from ..utils.logging import log_warning
-        import yaml
         
         project_root = self.project_root
         
         # Get project name from config in self.project_root (not current directory)
-        project_name = None
-        config_path = self.project_root / DOCKERTREE_DIR / "config.yml"
-        if config_path.exists():
-            try:
-                with open(config_path) as f:
-                    config = yaml.safe_load(f) or {}
-                    project_name = config.get("project_name")
-            except Exception:
-                pass
+        project_name = load_project_config(self.project_root).project_name
         
         # Fallback to project root directory name if config doesn't have project_name
         if not project_name:
@@ -12,6 +12,7 @@ from typing import List, Optional, Tuple
 
 from ..config.settings import PROTECTED_BRANCHES, get_worktree_paths, get_project_root
 from ..utils.logging import log_info, log_success, log_warning, log_error
+from ..utils.worktree_registry import get_worktree_registry
 from ..utils.validation import (
     validate_branch_exists, 
     validate_worktree_exists, 
@@ -47,6 +48,11 @@ class GitManager:
             except subprocess.CalledProcessError:
                 log_warning("Not in a git repository. Some operations may fail.")
     
+    @property
+    def worktree_registry(self):
+        """Shared cache of this repository's worktrees."""
+        return get_worktree_registry(self.project_root)
+    
     def _validate_git_repo(self) -> None:
         """Validate we're in a git repository."""
         try:
@@ -116,6 +122,7 @@ class GitManager:
             result = subprocess.run([
                 "git", "worktree", "add", str(worktree_path), branch_name
             ], capture_output=True, text=True, cwd=self.project_root)
+            self.worktree_registry.invalidate()
             
             if result.returncode == 0:
                 log_success(f"Git worktree created for {branch_name}")
@@ -139,6 +146,7 @@ class GitManager:
             cmd.append(str(worktree_path))
             
             result = subprocess.run(cmd, capture_output=True, text=True, cwd=self.project_root)
+            self.worktree_registry.invalidate()
             
             if result.returncode == 0:
                 log_success(f"Git worktree removed: {worktree_path}")
@@ -150,6 +158,7 @@ class GitManager:
                 
                 # First, prune the worktree from git's tracking
                 subprocess.run(["git", "worktree", "prune"], cwd=self.project_root, capture_output=True)
+                self.worktree_registry.invalidate()
                 
                 # Then try to remove the directory manually
                 import shutil
@@ -189,36 +198,21 @@ class GitManager:
         Returns:
             List of tuples (path, commit, branch)
         """
-        worktrees = []
         try:
-            result = subprocess.run(["git", "worktree", "list"], 
-                                  capture_output=True, text=True, check=True, cwd=self.project_root)
-            
-            for line in result.stdout.strip().split('\n'):
-                if line.strip():
-                    parts = line.split()
-                    if len(parts) >= 3:
-                        path = parts[0]
-                        commit = parts[1]
-                        branch = parts[2].strip('[]') if parts[2].startswith('[') else parts[2]
-                        worktrees.append((path, commit, branch))
-                        
+            return [
+                (str(wt.path), wt.commit[:7], wt.display_branch)
+                for wt in self.worktree_registry.list() if not wt.bare
+            ]
         except subprocess.CalledProcessError as e:
             log_error(f"Failed to list worktrees: {e}")
-        
-        return worktrees
+            return []
     
     def prune_worktrees(self) -> int:
         """Prune worktrees and return count of pruned worktrees."""
         try:
             # Check if there are any prunable worktrees
-            result = subprocess.run(["git", "worktree", "list"], 
-                                  capture_output=True, text=True, check=True, cwd=self.project_root)
-            
-            prunable_count = 0
-            for line in result.stdout.strip().split('\n'):
-                if 'prunable' in line:
-                    prunable_count += 1
+            prunable = [wt for wt in self.worktree_registry.refresh() if wt.prunable]
+            prunable_count = len(prunable)
             
             if prunable_count == 0:
                 log_info("No prunable worktrees found")
@@ -228,13 +222,13 @@ class GitManager:
             
             # Show what will be pruned
             log_info("Prunable worktrees:")
-            for line in result.stdout.strip().split('\n'):
-                if 'prunable' in line:
-                    log_info(line)
+            for wt in prunable:
+                log_info(f"{wt.path} {wt.commit[:7]} [{wt.display_branch}] prunable")
             
             # Prune the worktrees
             subprocess.run(["git", "worktree", "prune"], 
                           capture_output=True, check=True, cwd=self.project_root)
+            self.worktree_registry.invalidate()
             
             log_success(f"Successfully pruned {prunable_count} worktree(s)")
             return prunable_count
@@ -304,24 +298,15 @@ class GitManager:
     def find_worktree_path(self, branch_name: str) -> Optional[Path]:
         """Find the actual worktree path for a branch with exact matching."""
         try:
-            result = subprocess.run(["git", "worktree", "list"], 
-                                  capture_output=True, text=True, check=True, cwd=self.project_root)
-            
-            for line in result.stdout.strip().split('\n'):
-                if line.strip():
-                    parts = line.split()
-                    if len(parts) >= 3:
-                        path = parts[0]
-                        branch = parts[2].strip('[]') if parts[2].startswith('[') else parts[2]
-                        # Explicit exact match check
-                        if branch == branch_name:
-                            log_info(f"Exact match found: worktree for '{branch_name}' at {path}")
-                            return Path(path)
-            
-            log_warning(f"No exact worktree match found for '{branch_name}'")
-            return None
+            worktree = self.worktree_registry.get_by_branch(branch_name)
         except subprocess.CalledProcessError:
             return None
+        if worktree is not None:
+            log_info(f"Exact match found: worktree for '{branch_name}' at {worktree.path}")
+            return worktree.path
+        
+        log_warning(f"No exact worktree match found for '{branch_name}'")
+        return None
     
     def validate_worktree_creation(self, branch_name: str) -> Tuple[bool, str]:
         """Validate that a worktree can be created for the given branch."""
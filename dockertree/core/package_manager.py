@@ -5,26 +5,53 @@ This module provides comprehensive environment export/import functionality
 to enable sharing complete isolated development environments between team members.
 """
 
+import functools
+import io
 import json
+import os
 import shutil
-import subprocess
 import tarfile
 import tempfile
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
 
-from ..config.settings import get_project_root, get_project_name
+from ..config.settings import get_project_root, get_project_name, get_volume_names
 from ..core.docker_manager import DockerManager
 from ..core.git_manager import GitManager
 from ..core.environment_manager import EnvironmentManager
 from ..core.worktree_orchestrator import WorktreeOrchestrator
 from ..core.droplet_manager import DropletInfo
 from ..utils.logging import log_info, log_success, log_warning, log_error
-from ..utils.checksum import calculate_file_checksum, verify_file_checksum
+from ..utils.chunk_store import (
+    PACKAGE_MANIFEST_FORMAT, ChunkStore, load_manifest, write_package_from_manifest
+)
+from ..utils.checksum import (
+    CHECKSUM_BUFFER_SIZE, DEFAULT_CHECKSUM_ALGORITHM, TreeChecksum, calculate_checksums,
+    is_checksum_algorithm_available,
+    new_hasher, select_checksum_algorithm, verify_checksums
+)
+from ..utils.compression import (
+    COMPRESSION_FORMATS, COMPRESSION_GZIP, COMPRESSION_NONE, DEFAULT_COMPRESSION,
+    detect_compression, get_archive_extension, iter_archive_members, open_archive_reader,
+    open_archive_writer, resolve_level
+)
 from ..utils.confirmation import confirm_use_existing_worktree
 from ..utils.container_selector import resolve_service_dependencies
+from ..utils.seekable_archive import INDEX_MEMBER_NAME, read_archive_index
+from ..utils.volume_archive import (
+    locate_volume_member, get_relative_link_target, is_volume_member, normalize_member_name,
+    CHECKSUM_ALGORITHM_HEADER, LAYOUT_STREAMED
+)
+
+PACKAGE_DIR_SUFFIX = ".dockertree-package"
+METADATA_FILE = "metadata.json"
+# Trailing member of compressed packages with the tree checksums of streamed
+# volumes, which are only known once the volumes are written. metadata.json is
+# the first member, so listing packages only reads the start of each archive.
+VOLUME_CHECKSUMS_FILE = "volume_checksums.json"
 
 
 class PackageManager:
@@ -125,7 +152,10 @@ class PackageManager:
                       container_filter: Optional[List[Dict[str, str]]] = None,
                       exclude_deps: Optional[List[str]] = None,
                       droplet_info: Optional[DropletInfo] = None,
-                      central_droplet_info: Optional[DropletInfo] = None) -> Dict[str, Any]:
+                      central_droplet_info: Optional[DropletInfo] = None,
+                      compression: str = DEFAULT_COMPRESSION,
+                      compression_level: Optional[int] = None,
+                      output_stream: Optional[BinaryIO] = None) -> Dict[str, Any]:
         """Export worktree to package - orchestrates existing managers.
         
         Args:
@@ -137,11 +167,38 @@ class PackageManager:
             container_filter: Optional list of dicts with 'worktree' and 'container' keys
                              to filter which containers/volumes to export
             exclude_deps: Optional list of service names to exclude from dependency resolution
+            compression: Archive compression ("gzip", "zstd" or "none")
+            compression_level: Compression level (defaults per format)
+            output_stream: Optional binary stream (e.g. an upload pipe) to write
+                the compressed package to instead of a file in output_dir. The
+                result then has no package_path, only the package_name.
             
         Returns:
             Dictionary with success status, package path, and metadata
         """
         try:
+            if output_stream is not None and not compressed:
+                return {
+                    "success": False,
+                    "error": "Only compressed packages can be written to a stream"
+                }
+            if compression not in COMPRESSION_FORMATS:
+                return {
+                    "success": False,
+                    "error": f"Unknown compression format: {compression}"
+                }
+            try:
+                compression_level = resolve_level(compression, compression_level)
+            except ValueError as e:
+                return {
+                    "success": False,
+                    "error": str(e)
+                }
+            
+            checksum_algorithm = select_checksum_algorithm()
+            # Checksums of files hashed while they were written, keyed by package-relative path
+            known_checksums = {}
+            
             # 1. Validate worktree exists
             if not self.git_manager.validate_worktree_exists(branch_name):
                 return {
@@ -165,12 +222,9 @@ class PackageManager:
             temp_package_dir = output_dir / package_name
             temp_package_dir.mkdir(exist_ok=True)
             
-            # 4. Backup volumes using existing DockerManager (unless skipped)
-            backup_file = None
+            # 4. Determine volumes to backup (unless skipped)
+            volumes_to_backup = None
             if not skip_volumes:
-                volumes_backup_path = temp_package_dir / "volumes" / f"backup_{branch_name}.tar"
-                volumes_backup_path.parent.mkdir(exist_ok=True)
-                
                 # If container_filter is provided, only backup volumes for selected containers
                 if container_filter:
                     log_info(f"Backing up volumes for selected containers in {branch_name}...")
@@ -185,69 +239,102 @@ class PackageManager:
                     
                     if selected_volumes:
                         log_info(f"Backing up {len(selected_volumes)} selected volume(s)...")
-                        backup_file = self._backup_selected_volumes(
-                            branch_name, 
-                            list(selected_volumes), 
-                            temp_package_dir / "volumes"
-                        )
-                        # If backup was attempted but failed, return error
-                        if not backup_file:
-                            return {
-                                "success": False,
-                                "error": "Failed to backup selected volumes"
-                            }
+                        volumes_to_backup = sorted(selected_volumes)
                     else:
                         log_warning("No volumes found for selected containers")
-                        backup_file = None
                         # No volumes found is valid - continue with export
                 else:
                     log_info(f"Backing up all volumes for {branch_name}...")
-                    backup_file = self.docker_manager.backup_volumes(branch_name, temp_package_dir / "volumes")
+                    volumes_to_backup = list(get_volume_names(branch_name).values())
+                
+                # Compressed packages stream volumes straight into the package archive
+                # (step 7); uncompressed packages keep them in a single backup file
+                if volumes_to_backup and not compressed:
+                    backup_hasher = new_hasher(checksum_algorithm)
+                    backup_file = self.docker_manager.backup_volumes(
+                        branch_name, temp_package_dir / "volumes", volume_names=volumes_to_backup,
+                        compression=compression, compression_level=compression_level,
+                        hasher=backup_hasher
+                    )
                     # If backup was attempted but failed, return error
                     if not backup_file:
                         return {
                             "success": False,
                             "error": "Failed to backup volumes"
                         }
+                    known_checksums[str(backup_file.relative_to(temp_package_dir))] = backup_hasher.hexdigest()
             else:
                 log_warning("Skipping volume backup as requested")
             
             # 5. Create project archive if requested (includes .dockertree directories)
             code_archive_path = None
             if include_code:
-                code_archive_path = temp_package_dir / "code" / f"{branch_name}.tar.gz"
+                # Inside a compressed package the code archive is left uncompressed,
+                # so its contents are only compressed once (by the package archive)
+                code_compression = COMPRESSION_NONE if compressed else compression
+                code_archive_path = temp_package_dir / "code" / f"{branch_name}{get_archive_extension(code_compression)}"
                 code_archive_path.parent.mkdir(exist_ok=True)
                 
                 log_info(f"Creating project archive for {branch_name}...")
-                if not self._create_project_archive(branch_name, worktree_path, code_archive_path):
+                code_hasher = new_hasher(checksum_algorithm)
+                if not self._create_project_archive(branch_name, worktree_path, code_archive_path,
+                                                    compression=code_compression,
+                                                    compression_level=compression_level,
+                                                    hasher=code_hasher):
                     return {
                         "success": False,
                         "error": "Failed to create project archive"
                     }
+                known_checksums[str(code_archive_path.relative_to(temp_package_dir))] = code_hasher.hexdigest()
             
             # 6. Generate metadata with checksums
-            metadata = self._generate_metadata(
+            generate_metadata = functools.partial(
+                self._generate_metadata,
                 branch_name, temp_package_dir, include_code, skip_volumes, container_filter,
-                exclude_deps=exclude_deps, droplet_info=droplet_info, central_droplet_info=central_droplet_info
+                exclude_deps=exclude_deps, droplet_info=droplet_info, central_droplet_info=central_droplet_info,
+                compression=compression, checksum_algorithm=checksum_algorithm,
+                known_checksums=known_checksums
             )
             
             # 7. Compress package if requested
             final_package_path = temp_package_dir
             if compressed:
-                final_package_path = output_dir / f"{package_name}.tar.gz"
-                log_info(f"Compressing package to {final_package_path}...")
-                if not self._compress_package(temp_package_dir, final_package_path):
+                final_package_path = output_dir / f"{package_name}{get_archive_extension(compression)}"
+                if output_stream is None:
+                    log_info(f"Compressing package to {final_package_path} ({compression})...")
+                else:
+                    log_info(f"Streaming package {final_package_path.name} ({compression})...")
+                metadata = self._compress_package(
+                    temp_package_dir, output_stream if output_stream is not None else final_package_path,
+                    branch_name=branch_name, volume_names=volumes_to_backup,
+                    generate_metadata=generate_metadata,
+                    compression=compression, compression_level=compression_level,
+                    checksum_algorithm=checksum_algorithm
+                )
+                if metadata is None:
                     return {
                         "success": False,
                         "error": "Failed to compress package"
                     }
                 # Clean up temp directory
                 shutil.rmtree(temp_package_dir)
+            else:
+                metadata = generate_metadata()
+            
+            if output_stream is not None:
+                log_success(f"Package streamed successfully: {final_package_path.name}")
+                return {
+                    "success": True,
+                    "package_path": None,
+                    "package_name": final_package_path.name,
+                    "metadata": metadata
+                }
             
             log_success(f"Package exported successfully: {final_package_path}")
             return {
                 "success": True,
                 "package_path": str(final_package_path),
+                "package_name": final_package_path.name,
                 "metadata": metadata
             }
             
@@ -318,42 +405,109 @@ class PackageManager:
         if not package_path.exists():
             raise FileNotFoundError(f"Package file not found: {package_path}")
         
-        # Create temporary extraction directory
-        temp_extract_dir = Path(tempfile.mkdtemp())
-        
-        # Check if it's a compressed tar.gz file
-        is_compressed = package_path.name.endswith('.tar.gz')
-        
-        if is_compressed:
-            # Extract compressed package
-            log_info("Extracting compressed package...")
-            with tarfile.open(package_path, 'r:gz') as tar:
-                tar.extractall(temp_extract_dir)
-        else:
-            # Copy uncompressed package
-            log_info("Copying uncompressed package...")
-            shutil.copytree(package_path, temp_extract_dir / package_path.name)
-            temp_extract_dir = temp_extract_dir / package_path.name
+        # Create temporary extraction directory and extract (or copy) the package
+        temp_extract_dir, volume_checksums = self._extract_package(package_path, Path(tempfile.mkdtemp()))
         
         # Verify package integrity - look for the package directory
-        package_dirs = [d for d in temp_extract_dir.iterdir() if d.is_dir() and d.name.endswith('.dockertree-package')]
+        package_dirs = [d for d in temp_extract_dir.iterdir() if d.is_dir() and d.name.endswith(PACKAGE_DIR_SUFFIX)]
         if not package_dirs:
             raise ValueError("Invalid package: package directory not found")
         
         package_dir = package_dirs[0]
-        metadata_path = package_dir / "metadata.json"
-        if not metadata_path.exists():
+        if not (package_dir / METADATA_FILE).exists():
             raise ValueError("Invalid package: metadata.json not found")
         
-        with open(metadata_path) as f:
-            metadata = json.load(f)
+        metadata = self._load_package_metadata(package_dir)
         
-        # Verify checksums
-        if not self._verify_package_checksums(package_dir, metadata):
+        # Verify checksums, including the volume checksums computed during extraction
+        if not self._verify_package_checksums(package_dir, metadata, volume_checksums):
             raise ValueError("Package integrity check failed")
         
         return (temp_extract_dir, package_dir, metadata)
     
+    def _get_streamable_metadata(self, package_path: Path) -> Optional[Dict[str, Any]]:
+        """Get the metadata of a package that can be imported in a single pass.
+        
+        That is a package file that starts with its metadata and streams its
+        volumes (VOLUME_CHECKSUMS_FILE layout).
+        
+        Returns:
+            Package metadata, or None if the package has to be extracted first
+        """
+        if not package_path.is_file():
+            return None
+        metadata = self.read_package_metadata(package_path, header_only=True)
+        if not metadata or metadata.get("volume_layout") != LAYOUT_STREAMED or not metadata.get("volume_checksums_file"):
+            return None
+        return metadata
+    
+    def _stream_import(self, package_path: Path, branch_name: str) -> Tuple[Path, Path, Dict[str, Any]]:
+        """Restore volumes, extract the package files and verify checksums in one pass.
+        
+        Volume members are piped straight into their target volumes and
+        tree-checksummed on the way; the other members (code, environment
+        files, metadata) are extracted to a temporary directory. The package
+        is therefore decompressed once, and no volume data touches the host disk.
+        
+        Args:
+            package_path: Package file (see _get_streamable_metadata)
+            branch_name: Branch whose volumes are restored
+            
+        Returns:
+            Tuple of (temp_extract_dir, package_dir, metadata)
+            
+        Raises:
+            ValueError: If the package is invalid or its checksums do not match
+        """
+        temp_extract_dir = Path(tempfile.mkdtemp())
+        volume_checksums: Dict[str, str] = {}
+        
+        def extract_member(archive: tarfile.TarFile, member: tarfile.TarInfo) -> None:
+            archive.extract(member, temp_extract_dir)
+        
+        log_info(f"Restoring volumes for {branch_name} while extracting {detect_compression(package_path)} package...")
+        volumes_restored = self.docker_manager.restore_volumes(
+            branch_name, package_path, layout=LAYOUT_STREAMED,
+            member_handler=extract_member, volume_checksums=volume_checksums
+        )
+        
+        package_dirs = [d for d in temp_extract_dir.iterdir() if d.is_dir() and d.name.endswith(PACKAGE_DIR_SUFFIX)]
+        if not package_dirs or not (package_dirs[0] / METADATA_FILE).exists():
+            shutil.rmtree(temp_extract_dir, ignore_errors=True)
+            raise ValueError("Invalid package: metadata.json not found")
+        package_dir = package_dirs[0]
+        metadata = self._load_package_metadata(package_dir)
+        
+        if not self._verify_package_checksums(package_dir, metadata, volume_checksums, restored_only=True):
+            shutil.rmtree(temp_extract_dir, ignore_errors=True)
+            raise ValueError("Package integrity check failed")
+        if not volumes_restored:
+            log_warning("Failed to restore volumes")
+        
+        return temp_extract_dir, package_dir, metadata
+    
+    def _discard_stream_import(self, branch_name: str, create_result: Dict[str, Any],
+                               branch_existed: bool) -> None:
+        """Undo a streaming import that failed verification.
+        
+        The branch had no volumes before the import (see _normal_import), so the
+        partly restored volumes are removed, along with the worktree and branch
+        if the import created them.
+        
+        Args:
+            branch_name: Branch whose volumes were restored
+            create_result: Result of the create_worktree() call of the import
+            branch_existed: Whether the branch existed before the import
+        """
+        log_warning(f"Removing volumes restored for {branch_name} from the invalid package...")
+        if create_result.get("data", {}).get("status") == "created":
+            remove_result = self.orchestrator.remove_worktree(branch_name, force=True,
+                                                              delete_branch=not branch_existed)
+            if not remove_result.get("success"):
+                log_warning(f"Failed to remove worktree for {branch_name}: {remove_result.get('error')}")
+        elif not self.docker_manager.remove_volumes(branch_name):
+            log_warning(f"Failed to remove some volumes for {branch_name}")
+    
     def _normal_import(self, package_path: Path, target_branch: str = None,
                       restore_data: bool = True, domain: Optional[str] = None,
                       ip: Optional[str] = None, debug: bool = False) -> Dict[str, Any]:
@@ -369,7 +523,7 @@ class PackageManager:
             Dictionary with success status and worktree info
         """
         # Validate git repository for normal import
-        from ..utils.validation import validate_git_repository
+        from ..utils.validation import validate_branch_exists, validate_git_repository
         if not validate_git_repository(self.project_root):
             return {
                 "success": False,
@@ -377,9 +531,13 @@ class PackageManager:
             }
         
         temp_extract_dir = None
+        package_dir = None
         try:
-            # Extract and validate package
-            temp_extract_dir, package_dir, metadata = self._extract_and_validate_package(package_path)
+            # Packages that start with their metadata are restored, extracted and
+            # verified in one pass once the worktree exists (see _stream_import)
+            metadata = self._get_streamable_metadata(package_path) if restore_data else None
+            if metadata is None:
+                temp_extract_dir, package_dir, metadata = self._extract_and_validate_package(package_path)
             
             # Determine target branch
             if not target_branch:
@@ -390,16 +548,16 @@ class PackageManager:
                         "error": "Could not determine target branch from package"
                     }
             
+            # Check if volumes exist for this branch
+            from ..config.settings import get_volume_names
+            from ..utils.validation import get_existing_volumes
+            
+            volume_names = get_volume_names(target_branch)
+            existing = get_existing_volumes(volume_names.values())
+            existing_volumes = [name for name in volume_names.values() if name in existing]
+            
             # Check if target branch already exists
             if self.git_manager.validate_worktree_exists(target_branch):
-                # Check if volumes exist for this branch
-                from ..config.settings import get_volume_names
-                from ..utils.validation import validate_volume_exists
-                
-                volume_names = get_volume_names(target_branch)
-                existing_volumes = [name for name in volume_names.values() 
-                                  if validate_volume_exists(name)]
-                
                 if existing_volumes and restore_data:
                     if not confirm_use_existing_worktree(target_branch):
                         return {
@@ -407,7 +565,14 @@ class PackageManager:
                             "error": "Import cancelled by user"
                         }
             
+            # A streaming import overwrites volumes before their checksums are known,
+            # so packages are verified first when volumes with data would be replaced
+            if package_dir is None and existing_volumes:
+                log_info(f"Volumes for {target_branch} already exist, verifying package before restoring...")
+                temp_extract_dir, package_dir, metadata = self._extract_and_validate_package(package_path)
+            
             # Create worktree using orchestrator
+            branch_existed = validate_branch_exists(target_branch, self.project_root)
             log_info(f"Creating worktree for branch '{target_branch}'...")
             create_result = self.orchestrator.create_worktree(target_branch)
             if not create_result.get("success"):
@@ -423,6 +588,15 @@ class PackageManager:
                     "error": "Worktree created but path not found"
                 }
             
+            streamed = package_dir is None
+            if streamed:
+                # restore_volumes() handles stopping containers safely before restore
+                try:
+                    temp_extract_dir, package_dir, metadata = self._stream_import(package_path, target_branch)
+                except Exception:
+                    self._discard_stream_import(target_branch, create_result, branch_existed)
+                    raise
+            
             # Restore environment files
             # NOTE: This may overwrite domain/IP settings, so we'll re-apply them after restore
             preserve_domain = domain is not None or ip is not None
@@ -438,11 +612,11 @@ class PackageManager:
             # Apply domain/ip overrides if provided (DRY: uses shared helper method)
             self._apply_domain_or_ip_override(worktree_path, domain, ip, debug=debug)
             
-            # Restore volumes if requested
+            # Restore volumes if requested (already done by a streaming import)
             # restore_volumes() handles stopping containers safely before restore
-            if restore_data:
-                volumes_backup = package_dir / "volumes" / f"backup_{metadata['branch_name']}.tar"
-                if volumes_backup.exists():
+            if restore_data and not streamed:
+                volumes_backup = self._get_volumes_backup(package_path, package_dir, metadata)
+                if volumes_backup:
                     log_info(f"Restoring volumes for {target_branch}...")
                     if not self.docker_manager.restore_volumes(target_branch, volumes_backup):
                         log_warning("Failed to restore volumes")
@@ -451,14 +625,14 @@ class PackageManager:
             
             # Extract code archive if present
             # New format: tar contains worktrees/{branch}/ - extract those contents to worktree_path
-            code_archive = package_dir / "code" / f"{metadata['branch_name']}.tar.gz"
-            if code_archive.exists():
+            code_archive = self._find_code_archive(package_dir, metadata['branch_name'])
+            if code_archive:
                 log_info(f"Extracting code archive to {worktree_path}...")
                 try:
-                    with tarfile.open(code_archive, 'r:gz') as tar:
+                    with open_archive_reader(code_archive) as tar:
                         # Extract only worktree contents, remapping paths
                         worktree_prefix = f"worktrees/{metadata['branch_name']}/"
-                        for member in tar.getmembers():
+                        for member in tar:
                             if member.name.startswith(worktree_prefix):
                                 # Remap path: worktrees/{branch}/foo -> foo
                                 member.name = member.name[len(worktree_prefix):]
@@ -543,16 +717,16 @@ class PackageManager:
             
             # Extract project archive to target directory
             # Archive contains complete structure: .dockertree/, worktrees/{branch}/
-            code_archive = package_dir / "code" / f"{branch_name}.tar.gz"
-            if code_archive.exists():
+            code_archive = self._find_code_archive(package_dir, branch_name)
+            if code_archive:
                 log_info(f"Extracting project archive to {target_directory}...")
-                with tarfile.open(code_archive, 'r:gz') as tar:
+                with open_archive_reader(code_archive) as tar:
                     tar.extractall(target_directory)
                 log_success(f"Extracted project with worktree: worktrees/{branch_name}/")
             else:
                 return {
                     "success": False,
-                    "error": f"Code archive not found in package: {code_archive}"
+                    "error": f"Code archive not found in package: {package_dir / 'code'}"
                 }
             
             # Verify worktree was extracted
@@ -605,14 +779,21 @@ class PackageManager:
             # 3. The restoration process extracts files directly into the volume (no database commands needed)
             if restore_data:
                 if branch_name:
-                    volumes_backup = package_dir / "volumes" / f"backup_{branch_name}.tar"
-                    if volumes_backup.exists():
+                    volumes_backup = self._get_volumes_backup(package_path, package_dir, metadata)
+                    if volumes_backup:
                         log_info(f"Restoring volumes...")
                         # Ensure containers are stopped before restoration (DRY: use shared function)
                         from ..core.docker_manager import DockerManager
                         docker_manager = DockerManager(project_root=target_directory)
                         # restore_volumes() handles stopping containers safely before restore
-                        docker_manager.restore_volumes(branch_name, volumes_backup)
+                        volume_checksums: Dict[str, str] = {}
+                        docker_manager.restore_volumes(branch_name, volumes_backup,
+                                                       volume_checksums=volume_checksums)
+                        if not self._compare_volume_checksums(metadata, volume_checksums, restored_only=True):
+                            return {
+                                "success": False,
+                                "error": "Package integrity check failed; restored volumes may be incomplete"
+                            }
             
             log_success(f"Standalone import completed: {target_directory}")
             return {
@@ -634,9 +815,40 @@ class PackageManager:
             if temp_extract_dir and temp_extract_dir.exists():
                 shutil.rmtree(temp_extract_dir, ignore_errors=True)
     
+    def read_package_metadata(self, package_path: Path, header_only: bool = False) -> Optional[Dict[str, Any]]:
+        """Read a package's metadata without extracting or verifying it.
+        
+        metadata.json is the first member of current packages, so only the
+        start of the archive is read. Older packages carry it after their
+        volumes; the archive is then read up to it (still without writing
+        anything to disk).
+        
+        Args:
+            package_path: Compressed package file or uncompressed package directory
+            header_only: Only look at the first member (None for older packages)
+            
+        Returns:
+            Package metadata, or None if the package has no readable metadata
+        """
+        try:
+            if package_path.is_dir():
+                return self._load_package_metadata(package_path)
+            with open_archive_reader(package_path) as tar:
+                for member in tar:
+                    if member.isfile() and self._package_member_path(member.name) == METADATA_FILE:
+                        return json.load(tar.extractfile(member))
+                    if header_only:
+                        break
+        except (OSError, ValueError, tarfile.TarError) as e:
+            log_warning(f"Could not read metadata of {package_path.name}: {e}")
+        return None
+    
     def validate_package(self, package_path: Path) -> Dict[str, Any]:
         """Validate package integrity.
         
+        Every member is checksummed while the archive is streamed once; nothing
+        is extracted.
+        
         Args:
             package_path: Path to the package file
             
@@ -650,45 +862,28 @@ class PackageManager:
                     "error": "Package file not found"
                 }
             
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_extract_dir = Path(temp_dir)
-                
-                # Extract package
-                if package_path.suffix == '.tar.gz':
-                    with tarfile.open(package_path, 'r:gz') as tar:
-                        tar.extractall(temp_extract_dir)
-                else:
-                    shutil.copytree(package_path, temp_extract_dir / package_path.name)
-                    temp_extract_dir = temp_extract_dir / package_path.name
-                
-                # Check metadata - look for the package directory
-                package_dirs = [d for d in temp_extract_dir.iterdir() if d.is_dir() and d.name.endswith('.dockertree-package')]
-                if not package_dirs:
+            if package_path.is_dir():
+                if not (package_path / METADATA_FILE).exists():
                     return {
                         "success": False,
-                        "error": "Invalid package: package directory not found"
+                        "error": "Invalid package: metadata.json not found"
                     }
-                
-                package_dir = package_dirs[0]
-                metadata_path = package_dir / "metadata.json"
-                if not metadata_path.exists():
+                metadata = self._load_package_metadata(package_path)
+                checksum_valid = self._verify_package_checksums(package_path, metadata)
+            else:
+                metadata, checksum_valid = self._verify_package_archive(package_path)
+                if metadata is None:
                     return {
                         "success": False,
                         "error": "Invalid package: metadata.json not found"
                     }
-                
-                with open(metadata_path) as f:
-                    metadata = json.load(f)
-                
-                # Verify checksums
-                checksum_valid = self._verify_package_checksums(package_dir, metadata)
-                
-                return {
-                    "success": True,
-                    "valid": checksum_valid,
-                    "metadata": metadata,
-                    "checksum_valid": checksum_valid
-                }
+            
+            return {
+                "success": True,
+                "valid": checksum_valid,
+                "metadata": metadata,
+                "checksum_valid": checksum_valid
+            }
                 
         except Exception as e:
             return {
@@ -696,14 +891,18 @@ class PackageManager:
                 "error": f"Validation error: {str(e)}"
             }
     
-    def list_packages(self, package_dir: Path) -> List[Dict[str, Any]]:
+    def list_packages(self, package_dir: Path, verify: bool = False) -> List[Dict[str, Any]]:
         """List available packages in directory.
         
+        Only the metadata of each package is read unless verify is set.
+        
         Args:
             package_dir: Directory to search for packages
+            verify: Verify the checksums of every package (reads each package in full)
             
         Returns:
-            List of package information dictionaries
+            List of package information dictionaries; "valid" is None for
+            packages that were not verified
         """
         packages = []
         
@@ -711,21 +910,72 @@ class PackageManager:
             return packages
         
         for item in package_dir.iterdir():
-            if item.is_file() and ('.tar.gz' in item.name or item.name.endswith('.dockertree-package')):
-                # Validate package
-                validation = self.validate_package(item)
-                if validation.get("success"):
-                    packages.append({
-                        "name": item.name,
-                        "path": str(item),
-                        "size": item.stat().st_size,
-                        "metadata": validation.get("metadata", {}),
-                        "valid": validation.get("valid", False)
-                    })
+            if item.is_file() and ('.tar.gz' in item.name or '.tar.zst' in item.name or item.name.endswith('.tar')
+                                   or item.name.endswith(PACKAGE_DIR_SUFFIX)):
+                if verify:
+                    validation = self.validate_package(item)
+                    if not validation.get("success"):
+                        continue
+                    metadata = validation.get("metadata", {})
+                    valid = validation.get("valid", False)
+                else:
+                    metadata = self.read_package_metadata(item)
+                    if metadata is None:
+                        continue
+                    valid = None
+                packages.append({
+                    "name": item.name,
+                    "path": str(item),
+                    "size": item.stat().st_size,
+                    "metadata": metadata,
+                    "valid": valid
+                })
         
         return sorted(packages, key=lambda x: x["name"])
     
-    def _create_project_archive(self, branch_name: str, worktree_path: Path, output_path: Path) -> bool:
+    def rebuild_package(self, manifest_path: Path, output_path: Optional[Path] = None) -> Dict[str, Any]:
+        """Rebuild a package archive from a package manifest and its chunk store.
+        
+        Used on the receiving side of a delta push: only chunks the server did not
+        already have are uploaded next to the manifest, then the package is
+        reassembled here before it is imported.
+        
+        Args:
+            manifest_path: Manifest in <store>/manifests/packages/
+            output_path: Package file to write. Defaults to the original package
+                name next to the chunk store.
+            
+        Returns:
+            Dictionary with success status and package path
+        """
+        try:
+            manifest = load_manifest(manifest_path, PACKAGE_MANIFEST_FORMAT)
+            store = ChunkStore.for_manifest(manifest_path, manifest.get("checksum_algorithm", DEFAULT_CHECKSUM_ALGORITHM))
+            if output_path is None:
+                output_path = store.root.parent / manifest["package_name"]
+            
+            log_info(f"Rebuilding package {output_path.name} from {len(manifest['entries'])} entries...")
+            try:
+                write_package_from_manifest(manifest, store, output_path)
+            except Exception:
+                if output_path.exists():
+                    output_path.unlink()
+                raise
+            
+            log_success(f"Package rebuilt: {output_path}")
+            return {
+                "success": True,
+                "package_path": str(output_path)
+            }
+        except (OSError, ValueError, KeyError) as e:
+            return {
+                "success": False,
+                "error": f"Failed to rebuild package: {e}"
+            }
+    
+    def _create_project_archive(self, branch_name: str, worktree_path: Path, output_path: Path,
+                                compression: str = DEFAULT_COMPRESSION,
+                                compression_level: Optional[int] = None, hasher=None) -> bool:
         """Create tar archive of project including .dockertree directories.
         
         Creates a complete tar of the project structure preserving the fractal
@@ -738,6 +988,7 @@ class PackageManager:
             branch_name: Name of the branch/worktree
             worktree_path: Path to the worktree directory
             output_path: Path where the archive should be created
+            hasher: Optional hash object fed with the archive's bytes as they are written
             
         Returns:
             True if archive was created successfully, False otherwise
@@ -755,7 +1006,7 @@ class PackageManager:
             
             # Create tar archive of project
             # Include: .dockertree/, worktrees/{branch}/, and key project files
-            with tarfile.open(output_path, 'w:gz') as tar:
+            with open_archive_writer(output_path, compression, compression_level, hasher=hasher) as tar:
                 # Add project root .dockertree/
                 dockertree_dir = project_root / ".dockertree"
                 if dockertree_dir.exists():
@@ -1390,121 +1641,27 @@ class PackageManager:
             log_error(f"Failed to restore environment files: {e}")
             return False
     
-    def _backup_selected_volumes(self, branch_name: str, volume_names: List[str], backup_dir: Path) -> Optional[Path]:
-        """Backup only selected volumes to a tar file.
-        
-        Args:
-            branch_name: Branch name for the worktree
-            volume_names: List of volume names to backup
-            backup_dir: Directory to save the backup
-            
-        Returns:
-            Path to backup file if successful, None otherwise
-        """
-        import tempfile
-        backup_file = backup_dir / f"backup_{branch_name}.tar"
-        
-        log_info(f"Backing up {len(volume_names)} selected volume(s) for {branch_name} to {backup_file}")
-        
-        # Check if worktree is running before backup
-        was_running = self.docker_manager._is_worktree_running(branch_name)
-        if was_running:
-            log_info(f"Worktree containers are running, stopping them safely before backup...")
-            from ..core.worktree_orchestrator import WorktreeOrchestrator
-            orchestrator = WorktreeOrchestrator(project_root=self.project_root)
-            stop_result = orchestrator.stop_worktree(branch_name)
-            if not stop_result.get("success"):
-                log_warning("Failed to stop containers, but continuing with backup")
-            else:
-                log_success("Containers stopped successfully")
-        
-        # Create backup directory
-        backup_dir.mkdir(parents=True, exist_ok=True)
-        temp_backup_dir = backup_dir / "temp_backup"
-        temp_backup_dir.mkdir(exist_ok=True)
-        
-        try:
-            from ..utils.validation import validate_volume_exists
-            
-            # Backup each selected volume
-            for volume_name in volume_names:
-                if not validate_volume_exists(volume_name):
-                    log_warning(f"Volume {volume_name} not found, skipping")
-                    continue
-                
-                log_info(f"Backing up volume: {volume_name}")
-                
-                # Use file-level backup
-                volume_backup = temp_backup_dir / f"{volume_name}.tar.gz"
-                
-                try:
-                    subprocess.run([
-                        "docker", "run", "--rm",
-                        "-v", f"{volume_name}:/data",
-                        "-v", f"{temp_backup_dir.absolute()}:/backup",
-                        "alpine", "tar", "czf", f"/backup/{volume_name}.tar.gz", "-C", "/data", "."
-                    ], check=True, capture_output=True, text=True)
-                    log_success(f"Volume backup created: {volume_name}.tar.gz")
-                except subprocess.CalledProcessError as e:
-                    log_error(f"Failed to backup volume {volume_name}: {e}")
-                    if e.stderr:
-                        log_error(f"Error details: {e.stderr}")
-                    continue
-            
-            # Create combined backup
-            subprocess.run([
-                "tar", "czf", str(backup_file), "-C", str(temp_backup_dir), "."
-            ], check=True, capture_output=True)
-            
-            # Cleanup temp directory
-            shutil.rmtree(temp_backup_dir)
-            
-            log_success(f"Backup created: {backup_file}")
-            
-            # Restart containers if they were running before
-            if was_running:
-                log_info("Restarting worktree containers in background...")
-                from ..core.worktree_orchestrator import WorktreeOrchestrator
-                orchestrator = WorktreeOrchestrator(project_root=self.project_root)
-                import threading
-                
-                def start_in_background():
-                    start_result = orchestrator.start_worktree(branch_name)
-                    if start_result.get("success"):
-                        log_success("Containers restarted successfully")
-                    else:
-                        log_warning(f"Failed to restart containers: {start_result.get('error', 'Unknown error')}")
-                
-                thread = threading.Thread(target=start_in_background, daemon=True)
-                thread.start()
-            
-            return backup_file
-            
-        except subprocess.CalledProcessError as e:
-            log_error(f"Failed to create backup: {e}")
-            # Cleanup temp directory
-            if temp_backup_dir.exists():
-                shutil.rmtree(temp_backup_dir)
-            
-            # Try to restart containers if they were running
-            if was_running:
-                log_info("Attempting to restart containers after backup failure...")
-                try:
-                    from ..core.worktree_orchestrator import WorktreeOrchestrator
-                    orchestrator = WorktreeOrchestrator(project_root=self.project_root)
-                    orchestrator.start_worktree(branch_name)
-                except Exception as restart_error:
-                    log_error(f"Failed to restart containers: {restart_error}")
-            
-            return None
-    
     def _generate_metadata(self, branch_name: str, package_dir: Path, include_code: bool, 
                           skip_volumes: bool = False, container_filter: Optional[List[Dict[str, str]]] = None,
                           exclude_deps: Optional[List[str]] = None, droplet_info: Optional[DropletInfo] = None,
-                          central_droplet_info: Optional[DropletInfo] = None) -> Dict[str, Any]:
-        """Generate package metadata with checksums."""
+                          central_droplet_info: Optional[DropletInfo] = None,
+                          streamed_volumes: bool = False,
+                          seekable: bool = False,
+                          compression: str = DEFAULT_COMPRESSION,
+                          checksum_algorithm: str = DEFAULT_CHECKSUM_ALGORITHM,
+                          known_checksums: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Generate package metadata with checksums.
+        
+        streamed_volumes marks volumes streamed directly into the package
+        archive; their tree checksums are stored in VOLUME_CHECKSUMS_FILE at the
+        end of the archive. seekable marks packages written in the seekable gzip
+        layout (package version 2.0), whose members can be read without
+        decompressing the whole archive. known_checksums holds checksums of staged files that
+        were hashed while being written; the remaining staged files are
+        checksummed from package_dir in parallel.
+        """
         metadata = {
-            "package_version": "1.0",
+            "package_version": "2.0" if seekable else "1.2" if streamed_volumes else "1.0",
             "dockertree_version": "0.9.4",
             "created_at": datetime.now().isoformat(),
             "branch_name": branch_name,
@@ -1512,6 +1669,8 @@ class PackageManager:
             "include_code": include_code,
             "skip_volumes": skip_volumes,
             "container_filter": container_filter if container_filter else None,
+            "compression": compression,
+            "checksum_algorithm": checksum_algorithm,
             "checksums": {}
         }
         
@@ -1550,48 +1709,346 @@ class PackageManager:
         if vpc_deployment:
             metadata["vpc_deployment"] = vpc_deployment
         
-        # Calculate checksums for all files
-        for file_path in package_dir.rglob('*'):
-            if file_path.is_file():
-                try:
-                    checksum = calculate_file_checksum(file_path)
-                    relative_path = file_path.relative_to(package_dir)
-                    metadata["checksums"][str(relative_path)] = checksum
-                except Exception:
-                    continue
+        if streamed_volumes:
+            metadata["volume_layout"] = LAYOUT_STREAMED
+            metadata["volume_checksums_file"] = VOLUME_CHECKSUMS_FILE
+        if seekable:
+            metadata["package_index"] = INDEX_MEMBER_NAME
+        
+        # Calculate checksums for all files not already hashed during export
+        known_checksums = known_checksums or {}
+        pending_files = [
+            file_path for file_path in package_dir.rglob('*')
+            if file_path.is_file() and str(file_path.relative_to(package_dir)) not in known_checksums
+        ]
+        for file_path, checksum in calculate_checksums(pending_files, checksum_algorithm).items():
+            metadata["checksums"][str(file_path.relative_to(package_dir))] = checksum
+        metadata["checksums"].update(known_checksums)
         
         # Save metadata
-        metadata_path = package_dir / "metadata.json"
+        metadata_path = package_dir / METADATA_FILE
         with open(metadata_path, 'w') as f:
             json.dump(metadata, f, indent=2)
         
         return metadata
     
-    def _verify_package_checksums(self, package_dir: Path, metadata: Dict[str, Any]) -> bool:
-        """Verify package checksums."""
+    def _verify_package_checksums(self, package_dir: Path, metadata: Dict[str, Any],
+                                  volume_checksums: Optional[Dict[str, str]] = None,
+                                  restored_only: bool = False) -> bool:
+        """Verify package checksums.
+        
+        volume_checksums holds the tree checksums of streamed volumes computed
+        while the package was extracted (see _extract_package) or restored.
+        With restored_only, volumes that were not read are not reported missing.
+        """
+        checksum_algorithm = metadata.get("checksum_algorithm", DEFAULT_CHECKSUM_ALGORITHM)
+        if not is_checksum_algorithm_available(checksum_algorithm):
+            log_error(f"Package checksums use '{checksum_algorithm}', which is not available on this machine")
+            return False
+        
+        if not self._compare_volume_checksums(metadata, volume_checksums or {}, restored_only):
+            return False
+        
         checksums = metadata.get("checksums", {})
         
-        for relative_path, expected_checksum in checksums.items():
-            file_path = package_dir / relative_path
-            if not file_path.exists():
+        for relative_path in verify_checksums(package_dir, checksums, checksum_algorithm):
+            if not (package_dir / relative_path).exists():
                 log_warning(f"File not found in package: {relative_path}")
-                return False
-            
-            if not verify_file_checksum(file_path, expected_checksum):
+            else:
                 log_warning(f"Checksum mismatch for: {relative_path}")
-                return False
+            return False
         
         return True
     
-    def _compress_package(self, source_dir: Path, output_path: Path) -> bool:
-        """Compress package directory to tar.gz."""
+    def _load_package_metadata(self, package_dir: Path) -> Dict[str, Any]:
+        """Load metadata.json of an extracted package, with its volume checksums."""
+        with open(package_dir / METADATA_FILE) as f:
+            metadata = json.load(f)
+        checksums_file = metadata.get("volume_checksums_file")
+        if checksums_file and "volume_checksums" not in metadata:
+            try:
+                with open(package_dir / checksums_file) as f:
+                    metadata["volume_checksums"] = json.load(f)
+            except (OSError, ValueError):
+                # Reported by _verify_package_checksums
+                metadata["volume_checksums"] = None
+        return metadata
+    
+    @staticmethod
+    def _package_member_path(name: str) -> Optional[str]:
+        """Get the path of an archive member relative to the package directory."""
+        parts = normalize_member_name(name).split("/", 1)
+        if len(parts) != 2 or not parts[0].endswith(PACKAGE_DIR_SUFFIX):
+            return None
+        return parts[1]
+    
+    def _verify_package_archive(self, package_path: Path) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Verify a package archive's checksums in one streaming pass.
+        
+        Staged files are hashed and volumes tree-checksummed as members are
+        read; the results are compared with the metadata at the end. The
+        sections of seekable packages (each volume, and the other files) are
+        independently compressed, so they are decompressed and hashed in parallel.
+        
+        Returns:
+            Tuple of (package metadata or None if missing, whether all checksums match)
+        """
+        log_info(f"Verifying {detect_compression(package_path)} package {package_path.name}...")
+        index = read_archive_index(package_path)
+        if index is None:
+            parts = [self._hash_package_members(iter_archive_members(package_path))]
+        else:
+            predicates = [lambda name: locate_volume_member(name) is None] + self._volume_member_predicates(index)
+            with ThreadPoolExecutor(max_workers=min(len(predicates), os.cpu_count() or 1)) as executor:
+                parts = list(executor.map(
+                    lambda predicate: self._hash_package_members(index.iter_members(predicate)), predicates
+                ))
+        
+        metadata = None
+        volume_checksums = None
+        file_checksums: Dict[str, str] = {}
+        actual_volume_checksums: Dict[str, str] = {}
+        for part in parts:
+            if part["algorithm"] is not None and not is_checksum_algorithm_available(part["algorithm"]):
+                log_error(f"Package checksums use '{part['algorithm']}', which is not available on this machine")
+                return self.read_package_metadata(package_path), False
+            metadata = metadata or part["metadata"]
+            volume_checksums = volume_checksums or part["volume_checksums"]
+            file_checksums.update(part["files"])
+            actual_volume_checksums.update(part["volumes"])
+        
+        if metadata is None:
+            return None, False
+        if metadata.get("volume_checksums_file") and "volume_checksums" not in metadata:
+            metadata["volume_checksums"] = volume_checksums
+        if not self._compare_volume_checksums(metadata, actual_volume_checksums):
+            return metadata, False
+        
+        valid = True
+        for relative_path, expected_checksum in (metadata.get("checksums") or {}).items():
+            if relative_path not in file_checksums:
+                log_warning(f"File not found in package: {relative_path}")
+                valid = False
+            elif file_checksums[relative_path] != expected_checksum:
+                log_warning(f"Checksum mismatch for: {relative_path}")
+                valid = False
+        return metadata, valid
+    
+    @staticmethod
+    def _volume_member_predicates(index) -> List[Callable[[str], bool]]:
+        """Get a member name predicate for each volume of a seekable package, in archive order."""
+        volume_dirs = dict.fromkeys(
+            location[0] for location in map(locate_volume_member, index.names()) if location is not None
+        )
+        return [functools.partial(is_volume_member, volume_dir=volume_dir) for volume_dir in volume_dirs]
+    
+    def _hash_package_members(self, members: Iterator[Tuple[tarfile.TarFile, tarfile.TarInfo]]) -> Dict[str, Any]:
+        """Hash package archive members: staged files one by one, volumes as trees.
+        
+        Returns:
+            Dictionary with the checksum algorithm (None if there were no
+            members), metadata, volume_checksums (the parsed metadata and
+            VOLUME_CHECKSUMS_FILE members, if read), files (staged file
+            checksums) and volumes (volume tree checksums). Hashing stops if the
+            algorithm is not available.
+        """
+        result = {"algorithm": None, "metadata": None, "volume_checksums": None, "files": {}, "volumes": {}}
+        volume_trees: Dict[str, TreeChecksum] = {}
+        for tar, member in members:
+            if result["algorithm"] is None:
+                # Global headers are only available once the first member is read
+                result["algorithm"] = tar.pax_headers.get(CHECKSUM_ALGORITHM_HEADER, DEFAULT_CHECKSUM_ALGORITHM)
+                if not is_checksum_algorithm_available(result["algorithm"]):
+                    return result
+            algorithm = result["algorithm"]
+            location = locate_volume_member(member.name)
+            if location is not None:
+                volume_dir, relative_name = location
+                tree = volume_trees.setdefault(volume_dir, TreeChecksum(algorithm))
+                if member.isfile():
+                    tree.add_fileobj(relative_name, tar.extractfile(member))
+                elif member.issym() or member.islnk():
+                    tree.add_link(relative_name, get_relative_link_target(member, volume_dir))
+                continue
+            relative_path = self._package_member_path(member.name)
+            if relative_path is None or not member.isfile():
+                continue
+            if relative_path == METADATA_FILE:
+                result["metadata"] = json.load(tar.extractfile(member))
+            elif relative_path == VOLUME_CHECKSUMS_FILE:
+                result["volume_checksums"] = json.load(tar.extractfile(member))
+            else:
+                hasher = new_hasher(algorithm)
+                fileobj = tar.extractfile(member)
+                for block in iter(lambda: fileobj.read(CHECKSUM_BUFFER_SIZE), b''):
+                    hasher.update(block)
+                result["files"][relative_path] = hasher.hexdigest()
+        result["volumes"] = {name: tree.hexdigest() for name, tree in volume_trees.items()}
+        return result
+    
+    def _compare_volume_checksums(self, metadata: Dict[str, Any], actual_volume_checksums: Dict[str, str],
+                                  restored_only: bool = False) -> bool:
+        """Compare volume tree checksums computed from a package with its metadata.
+        
+        With restored_only, only the volumes in actual_volume_checksums are
+        compared (imports do not read volumes they have no target for).
+        """
+        if metadata.get("volume_checksums_file") and metadata.get("volume_checksums") is None:
+            log_warning("Volume checksums not found in package")
+            return False
+        for volume_name, expected_checksum in (metadata.get("volume_checksums") or {}).items():
+            if volume_name not in actual_volume_checksums:
+                if restored_only:
+                    continue
+                log_warning(f"Volume not found in package: {volume_name}")
+                return False
+            if actual_volume_checksums[volume_name] != expected_checksum:
+                log_warning(f"Checksum mismatch for volume: {volume_name}")
+                return False
+        return True
+    
+    def _compress_package(self, source_dir: Path, output_path, branch_name: Optional[str] = None,
+                          volume_names: Optional[List[str]] = None,
+                          generate_metadata: Optional[Callable[..., Dict[str, Any]]] = None,
+                          compression: str = DEFAULT_COMPRESSION,
+                          compression_level: Optional[int] = None,
+                          checksum_algorithm: str = DEFAULT_CHECKSUM_ALGORITHM) -> Optional[Dict[str, Any]]:
+        """Compress package directory to a gzip, zstd or uncompressed tar archive.
+        
+        generate_metadata is called first and metadata.json becomes the first
+        member, so readers can get the metadata without reading the rest of
+        the archive. Volumes in volume_names are then streamed straight into
+        the archive under ``volumes/<volume_name>/``, so their data is only
+        compressed once, followed by the staged files and, last, the volume
+        tree checksums (VOLUME_CHECKSUMS_FILE). gzip packages are written in the
+        seekable layout, so importing or verifying them can skip to the members
+        they need.
+        
+        output_path may also be a writable binary stream, which is left open.
+        
+        Returns:
+            Package metadata including volume checksums (empty if no generator
+            was given), or None on failure
+        """
+        pax_headers = None
+        if checksum_algorithm != DEFAULT_CHECKSUM_ALGORITHM:
+            pax_headers = {CHECKSUM_ALGORITHM_HEADER: checksum_algorithm}
+        metadata_arcname = f"{source_dir.name}/{METADATA_FILE}"
+        seekable = compression == COMPRESSION_GZIP
         try:
-            with tarfile.open(output_path, 'w:gz') as tar:
-                tar.add(source_dir, arcname=source_dir.name)
-            return True
+            with open_archive_writer(output_path, compression, compression_level,
+                                     pax_headers=pax_headers, seekable=seekable) as tar:
+                metadata = generate_metadata(streamed_volumes=bool(volume_names),
+                                             seekable=seekable) if generate_metadata else {}
+                if (source_dir / METADATA_FILE).exists():
+                    tar.add(source_dir / METADATA_FILE, arcname=metadata_arcname)
+                if volume_names:
+                    volume_checksums = self.docker_manager.backup_volumes_to_archive(
+                        branch_name, volume_names, tar, f"{source_dir.name}/volumes",
+                        checksum_algorithm=checksum_algorithm
+                    )
+                    if volume_checksums is None:
+                        raise RuntimeError("failed to backup volumes")
+                    metadata["volume_checksums"] = volume_checksums
+                tar.add(source_dir, arcname=source_dir.name,
+                        filter=lambda info: None if info.name == metadata_arcname else info)
+                if volume_names:
+                    data = json.dumps(volume_checksums, indent=2).encode("utf-8")
+                    info = tarfile.TarInfo(f"{source_dir.name}/{VOLUME_CHECKSUMS_FILE}")
+                    info.size = len(data)
+                    info.mtime = int(datetime.now().timestamp())
+                    info.mode = 0o644
+                    tar.addfile(info, io.BytesIO(data))
+            return metadata
         except Exception as e:
             log_error(f"Failed to compress package: {e}")
-            return False
+            if isinstance(output_path, Path) and output_path.exists():
+                output_path.unlink()
+            return None
+    
+    def _extract_package(self, package_path: Path, extract_dir: Path) -> Tuple[Path, Dict[str, str]]:
+        """Extract a package, checksumming streamed volumes instead of writing them to disk.
+        
+        Volume data stays in the package archive and is restored from it directly,
+        so only code, environment files and metadata are extracted. The volume
+        sections of seekable packages are checksummed in parallel, while the
+        other files are extracted.
+        
+        Args:
+            package_path: Compressed package file or uncompressed package directory
+            extract_dir: Directory to extract into
+            
+        Returns:
+            Tuple of (directory containing the package directory, volume tree checksums)
+        """
+        volume_trees: Dict[str, TreeChecksum] = {}
+        
+        index = read_archive_index(package_path) if package_path.is_file() else None
+        if index is not None:
+            log_info("Extracting seekable package and checksumming its volumes...")
+            predicates = self._volume_member_predicates(index)
+            volume_checksums: Dict[str, str] = {}
+            with ThreadPoolExecutor(max_workers=max(1, min(len(predicates), os.cpu_count() or 1))) as executor:
+                parts = [executor.submit(lambda predicate: self._hash_package_members(index.iter_members(predicate)),
+                                         predicate) for predicate in predicates]
+                for archive, member in index.iter_members(lambda name: locate_volume_member(name) is None):
+                    archive.extract(member, extract_dir)
+                for part in parts:
+                    # Volumes hashed with an unavailable algorithm are missing
+                    # here; the algorithm is reported by _verify_package_checksums
+                    volume_checksums.update(part.result()["volumes"])
+            return extract_dir, volume_checksums
+        
+        if package_path.is_file():
+            log_info(f"Extracting {detect_compression(package_path)} package...")
+            with open_archive_reader(package_path) as tar:
+                def package_members():
+                    algorithm = None
+                    for member in tar:
+                        location = locate_volume_member(member.name)
+                        if location is None:
+                            yield member
+                            continue
+                        volume_dir, relative_name = location
+                        if algorithm is None:
+                            # Global headers are only available once the first member is read
+                            algorithm = tar.pax_headers.get(CHECKSUM_ALGORITHM_HEADER, DEFAULT_CHECKSUM_ALGORITHM)
+                            available = is_checksum_algorithm_available(algorithm)
+                        if not available:
+                            # Reported by _verify_package_checksums
+                            continue
+                        tree = volume_trees.setdefault(volume_dir, TreeChecksum(algorithm))
+                        if member.isfile():
+                            tree.add_fileobj(relative_name, tar.extractfile(member))
+                        elif member.issym() or member.islnk():
+                            tree.add_link(relative_name, get_relative_link_target(member, volume_dir))
+                
+                tar.extractall(extract_dir, members=package_members())
+        else:
+            log_info("Copying uncompressed package...")
+            shutil.copytree(package_path, extract_dir / package_path.name)
+            extract_dir = extract_dir / package_path.name
+        
+        return extract_dir, {name: tree.hexdigest() for name, tree in volume_trees.items()}
+    
+    def _find_code_archive(self, package_dir: Path, branch_name: str) -> Optional[Path]:
+        """Find the code archive in an extracted package, whatever its compression."""
+        for extension in (".tar.gz", ".tar.zst", ".tar"):
+            code_archive = package_dir / "code" / f"{branch_name}{extension}"
+            if code_archive.exists():
+                return code_archive
+        return None
+    
+    def _get_volumes_backup(self, package_path: Path, package_dir: Path, metadata: Dict[str, Any]) -> Optional[Path]:
+        """Get the archive to restore volumes from for an extracted package.
+        
+        Streamed volumes are restored directly from the package file; older
+        packages and uncompressed packages carry volumes/backup_<branch>.tar.
+        """
+        if metadata.get("volume_layout") == LAYOUT_STREAMED and package_path.is_file():
+            return package_path if metadata.get("volume_checksums") else None
+        volumes_backup = package_dir / "volumes" / f"backup_{metadata['branch_name']}.tar"
+        return volumes_backup if volumes_backup.exists() else None
 
     def _initialize_git_for_standalone(self, target_directory: Path) -> bool:
         """Initialize a git repository for standalone deployment.
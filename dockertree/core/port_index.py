@@ -0,0 +1,233 @@
+"""
+Host port allocation index for dockertree CLI.
+
+Assigning host ports used to scan every directory under the worktree root
+(and the legacy parent directory), parse each ``env.dockertree``, and then
+try ``socket.bind`` on candidate ports one by one. PortIndex keeps the
+assignments in ``.dockertree/ports.json`` instead, with a "lowest free port"
+cursor per range, so allocating and releasing a port does not depend on the
+number of worktrees. Only the candidate about to be handed out is checked
+for bind availability.
+
+Every read-modify-write of the index happens under an exclusive lock on
+``.dockertree/ports.lock`` (``flock``, plus a thread lock for callers in the
+same process), so concurrent ``create`` calls never hand out the same port.
+"""
+
+import json
+import os
+import socket
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from ..config.settings import DOCKERTREE_DIR
+from ..utils.logging import log_info
+
+INDEX_FILE_NAME = "ports.json"
+LOCK_FILE_NAME = "ports.lock"
+INDEX_VERSION = 1
+
+# branch name -> {port variable: port}
+PortAssignments = Dict[str, Dict[str, int]]
+
+_thread_lock = threading.RLock()
+
+
+def is_port_available(port: int) -> bool:
+    """Check if a host port is available on the current machine."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.bind(("", port))
+        except OSError:
+            return False
+    return True
+
+
+class _IndexState:
+    """Loaded index: assignments plus reverse lookup and free-port cursors."""
+
+    def __init__(self, branches: PortAssignments, cursors: Dict[str, int]):
+        self.branches = branches
+        self.cursors = cursors
+        self.owners: Dict[Tuple[str, int], str] = {
+            (var, port): branch for branch, ports in branches.items() for var, port in ports.items()
+        }
+
+    def assign(self, branch: str, var: str, port: int) -> None:
+        self.branches.setdefault(branch, {})[var] = port
+        self.owners[(var, port)] = branch
+
+    def release(self, branch: str) -> Dict[str, int]:
+        ports = self.branches.pop(branch, {})
+        for var, port in ports.items():
+            self.owners.pop((var, port), None)
+            # Freed ports below the cursor are handed out again first
+            if port < self.cursors.get(var, port + 1):
+                self.cursors[var] = port
+        return ports
+
+    def to_dict(self) -> Dict:
+        return {"version": INDEX_VERSION, "branches": self.branches, "cursors": self.cursors}
+
+
+class PortIndex:
+    """Persistent index of the host ports assigned to worktrees of a project."""
+
+    def __init__(self, project_root: Path, port_ranges: Dict[str, Tuple[int, int]],
+                 port_available: Callable[[int], bool] = is_port_available):
+        """Initialize port index.
+
+        Args:
+            project_root: Project root; the index lives in its .dockertree directory
+            port_ranges: Port variable -> (first, last) port of its range
+            port_available: Bind check for a candidate port
+        """
+        self.project_root = Path(project_root)
+        self.port_ranges = port_ranges
+        self.port_available = port_available
+
+    @property
+    def index_path(self) -> Path:
+        return self.project_root / DOCKERTREE_DIR / INDEX_FILE_NAME
+
+    @property
+    def lock_path(self) -> Path:
+        return self.project_root / DOCKERTREE_DIR / LOCK_FILE_NAME
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with _thread_lock:
+            self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.lock_path, "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _load(self) -> Optional[_IndexState]:
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return None
+            branches = {
+                branch: {var: int(port) for var, port in ports.items()}
+                for branch, ports in (data.get("branches") or {}).items()
+            }
+            cursors = {var: int(port) for var, port in (data.get("cursors") or {}).items()}
+        except (OSError, ValueError, TypeError, AttributeError):
+            return None
+        return _IndexState(branches, cursors)
+
+    def _save(self, state: _IndexState) -> None:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=self.index_path.parent, prefix=".tmp-ports-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(state.to_dict(), f, indent=2, sort_keys=True)
+            os.replace(temp_name, self.index_path)
+        except BaseException:
+            try:
+                os.unlink(temp_name)
+            except OSError:
+                pass
+            raise
+
+    def _next_free_port(self, state: _IndexState, var: str) -> int:
+        start, end = self.port_ranges[var]
+        port = max(state.cursors.get(var, start), start)
+        skipped = []
+        while port <= end:
+            if (var, port) not in state.owners:
+                if self.port_available(port):
+                    break
+                # Taken by something outside dockertree; try it again after the next release
+                skipped.append(port)
+            port += 1
+        # The cursor only moves past ports that are assigned
+        state.cursors[var] = skipped[0] if skipped else min(port, end + 1)
+        return port if port <= end else 0
+
+    def allocate(self, branch_name: str, existing: Optional[Dict[str, int]] = None,
+                 seed: Optional[Callable[[], PortAssignments]] = None) -> Dict[str, int]:
+        """Get the host ports of a branch, assigning the ones it does not have yet.
+
+        Args:
+            branch_name: Branch to assign ports to
+            existing: Ports the branch already uses (e.g. from its env.dockertree);
+                they are kept and recorded in the index
+            seed: Returns the assignments of existing worktrees; called to build
+                the index when it does not exist yet, or to rebuild it when a range
+                has no free port left (assignments of removed worktrees are dropped)
+
+        Returns:
+            Port variable -> port, 0 when a range has no free port left
+        """
+        with self._locked():
+            state = self._load()
+            if state is None:
+                state = _IndexState(seed() if seed else {}, {})
+                log_info(f"Built host port index with {len(state.branches)} worktree(s)")
+            changed = self._assign(state, branch_name, existing or {})
+            if 0 in state.branches.get(branch_name, {}).values() and seed is not None:
+                # Worktrees deleted outside dockertree keep their ports reserved until a rebuild
+                state = _IndexState(seed(), {})
+                self._assign(state, branch_name, existing or {})
+                changed = True
+            assigned = dict(state.branches.get(branch_name, {}))
+            # Unassigned ranges are not recorded, so they are retried on the next allocation
+            state.branches[branch_name] = {var: port for var, port in assigned.items() if port}
+            if not state.branches[branch_name]:
+                state.branches.pop(branch_name)
+            if changed:
+                self._save(state)
+        return {var: assigned.get(var, 0) for var in self.port_ranges}
+
+    def _assign(self, state: _IndexState, branch_name: str, existing: Dict[str, int]) -> bool:
+        changed = False
+        ports = state.branches.get(branch_name, {})
+        for var in self.port_ranges:
+            if ports.get(var):
+                continue
+            port = existing.get(var)
+            if port and state.owners.get((var, port), branch_name) == branch_name:
+                state.assign(branch_name, var, port)
+            else:
+                port = self._next_free_port(state, var)
+                state.branches.setdefault(branch_name, {})[var] = port
+                if port:
+                    state.assign(branch_name, var, port)
+            changed = True
+        return changed
+
+    def release(self, branch_name: str) -> Dict[str, int]:
+        """Free the host ports of a branch.
+
+        Returns:
+            The ports that were released
+        """
+        with self._locked():
+            state = self._load()
+            if state is None or branch_name not in state.branches:
+                return {}
+            ports = state.release(branch_name)
+            self._save(state)
+        return ports
+
+    def get(self, branch_name: str) -> Dict[str, int]:
+        """Get the host ports recorded for a branch."""
+        with self._locked():
+            state = self._load()
+        return dict(state.branches.get(branch_name, {})) if state else {}
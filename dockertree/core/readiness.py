@@ -0,0 +1,284 @@
+"""
+Readiness checks for dockertree CLI.
+
+Startup used to wait fixed delays (5 seconds after ``compose up``, a droplet
+polled every 5 seconds), which is too long for warm starts and says nothing
+about what is slow when a start takes longer. wait_until_ready polls probes
+with exponential backoff under one overall deadline and reports, for every
+service, whether it became ready and how long that took.
+
+A probe is a callable returning the state of the services it checks, as
+``{name: (state, detail)}`` with state READY, PENDING or FAILED. Provided probes:
+
+- compose_probe: containers of a compose project are running, and healthy
+  when they define a healthcheck (one container listing per poll)
+- tcp_probe: a TCP port accepts connections
+- http_probe: an HTTP endpoint answers without a server error or HTTPS redirect
+"""
+
+import re
+import socket
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..utils.docker_client import DockerClient, Filters, get_docker_client
+from ..utils.logging import log_info, log_warning
+
+READY = "ready"
+PENDING = "pending"
+FAILED = "failed"
+
+# First and longest delay between polls, in seconds
+READINESS_INITIAL_DELAY = 0.1
+READINESS_MAX_DELAY = 2.0
+
+ProbeStatus = Dict[str, Tuple[str, str]]
+Probe = Callable[[], ProbeStatus]
+
+# Gateway errors mean the upstream is not reachable yet; other server errors
+# come from the app itself and fail the probe once they persist
+GATEWAY_ERRORS = (502, 503, 504)
+HTTP_MAX_SERVER_ERRORS = 3
+
+# Worst state wins when several containers back one service
+_STATE_RANK = {READY: 0, PENDING: 1, FAILED: 2}
+
+
+@dataclass
+class ReadinessResult:
+    """Readiness of one service."""
+    name: str
+    state: str
+    seconds: float
+    detail: str = ""
+
+    @property
+    def ready(self) -> bool:
+        return self.state == READY
+
+
+@dataclass
+class ReadinessReport:
+    """Outcome of wait_until_ready."""
+    results: Dict[str, ReadinessResult]
+    seconds: float
+
+    @property
+    def ready(self) -> bool:
+        """True if every service is ready."""
+        return all(result.ready for result in self.results.values())
+
+    def not_ready(self) -> List[ReadinessResult]:
+        """Services that are still pending or failed."""
+        return [result for result in self.results.values() if not result.ready]
+
+    def describe(self) -> str:
+        """One-line summary of the services that are not ready."""
+        return ", ".join(f"{result.name}: {result.detail or result.state}" for result in self.not_ready())
+
+    def extend(self, other: "ReadinessReport") -> "ReadinessReport":
+        """Append the report of a later wait (its timings are offset by this report's)."""
+        results = dict(self.results)
+        for name, result in other.results.items():
+            results[name] = ReadinessResult(name, result.state, self.seconds + result.seconds, result.detail)
+        return ReadinessReport(results, self.seconds + other.seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Timings for JSON output."""
+        return {
+            "ready": self.ready,
+            "seconds": round(self.seconds, 2),
+            "services": {
+                name: {"state": result.state, "seconds": round(result.seconds, 2), "detail": result.detail}
+                for name, result in self.results.items()
+            },
+        }
+
+
+def wait_until_ready(probes: Iterable[Probe], timeout: float,
+                     initial_delay: float = READINESS_INITIAL_DELAY,
+                     max_delay: float = READINESS_MAX_DELAY,
+                     clock: Optional[Callable[[], float]] = None,
+                     sleep: Optional[Callable[[float], None]] = None) -> ReadinessReport:
+    """Poll probes until every service is ready or failed, or the deadline passes.
+
+    A service's result is final once it is ready or failed; probes whose
+    services are all final are not polled again.
+
+    Args:
+        probes: Probes to poll
+        timeout: Overall deadline in seconds
+        initial_delay: Delay after the first poll, doubled after every poll
+        max_delay: Longest delay between polls
+
+    Returns:
+        Readiness report with the time each service took
+    """
+    clock = clock or time.monotonic
+    sleep = sleep or time.sleep
+    probes = list(probes)
+    start = clock()
+    deadline = start + timeout
+    delay = initial_delay
+    results: Dict[str, ReadinessResult] = {}
+    probe_services: Dict[int, List[str]] = {}
+
+    while True:
+        for index, probe in enumerate(probes):
+            names = probe_services.get(index)
+            if names and all(results[name].state != PENDING for name in names):
+                continue
+            statuses = probe()
+            for name in names or []:
+                # e.g. the "no containers yet" placeholder once containers appear
+                if name not in statuses and results[name].state == PENDING:
+                    del results[name]
+            probe_services[index] = list(statuses)
+            elapsed = clock() - start
+            for name, (state, detail) in statuses.items():
+                previous = results.get(name)
+                if previous is not None and previous.state != PENDING:
+                    continue
+                results[name] = ReadinessResult(name, state, elapsed, detail)
+                if state == READY:
+                    log_info(f"{name} ready after {elapsed:.1f}s")
+                elif state == FAILED:
+                    log_warning(f"{name} failed after {elapsed:.1f}s: {detail}")
+
+        if all(result.state != PENDING for result in results.values()):
+            break
+        remaining = deadline - clock()
+        if remaining <= 0:
+            break
+        sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
+
+    return ReadinessReport(results, clock() - start)
+
+
+def _container_state(state: str, status: str, health: Optional[str]) -> Tuple[str, str]:
+    if health == "unhealthy":
+        return FAILED, "unhealthy"
+    if state == "running":
+        if health == "starting":
+            return PENDING, "health: starting"
+        return READY, health or "running"
+    if state == "exited":
+        match = re.search(r"Exited \((\d+)\)", status)
+        exit_code = int(match.group(1)) if match else None
+        # One-off jobs (migrations, asset builds) exit 0 when done
+        if exit_code == 0:
+            return READY, "exited (0)"
+        return FAILED, status or "exited"
+    if state in ("created", "restarting"):
+        return PENDING, state
+    return FAILED, state or status
+
+
+def compose_probe(compose_project_name: Optional[str] = None, filters: Optional[Filters] = None,
+                  client: Optional[DockerClient] = None) -> Probe:
+    """Probe the containers of a compose project, one service each.
+
+    Args:
+        compose_project_name: Compose project name (project-branch format)
+        filters: Container filters to use instead of the project label
+        client: Docker client (default: the shared client)
+    """
+    if filters is None:
+        filters = {"label": [f"com.docker.compose.project={compose_project_name}"]}
+    placeholder = compose_project_name or "containers"
+
+    def probe() -> ProbeStatus:
+        containers = (client or get_docker_client()).list_containers(all=True, filters=filters)
+        if containers is None:
+            return {placeholder: (FAILED, "could not list containers")}
+        if not containers:
+            return {placeholder: (PENDING, "no containers yet")}
+        statuses: ProbeStatus = {}
+        for container in containers:
+            service = container.labels.get("com.docker.compose.service") or container.name
+            state = _container_state(container.state, container.status, container.health)
+            if service not in statuses or _STATE_RANK[state[0]] > _STATE_RANK[statuses[service][0]]:
+                statuses[service] = state
+        return statuses
+
+    return probe
+
+
+def tcp_probe(name: str, host: str, port: int, connect_timeout: float = 2.0) -> Probe:
+    """Probe that a TCP port accepts connections."""
+    def probe() -> ProbeStatus:
+        try:
+            with socket.create_connection((host, port), timeout=connect_timeout):
+                return {name: (READY, f"{host}:{port} open")}
+        except OSError as e:
+            return {name: (PENDING, f"{host}:{port}: {e}")}
+
+    return probe
+
+
+class _ServerNameAdapter(HTTPAdapter):
+    """Transport adapter sending a fixed TLS server name (SNI) to every host."""
+
+    def __init__(self, server_hostname: str, **kwargs):
+        self.server_hostname = server_hostname
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["server_hostname"] = self.server_hostname
+        super().init_poolmanager(*args, **kwargs)
+
+
+def http_probe(name: str, url: str, headers: Optional[Dict[str, str]] = None,
+               request_timeout: float = 2.0, server_hostname: Optional[str] = None,
+               max_server_errors: int = HTTP_MAX_SERVER_ERRORS) -> Probe:
+    """Probe that an HTTP endpoint answers with a status below 500.
+
+    A redirect from plain HTTP to HTTPS is pending: the reverse proxy sends
+    it whether or not the app behind it is up. Gateway errors are pending
+    too; any other server error fails the probe once it has been returned
+    max_server_errors times in a row.
+
+    Args:
+        name: Service name to report
+        url: URL to request
+        headers: Request headers (e.g. the Host to route on)
+        request_timeout: Timeout of each request in seconds
+        server_hostname: TLS server name for https URLs whose host differs
+            from the routed host; the certificate is not verified
+        max_server_errors: Consecutive non-gateway server errors that fail the probe
+    """
+    session = requests.Session()
+    verify = True
+    if server_hostname:
+        session.mount("https://", _ServerNameAdapter(server_hostname))
+        verify = False
+    server_errors = 0
+
+    def probe() -> ProbeStatus:
+        nonlocal server_errors
+        try:
+            response = session.get(url, headers=headers, timeout=request_timeout,
+                                   allow_redirects=False, verify=verify)
+        except requests.exceptions.RequestException as e:
+            return {name: (PENDING, f"{url}: {e.__class__.__name__}")}
+        status = response.status_code
+        if status in GATEWAY_ERRORS:
+            server_errors = 0
+            return {name: (PENDING, f"HTTP {status}")}
+        if status >= 500:
+            server_errors += 1
+            if server_errors >= max_server_errors:
+                return {name: (FAILED, f"HTTP {status}")}
+            return {name: (PENDING, f"HTTP {status}")}
+        server_errors = 0
+        location = response.headers.get("Location") or ""
+        if 300 <= status < 400 and url.startswith("http://") and location.startswith("https://"):
+            return {name: (PENDING, f"HTTP {status} to {location}")}
+        return {name: (READY, f"HTTP {status}")}
+
+    return probe
@@ -7,15 +7,18 @@ with Python code that reuses existing dockertree modules.
 """
 
 import subprocess
-import time
 from pathlib import Path
 from typing import Dict, Optional
 
 from ..core.package_manager import PackageManager
 from ..core.docker_manager import DockerManager
+from ..core.readiness import compose_probe, http_probe, wait_until_ready
+from ..config.settings import READINESS_TIMEOUT
 from ..commands.caddy import CaddyManager
+from ..utils.caddy_config import CADDY_ADMIN_URL
 from ..utils.logging import log_info, log_success, log_warning, log_error
 from ..utils.validation import validate_git_repository
+from ..utils.volume_inventory import get_volume_inventory
 
 
 class ServerImportOrchestrator:
@@ -198,6 +201,9 @@ class ServerImportOrchestrator:
         volumes_missing = 0
         empty_volumes = 0
         need_restore = False
+        # Volumes were just restored; list them once for all checks below
+        inventory = get_volume_inventory()
+        inventory.invalidate()
         
         volume_types = ["postgres_data", "redis_data", "media_files"]
         
@@ -208,22 +214,11 @@ class ServerImportOrchestrator:
                 vol_name = f"{sanitize_project_name(project_root.name)}-{branch_name}_{vol_type}"
             
             # Check if volume exists
-            result = subprocess.run(
-                ["docker", "volume", "inspect", vol_name],
-                capture_output=True,
-                text=True,
-                check=False
-            )
+            volume = inventory.get(vol_name)
             
-            if result.returncode == 0:
+            if volume is not None:
                 # Check volume size
-                mountpoint_result = subprocess.run(
-                    ["docker", "volume", "inspect", vol_name, "--format", "{{.Mountpoint}}"],
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                mountpoint = mountpoint_result.stdout.strip()
+                mountpoint = volume.mountpoint
                 
                 size_result = subprocess.run(
                     ["du", "-sb", mountpoint],
@@ -247,14 +242,8 @@ class ServerImportOrchestrator:
                     volumes_found += 1
             else:
                 # Try to find by pattern
-                result = subprocess.run(
-                    ["docker", "volume", "ls", "--format", "{{.Name}}"],
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
                 found = False
-                for vol in result.stdout.strip().split('\n'):
+                for vol in inventory.names():
                     if vol.endswith(f"{branch_name}_{vol_type}"):
                         log_success(f"Volume found: {vol}")
                         volumes_found += 1
@@ -457,19 +446,10 @@ class ServerImportOrchestrator:
             
             # Fallback: reconstruct if not found in env.dockertree using self.project_root
             if not compose_project_name:
-                from ..config.settings import DOCKERTREE_DIR, sanitize_project_name
-                import yaml
+                from ..config.settings import load_project_config, sanitize_project_name
                 
                 # Get project name from self.project_root's config.yml
-                project_name = None
-                config_path = self.project_root / DOCKERTREE_DIR / "config.yml"
-                if config_path.exists():
-                    try:
-                        with open(config_path) as f:
-                            config = yaml.safe_load(f) or {}
-                            project_name = config.get("project_name")
-                    except Exception:
-                        pass
+                project_name = load_project_config(self.project_root).project_name
                 
                 # Fallback to project root directory name if config doesn't have project_name
                 if not project_name:
@@ -662,8 +642,10 @@ class ServerImportOrchestrator:
         if not self.caddy_manager.start_global_caddy():
             log_warning("Failed to start proxy, but continuing...")
         
-        # Give Caddy a moment to initialize
-        time.sleep(2)
+        # Wait for Caddy's admin API rather than a fixed delay
+        caddy_readiness = wait_until_ready([http_probe("caddy", f"{CADDY_ADMIN_URL}/config/")], READINESS_TIMEOUT)
+        if not caddy_readiness.ready:
+            log_warning(f"Caddy proxy not ready: {caddy_readiness.describe()}")
         
         # Verify and restore volumes if needed
         if not self._restore_volumes_if_needed(package_path, branch_name, project_root, is_standalone):
@@ -684,8 +666,12 @@ class ServerImportOrchestrator:
                     "error": "Failed to start services"
                 }
             
-            # Verify containers
-            time.sleep(5)  # Wait for containers to initialize
+            # Verify containers once they are running (and healthy) instead of after a fixed delay
+            readiness = wait_until_ready([compose_probe(filters={"name": [branch_name]})], READINESS_TIMEOUT)
+            if readiness.ready:
+                log_info(f"Containers ready after {readiness.seconds:.1f}s")
+            else:
+                log_warning(f"Containers not ready after {readiness.seconds:.0f}s: {readiness.describe()}")
             container_status = self._verify_containers(branch_name)
             
             log_info(f"Container status: {container_status['running']} running out of {container_status['total']} total")
@@ -716,6 +702,7 @@ class ServerImportOrchestrator:
             "success": True,
             "project_root": str(project_root),
             "is_standalone": is_standalone,
-            "containers": container_status if start else None
+            "containers": container_status if start else None,
+            "readiness": caddy_readiness.extend(readiness).to_dict() if start else caddy_readiness.to_dict()
         }
 
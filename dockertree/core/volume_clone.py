@@ -0,0 +1,227 @@
+"""
+Volume clone backends for dockertree CLI.
+
+This module provides fast, copy-on-write cloning of Docker volumes. When the
+Docker data root lives on a filesystem that supports reflinks (btrfs, XFS with
+reflink=1, ZFS with block cloning, bcachefs) and is accessible from the host,
+volume data can be cloned in near-constant time with ``cp --reflink=always``.
+Disk usage then only grows by what each worktree changes.
+
+Backends only provide the fast path. DockerManager falls back to its regular
+file-level copy whenever a backend is unavailable or a clone fails.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Type
+
+from ..config.settings import _get_config_value
+from ..utils.logging import log_info, log_success, log_warning, format_elapsed_time
+
+# Filesystems where `cp --reflink=always` can share extents between files
+REFLINK_FILESYSTEMS = {"btrfs", "xfs", "zfs", "bcachefs"}
+
+# Locations checked for the Docker data root, in order of preference
+DOCKER_DAEMON_CONFIG = Path("/etc/docker/daemon.json")
+DEFAULT_DOCKER_DATA_ROOTS = [
+    Path("/var/lib/docker"),
+    Path.home() / ".local" / "share" / "docker",  # rootless Docker
+]
+
+
+def get_docker_data_root() -> Optional[Path]:
+    """Find the Docker data root directory on this host.
+
+    Resolution order: DOCKERTREE_DOCKER_ROOT environment variable, ``data-root``
+    from /etc/docker/daemon.json, then the default rootful and rootless locations.
+    Only directories that contain a ``volumes`` subdirectory are returned.
+
+    Returns:
+        Path to the Docker data root, or None if it cannot be found
+    """
+    candidates = []
+    env_root = os.environ.get("DOCKERTREE_DOCKER_ROOT")
+    if env_root:
+        candidates.append(Path(env_root))
+
+    try:
+        if DOCKER_DAEMON_CONFIG.exists():
+            daemon_config = json.loads(DOCKER_DAEMON_CONFIG.read_text())
+            data_root = daemon_config.get("data-root") or daemon_config.get("graph")
+            if data_root:
+                candidates.append(Path(data_root))
+    except (OSError, ValueError):
+        pass
+
+    candidates.extend(DEFAULT_DOCKER_DATA_ROOTS)
+
+    for candidate in candidates:
+        try:
+            if (candidate / "volumes").is_dir():
+                return candidate
+        except OSError:
+            continue
+    return None
+
+
+def get_filesystem_type(path: Path, mounts_file: Path = Path("/proc/mounts")) -> Optional[str]:
+    """Get the filesystem type backing a path.
+
+    Uses the longest matching mount point from /proc/mounts.
+
+    Args:
+        path: Path to inspect
+        mounts_file: Mount table to read (overridable for tests)
+
+    Returns:
+        Filesystem type (e.g. "btrfs", "ext4"), or None if it cannot be determined
+    """
+    try:
+        target = str(Path(path).resolve())
+        best_match = ""
+        fs_type = None
+        with open(mounts_file) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) < 3:
+                    continue
+                # Mount points escape spaces as \040
+                mount_point = parts[1].replace("\\040", " ")
+                prefix = mount_point.rstrip("/") + "/"
+                if (target == mount_point or target.startswith(prefix) or mount_point == "/") \
+                        and len(mount_point) >= len(best_match):
+                    best_match = mount_point
+                    fs_type = parts[2]
+        return fs_type
+    except OSError:
+        return None
+
+
+class VolumeCloneBackend:
+    """Base class for volume clone backends."""
+
+    name = "base"
+
+    def is_available(self) -> bool:
+        """Check whether this backend can be used on the current host."""
+        return False
+
+    def clone(self, source_volume: str, target_volume: str) -> bool:
+        """Clone the contents of source_volume into target_volume.
+
+        Both volumes must already exist. Returning False tells the caller to
+        fall back to a regular copy.
+        """
+        return False
+
+
+class ReflinkCloneBackend(VolumeCloneBackend):
+    """Clone volumes with `cp --reflink=always` directly on the Docker data root."""
+
+    name = "reflink"
+
+    def __init__(self, data_root: Optional[Path] = None):
+        self.data_root = data_root if data_root is not None else get_docker_data_root()
+        self._available: Optional[bool] = None
+        self._lock = threading.Lock()
+
+    @property
+    def volumes_dir(self) -> Optional[Path]:
+        return self.data_root / "volumes" if self.data_root else None
+
+    def is_available(self) -> bool:
+        """Check for a Linux host with a writable, reflink-capable Docker data root."""
+        with self._lock:
+            if self._available is None:
+                self._available = self._detect()
+            return self._available
+
+    def _detect(self) -> bool:
+        if not sys.platform.startswith("linux") or self.volumes_dir is None:
+            return False
+        if not os.access(self.volumes_dir, os.R_OK | os.W_OK | os.X_OK):
+            log_info(f"Docker volumes directory {self.volumes_dir} is not accessible, reflink cloning disabled")
+            return False
+        fs_type = get_filesystem_type(self.volumes_dir)
+        if fs_type not in REFLINK_FILESYSTEMS:
+            log_info(f"Docker data root is on {fs_type or 'an unknown filesystem'}, reflink cloning disabled")
+            return False
+        log_info(f"Docker data root is on {fs_type}, using reflink volume cloning")
+        return True
+
+    def _mountpoint(self, volume_name: str) -> Path:
+        return self.volumes_dir / volume_name / "_data"
+
+    def clone(self, source_volume: str, target_volume: str) -> bool:
+        if not self.is_available():
+            return False
+
+        source_path = self._mountpoint(source_volume)
+        target_path = self._mountpoint(target_volume)
+        if not source_path.is_dir() or not target_path.is_dir():
+            # Volume uses a non-local driver or a custom mountpoint
+            return False
+
+        start_time = time.monotonic()
+        result = subprocess.run(
+            ["cp", "-a", "--reflink=always", f"{source_path}/.", f"{target_path}/"],
+            capture_output=True,
+            text=True,
+            check=False
+        )
+        if result.returncode != 0:
+            log_warning(f"Reflink clone of {source_volume} failed, falling back to copy: {result.stderr.strip()}")
+            if "not supported" in result.stderr.lower():
+                # Filesystem lacks reflink support (e.g. XFS without reflink=1); stop trying
+                with self._lock:
+                    self._available = False
+            return False
+
+        log_success(
+            f"Volume cloned (reflink): {source_volume} -> {target_volume} "
+            f"in {format_elapsed_time(time.monotonic() - start_time)}"
+        )
+        return True
+
+
+# Registered clone backends, selectable with `volume_clone_backend` in .dockertree/config.yml
+CLONE_BACKENDS: Dict[str, Type[VolumeCloneBackend]] = {
+    ReflinkCloneBackend.name: ReflinkCloneBackend,
+}
+
+
+def select_clone_backend(preference: Optional[str] = None) -> Optional[VolumeCloneBackend]:
+    """Select the clone backend to use for volume copies.
+
+    Args:
+        preference: Backend name, "auto" or "copy". If None, reads
+            `volume_clone_backend` from .dockertree/config.yml (default "auto").
+
+    Returns:
+        An available backend, or None to use the regular file-level copy
+    """
+    if preference is None:
+        preference = _get_config_value(["volume_clone_backend"], "auto")
+    preference = (preference or "auto").lower()
+
+    if preference == "copy":
+        return None
+
+    if preference == "auto":
+        candidates = list(CLONE_BACKENDS.values())
+    elif preference in CLONE_BACKENDS:
+        candidates = [CLONE_BACKENDS[preference]]
+    else:
+        log_warning(f"Unknown volume clone backend '{preference}', using file-level copy")
+        return None
+
+    for backend_cls in candidates:
+        backend = backend_cls()
+        if backend.is_available():
+            return backend
+    return None
@@ -0,0 +1,267 @@
+"""
+Volume helper container for dockertree CLI.
+
+Volume data is read, written and inspected from a container with the volume
+mounted. Starting a fresh ``docker run --rm alpine`` container for every step
+(each copy, each tar stream, each size and PostgreSQL check) costs a few hundred
+milliseconds per step, which adds up for commands that touch several volumes.
+A VolumeHelper is one long-lived container for a batch of steps instead: it
+mounts every volume the batch needs under VOLUME_MOUNT_ROOT and each step runs
+in it with ``docker exec``.
+
+Steps are built with volume_command(), which runs them in the helper when it
+mounts their volumes and in a one-off container of the same pinned image
+otherwise. Volumes are mounted at the same paths either way, so the commands
+of a step do not depend on where it runs.
+
+A helper is removed when its batch ends. Helpers of commands that were killed
+keep their volumes mounted (``docker volume rm`` then fails with "volume is in
+use"), so every helper records the host and PID of its owner and
+remove_orphaned_helpers() removes the helpers whose owner is gone.
+"""
+
+import os
+import socket
+import subprocess
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from ..config.settings import VOLUME_HELPER_IMAGE
+from ..utils.docker_client import get_docker_client
+from ..utils.logging import log_info, log_warning
+from ..utils.volume_inventory import invalidate_volume_inventory
+
+# Volumes are mounted at VOLUME_MOUNT_ROOT/<volume name>
+VOLUME_MOUNT_ROOT = "/volumes"
+
+# Label set on helper containers, so leftovers of killed commands can be found
+HELPER_LABEL = "dockertree.volume-helper"
+
+# Label recording the "<host>:<pid>" of the process that started a helper
+HELPER_OWNER_LABEL = "dockertree.volume-helper.owner"
+
+# Seconds a helper container lives at most, in case the command that started it is killed
+HELPER_MAX_LIFETIME = 24 * 60 * 60
+
+# Volume name -> whether the steps only read it
+VolumeMounts = Dict[str, bool]
+
+_available_images = set()
+_image_lock = threading.Lock()
+
+_orphans_checked = False
+_orphans_lock = threading.Lock()
+
+
+def get_helper_image() -> str:
+    """Get the image helper containers run (DOCKERTREE_VOLUME_HELPER_IMAGE or VOLUME_HELPER_IMAGE)."""
+    return os.environ.get("DOCKERTREE_VOLUME_HELPER_IMAGE") or VOLUME_HELPER_IMAGE
+
+
+def volume_path(volume_name: str) -> str:
+    """Get the path a volume is mounted at in helper containers."""
+    return f"{VOLUME_MOUNT_ROOT}/{volume_name}"
+
+
+def _mount_options(volumes: VolumeMounts) -> List[str]:
+    options = []
+    for volume_name, read_only in volumes.items():
+        options += ["-v", f"{volume_name}:{volume_path(volume_name)}" + (":ro" if read_only else "")]
+    return options
+
+
+def _helper_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _owner_alive(owner: Optional[str]) -> bool:
+    """Check whether the process that started a helper may still be running.
+
+    Helpers started on another host are assumed alive; HELPER_MAX_LIFETIME
+    bounds them.
+    """
+    host, _, pid = (owner or "").rpartition(":")
+    if not host or not pid.isdigit():
+        return False
+    if host != socket.gethostname():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # e.g. EPERM: the process exists but belongs to another user
+        return True
+    return True
+
+
+def remove_orphaned_helpers() -> int:
+    """Remove helper containers whose owner process is no longer running.
+
+    Returns:
+        Number of helper containers removed
+    """
+    containers = get_docker_client().list_containers(all=True, filters={"label": [HELPER_LABEL]})
+    removed = 0
+    for container in containers or []:
+        if _owner_alive(container.labels.get(HELPER_OWNER_LABEL)):
+            continue
+        try:
+            result = subprocess.run(["docker", "rm", "-f", container.name],
+                                    capture_output=True, text=True, check=False, timeout=30)
+        except (OSError, subprocess.SubprocessError) as e:
+            log_warning(f"Could not remove orphaned volume helper container {container.name}: {e}")
+            continue
+        if result.returncode != 0:
+            log_warning(f"Could not remove orphaned volume helper container {container.name}: "
+                        f"{result.stderr.strip()}")
+            continue
+        log_info(f"Removed orphaned volume helper container {container.name}")
+        removed += 1
+    return removed
+
+
+def _remove_orphaned_helpers_once() -> None:
+    global _orphans_checked
+    with _orphans_lock:
+        if _orphans_checked:
+            return
+        _orphans_checked = True
+    remove_orphaned_helpers()
+
+
+def ensure_helper_image(image: Optional[str] = None) -> bool:
+    """Make sure the helper image is available locally, pulling it if it is not.
+
+    The check runs once per image and process.
+
+    Returns:
+        True if the image is available
+    """
+    image = image or get_helper_image()
+    with _image_lock:
+        if image in _available_images:
+            return True
+        try:
+            inspect = subprocess.run(["docker", "image", "inspect", image],
+                                     capture_output=True, check=False, timeout=30)
+            if inspect.returncode != 0:
+                log_info(f"Pulling volume helper image {image}...")
+                pull = subprocess.run(["docker", "pull", image],
+                                      capture_output=True, text=True, check=False, timeout=600)
+                if pull.returncode != 0:
+                    log_warning(f"Could not pull volume helper image {image}: {pull.stderr.strip()}")
+                    return False
+        except Exception as e:
+            log_warning(f"Could not check volume helper image {image}: {e}")
+            return False
+        _available_images.add(image)
+        return True
+
+
+class VolumeHelper:
+    """Long-lived container that runs volume steps through ``docker exec``."""
+
+    def __init__(self, volumes: VolumeMounts, image: Optional[str] = None):
+        """Initialize volume helper.
+
+        Args:
+            volumes: Volumes to mount; volumes that do not exist are created
+            image: Image to run (defaults to get_helper_image())
+        """
+        self.volumes = dict(volumes)
+        self.image = image or get_helper_image()
+        self.container_name = f"dockertree-volumes-{uuid.uuid4().hex[:12]}"
+        self.running = False
+
+    def start(self) -> bool:
+        """Start the helper container.
+
+        Returns:
+            True if it is running
+        """
+        if not ensure_helper_image(self.image):
+            return False
+        command = [
+            "docker", "run", "-d", "--rm",
+            "--name", self.container_name,
+            "--label", f"{HELPER_LABEL}=1",
+            "--label", f"{HELPER_OWNER_LABEL}={_helper_owner()}",
+        ] + _mount_options(self.volumes) + [self.image, "sleep", str(HELPER_MAX_LIFETIME)]
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, check=False, timeout=60)
+        except Exception as e:
+            log_warning(f"Could not start volume helper container: {e}")
+            return False
+        finally:
+            # Mounting creates volumes that did not exist
+            invalidate_volume_inventory()
+        if result.returncode != 0:
+            log_warning(f"Could not start volume helper container: {result.stderr.strip()}")
+            return False
+        self.running = True
+        return True
+
+    def stop(self) -> None:
+        """Remove the helper container, killing steps still running in it."""
+        if not self.running:
+            return
+        self.running = False
+        try:
+            subprocess.run(["docker", "rm", "-f", self.container_name],
+                           capture_output=True, check=False, timeout=30)
+        except (OSError, subprocess.SubprocessError) as e:
+            log_warning(f"Could not remove volume helper container {self.container_name}: {e}")
+
+    def mounts(self, volume_name: str, writable: bool = False) -> bool:
+        """Check whether the running helper mounts a volume (writable, if required)."""
+        return self.running and volume_name in self.volumes and not (writable and self.volumes[volume_name])
+
+    def exec_command(self, args: List[str], interactive: bool = False) -> List[str]:
+        """Build the command running args in the helper container."""
+        return ["docker", "exec"] + (["-i"] if interactive else []) + [self.container_name] + list(args)
+
+
+def volume_command(args: List[str], volumes: VolumeMounts, helper: Optional[VolumeHelper] = None,
+                   interactive: bool = False) -> List[str]:
+    """Build the command running a volume step.
+
+    Args:
+        args: Command to run; volumes are mounted at volume_path()
+        volumes: Volumes the step uses
+        helper: Helper container of the current batch, if any
+        interactive: Keep stdin open, for steps reading a stream
+
+    Returns:
+        ``docker exec`` into the helper if it mounts every volume the way the
+        step needs it, ``docker run --rm`` of the helper image otherwise
+    """
+    if helper is not None and all(helper.mounts(name, writable=not read_only) for name, read_only in volumes.items()):
+        return helper.exec_command(args, interactive)
+    return (["docker", "run", "--rm"] + (["-i"] if interactive else []) + _mount_options(volumes)
+            + [get_helper_image()] + list(args))
+
+
+@contextmanager
+def open_volume_helper(volumes: VolumeMounts) -> Iterator[Optional[VolumeHelper]]:
+    """Run a helper container for the duration of a batch of volume steps.
+
+    Helpers left behind by killed commands are removed before the first
+    helper of the process starts.
+
+    Yields:
+        The running helper, or None if it could not be started (steps then run
+        in their own containers)
+    """
+    _remove_orphaned_helpers_once()
+    helper = VolumeHelper(volumes)
+    if not helper.start():
+        yield None
+        return
+    log_info(f"Started volume helper container {helper.container_name} for {len(volumes)} volume(s)")
+    try:
+        yield helper
+    finally:
+        helper.stop()
@@ -0,0 +1,226 @@
+"""
+Volume size accounting for dockertree CLI.
+
+Sizing a volume used to mean starting an ``alpine du -sh`` container for it,
+one after another, which takes minutes with hundreds of worktree volumes.
+Sizes now come from one of two cheap sources:
+
+- the volume's mountpoint, walked directly (in parallel) when dockertree can
+  read the Docker data root, e.g. when running as root on the Docker host;
+- the daemon's own usage data (``GET /system/df``), one request for all
+  volumes, for everything else.
+
+Results are cached in memory and in ``~/.cache/dockertree/volume_sizes.json``
+for VOLUME_SIZE_CACHE_TTL seconds, so repeated size queries within a command
+or across quick successive commands do not recompute them.
+"""
+
+import json
+import os
+import stat
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from ..utils.docker_client import DockerClient, get_docker_client
+from ..utils.logging import log_info
+from ..utils.volume_inventory import VolumeInventory, get_volume_inventory
+
+# Seconds a computed volume size is reused for
+VOLUME_SIZE_CACHE_TTL = 60
+
+# Upper bound on volume directories walked at once
+VOLUME_SIZE_MAX_WORKERS = 8
+
+CACHE_FILE_NAME = "volume_sizes.json"
+
+
+def get_cache_path() -> Path:
+    """Get the file volume sizes are cached in (per user, shared by projects)."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home) / "dockertree" / CACHE_FILE_NAME
+
+
+def _docker_host() -> str:
+    # Sizes cached for one daemon are not valid for another
+    return os.environ.get("DOCKER_HOST") or os.environ.get("DOCKER_CONTEXT") or "default"
+
+
+def measure_directory(path: Path) -> Optional[int]:
+    """Get the disk usage of a directory tree, like ``du -s``.
+
+    Counts allocated blocks (so sparse files count for what they use) and
+    hard-linked files once.
+
+    Returns:
+        Size in bytes, or None if the directory cannot be read
+    """
+    total = 0
+    seen: Set[Tuple[int, int]] = set()
+    stack = [str(path)]
+    try:
+        root_stat = os.lstat(path)
+    except OSError:
+        return None
+    total += root_stat.st_blocks * 512
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            if directory == str(path):
+                return None
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    entry_stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if entry_stat.st_nlink > 1 and not stat.S_ISDIR(entry_stat.st_mode):
+                    key = (entry_stat.st_dev, entry_stat.st_ino)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                total += entry_stat.st_blocks * 512
+                if stat.S_ISDIR(entry_stat.st_mode):
+                    stack.append(entry.path)
+    return total
+
+
+class VolumeSizeEngine:
+    """Computes and caches volume sizes."""
+
+    def __init__(self, client: Optional[DockerClient] = None, inventory: Optional[VolumeInventory] = None,
+                 ttl: float = VOLUME_SIZE_CACHE_TTL, cache_path: Optional[Path] = None):
+        """Initialize volume size engine.
+
+        Args:
+            client: Docker client (default: the shared client)
+            inventory: Volume inventory for mountpoints (default: the shared inventory)
+            ttl: Seconds a computed size stays valid
+            cache_path: Cache file (default: get_cache_path())
+        """
+        self._client = client
+        self._inventory = inventory
+        self.ttl = ttl
+        self._cache_path = cache_path
+        self._lock = threading.Lock()
+        # volume name -> (measured at, size in bytes or None if unknown)
+        self._sizes: Dict[str, Tuple[float, Optional[int]]] = {}
+        self._loaded = False
+
+    @property
+    def cache_path(self) -> Path:
+        return self._cache_path or get_cache_path()
+
+    def _load_cache(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.cache_path, "r") as f:
+                cache = json.load(f)
+            if cache.get("docker_host") == _docker_host():
+                for name, (measured_at, size) in (cache.get("sizes") or {}).items():
+                    self._sizes.setdefault(name, (float(measured_at), None if size is None else int(size)))
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass
+
+    def _save_cache(self) -> None:
+        now = time.time()
+        cache = {
+            "docker_host": _docker_host(),
+            "sizes": {name: list(entry) for name, entry in self._sizes.items() if now - entry[0] < self.ttl}
+        }
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=self.cache_path.parent, prefix=".tmp-")
+            with os.fdopen(fd, "w") as f:
+                json.dump(cache, f)
+            os.replace(temp_name, self.cache_path)
+        except OSError:
+            # The cache is only an optimization
+            pass
+
+    def _readable_mountpoints(self, volume_names: Iterable[str]) -> Dict[str, Path]:
+        inventory = self._inventory or get_volume_inventory()
+        mountpoints = {}
+        for name in volume_names:
+            volume = inventory.get(name)
+            if volume is None or not volume.mountpoint:
+                continue
+            mountpoint = Path(volume.mountpoint)
+            if os.access(mountpoint, os.R_OK | os.X_OK):
+                mountpoints[name] = mountpoint
+        return mountpoints
+
+    def _measure(self, volume_names: Set[str]) -> Dict[str, int]:
+        sizes = {}
+        mountpoints = self._readable_mountpoints(volume_names)
+        if mountpoints:
+            workers = max(1, min(VOLUME_SIZE_MAX_WORKERS, len(mountpoints)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="volume-size") as executor:
+                measured = executor.map(measure_directory, mountpoints.values())
+                for name, size in zip(mountpoints, measured):
+                    if size is not None:
+                        sizes[name] = size
+        remaining = volume_names - set(sizes)
+        if remaining:
+            # One request sizes every volume, so ask for all the remaining ones at once
+            usage = (self._client or get_docker_client()).volume_usage()
+            if usage is None:
+                log_info("Docker did not report volume usage; sizes are unknown")
+            else:
+                sizes.update({name: usage[name] for name in remaining if name in usage})
+        return sizes
+
+    def get_sizes(self, volume_names: Iterable[str], refresh: bool = False) -> Dict[str, Optional[int]]:
+        """Get the size of volumes.
+
+        Args:
+            volume_names: Volumes to size
+            refresh: Ignore cached sizes
+
+        Returns:
+            Dictionary of volume name to size in bytes (None if unknown)
+        """
+        volume_names = list(volume_names)
+        with self._lock:
+            self._load_cache()
+            now = time.time()
+            stale = {
+                name for name in volume_names
+                if refresh or name not in self._sizes or now - self._sizes[name][0] >= self.ttl
+            }
+            if stale:
+                measured = self._measure(stale)
+                measured_at = time.time()
+                for name in stale:
+                    # Unknown sizes are cached too, so they are not re-queried on every call
+                    self._sizes[name] = (measured_at, measured.get(name))
+                self._save_cache()
+            return {name: self._sizes[name][1] for name in volume_names}
+
+    def clear(self) -> None:
+        """Forget sizes cached in memory (the cache file is left alone)."""
+        with self._lock:
+            self._sizes = {}
+            self._loaded = False
+
+
+_engine: Optional[VolumeSizeEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_volume_size_engine() -> VolumeSizeEngine:
+    """Get the volume size engine shared by all of dockertree."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = VolumeSizeEngine()
+    return _engine
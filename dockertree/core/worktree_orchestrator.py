@@ -8,21 +8,25 @@ formatting or presentation concerns.
 
 import os
 import shutil
-import subprocess
-import sys
+import threading
 import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from ..config.settings import get_project_root, get_script_dir, get_project_name, sanitize_project_name
+from ..config.settings import (
+    get_project_root, get_script_dir, get_project_name, sanitize_project_name, READINESS_TIMEOUT
+)
 from ..core.docker_manager import DockerManager
 from ..core.git_manager import GitManager
 from ..core.environment_manager import EnvironmentManager
+from ..core.readiness import http_probe, wait_until_ready
 from ..utils.path_utils import (
     get_compose_override_path, 
     get_worktree_branch_name,
     ensure_main_repo
 )
+from ..utils.caddy_config import configure_caddy_routes
+from ..scripts.caddy_routes import is_domain
 from ..utils.validation import validate_branch_exists, validate_worktree_name_not_reserved
 from ..utils.pattern_matcher import get_matching_branches
 from ..utils.confirmation import confirm_batch_operation
@@ -58,6 +62,8 @@ class WorktreeOrchestrator:
         self.git_manager = GitManager(project_root=self.project_root, validate=False)
         self.docker_manager = DockerManager(project_root=self.project_root)
         self.env_manager = EnvironmentManager(project_root=self.project_root)
+        # Serializes git metadata changes when worktrees are removed concurrently
+        self._git_lock = threading.RLock()
     
     def _get_project_name(self) -> str:
         """Get project name from config using instance project_root.
@@ -65,18 +71,10 @@ class WorktreeOrchestrator:
         Ensures we use the correct project_root context from the orchestrator instance.
         """
         # If we have a project_root with config, use it directly
-        from ..config.settings import DOCKERTREE_DIR
-        config_path = self.project_root / DOCKERTREE_DIR / "config.yml"
-        if config_path.exists():
-            try:
-                import yaml
-                with open(config_path) as f:
-                    config = yaml.safe_load(f) or {}
-                    project_name = config.get("project_name")
-                    if project_name:
-                        return project_name
-            except Exception:
-                pass
+        from ..config.settings import load_project_config
+        project_name = load_project_config(self.project_root).project_name
+        if project_name:
+            return project_name
         
         # Fallback to project root directory name (sanitized)
         from ..config.settings import sanitize_project_name
@@ -397,15 +395,28 @@ class WorktreeOrchestrator:
                 "error": "Failed to start worktree environment"
             }
         
-        # Give containers time to initialize before configuring Caddy
-        time.sleep(5)
-
-        # Configure Caddy routes for dynamic routing
-        caddy_success = self._configure_caddy_routes()
+        # Configure Caddy once the containers are up rather than after a fixed delay
+        started_at = time.monotonic()
+        readiness = self.docker_manager.wait_for_containers_ready(compose_project_name)
+        caddy_success = configure_caddy_routes()
 
         # Get the correct domain name with project prefix
         domain_name = self.env_manager.get_domain_name(resolved_branch_name)
         
+        if caddy_success and readiness.ready:
+            # The app is reachable once Caddy stops answering 502 for its domain.
+            # Caddy redirects plain HTTP to HTTPS for public domains, so those
+            # are probed on the HTTPS listener.
+            remaining = max(0.0, READINESS_TIMEOUT - (time.monotonic() - started_at))
+            if is_domain(domain_name):
+                app_probe = http_probe(domain_name, "https://localhost/", headers={"Host": domain_name},
+                                       server_hostname=domain_name)
+            else:
+                app_probe = http_probe(domain_name, "http://localhost/", headers={"Host": domain_name})
+            readiness = readiness.extend(wait_until_ready([app_probe], remaining))
+        if not readiness.ready:
+            log_warning(f"Not ready after {readiness.seconds:.0f}s: {readiness.describe()}")
+        
         return {
             "success": True,
             "data": {
@@ -413,29 +424,11 @@ class WorktreeOrchestrator:
                 "worktree_path": str(worktree_path),
                 "compose_project_name": compose_project_name,
                 "domain_name": domain_name,
-                "caddy_configured": caddy_success
+                "caddy_configured": caddy_success,
+                "readiness": readiness.to_dict()
             }
         }
     
-    def _configure_caddy_routes(self) -> bool:
-        """Configure Caddy routes for dynamic routing."""
-        try:
-            # Get the path to the dynamic config script
-            script_path = get_script_dir() / "scripts" / "caddy-dynamic-config.py"
-
-            if not script_path.exists():
-                return False
-            
-            # Run the dynamic configuration script using current Python interpreter
-            result = subprocess.run([
-                sys.executable, str(script_path)
-            ], capture_output=True, text=True, check=False)
-
-            return result.returncode == 0 or "Using container label-based routing" in result.stdout
-
-        except Exception:
-            return False
-    
     def stop_worktree(self, branch_name: str, remove_images: bool = False) -> Dict[str, Any]:
         """Stop worktree environment."""
         # Validate worktree exists (allow stopping even if not found for cleanup)
@@ -509,14 +502,11 @@ class WorktreeOrchestrator:
     def _check_volumes_exist(self, branch_name: str) -> List[str]:
         """Check which volumes exist for this exact branch name."""
         from ..config.settings import get_volume_names
-        from ..utils.validation import validate_volume_exists
+        from ..utils.validation import get_existing_volumes
         
         volume_names = get_volume_names(branch_name)
-        existing = []
-        for volume_type, volume_name in volume_names.items():
-            if validate_volume_exists(volume_name):
-                existing.append(volume_name)
-        return existing
+        found = get_existing_volumes(volume_names.values())
+        return [volume_name for volume_name in volume_names.values() if volume_name in found]
     
     def remove_worktree(self, branch_name: str, force: bool = False, delete_branch: bool = True) -> Dict[str, Any]:
         """Remove worktree completely with exact match validation."""
@@ -559,7 +549,8 @@ class WorktreeOrchestrator:
             # Check if branch exists to determine appropriate action
             if branch_exists:
                 if delete_branch:
-                    branch_deleted = self.git_manager.delete_branch_safely(branch_name, force)
+                    with self._git_lock:
+                        branch_deleted = self.git_manager.delete_branch_safely(branch_name, force)
                     if branch_deleted:
                         return {
                             "success": True,
@@ -595,11 +586,14 @@ class WorktreeOrchestrator:
         
         # Remove worktree
         if worktree_path:
-            if not self.git_manager.remove_worktree(worktree_path, force=True):
+            with self._git_lock:
+                worktree_removed = self.git_manager.remove_worktree(worktree_path, force=True)
+            if not worktree_removed:
                 return {
                     "success": False,
                     "error": f"Failed to remove worktree for {branch_name}"
                 }
+            self.env_manager.release_host_ports(branch_name)
         else:
             return {
                 "success": False,
@@ -609,7 +603,8 @@ class WorktreeOrchestrator:
         # Delete the git branch if requested
         branch_deleted = False
         if delete_branch:
-            branch_deleted = self.git_manager.delete_branch_safely(branch_name, force)
+            with self._git_lock:
+                branch_deleted = self.git_manager.delete_branch_safely(branch_name, force)
         
         return {
             "success": True,
@@ -4,20 +4,51 @@ Caddy Docker Monitor Script
 
 This script monitors Docker containers with caddy.proxy labels and dynamically
 updates Caddy configuration via the admin API.
+
+Route changes are driven by the Docker events stream: container start, stop,
+die, destroy and rename events wake the monitor, which waits for the burst of
+events to settle (a compose project starts several containers at once) and
+then reconfigures Caddy once. A slow periodic reconcile re-lists containers,
+checks for configuration drift and certificate problems as a safety net. While
+the events stream is unavailable the monitor falls back to polling.
 """
 
 import json
+import threading
 import time
 import requests
 import docker
 import logging
 import re
-from typing import Dict, List, Optional, Any
+from typing import Dict, FrozenSet, List, Optional, Any, Tuple
+
+# Mounted next to this script (see docker-compose.global-caddy.yml)
+from caddy_routes import (RouteBuilder, apply_route_config, build_caddy_config, build_route_table,
+                          find_route_mismatches, get_routes, is_domain)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Container events that can add, remove or change a route
+ROUTE_EVENTS = ["start", "stop", "die", "kill", "destroy", "rename", "pause", "unpause"]
+
+# Wait this long without further events before reconfiguring, coalescing bursts
+EVENT_DEBOUNCE_SECONDS = 0.1
+
+# Never delay a reconfiguration by more than this while events keep arriving
+EVENT_MAX_DELAY_SECONDS = 1.0
+
+# Safety-net reconcile: re-list containers, detect drift, check certificates
+RECONCILE_INTERVAL_SECONDS = 300
+
+# Container polling interval while the events stream is unavailable
+POLL_INTERVAL_SECONDS = 5
+
+# Delay before reconnecting to a broken events stream (doubles up to the maximum)
+EVENTS_RETRY_SECONDS = 1
+EVENTS_RETRY_MAX_SECONDS = 30
+
 class CaddyDockerMonitor:
     """Monitor Docker containers and update Caddy configuration."""
     
@@ -25,6 +56,14 @@ class CaddyDockerMonitor:
         """Initialize the monitor."""
         self.caddy_admin_url = caddy_admin_url
         self.known_containers = set()
+        # Set by the events watcher when containers changed
+        self._changed = threading.Event()
+        self._events_connected = threading.Event()
+        self._stop = threading.Event()
+        # Routes are rebuilt only when container labels change
+        self.route_builder = RouteBuilder(
+            health_check=lambda entry: {"active": {"path": entry.health_check}}
+        )
         try:
             self.docker_client = docker.DockerClient(base_url='unix://var/run/docker.sock')
         except Exception as e:
@@ -73,282 +112,65 @@ class CaddyDockerMonitor:
         return None
     
     def update_caddy_config(self, config: Dict) -> bool:
-        """Update Caddy configuration."""
-        try:
-            response = requests.post(
-                f"{self.caddy_admin_url}/load",
-                json=config,
-                timeout=10
-            )
-            if response.status_code != 200:
-                logger.error(f"Failed to update Caddy config: {response.status_code} - {response.text}")
-                return False
-            return True
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to update Caddy config: {e}")
-            return False
+        """Update Caddy configuration, sending only the routes that changed."""
+        success, error = apply_route_config(self.caddy_admin_url, config, logger=logger)
+        if not success:
+            logger.error(f"Failed to update Caddy config: {error}")
+        return success
     
     def _is_domain(self, host: str) -> bool:
         """Check if a host string is a domain (not localhost or IP)."""
-        if not host or not isinstance(host, str):
-            return False
-        
-        # IP address patterns
-        import re
-        ipv4_pattern = r'^(\d{1,3}\.){3}\d{1,3}$'
-        ipv6_pattern = r'^([0-9a-fA-F]{0,4}:){2,7}[0-9a-fA-F]{0,4}$'
-        
-        if re.match(ipv4_pattern, host) or re.match(ipv6_pattern, host):
-            return False
-        
-        # localhost variants
-        if host in ['localhost', '127.0.0.1', '::1'] or host.endswith('.localhost'):
-            return False
-        
-        # Domain: contains dots and valid domain characters
-        return '.' in host and not host.startswith('.')
+        return is_domain(host)
     
     def create_route_config(self, containers: List[Dict]) -> Dict:
         """Create Caddy configuration with routes for containers."""
-        # Detect if any domains are being used (vs localhost/IP)
-        has_domains = False
-        domains = []
+        table, routes = self.route_builder.build(containers)
         
-        for container in containers:
-            labels = container.get('Labels', {})
-            if 'caddy.proxy' in labels:
-                domain = labels['caddy.proxy']
-                if self._is_domain(domain):
-                    has_domains = True
-                    domains.append(domain)
+        # Detect if any domains are being used (vs localhost/IP)
+        domains = [host for host in table if self._is_domain(host)]
+        has_domains = bool(domains)
         
-        # Configure HTTP server (always present)
-        http_listen = [":80"]
-        # Add HTTPS listener if domains are detected
+        caddy_email = None
+        use_staging = False
         if has_domains:
-            http_listen.append(":443")
             logger.info(f"HTTPS enabled for domains: {', '.join(domains)}")
-        
-        config = {
-            "admin": {
-                "listen": "0.0.0.0:2019",
-                "enforce_origin": False,
-                "origins": ["//0.0.0.0:2019"]
-            },
-            "apps": {
-                "http": {
-                    "servers": {
-                        "srv0": {
-                            "listen": http_listen,
-                            "routes": []
-                        }
-                    }
-                }
-            }
-        }
-        
-        # Add TLS automation if domains are present
-        if has_domains:
             import os
             # Try to get CADDY_EMAIL from environment (set via env.dockertree in docker-compose)
             caddy_email = os.getenv("CADDY_EMAIL")
             if not caddy_email:
-                # Fallback: try to construct from first domain
-                first_domain = domains[0] if domains else "example.com"
-                caddy_email = f"admin@{first_domain}"
-                logger.warning(f"CADDY_EMAIL not set. Using default: {caddy_email}")
+                # Fallback: build_caddy_config uses the first domain
+                logger.warning(f"CADDY_EMAIL not set. Using default: admin@{domains[0]}")
             
             # Check for environment variable to force staging mode (for testing)
             env_staging = os.getenv("USE_STAGING_CERTIFICATES", "").lower()
             use_staging = env_staging in ("1", "true", "yes", "on")
             
-            issuer_config = {
-                "module": "acme",
-                "email": caddy_email
-            }
-            
-            # Add staging CA endpoint if needed
             if use_staging:
-                issuer_config["ca"] = "https://acme-staging-v02.api.letsencrypt.org/directory"
                 logger.info(f"Using Let's Encrypt staging endpoint for domains: {', '.join(domains)}")
                 logger.warning("Staging certificates will show browser warnings but allow HTTPS to work")
             else:
                 logger.info(f"Using Let's Encrypt production endpoint for domains: {', '.join(domains)}")
-            
-            config["apps"]["tls"] = {
-                "automation": {
-                    "policies": [{
-                        "subjects": domains,
-                        "issuers": [issuer_config]
-                    }]
-                }
-            }
-        
-        routes = []
         
-        # Group containers by domain to handle path-based routing
-        domain_containers = {}
-        for container in containers:
-            labels = container.get('Labels', {})
-            if 'caddy.proxy' in labels:
-                domain = labels['caddy.proxy']
-                if domain not in domain_containers:
-                    domain_containers[domain] = []
-                domain_containers[domain].append((container, labels))
+        for host, entries in table.items():
+            route_type = "HTTPS" if self._is_domain(host) else "HTTP"
+            for entry in entries:
+                logger.info(f"Added {route_type} route for {host} path {entry.path} -> {entry.target}")
         
-        # Add routes for each domain (with path-based routing support)
-        for domain, container_list in domain_containers.items():
-            if len(container_list) == 1:
-                # Single container for this domain - simple route
-                container, labels = container_list[0]
-                target = labels.get('caddy.proxy.reverse_proxy', f"{container['Names']}:8000")
-                
-                route = {
-                    "match": [{"host": [domain]}],
-                    "handle": [{
-                        "handler": "reverse_proxy",
-                        "upstreams": [{"dial": target}]
-                    }]
-                }
-                
-                # Add health check if specified
-                if 'caddy.proxy.health_check' in labels:
-                    route["handle"][0]["health_checks"] = {
-                        "active": {
-                            "path": labels['caddy.proxy.health_check']
-                        }
-                    }
-                
-                routes.append(route)
-                route_type = "HTTPS" if self._is_domain(domain) else "HTTP"
-                logger.info(f"Added {route_type} route for {domain} -> {target}")
-            else:
-                # Multiple containers for same domain - use subroute with path matching
-                # Sort containers: specific paths first (longest first), then catch-all
-                def sort_key(x):
-                    labels = x[1]
-                    path = labels.get('caddy.proxy.path', '/')
-                    except_path = labels.get('caddy.proxy.except', '')
-                    # Priority: specific paths > except paths > catch-all
-                    if path and path != '/':
-                        return (0, -len(path))  # Specific path, longer = higher priority
-                    elif except_path:
-                        return (1, 0)  # Except path
-                    else:
-                        return (2, 0)  # Catch-all
-                
-                container_list_sorted = sorted(container_list, key=sort_key)
-                
-                # Create subroutes - Caddy evaluates subroutes in order within a subroute handler
-                subroutes = []
-                for container, labels in container_list_sorted:
-                    target = labels.get('caddy.proxy.reverse_proxy', f"{container['Names']}:8000")
-                    path = labels.get('caddy.proxy.path', '/')
-                    except_path = labels.get('caddy.proxy.except', '')
-                    
-                    # Create match conditions for subroute
-                    # Subroutes are evaluated in order, so specific paths must come first
-                    match_conditions = []
-                    if path and path != '/':
-                        # Specific path pattern (e.g., /api/*) - must come first
-                        match_conditions.append({"path": [path]})
-                    # For catch-all, no path condition - matches everything not matched above
-                    
-                    subroute = {
-                        "match": match_conditions if match_conditions else [],
-                        "handle": [{
-                            "handler": "reverse_proxy",
-                            "upstreams": [{"dial": target}]
-                        }]
-                    }
-                    
-                    # Add health check if specified
-                    if 'caddy.proxy.health_check' in labels:
-                        subroute["handle"][0]["health_checks"] = {
-                            "active": {
-                                "path": labels['caddy.proxy.health_check']
-                            }
-                        }
-                    
-                    subroutes.append(subroute)
-                    route_type = "HTTPS" if self._is_domain(domain) else "HTTP"
-                    logger.info(f"Added subroute for {domain} path {path} (except: {except_path}) -> {target}")
-                
-                # Create main route with subroute handler
-                # Subroutes are evaluated in order, so /api/* matches first, then catch-all
-                route = {
-                    "match": [{"host": [domain]}],
-                    "handle": [{
-                        "handler": "subroute",
-                        "routes": subroutes
-                    }]
-                }
-                routes.append(route)
-                route_type = "HTTPS" if self._is_domain(domain) else "HTTP"
-                logger.info(f"Added {route_type} route with subroutes for {domain}")
-        
-        # Add default wildcard route at the end (must be last for proper matching)
-        routes.append({
-            "match": [{"host": ["*"]}],
-            "handle": [{
-                "handler": "static_response",
-                "body": "Dockertree Global Caddy Proxy Ready - No worktree found for this domain",
-                "status_code": 200
-            }]
-        })
-        
-        config["apps"]["http"]["servers"]["srv0"]["routes"] = routes
-        return config
+        return build_caddy_config(routes, domains, caddy_email, use_staging)
     
     def validate_route_configuration(self, config: Dict, containers: List[Dict]) -> bool:
         """Validate that Caddy routes match container labels correctly."""
         try:
-            routes = config.get("apps", {}).get("http", {}).get("servers", {}).get("srv0", {}).get("routes", [])
-            
-            # Create a mapping of domain+path -> expected target from container labels
-            expected_routes = {}
-            for container in containers:
-                labels = container.get('Labels', {})
-                if 'caddy.proxy' in labels:
-                    domain = labels['caddy.proxy']
-                    path = labels.get('caddy.proxy.path', '/')
-                    expected_target = labels.get('caddy.proxy.reverse_proxy', f"{container['Names']}:8000")
-                    # Use domain+path as key to handle multiple routes per domain
-                    route_key = f"{domain}:{path}"
-                    expected_routes[route_key] = expected_target
-            
-            # Validate each route matches expected configuration
-            # Build a set of all expected route keys for validation
-            validated_routes = set()
-            for route in routes:
-                if 'match' in route and 'handle' in route:
-                    hosts = route['match'][0].get('host', [])
-                    # Extract path from match conditions (if present)
-                    path = '/'
-                    if len(route.get('match', [])) > 1:
-                        path_match = route['match'][1].get('path', [])
-                        if path_match:
-                            path = path_match[0] if isinstance(path_match, list) else path_match
-                    
-                    for host in hosts:
-                        route_key = f"{host}:{path}"
-                        if route_key in expected_routes:
-                            # Check if the upstream target matches expected
-                            handle = route['handle'][0]
-                            if 'upstreams' in handle:
-                                actual_target = handle['upstreams'][0].get('dial', '')
-                                expected_target = expected_routes[route_key]
-                                
-                                if actual_target != expected_target:
-                                    logger.error(f"Route misconfiguration detected: {route_key} -> {actual_target} (expected: {expected_target})")
-                                    return False
-                                else:
-                                    logger.info(f"Route validation passed: {route_key} -> {actual_target}")
-                                    validated_routes.add(route_key)
+            mismatches = find_route_mismatches(get_routes(config), build_route_table(containers))
+            missing = set()
+            for (host, path), actual_target, expected_target in mismatches:
+                if actual_target is None:
+                    missing.add(f"{host}:{path}")
+                    continue
+                logger.error(f"Route misconfiguration detected: {host}:{path} -> {actual_target} (expected: {expected_target})")
+                return False
             
-            # Check that all expected routes were validated
-            if len(validated_routes) != len(expected_routes):
-                missing = set(expected_routes.keys()) - validated_routes
+            if missing:
                 logger.warning(f"Some expected routes were not found in configuration: {missing}")
                 # Don't fail validation for this - routes might be in different order
             
@@ -512,30 +334,13 @@ class CaddyDockerMonitor:
                 return drift_issues
             
             current_config = response.json()
-            current_routes = current_config.get("apps", {}).get("http", {}).get("servers", {}).get("srv0", {}).get("routes", [])
-            
-            # Create expected routes from container labels
-            expected_routes = {}
-            for container in containers:
-                labels = container.get('Labels', {})
-                if 'caddy.proxy' in labels:
-                    domain = labels['caddy.proxy']
-                    expected_target = labels.get('caddy.proxy.reverse_proxy', f"{container['Names']}:8000")
-                    expected_routes[domain] = expected_target
-            
-            # Check for drift
-            for route in current_routes:
-                if 'match' in route and 'handle' in route:
-                    hosts = route['match'][0].get('host', [])
-                    for host in hosts:
-                        if host in expected_routes:
-                            handle = route['handle'][0]
-                            if 'upstreams' in handle:
-                                actual_target = handle['upstreams'][0].get('dial', '')
-                                expected_target = expected_routes[host]
-                                
-                                if actual_target != expected_target:
-                                    drift_issues.append(f"Domain {host} points to {actual_target} but should point to {expected_target}")
+            mismatches = find_route_mismatches(get_routes(current_config), build_route_table(containers))
+            for (host, path), actual_target, expected_target in mismatches:
+                route = host if path == "/" else f"{host}{path}"
+                if actual_target is None:
+                    drift_issues.append(f"Domain {route} has no route but should point to {expected_target}")
+                else:
+                    drift_issues.append(f"Domain {route} points to {actual_target} but should point to {expected_target}")
             
             if drift_issues:
                 logger.warning(f"Detected {len(drift_issues)} configuration drift issues")
@@ -575,61 +380,155 @@ class CaddyDockerMonitor:
             logger.error(f"Auto-reconfiguration failed: {e}")
             return False
 
+    @staticmethod
+    def get_container_signature(containers: List[Dict]) -> FrozenSet[Tuple[str, Tuple[Tuple[str, str], ...]]]:
+        """Identify the routed container set, including labels that shape routes."""
+        return frozenset(
+            (c['ID'], tuple(sorted((k, v) for k, v in (c.get('Labels') or {}).items() if k.startswith('caddy.'))))
+            for c in containers
+        )
+    
+    def sync_routes(self, containers: Optional[List[Dict]] = None, force: bool = False) -> bool:
+        """Push routes for the current containers to Caddy if they changed.
+        
+        Args:
+            containers: Containers to route (listed from Docker if not given)
+            force: Reconfigure even if the containers have not changed
+            
+        Returns:
+            True if Caddy is up to date, False otherwise
+        """
+        if containers is None:
+            containers = self.get_docker_containers()
+        current_containers = self.get_container_signature(containers)
+        if current_containers == self.known_containers and not force:
+            return True
+        
+        logger.info(f"Container change detected: {len(containers)} containers")
+        
+        # Create new configuration
+        config = self.create_route_config(containers)
+        
+        # Validate configuration before applying
+        if not self.validate_route_configuration(config, containers):
+            logger.error("Route validation failed - skipping configuration update")
+            return False
+        
+        # Update Caddy
+        if self.update_caddy_config(config):
+            logger.info("Caddy configuration updated successfully")
+            self.known_containers = current_containers
+            return True
+        logger.error("Failed to update Caddy configuration")
+        return False
+    
+    def reconcile(self) -> bool:
+        """Safety-net pass: re-sync routes, fix drift and check certificates.
+        
+        Returns:
+            False if routes could not be synced (e.g. Caddy is not up yet)
+        """
+        containers = self.get_docker_containers()
+        if not self.sync_routes(containers):
+            return False
+        
+        # Check for configuration drift (e.g. Caddy restarted with its static config)
+        drift_issues = self.detect_configuration_drift(containers)
+        if drift_issues:
+            logger.warning("Configuration drift detected, auto-reconfiguring...")
+            if self.auto_reconfigure_on_drift(containers):
+                logger.info("Auto-reconfiguration completed")
+            else:
+                logger.error("Auto-reconfiguration failed")
+        
+        # Monitor certificate health
+        cert_health = self.monitor_certificate_health(containers)
+        for health in cert_health:
+            if health['has_errors']:
+                error_info = health['error_info']
+                if error_info.get('type') == 'rate_limit':
+                    logger.warning(f"Rate limit detected for {health['domain']}. Consider using staging certificates.")
+                    logger.warning(f"To fix: Update Caddy config to use staging ACME endpoint for {health['domain']}")
+        return True
+    
+    def watch_events(self) -> None:
+        """Watch the Docker events stream and flag container changes (runs in a thread)."""
+        retry_delay = EVENTS_RETRY_SECONDS
+        while not self._stop.is_set():
+            try:
+                if not self.docker_client:
+                    raise RuntimeError("not connected to Docker")
+                events = self.docker_client.events(
+                    decode=True,
+                    filters={"type": "container", "event": ROUTE_EVENTS, "label": "caddy.proxy"}
+                )
+                self._events_connected.set()
+                # Events may have been missed while disconnected
+                self._changed.set()
+                retry_delay = EVENTS_RETRY_SECONDS
+                for event in events:
+                    if self._stop.is_set():
+                        return
+                    logger.debug(f"Docker event: {event.get('Action')} {event.get('Actor', {}).get('Attributes', {}).get('name')}")
+                    self._changed.set()
+                logger.warning("Docker events stream ended, reconnecting...")
+            except Exception as e:
+                logger.warning(f"Docker events stream unavailable ({e}), polling every {POLL_INTERVAL_SECONDS}s")
+            self._events_connected.clear()
+            self._stop.wait(retry_delay)
+            retry_delay = min(retry_delay * 2, EVENTS_RETRY_MAX_SECONDS)
+    
+    def wait_for_changes(self, timeout: float) -> bool:
+        """Wait for container changes, then for the burst of events to settle.
+        
+        Args:
+            timeout: Seconds to wait for a first change
+            
+        Returns:
+            True if containers changed, False on timeout
+        """
+        if not self._changed.wait(timeout):
+            return False
+        deadline = time.monotonic() + EVENT_MAX_DELAY_SECONDS
+        self._changed.clear()
+        # Coalesce: keep waiting while events arrive, up to EVENT_MAX_DELAY_SECONDS
+        while time.monotonic() < deadline and self._changed.wait(
+                min(EVENT_DEBOUNCE_SECONDS, max(0.0, deadline - time.monotonic()))):
+            self._changed.clear()
+        return True
+    
     def monitor(self):
         """Main monitoring loop."""
         logger.info("Starting Caddy Docker monitor...")
         
+        watcher = threading.Thread(target=self.watch_events, name="docker-events", daemon=True)
+        watcher.start()
+        next_reconcile = time.monotonic()
+        
         while True:
             try:
-                containers = self.get_docker_containers()
-                current_containers = {c['ID'] for c in containers}
+                now = time.monotonic()
+                if now >= next_reconcile:
+                    # Retry soon if Caddy could not be updated
+                    interval = RECONCILE_INTERVAL_SECONDS if self.reconcile() else POLL_INTERVAL_SECONDS
+                    next_reconcile = time.monotonic() + interval
+                    continue
                 
-                # Check if configuration needs updating
-                if current_containers != self.known_containers:
-                    logger.info(f"Container change detected: {len(containers)} containers")
-                    
-                    # Create new configuration
-                    config = self.create_route_config(containers)
-                    
-                    # Validate configuration before applying
-                    if not self.validate_route_configuration(config, containers):
-                        logger.error("Route validation failed - skipping configuration update")
-                        time.sleep(5)
-                        continue
-                    
-                    # Update Caddy
-                    if self.update_caddy_config(config):
-                        logger.info("Caddy configuration updated successfully")
-                        self.known_containers = current_containers
-                    else:
-                        logger.error("Failed to update Caddy configuration")
-                else:
-                    # Check for configuration drift even when containers haven't changed
-                    drift_issues = self.detect_configuration_drift(containers)
-                    if drift_issues:
-                        logger.warning("Configuration drift detected, auto-reconfiguring...")
-                        if self.auto_reconfigure_on_drift(containers):
-                            logger.info("Auto-reconfiguration completed")
-                        else:
-                            logger.error("Auto-reconfiguration failed")
-                    
-                    # Monitor certificate health
-                    cert_health = self.monitor_certificate_health(containers)
-                    for health in cert_health:
-                        if health['has_errors']:
-                            error_info = health['error_info']
-                            if error_info.get('type') == 'rate_limit':
-                                logger.warning(f"Rate limit detected for {health['domain']}. Consider using staging certificates.")
-                                logger.warning(f"To fix: Update Caddy config to use staging ACME endpoint for {health['domain']}")
+                timeout = next_reconcile - now
+                if not self._events_connected.is_set():
+                    timeout = min(timeout, POLL_INTERVAL_SECONDS)
                 
-                time.sleep(5)  # Check every 5 seconds
+                if self.wait_for_changes(timeout) or not self._events_connected.is_set():
+                    if not self.sync_routes():
+                        next_reconcile = min(next_reconcile, time.monotonic() + POLL_INTERVAL_SECONDS)
                 
             except KeyboardInterrupt:
                 logger.info("Monitor stopped by user")
+                self._stop.set()
                 break
             except Exception as e:
                 logger.error(f"Error in monitor loop: {e}")
-                time.sleep(5)
+                time.sleep(POLL_INTERVAL_SECONDS)
 
 if __name__ == "__main__":
     monitor = CaddyDockerMonitor()
@@ -15,6 +15,9 @@ import docker
 import logging
 from typing import Dict, List, Optional
 
+from caddy_routes import (RouteBuilder, apply_route_config, build_caddy_config, build_route_table,
+                          find_route_mismatches, get_routes, iter_proxy_handlers, routes_match)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -35,6 +38,8 @@ class CaddyDynamicConfig:
             self.caddy_admin_url = caddy_admin_url
         
         self.known_containers = set()
+        # Routes are rebuilt only when container labels change
+        self.route_builder = RouteBuilder(health_check=self._health_check_config)
         
         # Detect Docker socket path based on environment
         docker_socket_paths = [
@@ -198,6 +203,20 @@ class CaddyDynamicConfig:
             logger.debug(f"Error checking certificate status: {e}")
             return None
     
+    @staticmethod
+    def _health_check_config(entry) -> Dict:
+        """Active health check for a route with a caddy.proxy.health_check label."""
+        return {
+            "active": {
+                "path": entry.health_check,
+                "headers": {
+                    "Host": [entry.host]
+                },
+                "timeout": "30s",
+                "interval": "10s"
+            }
+        }
+    
     def create_route_config(self, containers: List[Dict], use_staging: Optional[bool] = None) -> Dict:
         """Create Caddy configuration with routes for containers.
         
@@ -209,52 +228,21 @@ class CaddyDynamicConfig:
         Returns:
             Caddy configuration dictionary
         """
-        # Detect if any domains are being used (vs localhost/IP)
-        has_domains = False
-        domains = []
+        table, routes = self.route_builder.build(containers)
         
-        for container in containers:
-            labels = container.get('Labels', {})
-            if 'caddy.proxy' in labels:
-                domain = labels['caddy.proxy']
-                if self._is_domain(domain):
-                    has_domains = True
-                    domains.append(domain)
+        # Detect if any domains are being used (vs localhost/IP)
+        domains = [host for host in table if self._is_domain(host)]
+        has_domains = bool(domains)
         
-        # Configure HTTP server (always present)
-        http_listen = [":80"]
-        # Add HTTPS listener if domains are detected
+        caddy_email = None
+        should_use_staging = False
         if has_domains:
-            http_listen.append(":443")
             logger.info(f"HTTPS enabled for domains: {', '.join(domains)}")
-        
-        config = {
-            "admin": {
-                "listen": "0.0.0.0:2019",
-                "enforce_origin": False,
-                "origins": ["//0.0.0.0:2019"]
-            },
-            "apps": {
-                "http": {
-                    "servers": {
-                        "srv0": {
-                            "listen": http_listen,
-                            "routes": []
-                        }
-                    }
-                }
-            }
-        }
-        
-        # Add TLS automation if domains are present
-        if has_domains:
             # Try to get CADDY_EMAIL from environment (set via env.dockertree in docker-compose)
             caddy_email = os.getenv("CADDY_EMAIL")
             if not caddy_email:
-                # Fallback: try to construct from first domain
-                first_domain = domains[0] if domains else "example.com"
-                caddy_email = f"admin@{first_domain}"
-                logger.warning(f"CADDY_EMAIL not set. Using default: {caddy_email}")
+                # Fallback: build_caddy_config uses the first domain
+                logger.warning(f"CADDY_EMAIL not set. Using default: admin@{domains[0]}")
             
             # Determine if we should use staging certificates
             should_use_staging = use_staging
@@ -280,77 +268,18 @@ class CaddyDynamicConfig:
                             logger.info(f"Already using staging certificates for {domain}")
                             break
             
-            # Build issuer configuration
-            issuer_config = {
-                "module": "acme",
-                "email": caddy_email
-            }
-            
-            # Add staging CA endpoint if needed
             if should_use_staging:
-                issuer_config["ca"] = "https://acme-staging-v02.api.letsencrypt.org/directory"
                 logger.info(f"Using Let's Encrypt staging endpoint for domains: {', '.join(domains)}")
                 logger.warning("Staging certificates will show browser warnings but allow HTTPS to work")
             else:
                 logger.info(f"Using Let's Encrypt production endpoint for domains: {', '.join(domains)}")
-            
-            config["apps"]["tls"] = {
-                "automation": {
-                    "policies": [{
-                        "subjects": domains,
-                        "issuers": [issuer_config]
-                    }]
-                }
-            }
         
-        routes = []
+        for host, entries in table.items():
+            route_type = "HTTPS" if self._is_domain(host) else "HTTP"
+            for entry in entries:
+                logger.info(f"Added {route_type} route for {host} path {entry.path} -> {entry.target}")
         
-        # Add routes for each container (specific routes first)
-        for container in containers:
-            # Labels are already in the container dict from get_docker_containers
-            labels = container.get('Labels', {})
-            
-            if 'caddy.proxy' in labels:
-                domain = labels['caddy.proxy']
-                target = labels.get('caddy.proxy.reverse_proxy', f"{container['Names']}:8000")
-                
-                route = {
-                    "match": [{"host": [domain]}],
-                    "handle": [{
-                        "handler": "reverse_proxy",
-                        "upstreams": [{"dial": target}]
-                    }]
-                }
-                
-                # Add health check if specified
-                if 'caddy.proxy.health_check' in labels:
-                    route["handle"][0]["health_checks"] = {
-                        "active": {
-                            "path": labels['caddy.proxy.health_check'],
-                            "headers": {
-                                "Host": [domain]
-                            },
-                            "timeout": "30s",
-                            "interval": "10s"
-                        }
-                    }
-                
-                routes.append(route)
-                route_type = "HTTPS" if self._is_domain(domain) else "HTTP"
-                logger.info(f"Added {route_type} route for {domain} -> {target}")
-        
-        # Add default wildcard route at the end (must be last for proper matching)
-        routes.append({
-            "match": [{"host": ["*"]}],
-            "handle": [{
-                "handler": "static_response",
-                "body": "Dockertree Global Caddy Proxy Ready - No worktree found for this domain",
-                "status_code": 200
-            }]
-        })
-        
-        config["apps"]["http"]["servers"]["srv0"]["routes"] = routes
-        return config
+        return build_caddy_config(routes, domains, caddy_email, should_use_staging)
     
     def update_caddy_config(self, config: Dict) -> bool:
         """Update Caddy configuration."""
@@ -363,17 +292,15 @@ class CaddyDynamicConfig:
                 print("Using container label-based routing")
                 return True  # Return True to indicate fallback is available
             
-            response = requests.post(
-                f"{self.caddy_admin_url}/load",
-                json=config,
-                timeout=10
-            )
-            if response.status_code == 200:
+            # Only the routes that changed are sent; other worktrees' routes are left alone
+            success, error = apply_route_config(self.caddy_admin_url, config,
+                                                live_config=health_response.json(), logger=logger)
+            if success:
                 logger.info("Successfully updated Caddy configuration via admin API")
                 print("Successfully updated Caddy configuration via admin API")
                 return True
             else:
-                logger.warning(f"Failed to update Caddy config via admin API: HTTP {response.status_code}")
+                logger.warning(f"Failed to update Caddy config via admin API: {error}")
                 logger.info("Trying individual route updates...")
                 return self.update_routes_individually(config)
         except requests.exceptions.ConnectionError as e:
@@ -437,36 +364,12 @@ class CaddyDynamicConfig:
     def validate_route_configuration(self, config: Dict, containers: List[Dict]) -> bool:
         """Validate that Caddy routes match container labels correctly."""
         try:
-            routes = config.get("apps", {}).get("http", {}).get("servers", {}).get("srv0", {}).get("routes", [])
-            
-            # Create a mapping of domain -> expected target from container labels
-            expected_routes = {}
-            for container in containers:
-                labels = container.get('Labels', {})
-                if 'caddy.proxy' in labels:
-                    domain = labels['caddy.proxy']
-                    expected_target = labels.get('caddy.proxy.reverse_proxy', f"{container['Names']}:8000")
-                    expected_routes[domain] = expected_target
-            
-            # Validate each route matches expected configuration
-            for route in routes:
-                if 'match' in route and 'handle' in route:
-                    hosts = route['match'][0].get('host', [])
-                    for host in hosts:
-                        if host in expected_routes:
-                            # Check if the upstream target matches expected
-                            handle = route['handle'][0]
-                            if 'upstreams' in handle:
-                                actual_target = handle['upstreams'][0].get('dial', '')
-                                expected_target = expected_routes[host]
-                                
-                                if actual_target != expected_target:
-                                    logger.error(f"Route misconfiguration detected: {host} -> {actual_target} (expected: {expected_target})")
-                                    print(f"Route misconfiguration detected: {host} -> {actual_target} (expected: {expected_target})")
-                                    return False
-                                else:
-                                    logger.info(f"Route validation passed: {host} -> {actual_target}")
-                                    print(f"Route validation passed: {host} -> {actual_target}")
+            for (host, path), actual_target, expected_target in find_route_mismatches(
+                    get_routes(config), build_route_table(containers)):
+                route = host if path == "/" else f"{host}{path}"
+                logger.error(f"Route misconfiguration detected: {route} -> {actual_target} (expected: {expected_target})")
+                print(f"Route misconfiguration detected: {route} -> {actual_target} (expected: {expected_target})")
+                return False
             
             logger.info("All route configurations validated successfully")
             print("All route configurations validated successfully")
@@ -603,31 +506,22 @@ class CaddyDynamicConfig:
         misconfigurations = []
         
         try:
-            routes = config.get("apps", {}).get("http", {}).get("servers", {}).get("srv0", {}).get("routes", [])
-            
-            for i, route in enumerate(routes):
-                if 'match' in route and 'handle' in route:
-                    hosts = route['match'][0].get('host', [])
-                    handle = route['handle'][0]
-                    
-                    # Check for missing upstreams
-                    if 'upstreams' not in handle:
-                        misconfigurations.append(f"Route {i} has no upstreams configured")
-                        continue
-                    
-                    # Check for invalid upstream targets
-                    upstreams = handle['upstreams']
-                    if not upstreams:
-                        misconfigurations.append(f"Route {i} has empty upstreams list")
-                        continue
-                    
-                    for upstream in upstreams:
-                        if 'dial' not in upstream:
-                            misconfigurations.append(f"Route {i} upstream missing 'dial' field")
-                        elif not upstream['dial']:
-                            misconfigurations.append(f"Route {i} upstream has empty 'dial' value")
-                        elif not upstream['dial'].endswith(':8000'):
-                            misconfigurations.append(f"Route {i} upstream target {upstream['dial']} doesn't end with :8000")
+            for host, path, handle in iter_proxy_handlers(get_routes(config)):
+                route = host if path == "/" else f"{host}{path}"
+                
+                # Check for invalid upstream targets
+                upstreams = handle.get('upstreams')
+                if not upstreams:
+                    misconfigurations.append(f"Route {route} has no upstreams configured")
+                    continue
+                
+                for upstream in upstreams:
+                    if 'dial' not in upstream:
+                        misconfigurations.append(f"Route {route} upstream missing 'dial' field")
+                    elif not upstream['dial']:
+                        misconfigurations.append(f"Route {route} upstream has empty 'dial' value")
+                    elif not upstream['dial'].endswith(':8000'):
+                        misconfigurations.append(f"Route {route} upstream target {upstream['dial']} doesn't end with :8000")
             
             if misconfigurations:
                 logger.warning(f"Detected {len(misconfigurations)} routing misconfigurations")
@@ -658,31 +552,11 @@ class CaddyDynamicConfig:
             
             # Check for misconfigurations
             misconfigurations_found = False
-            current_routes = current_config.get("apps", {}).get("http", {}).get("servers", {}).get("srv0", {}).get("routes", [])
-            
-            # Create expected routes from container labels
-            expected_routes = {}
-            for container in containers:
-                labels = container.get('Labels', {})
-                if 'caddy.proxy' in labels:
-                    domain = labels['caddy.proxy']
-                    expected_target = labels.get('caddy.proxy.reverse_proxy', f"{container['Names']}:8000")
-                    expected_routes[domain] = expected_target
-            
-            # Check each route for misconfigurations
-            for route in current_routes:
-                if 'match' in route and 'handle' in route:
-                    hosts = route['match'][0].get('host', [])
-                    for host in hosts:
-                        if host in expected_routes:
-                            handle = route['handle'][0]
-                            if 'upstreams' in handle:
-                                actual_target = handle['upstreams'][0].get('dial', '')
-                                expected_target = expected_routes[host]
-                                
-                                if actual_target != expected_target:
-                                    logger.warning(f"Misconfiguration detected: {host} -> {actual_target} (should be: {expected_target})")
-                                    misconfigurations_found = True
+            for (host, path), actual_target, expected_target in find_route_mismatches(
+                    get_routes(current_config), build_route_table(containers)):
+                route = host if path == "/" else f"{host}{path}"
+                logger.warning(f"Misconfiguration detected: {route} -> {actual_target} (should be: {expected_target})")
+                misconfigurations_found = True
             
             if misconfigurations_found:
                 logger.info("Misconfigurations detected, attempting auto-recovery...")
@@ -895,20 +769,12 @@ class CaddyDynamicConfig:
                 if response.status_code == 200:
                     current_config = response.json()
                     
-                    # Compare current config with expected config
-                    current_routes = current_config.get("apps", {}).get("http", {}).get("servers", {}).get("srv0", {}).get("routes", [])
-                    expected_routes = config.get("apps", {}).get("http", {}).get("servers", {}).get("srv0", {}).get("routes", [])
-                    
-                    if len(current_routes) != len(expected_routes):
-                        logger.warning(f"Route count mismatch: current={len(current_routes)}, expected={len(expected_routes)}")
+                    # Compare routes by @id: incremental updates insert new routes
+                    # before the catch-all route rather than in generation order
+                    if not routes_match(current_config, config):
+                        logger.warning("Route configuration mismatch")
                         return False
                     
-                    # Verify each route was applied correctly
-                    for i, (current_route, expected_route) in enumerate(zip(current_routes, expected_routes)):
-                        if current_route != expected_route:
-                            logger.warning(f"Route {i} configuration mismatch")
-                            return False
-                    
                     logger.info("Configuration verification passed")
                     return True
                 else:
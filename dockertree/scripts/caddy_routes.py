@@ -0,0 +1,473 @@
+"""
+Caddy route generation and incremental route updates shared by the Caddy
+helper scripts.
+
+Containers are indexed by the host in their ``caddy.proxy`` label
+(build_route_table), in a deterministic order: hosts sorted by name, and the
+containers sharing a host ordered by route priority (specific paths first,
+longest first, then ``caddy.proxy.except`` routes, then the catch-all). Each
+host becomes one route, with subroutes when several containers share it.
+RouteBuilder memoizes the generated routes by a fingerprint of the container
+labels, and validation compares (host, path) -> upstream maps built in one
+pass over the routes and containers.
+
+Generated routes are tagged with an ``@id`` derived from the host they match,
+so Caddy's admin API can address each one directly (``/id/<id>``). Instead of
+POSTing the whole config to ``/load`` on every change, apply_route_config()
+diffs the generated routes against the live config and sends only the
+changes: DELETE for removed routes, PATCH for changed ones and PUT (insert)
+before the catch-all route for new ones. Routes of other worktrees are not
+part of any request, and nothing is sent when the routes are unchanged.
+
+A full ``/load`` is still used when Caddy has no tagged routes yet (e.g. it
+started from the Caddyfile) or when anything outside the routes changed, such
+as the TLS policy when the set of domains changes.
+
+This module lives next to the scripts and is imported by them directly (the
+monitor container mounts it alongside monitor.py), so it must only depend on
+the standard library and requests.
+"""
+
+import copy
+import hashlib
+import json
+import re
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+SERVER_PATH = "/config/apps/http/servers/srv0"
+ROUTES_PATH = f"{SERVER_PATH}/routes"
+
+ROUTE_ID_PREFIX = "dockertree-route-"
+FALLBACK_ROUTE_ID = "dockertree-fallback"
+
+REQUEST_TIMEOUT = 10
+
+# Port containers are proxied to unless caddy.proxy.reverse_proxy says otherwise
+DEFAULT_UPSTREAM_PORT = 8000
+
+FALLBACK_ROUTE_BODY = "Dockertree Global Caddy Proxy Ready - No worktree found for this domain"
+
+ADMIN_LISTEN = "0.0.0.0:2019"
+
+STAGING_CA = "https://acme-staging-v02.api.letsencrypt.org/directory"
+
+# (host, path) a route serves, "/" for a host's catch-all
+RouteKey = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class RouteEntry:
+    """What one container's caddy.proxy labels ask to be routed."""
+    host: str
+    path: str
+    except_path: str
+    target: str
+    container: str
+    health_check: Optional[str] = None
+
+    @property
+    def key(self) -> RouteKey:
+        return (self.host, self.path)
+
+    @property
+    def priority(self) -> Tuple:
+        """Sort key within a host: specific paths (longest first), except paths, catch-all."""
+        if self.path and self.path != "/":
+            rank = (0, -len(self.path))
+        elif self.except_path:
+            rank = (1, 0)
+        else:
+            rank = (2, 0)
+        return rank + (self.path, self.container)
+
+
+def get_route_entry(container: Dict) -> Optional[RouteEntry]:
+    """Read a container's route from its labels (None if it is not proxied)."""
+    labels = container.get("Labels") or {}
+    host = labels.get("caddy.proxy")
+    if not host:
+        return None
+    return RouteEntry(
+        host=host,
+        path=labels.get("caddy.proxy.path", "/") or "/",
+        except_path=labels.get("caddy.proxy.except", ""),
+        target=labels.get("caddy.proxy.reverse_proxy", f"{container['Names']}:{DEFAULT_UPSTREAM_PORT}"),
+        container=container["Names"],
+        health_check=labels.get("caddy.proxy.health_check"),
+    )
+
+
+def build_route_table(containers: List[Dict]) -> Dict[str, List[RouteEntry]]:
+    """Index the routes of containers by host, in deterministic order."""
+    table: Dict[str, List[RouteEntry]] = {}
+    for container in containers:
+        entry = get_route_entry(container)
+        if entry is not None:
+            table.setdefault(entry.host, []).append(entry)
+    return {host: sorted(table[host], key=lambda entry: entry.priority) for host in sorted(table)}
+
+
+def get_expected_targets(table: Dict[str, List[RouteEntry]]) -> Dict[RouteKey, str]:
+    """Map (host, path) to the upstream each route should dial."""
+    return {entry.key: entry.target for entries in table.values() for entry in entries}
+
+
+def iter_proxy_handlers(routes: List[Dict], host: Optional[str] = None) -> Iterator[Tuple[str, str, Dict]]:
+    """Walk routes (and subroutes) and yield (host, path, reverse_proxy handler)."""
+    for route in routes:
+        matchers = route.get("match") or [{}]
+        route_hosts = [host] if host is not None else (matchers[0].get("host") or ["*"])
+        path = "/"
+        for matcher in matchers:
+            if matcher.get("path"):
+                path = matcher["path"][0]
+        for handler in route.get("handle") or []:
+            if handler.get("handler") == "reverse_proxy":
+                for route_host in route_hosts:
+                    yield route_host, path, handler
+            elif handler.get("handler") == "subroute":
+                for route_host in route_hosts:
+                    yield from iter_proxy_handlers(handler.get("routes") or [], route_host)
+
+
+def get_route_targets(routes: List[Dict]) -> Dict[RouteKey, str]:
+    """Map (host, path) to the upstream each configured route dials."""
+    targets = {}
+    for host, path, handler in iter_proxy_handlers(routes):
+        upstreams = handler.get("upstreams") or [{}]
+        targets.setdefault((host, path), upstreams[0].get("dial", ""))
+    return targets
+
+
+def find_route_mismatches(routes: List[Dict], table: Dict[str, List[RouteEntry]]
+                          ) -> List[Tuple[RouteKey, Optional[str], str]]:
+    """Compare configured routes with container labels.
+
+    Returns:
+        List of ((host, path), configured upstream or None if missing,
+        expected upstream), in host order
+    """
+    actual = get_route_targets(routes)
+    return [
+        (key, actual.get(key), expected)
+        for key, expected in get_expected_targets(table).items()
+        if actual.get(key) != expected
+    ]
+
+
+def build_routes(table: Dict[str, List[RouteEntry]],
+                 health_check: Optional[Callable[[RouteEntry], Dict]] = None) -> List[Dict]:
+    """Build srv0 routes from a route table, ending with the catch-all route.
+
+    Args:
+        table: Routes indexed by host (see build_route_table)
+        health_check: Builds a reverse_proxy ``health_checks`` value for
+            entries with a caddy.proxy.health_check label
+
+    Returns:
+        Tagged routes, one per host
+    """
+    def proxy_handler(entry: RouteEntry) -> Dict:
+        handler = {"handler": "reverse_proxy", "upstreams": [{"dial": entry.target}]}
+        if entry.health_check and health_check is not None:
+            handler["health_checks"] = health_check(entry)
+        return handler
+
+    routes = []
+    for host, entries in table.items():
+        if len(entries) == 1:
+            handle = [proxy_handler(entries[0])]
+        else:
+            # Subroutes are evaluated in order, so specific paths come first
+            handle = [{
+                "handler": "subroute",
+                "routes": [
+                    {"match": [{"path": [entry.path]}] if entry.path != "/" else [],
+                     "handle": [proxy_handler(entry)]}
+                    for entry in entries
+                ]
+            }]
+        routes.append({"@id": make_route_id(host), "match": [{"host": [host]}], "handle": handle})
+
+    routes.append({
+        "@id": FALLBACK_ROUTE_ID,
+        "match": [{"host": ["*"]}],
+        "handle": [{
+            "handler": "static_response",
+            "body": FALLBACK_ROUTE_BODY,
+            "status_code": 200
+        }]
+    })
+    return routes
+
+
+def is_domain(host: str) -> bool:
+    """Check if a host is a public domain (needs HTTPS), not localhost or an IP."""
+    if not host or not isinstance(host, str):
+        return False
+    if re.match(r"^(\d{1,3}\.){3}\d{1,3}$", host) or re.match(r"^([0-9a-fA-F]{0,4}:){2,7}[0-9a-fA-F]{0,4}$", host):
+        return False
+    if host in ("localhost", "127.0.0.1", "::1") or host.endswith(".localhost"):
+        return False
+    return "." in host and not host.startswith(".")
+
+
+def build_caddy_config(routes: List[Dict], domains: List[str], email: Optional[str] = None,
+                       use_staging: bool = False) -> Dict:
+    """Wrap srv0 routes in a full Caddy config.
+
+    Args:
+        routes: Routes (see build_routes)
+        domains: Public domains among the routed hosts; they get an HTTPS
+            listener and ACME certificates
+        email: ACME account email (default: admin@ the first domain)
+        use_staging: Use the Let's Encrypt staging CA
+
+    Returns:
+        Caddy configuration dictionary
+    """
+    config = {
+        "admin": {
+            "listen": ADMIN_LISTEN,
+            "enforce_origin": False,
+            "origins": [f"//{ADMIN_LISTEN}"]
+        },
+        "apps": {
+            "http": {
+                "servers": {
+                    "srv0": {
+                        "listen": [":80", ":443"] if domains else [":80"],
+                        "routes": routes
+                    }
+                }
+            }
+        }
+    }
+    if domains:
+        issuer = {"module": "acme", "email": email or f"admin@{domains[0]}"}
+        if use_staging:
+            issuer["ca"] = STAGING_CA
+        config["apps"]["tls"] = {
+            "automation": {
+                "policies": [{
+                    "subjects": list(domains),
+                    "issuers": [issuer]
+                }]
+            }
+        }
+    return config
+
+
+def uses_staging_ca(config: Optional[Dict]) -> bool:
+    """Check if a Caddy config issues certificates from the staging CA."""
+    policies = (config or {}).get("apps", {}).get("tls", {}).get("automation", {}).get("policies") or []
+    return any(issuer.get("ca") == STAGING_CA for policy in policies for issuer in policy.get("issuers") or [])
+
+
+def get_labels_fingerprint(containers: List[Dict]) -> str:
+    """Hash the names and caddy.* labels of containers (order-independent)."""
+    items = sorted(
+        (container["Names"], sorted((k, v) for k, v in (container.get("Labels") or {}).items()
+                                    if k.startswith("caddy.")))
+        for container in containers
+    )
+    return hashlib.sha256(json.dumps(items).encode("utf-8")).hexdigest()
+
+
+class RouteBuilder:
+    """Builds routes for containers, reusing the last result while labels are unchanged."""
+
+    def __init__(self, health_check: Optional[Callable[[RouteEntry], Dict]] = None):
+        self.health_check = health_check
+        self._lock = threading.Lock()
+        self._fingerprint: Optional[str] = None
+        self._table: Dict[str, List[RouteEntry]] = {}
+        self._routes: List[Dict] = []
+
+    def build(self, containers: List[Dict]) -> Tuple[Dict[str, List[RouteEntry]], List[Dict]]:
+        """Get the route table and routes for containers.
+
+        Returns:
+            Tuple of (route table, routes). The routes are a copy the caller may modify.
+        """
+        fingerprint = get_labels_fingerprint(containers)
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                self._table = build_route_table(containers)
+                self._routes = build_routes(self._table, self.health_check)
+                self._fingerprint = fingerprint
+            return self._table, copy.deepcopy(self._routes)
+
+
+def get_routes(config: Optional[Dict]) -> List[Dict]:
+    """Get the srv0 routes of a Caddy config."""
+    return ((config or {}).get("apps", {}).get("http", {}).get("servers", {})
+            .get("srv0", {}).get("routes", []))
+
+
+def make_route_id(host: str) -> str:
+    """Build the @id of the route for a host."""
+    return ROUTE_ID_PREFIX + re.sub(r"[^A-Za-z0-9.-]", "_", host)
+
+
+def tag_routes(config: Dict) -> Dict:
+    """Give every srv0 route of a generated config a stable @id (in place).
+
+    Host routes are identified by their first host; the catch-all route (host
+    "*") gets FALLBACK_ROUTE_ID. Repeated hosts get a numeric suffix.
+
+    Returns:
+        The same config
+    """
+    seen: Dict[str, int] = {}
+    for route in get_routes(config):
+        hosts = (route.get("match") or [{}])[0].get("host") or ["*"]
+        if hosts[0] == "*":
+            route_id = FALLBACK_ROUTE_ID
+        else:
+            route_id = make_route_id(hosts[0])
+        count = seen.get(route_id, 0)
+        seen[route_id] = count + 1
+        route["@id"] = route_id if count == 0 else f"{route_id}-{count + 1}"
+    return config
+
+
+def _without_routes(config: Optional[Dict]) -> Dict:
+    stripped = copy.deepcopy(config or {})
+    server = stripped.get("apps", {}).get("http", {}).get("servers", {}).get("srv0")
+    if server is not None:
+        server.pop("routes", None)
+    return stripped
+
+
+def diff_routes(live_routes: List[Dict], desired_routes: List[Dict]) -> Optional[Dict[str, List]]:
+    """Compute route changes between the live and the desired config.
+
+    Args:
+        live_routes: Routes currently loaded in Caddy
+        desired_routes: Tagged routes that should be loaded
+
+    Returns:
+        Dictionary with "added", "changed" (lists of routes) and "removed"
+        (list of route ids), or None if the live routes cannot be updated
+        incrementally (untagged routes, or no catch-all route to insert before)
+    """
+    live = {}
+    for route in live_routes:
+        route_id = route.get("@id")
+        if not route_id or route_id in live:
+            return None
+        live[route_id] = route
+    if FALLBACK_ROUTE_ID not in live:
+        return None
+
+    desired = {route["@id"]: route for route in desired_routes}
+    return {
+        "added": [route for route_id, route in desired.items() if route_id not in live],
+        "changed": [route for route_id, route in desired.items()
+                    if route_id in live and live[route_id] != route],
+        "removed": [route_id for route_id in live if route_id not in desired],
+    }
+
+
+def _request(session, method: str, url: str, **kwargs) -> Tuple[bool, str]:
+    try:
+        response = session.request(method, url, timeout=REQUEST_TIMEOUT, **kwargs)
+    except requests.exceptions.RequestException as e:
+        return False, str(e)
+    if response.status_code not in (200, 201):
+        return False, f"HTTP {response.status_code}: {response.text}"
+    return True, ""
+
+
+def load_full_config(admin_url: str, config: Dict, session=None) -> Tuple[bool, str]:
+    """Replace the whole Caddy config with POST /load."""
+    return _request(session or requests, "POST", f"{admin_url}/load", json=config)
+
+
+def apply_route_config(admin_url: str, config: Dict, live_config: Optional[Dict] = None,
+                       session=None, logger=None) -> Tuple[bool, str]:
+    """Bring Caddy to a generated config, touching only the routes that changed.
+
+    Args:
+        admin_url: Caddy admin API base URL
+        config: Generated config (routes are tagged in place)
+        live_config: Current Caddy config, if already fetched
+        session: requests module or Session to send requests with
+        logger: Optional logger for progress messages
+
+    Returns:
+        Tuple of (success, error message)
+    """
+    session = session or requests
+    tag_routes(config)
+    desired_routes = get_routes(config)
+
+    if live_config is None:
+        try:
+            response = session.get(f"{admin_url}/config/", timeout=REQUEST_TIMEOUT)
+            live_config = response.json() if response.status_code == 200 else None
+        except (requests.exceptions.RequestException, ValueError):
+            live_config = None
+
+    changes = None
+    if live_config and _without_routes(live_config) == _without_routes(config):
+        changes = diff_routes(get_routes(live_config), desired_routes)
+    if changes is None:
+        if logger:
+            logger.info("Loading full Caddy configuration")
+        return load_full_config(admin_url, config, session)
+
+    if not any(changes.values()):
+        if logger:
+            logger.info("Caddy routes are up to date")
+        return True, ""
+
+    for route_id in changes["removed"]:
+        ok, error = _request(session, "DELETE", f"{admin_url}/id/{route_id}")
+        if not ok:
+            return False, f"Failed to remove route {route_id}: {error}"
+        if logger:
+            logger.info(f"Removed route {route_id}")
+
+    for route in changes["changed"]:
+        ok, error = _request(session, "PATCH", f"{admin_url}/id/{route['@id']}", json=route)
+        if not ok:
+            return False, f"Failed to update route {route['@id']}: {error}"
+        if logger:
+            logger.info(f"Updated route {route['@id']}")
+
+    if changes["added"]:
+        # New routes go right before the catch-all route, which must stay last
+        remaining = [route.get("@id") for route in get_routes(live_config)
+                     if route.get("@id") not in changes["removed"]]
+        index = remaining.index(FALLBACK_ROUTE_ID)
+        for route in changes["added"]:
+            ok, error = _request(session, "PUT", f"{admin_url}{ROUTES_PATH}/{index}", json=route)
+            if not ok:
+                return False, f"Failed to add route {route['@id']}: {error}"
+            index += 1
+            if logger:
+                logger.info(f"Added route {route['@id']}")
+
+    return True, ""
+
+
+def routes_match(live_config: Optional[Dict], config: Dict) -> bool:
+    """Check whether Caddy serves the same routes as a generated config.
+
+    Host routes may be in any order (they match distinct hosts); the
+    catch-all route must be last.
+    """
+    live_routes = get_routes(live_config)
+    desired_routes = get_routes(tag_routes(config))
+    if len(live_routes) != len(desired_routes):
+        return False
+    if live_routes and live_routes[-1].get("@id") != FALLBACK_ROUTE_ID:
+        return False
+    live = {route.get("@id"): route for route in live_routes}
+    return all(live.get(route["@id"]) == route for route in desired_routes)
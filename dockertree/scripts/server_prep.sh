@@ -115,9 +115,11 @@ if [ "$USE_APT" = "true" ]; then
   echo "[PREP] Droplet initialization check complete"
 fi
 
-echo "[PREP] Installing base tools (curl git)..."
+echo "[PREP] Installing base tools (curl git zstd pigz)..."
 apt_retry "$PKG_UPDATE" || true
 apt_retry "$PKG_INSTALL curl git" || true
+# Multi-threaded compressors used for zstd/gzip packages (optional)
+apt_retry "$PKG_INSTALL zstd pigz" || true
 
 # Configure firewall to allow HTTP, HTTPS, and SSH
 echo "[PREP] Configuring firewall..."
@@ -3,9 +3,19 @@ Shared Caddy configuration utility for dockertree.
 
 This module provides a single source of truth for Caddy label and network
 configuration logic, used by SetupManager, EnvironmentManager, and PackageManager.
+It also configures the global Caddy proxy's routes (configure_caddy_routes).
 """
 
+import os
+import threading
 from typing import Optional, Dict, Any, List
+
+import requests
+
+from ..scripts.caddy_routes import (
+    RouteBuilder, RouteEntry, REQUEST_TIMEOUT, apply_route_config, build_caddy_config, is_domain, uses_staging_ca
+)
+from ..utils.docker_client import get_docker_client
 from ..utils.logging import log_info, log_warning
 
 
@@ -15,6 +25,9 @@ WEB_SERVICE_NAMES = ['web', 'app', 'frontend', 'api']
 # Default port for web services
 DEFAULT_WEB_PORT = 8000
 
+# Admin API of the global Caddy proxy, as published on the host
+CADDY_ADMIN_URL = "http://localhost:2019"
+
 
 def _detect_service_port(service_config: Dict[str, Any]) -> int:
     """
@@ -401,4 +414,82 @@ def update_vite_allowed_hosts_in_compose(
     return updated
 
 
+def _route_health_check(entry: RouteEntry) -> Dict[str, Any]:
+    return {
+        "active": {
+            "path": entry.health_check,
+            "headers": {"Host": [entry.host]},
+            "timeout": "30s",
+            "interval": "10s"
+        }
+    }
+
+
+_route_builder = RouteBuilder(health_check=_route_health_check)
+_admin_session: Optional[requests.Session] = None
+_admin_session_lock = threading.Lock()
+# Worktrees started concurrently must not interleave route updates
+_configure_lock = threading.Lock()
+
 
+def _get_admin_session() -> requests.Session:
+    global _admin_session
+    with _admin_session_lock:
+        if _admin_session is None:
+            _admin_session = requests.Session()
+        return _admin_session
+
+
+def configure_caddy_routes(admin_url: str = CADDY_ADMIN_URL) -> bool:
+    """
+    Point the global Caddy proxy at the running containers with caddy.proxy labels.
+    
+    In-process equivalent of scripts/caddy-dynamic-config.py: containers are
+    listed with the shared Docker client, and only the routes that changed are
+    sent to Caddy's admin API.
+    
+    Args:
+        admin_url: Caddy admin API base URL
+    
+    Returns:
+        True if the routes are configured (or Caddy's admin API is not
+        reachable, in which case Caddy routes from container labels),
+        False if Docker could not be queried or Caddy rejected the routes
+    """
+    with _configure_lock:
+        return _configure_caddy_routes(admin_url)
+
+
+def _configure_caddy_routes(admin_url: str) -> bool:
+    containers = get_docker_client().list_containers(filters={"label": ["caddy.proxy"]})
+    if containers is None:
+        log_warning("Could not list containers to configure Caddy routes")
+        return False
+    
+    session = _get_admin_session()
+    try:
+        response = session.get(f"{admin_url}/config/", timeout=REQUEST_TIMEOUT)
+        live_config = response.json() if response.status_code == 200 else None
+    except (requests.exceptions.RequestException, ValueError) as e:
+        log_info(f"Caddy admin API not accessible, using container label-based routing: {e}")
+        return True
+    if live_config is None:
+        log_info(f"Caddy admin API returned HTTP {response.status_code}, using container label-based routing")
+        return True
+    
+    table, routes = _route_builder.build([
+        {"ID": container.name, "Names": container.name, "Labels": dict(container.labels)}
+        for container in containers
+    ])
+    domains = [host for host in table if is_domain(host)]
+    # Keep staging certificates once Caddy uses them (e.g. after hitting rate limits)
+    use_staging = (os.getenv("USE_STAGING_CERTIFICATES", "").lower() in ("1", "true", "yes", "on")
+                   or uses_staging_ca(live_config))
+    config = build_caddy_config(routes, domains, os.getenv("CADDY_EMAIL"), use_staging)
+    
+    success, error = apply_route_config(admin_url, config, live_config=live_config, session=session)
+    if not success:
+        log_warning(f"Failed to configure Caddy routes: {error}")
+        return False
+    log_info(f"Configured Caddy routes for {len(table)} host(s)")
+    return True
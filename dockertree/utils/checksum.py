@@ -1,23 +1,108 @@
 """
 Checksum utilities for dockertree.
 
-This module provides SHA256 checksum calculation and verification utilities
-for file integrity validation in package operations.
+This module provides checksum calculation and verification utilities for file
+integrity validation in package operations. SHA256 is the default algorithm;
+BLAKE3 and XXH3 are used when the optional ``blake3`` / ``xxhash`` packages are
+installed and selected with ``checksum_algorithm`` in .dockertree/config.yml.
+
+Files are read with large reusable buffers and hashed on a thread pool (the
+hash functions release the GIL while hashing large buffers).
 """
 
 import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
+
+CHECKSUM_SHA256 = "sha256"
+CHECKSUM_BLAKE3 = "blake3"
+CHECKSUM_XXH3 = "xxh3"
+CHECKSUM_ALGORITHMS = (CHECKSUM_SHA256, CHECKSUM_BLAKE3, CHECKSUM_XXH3)
+DEFAULT_CHECKSUM_ALGORITHM = CHECKSUM_SHA256
+
+# Read buffer size for file hashing
+CHECKSUM_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Maximum number of files hashed concurrently
+CHECKSUM_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+# Optional packages providing the faster algorithms
+_ALGORITHM_PACKAGES = {CHECKSUM_BLAKE3: "blake3", CHECKSUM_XXH3: "xxhash"}
+
+
+def new_hasher(algorithm: str = DEFAULT_CHECKSUM_ALGORITHM):
+    """Create a hash object for a checksum algorithm.
+    
+    Args:
+        algorithm: One of CHECKSUM_ALGORITHMS
+        
+    Returns:
+        Object with update() and hexdigest() methods
+        
+    Raises:
+        ValueError: If the algorithm is unknown or its package is not installed
+    """
+    if algorithm == CHECKSUM_SHA256:
+        return hashlib.sha256()
+    try:
+        if algorithm == CHECKSUM_BLAKE3:
+            from blake3 import blake3
+            return blake3()
+        if algorithm == CHECKSUM_XXH3:
+            import xxhash
+            return xxhash.xxh3_128()
+    except ImportError:
+        raise ValueError(f"Checksum algorithm '{algorithm}' requires the '{_ALGORITHM_PACKAGES[algorithm]}' package")
+    raise ValueError(f"Unknown checksum algorithm: {algorithm}")
+
+
+def is_checksum_algorithm_available(algorithm: str) -> bool:
+    """Check whether a checksum algorithm can be used on this machine."""
+    try:
+        new_hasher(algorithm)
+        return True
+    except ValueError:
+        return False
+
+
+def select_checksum_algorithm(preference: Optional[str] = None) -> str:
+    """Select the checksum algorithm for new packages.
+    
+    Args:
+        preference: Algorithm name or "auto". If None, reads `checksum_algorithm`
+            from .dockertree/config.yml (default "sha256").
+            
+    Returns:
+        An available algorithm. "auto" prefers BLAKE3, then XXH3, then SHA256.
+    """
+    if preference is None:
+        from ..config.settings import _get_config_value
+        preference = _get_config_value(["checksum_algorithm"], DEFAULT_CHECKSUM_ALGORITHM)
+    preference = (preference or DEFAULT_CHECKSUM_ALGORITHM).lower()
+    
+    candidates = [CHECKSUM_BLAKE3, CHECKSUM_XXH3] if preference == "auto" else [preference]
+    for algorithm in candidates:
+        if is_checksum_algorithm_available(algorithm):
+            return algorithm
+    if preference != "auto":
+        from .logging import log_warning
+        log_warning(f"Checksum algorithm '{preference}' is not available, using {DEFAULT_CHECKSUM_ALGORITHM}")
+    return DEFAULT_CHECKSUM_ALGORITHM
 
 
-def calculate_file_checksum(file_path: Path) -> str:
-    """Calculate SHA256 checksum of file.
+def calculate_file_checksum(file_path: Path, algorithm: str = DEFAULT_CHECKSUM_ALGORITHM,
+                            buffer_size: int = CHECKSUM_BUFFER_SIZE) -> str:
+    """Calculate checksum of file.
     
     Args:
         file_path: Path to the file to checksum
+        algorithm: Checksum algorithm (default SHA256)
+        buffer_size: Read buffer size in bytes
         
     Returns:
-        SHA256 hex digest of the file
+        Hex digest of the file
         
     Raises:
         FileNotFoundError: If file doesn't exist
@@ -26,34 +111,89 @@ def calculate_file_checksum(file_path: Path) -> str:
     if not file_path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
     
-    sha256 = hashlib.sha256()
+    hasher = new_hasher(algorithm)
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
     try:
-        with open(file_path, 'rb') as f:
-            for block in iter(lambda: f.read(4096), b''):
-                sha256.update(block)
+        with open(file_path, 'rb', buffering=0) as f:
+            while True:
+                size = f.readinto(buffer)
+                if not size:
+                    break
+                hasher.update(view[:size])
     except IOError as e:
         raise IOError(f"Cannot read file {file_path}: {e}")
     
-    return sha256.hexdigest()
+    return hasher.hexdigest()
 
 
-def verify_file_checksum(file_path: Path, expected_checksum: str) -> bool:
+def verify_file_checksum(file_path: Path, expected_checksum: str,
+                         algorithm: str = DEFAULT_CHECKSUM_ALGORITHM) -> bool:
     """Verify file checksum matches expected value.
     
     Args:
         file_path: Path to the file to verify
-        expected_checksum: Expected SHA256 hex digest
+        expected_checksum: Expected hex digest
+        algorithm: Checksum algorithm (default SHA256)
         
     Returns:
         True if checksums match, False otherwise
     """
     try:
-        actual = calculate_file_checksum(file_path)
+        actual = calculate_file_checksum(file_path, algorithm)
         return actual == expected_checksum
     except (FileNotFoundError, IOError):
         return False
 
 
+def calculate_checksums(file_paths: Iterable[Path], algorithm: str = DEFAULT_CHECKSUM_ALGORITHM,
+                        max_workers: int = CHECKSUM_MAX_WORKERS) -> Dict[Path, str]:
+    """Calculate checksums of several files in parallel.
+    
+    Args:
+        file_paths: Files to checksum
+        algorithm: Checksum algorithm (default SHA256)
+        max_workers: Maximum number of files hashed concurrently
+        
+    Returns:
+        Dictionary of file path to hex digest
+        
+    Raises:
+        FileNotFoundError: If a file doesn't exist
+        IOError: If a file cannot be read
+    """
+    file_paths = list(file_paths)
+    if len(file_paths) <= 1 or max_workers <= 1:
+        return {path: calculate_file_checksum(path, algorithm) for path in file_paths}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(file_paths))) as executor:
+        digests = executor.map(lambda path: calculate_file_checksum(path, algorithm), file_paths)
+        return dict(zip(file_paths, digests))
+
+
+def verify_checksums(base_dir: Path, expected_checksums: Dict[str, str],
+                     algorithm: str = DEFAULT_CHECKSUM_ALGORITHM,
+                     max_workers: int = CHECKSUM_MAX_WORKERS) -> List[str]:
+    """Verify several files against expected checksums in parallel.
+    
+    Args:
+        base_dir: Directory the relative paths are resolved against
+        expected_checksums: Dictionary of relative path to expected hex digest
+        algorithm: Checksum algorithm (default SHA256)
+        max_workers: Maximum number of files hashed concurrently
+        
+    Returns:
+        Relative paths that are missing or do not match (empty if all match)
+    """
+    relative_paths = list(expected_checksums)
+    
+    def check(relative_path: str) -> bool:
+        return verify_file_checksum(base_dir / relative_path, expected_checksums[relative_path], algorithm)
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(relative_paths) or 1))) as executor:
+        results = list(executor.map(check, relative_paths))
+    return [path for path, ok in zip(relative_paths, results) if not ok]
+
+
 def calculate_directory_checksum(directory_path: Path, exclude_patterns: Optional[list] = None) -> str:
     """Calculate combined checksum for all files in a directory.
     
@@ -85,7 +225,7 @@ def calculate_directory_checksum(directory_path: Path, exclude_patterns: Optiona
             
         try:
             with open(file_path, 'rb') as f:
-                for block in iter(lambda: f.read(4096), b''):
+                for block in iter(lambda: f.read(CHECKSUM_BUFFER_SIZE), b''):
                     sha256.update(block)
         except IOError:
             # Skip files that can't be read
@@ -111,3 +251,80 @@ def verify_directory_checksum(directory_path: Path, expected_checksum: str,
         return actual == expected_checksum
     except Exception:
         return False
+
+
+class HashingReader:
+    """File-like wrapper that computes a checksum of everything read through it.
+    
+    Used to hash data while it is being copied (e.g. into a tar archive) so that
+    large streams are not read a second time just to checksum them.
+    """
+    
+    def __init__(self, fileobj, algorithm: str = DEFAULT_CHECKSUM_ALGORITHM):
+        self._fileobj = fileobj
+        self._hasher = new_hasher(algorithm)
+        self.bytes_read = 0
+    
+    def read(self, size: int = -1) -> bytes:
+        data = self._fileobj.read(size)
+        if data:
+            self._hasher.update(data)
+            self.bytes_read += len(data)
+        return data
+    
+    def hexdigest(self) -> str:
+        return self._hasher.hexdigest()
+
+
+class HashingWriter:
+    """File-like wrapper that feeds everything written through it to a hash object.
+    
+    Used to checksum an archive while it is being written.
+    """
+    
+    def __init__(self, fileobj, hasher):
+        self._fileobj = fileobj
+        self._hasher = hasher
+        self.bytes_written = 0
+    
+    def write(self, data) -> int:
+        self._hasher.update(data)
+        self.bytes_written += len(data)
+        return self._fileobj.write(data)
+    
+    def flush(self) -> None:
+        self._fileobj.flush()
+
+
+class TreeChecksum:
+    """Order-independent checksum over a tree of named files and links.
+    
+    Entries are combined in sorted order, so the same tree produces the same
+    checksum regardless of the order in which a tar stream lists its members.
+    """
+    
+    def __init__(self, algorithm: str = DEFAULT_CHECKSUM_ALGORITHM):
+        self.algorithm = algorithm
+        self._entries = {}
+    
+    def add_file(self, name: str, checksum: str) -> None:
+        """Record a regular file by its relative name and content checksum."""
+        self._entries[name] = f"file:{checksum}"
+    
+    def add_fileobj(self, name: str, fileobj) -> int:
+        """Hash a file object and record it. Returns the number of bytes read."""
+        reader = HashingReader(fileobj, self.algorithm)
+        for block in iter(lambda: reader.read(CHECKSUM_BUFFER_SIZE), b''):
+            pass
+        self.add_file(name, reader.hexdigest())
+        return reader.bytes_read
+    
+    def add_link(self, name: str, target: str) -> None:
+        """Record a symbolic or hard link by its relative name and target."""
+        self._entries[name] = f"link:{target}"
+    
+    def hexdigest(self) -> str:
+        hasher = new_hasher(self.algorithm)
+        for name in sorted(self._entries):
+            hasher.update(f"{name}\0{self._entries[name]}\n".encode('utf-8', 'surrogateescape'))
+        return hasher.hexdigest()
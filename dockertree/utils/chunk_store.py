@@ -0,0 +1,342 @@
+"""
+Content-addressed chunk store for incremental volume backups.
+
+Incremental backups split each file in a volume into fixed-size chunks, store
+every chunk once under its checksum and record the volume tree in a JSON
+manifest::
+
+    .dockertree/backups/
+        chunks/ab/ab12...ef            (zlib-compressed chunk, named by checksum)
+        manifests/<branch>/<branch>_<timestamp>.json
+
+Files are the natural chunk boundaries in a volume: unchanged files produce
+the same chunks, and databases such as PostgreSQL update fixed-size pages in
+place, so changed data does not shift the chunk boundaries of a file. A later
+backup therefore only writes the chunks that changed plus a new manifest.
+"""
+
+import json
+import os
+import tarfile
+import tempfile
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .checksum import DEFAULT_CHECKSUM_ALGORITHM, new_hasher
+from .compression import detect_compression, open_archive_reader, open_archive_writer
+from .seekable_archive import INDEX_MEMBER_NAME
+
+# Size of the chunks files are split into
+CHUNK_SIZE = 1024 * 1024
+
+# zlib level used for stored chunks (favours speed over ratio)
+CHUNK_COMPRESSION_LEVEL = 1
+
+MANIFEST_FORMAT = "dockertree-chunk-manifest"
+PACKAGE_MANIFEST_FORMAT = "dockertree-package-manifest"
+MANIFEST_VERSION = 1
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_name, path)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+
+
+class ChunkStore:
+    """Local content-addressed store of volume data chunks and backup manifests."""
+
+    def __init__(self, root: Path, algorithm: str = DEFAULT_CHECKSUM_ALGORITHM):
+        """Initialize chunk store.
+
+        Args:
+            root: Store directory (created on first write)
+            algorithm: Checksum algorithm chunks are addressed by
+        """
+        self.root = Path(root)
+        self.algorithm = algorithm
+        self.chunks_dir = self.root / "chunks"
+        self.manifests_dir = self.root / "manifests"
+
+    @classmethod
+    def for_manifest(cls, manifest_path: Path, algorithm: str = DEFAULT_CHECKSUM_ALGORITHM) -> "ChunkStore":
+        """Get the store a manifest was written to (manifests/<branch>/<file>)."""
+        return cls(Path(manifest_path).resolve().parents[2], algorithm)
+
+    def chunk_path(self, digest: str) -> Path:
+        """Get the file a chunk is stored in."""
+        return self.chunks_dir / digest[:2] / digest
+
+    def has_chunk(self, digest: str) -> bool:
+        """Check whether a chunk is already stored."""
+        return self.chunk_path(digest).exists()
+
+    def put_chunk(self, data: bytes) -> Tuple[str, bool]:
+        """Store a chunk unless an identical one is already stored.
+
+        Args:
+            data: Chunk contents
+
+        Returns:
+            Tuple of (chunk checksum, whether the chunk was newly written)
+        """
+        hasher = new_hasher(self.algorithm)
+        hasher.update(data)
+        digest = hasher.hexdigest()
+        if self.has_chunk(digest):
+            return digest, False
+        _write_atomic(self.chunk_path(digest), zlib.compress(data, CHUNK_COMPRESSION_LEVEL))
+        return digest, True
+
+    def put_stream(self, fileobj, hasher=None) -> Tuple[List[str], int]:
+        """Split a file object into chunks and store the ones not already stored.
+
+        Args:
+            fileobj: Readable file object
+            hasher: Optional hash object fed with the whole stream
+
+        Returns:
+            Tuple of (chunk checksums, bytes in newly written chunks)
+        """
+        chunks = []
+        new_bytes = 0
+        for data in iter(lambda: fileobj.read(CHUNK_SIZE), b""):
+            digest, is_new = self.put_chunk(data)
+            if hasher is not None:
+                hasher.update(data)
+            chunks.append(digest)
+            if is_new:
+                new_bytes += len(data)
+        return chunks, new_bytes
+
+    def get_chunk(self, digest: str) -> bytes:
+        """Read a chunk, verifying its checksum.
+
+        Corrupt chunks (e.g. from an interrupted upload) are removed, so the
+        next backup or upload that needs them writes them again.
+
+        Raises:
+            FileNotFoundError: If the chunk is not in the store
+            ValueError: If the stored chunk is corrupt
+        """
+        path = self.chunk_path(digest)
+        if not path.exists():
+            raise FileNotFoundError(f"Chunk {digest} not found in {self.chunks_dir}")
+        try:
+            data = zlib.decompress(path.read_bytes())
+        except zlib.error as e:
+            path.unlink()
+            raise ValueError(f"Chunk {digest} is corrupt: {e}")
+        hasher = new_hasher(self.algorithm)
+        hasher.update(data)
+        if hasher.hexdigest() != digest:
+            path.unlink()
+            raise ValueError(f"Chunk {digest} is corrupt: checksum mismatch")
+        return data
+
+    def open_chunks(self, digests: Iterable[str]) -> "ChunkReader":
+        """Open a sequence of chunks as one readable file object."""
+        return ChunkReader(self, digests)
+
+    def get_manifest_dir(self, branch_name: str) -> Path:
+        """Get the directory holding a branch's manifests."""
+        return self.manifests_dir / branch_name
+
+    def write_manifest(self, branch_name: str, manifest: Dict[str, Any]) -> Path:
+        """Write a backup manifest for a branch.
+
+        Returns:
+            Path to the manifest file
+        """
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = self.get_manifest_dir(branch_name) / f"{branch_name}_{timestamp}.json"
+        _write_atomic(path, json.dumps(manifest, indent=2).encode("utf-8"))
+        return path
+
+    def list_manifests(self, branch_name: str) -> List[Path]:
+        """List a branch's manifests, oldest first."""
+        manifest_dir = self.get_manifest_dir(branch_name)
+        if not manifest_dir.exists():
+            return []
+        return sorted(manifest_dir.glob(f"{branch_name}_*.json"))
+
+    def latest_manifest(self, branch_name: str) -> Optional[Path]:
+        """Get a branch's most recent manifest, if any."""
+        manifests = self.list_manifests(branch_name)
+        return manifests[-1] if manifests else None
+
+
+class ChunkReader:
+    """Read-only file object over a sequence of stored chunks."""
+
+    def __init__(self, store: ChunkStore, digests: Iterable[str]):
+        self._store = store
+        self._digests = iter(digests)
+        self._buffer = memoryview(b"")
+
+    def read(self, size: int = -1) -> bytes:
+        parts = []
+        while size < 0 or size > 0:
+            if not self._buffer:
+                digest = next(self._digests, None)
+                if digest is None:
+                    break
+                self._buffer = memoryview(self._store.get_chunk(digest))
+                continue
+            take = len(self._buffer) if size < 0 else min(size, len(self._buffer))
+            parts.append(self._buffer[:take])
+            self._buffer = self._buffer[take:]
+            if size > 0:
+                size -= take
+        return b"".join(parts)
+
+
+def is_chunk_manifest(path: Path) -> bool:
+    """Check whether a file is an incremental backup manifest."""
+    if not str(path).endswith(".json"):
+        return False
+    try:
+        with open(path, "r") as f:
+            return json.load(f).get("format") == MANIFEST_FORMAT
+    except (OSError, ValueError, AttributeError):
+        return False
+
+
+def load_manifest(path: Path, manifest_format: str = MANIFEST_FORMAT) -> Dict[str, Any]:
+    """Load an incremental backup or package manifest.
+
+    Args:
+        path: Manifest file
+        manifest_format: MANIFEST_FORMAT or PACKAGE_MANIFEST_FORMAT
+
+    Raises:
+        ValueError: If the file is not a supported manifest
+    """
+    with open(path, "r") as f:
+        manifest = json.load(f)
+    if not isinstance(manifest, dict) or manifest.get("format") != manifest_format:
+        raise ValueError(f"{path} is not a dockertree {'package' if manifest_format == PACKAGE_MANIFEST_FORMAT else 'backup'} manifest")
+    if manifest.get("version", 0) > MANIFEST_VERSION:
+        raise ValueError(f"Backup manifest version {manifest.get('version')} is not supported")
+    return manifest
+
+
+def entry_from_member(member: tarfile.TarInfo, name: str,
+                      chunks: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Describe a tar member in a manifest.
+
+    Args:
+        member: Member read from a volume tar stream
+        name: Path relative to the volume root ("." for the root)
+        chunks: Chunk checksums of a regular file's contents
+    """
+    entry = {
+        "name": name,
+        "type": member.type.decode("ascii"),
+        "mode": member.mode,
+        "uid": member.uid,
+        "gid": member.gid,
+        "mtime": int(member.mtime),
+    }
+    if member.isfile():
+        entry["size"] = member.size
+        entry["chunks"] = chunks or []
+    elif member.issym() or member.islnk():
+        entry["linkname"] = member.linkname
+    elif member.ischr() or member.isblk():
+        entry["devmajor"] = member.devmajor
+        entry["devminor"] = member.devminor
+    return entry
+
+
+def member_from_entry(entry: Dict[str, Any]) -> tarfile.TarInfo:
+    """Rebuild a tar member (without contents) from a manifest entry."""
+    member = tarfile.TarInfo(entry["name"])
+    member.type = entry["type"].encode("ascii")
+    member.mode = entry["mode"]
+    member.uid = entry["uid"]
+    member.gid = entry["gid"]
+    member.mtime = entry["mtime"]
+    member.size = entry.get("size", 0)
+    member.linkname = entry.get("linkname", "")
+    member.devmajor = entry.get("devmajor", 0)
+    member.devminor = entry.get("devminor", 0)
+    return member
+
+
+def build_package_manifest(package_path: Path, store: ChunkStore) -> Dict[str, Any]:
+    """Chunk a package archive into a store and describe it in a manifest.
+
+    The manifest lists every member of the (decompressed) package with the
+    chunks of its contents, so a copy of the package can be rebuilt anywhere
+    the chunks are available. Unlike the compressed package file, chunks of
+    unchanged files are identical between exports. The index of a seekable
+    package is not stored; rebuilding the package writes a new one.
+
+    Args:
+        package_path: Package archive (any supported compression)
+        store: Chunk store to write new chunks into
+
+    Returns:
+        Package manifest
+    """
+    entries = []
+    total_bytes = new_bytes = 0
+    seekable = False
+    with open_archive_reader(package_path) as tar:
+        for member in tar:
+            if member.name == INDEX_MEMBER_NAME:
+                seekable = True
+                continue
+            chunks = []
+            if member.isfile():
+                chunks, written = store.put_stream(tar.extractfile(member))
+                total_bytes += member.size
+                new_bytes += written
+            entries.append(entry_from_member(member, member.name, chunks))
+        pax_headers = dict(tar.pax_headers)
+    return {
+        "format": PACKAGE_MANIFEST_FORMAT,
+        "version": MANIFEST_VERSION,
+        "package_name": Path(package_path).name,
+        "compression": detect_compression(package_path),
+        "seekable": seekable,
+        "checksum_algorithm": store.algorithm,
+        "pax_headers": pax_headers,
+        "bytes": total_bytes,
+        "new_bytes": new_bytes,
+        "entries": entries
+    }
+
+
+def get_manifest_chunks(manifest: Dict[str, Any]) -> List[str]:
+    """List the distinct chunks a package manifest refers to, in first-use order."""
+    return list(dict.fromkeys(digest for entry in manifest["entries"] for digest in entry.get("chunks", [])))
+
+
+def write_package_from_manifest(manifest: Dict[str, Any], store: ChunkStore, output_path: Path,
+                                compression_level: Optional[int] = None) -> None:
+    """Rebuild a package archive from its manifest and stored chunks.
+
+    Raises:
+        FileNotFoundError: If a chunk is missing from the store
+        OSError: If the archive cannot be written
+        ValueError: If a chunk is corrupt
+    """
+    with open_archive_writer(output_path, manifest["compression"], compression_level,
+                             pax_headers=manifest.get("pax_headers") or None,
+                             seekable=manifest.get("seekable", False)) as tar:
+        for entry in manifest["entries"]:
+            member = member_from_entry(entry)
+            if member.isfile():
+                tar.addfile(member, store.open_chunks(entry["chunks"]))
+            else:
+                tar.addfile(member)
@@ -0,0 +1,307 @@
+"""
+Archive compression utilities for dockertree.
+
+Packages and volume backups are tar archives compressed with gzip, zstd or
+nothing at all. Compression runs in an external multi-threaded compressor
+(``zstd -T0`` or ``pigz``) when one is installed, with the tar stream piped
+into it, so large exports are not bound to a single core. gzip falls back to
+Python's built-in compressor when pigz is not available.
+
+Readers detect the format from the file's magic bytes, so imports and restores
+work regardless of file extension. gzip archives can also be written in the
+seekable layout (see seekable_archive), which lets iter_archive_members read
+selected members without decompressing the rest of the archive.
+"""
+
+import gzip
+import os
+import shutil
+import subprocess
+import tarfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .checksum import HashingWriter
+from .logging import log_info
+from .seekable_archive import open_seekable_writer, read_archive_index
+
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_ZSTD = "zstd"
+COMPRESSION_NONE = "none"
+COMPRESSION_FORMATS = (COMPRESSION_GZIP, COMPRESSION_ZSTD, COMPRESSION_NONE)
+DEFAULT_COMPRESSION = COMPRESSION_GZIP
+
+# File extension for each archive format
+ARCHIVE_EXTENSIONS = {
+    COMPRESSION_GZIP: ".tar.gz",
+    COMPRESSION_ZSTD: ".tar.zst",
+    COMPRESSION_NONE: ".tar",
+}
+
+# Default and maximum compression levels
+DEFAULT_LEVELS = {COMPRESSION_GZIP: 6, COMPRESSION_ZSTD: 3}
+LEVEL_RANGES = {COMPRESSION_GZIP: (1, 9), COMPRESSION_ZSTD: (1, 19)}
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def get_archive_extension(compression: str) -> str:
+    """Get the file extension for an archive format (e.g. ".tar.zst")."""
+    return ARCHIVE_EXTENSIONS[compression]
+
+
+def strip_archive_extension(name: str) -> str:
+    """Remove a known archive extension from a file name."""
+    for extension in sorted(set(ARCHIVE_EXTENSIONS.values()) | {".tgz"}, key=len, reverse=True):
+        if name.endswith(extension):
+            return name[:-len(extension)]
+    return name
+
+
+def resolve_level(compression: str, level: Optional[int] = None) -> Optional[int]:
+    """Validate a compression level, returning the default when none is given.
+
+    Raises:
+        ValueError: If the level is outside the supported range
+    """
+    if compression == COMPRESSION_NONE:
+        return None
+    if level is None:
+        return DEFAULT_LEVELS[compression]
+    low, high = LEVEL_RANGES[compression]
+    if not low <= level <= high:
+        raise ValueError(f"{compression} compression level must be between {low} and {high}")
+    return level
+
+
+def detect_compression(path: Path) -> str:
+    """Detect the compression format of an archive from its magic bytes.
+
+    Args:
+        path: Archive file
+
+    Returns:
+        COMPRESSION_GZIP, COMPRESSION_ZSTD or COMPRESSION_NONE
+    """
+    with open(path, "rb") as f:
+        magic = f.read(4)
+    if magic.startswith(GZIP_MAGIC):
+        return COMPRESSION_GZIP
+    if magic == ZSTD_MAGIC:
+        return COMPRESSION_ZSTD
+    return COMPRESSION_NONE
+
+
+def _require_zstd() -> str:
+    zstd = shutil.which("zstd")
+    if not zstd:
+        raise OSError("zstd compression requires the 'zstd' command-line tool to be installed")
+    return zstd
+
+
+def _finish_process(process: subprocess.Popen, description: str) -> None:
+    stderr = process.stderr.read().decode(errors="replace") if process.stderr else ""
+    if process.wait() != 0:
+        raise OSError(f"{description} failed: {stderr.strip() or f'exit code {process.returncode}'}")
+
+
+def _has_fileno(fileobj) -> bool:
+    try:
+        fileobj.fileno()
+        return True
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+def _copy_stream(source, sink, chunk_size: int = 1024 * 1024) -> None:
+    for chunk in iter(lambda: source.read(chunk_size), b""):
+        sink.write(chunk)
+
+
+@contextmanager
+def _open_output(path) -> Iterator:
+    if hasattr(path, "write"):
+        # Caller owns the stream (e.g. an upload pipe) and closes it
+        yield path
+        return
+    with open(path, "wb") as output:
+        yield output
+
+
+@contextmanager
+def open_archive_writer(path: Path, compression: str = DEFAULT_COMPRESSION,
+                        level: Optional[int] = None, hasher=None,
+                        pax_headers: Optional[Dict[str, str]] = None,
+                        seekable: bool = False) -> Iterator[tarfile.TarFile]:
+    """Open a tar archive for writing with the given compression.
+
+    Args:
+        path: Archive file to create, or a writable binary stream to write
+            the archive to
+        compression: One of COMPRESSION_FORMATS
+        level: Compression level (defaults per format)
+        hasher: Optional hash object (see checksum.new_hasher) fed with the
+            archive file's bytes as they are written, so the finished archive
+            does not need to be read again to checksum it
+        pax_headers: Optional global PAX headers written at the start of the archive
+        seekable: Write gzip archives in the seekable layout, compressed on a
+            thread pool instead of pigz (ignored for zstd and uncompressed
+            archives; uncompressed tar members can already be reached directly)
+
+    Yields:
+        TarFile opened for sequential writing
+
+    Raises:
+        OSError: If the compressor is unavailable or fails
+        ValueError: If the format or level is invalid
+    """
+    if compression not in COMPRESSION_FORMATS:
+        raise ValueError(f"Unknown compression format: {compression}")
+    level = resolve_level(compression, level)
+    tar_options = {"pax_headers": pax_headers} if pax_headers else {}
+
+    if compression == COMPRESSION_ZSTD:
+        cmd = [_require_zstd(), "-q", f"-{level}", "-T0", "-c"]
+    elif compression == COMPRESSION_GZIP and shutil.which("pigz"):
+        cmd = ["pigz", f"-{level}", "-p", str(os.cpu_count() or 1), "-c"]
+    else:
+        cmd = None
+
+    with _open_output(path) as output:
+        sink = HashingWriter(output, hasher) if hasher is not None else output
+
+        if compression == COMPRESSION_NONE:
+            with tarfile.open(fileobj=sink, mode="w|", **tar_options) as tar:
+                yield tar
+            return
+
+        if compression == COMPRESSION_GZIP and seekable:
+            with open_seekable_writer(sink, level, pax_headers) as tar:
+                yield tar
+            return
+
+        if cmd is None:
+            log_info("pigz not found, using single-threaded gzip compression")
+            with gzip.GzipFile(fileobj=sink, mode="wb", compresslevel=level) as gz, \
+                    tarfile.open(fileobj=gz, mode="w|", **tar_options) as tar:
+                yield tar
+            return
+
+        # The compressor writes straight to the file unless its output must be
+        # hashed or the output is a stream without a file descriptor
+        direct = hasher is None and _has_fileno(output)
+        process = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE,
+            stdout=output if direct else subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        pump = None
+        pump_errors: List[BaseException] = []
+
+        def pump_output() -> None:
+            try:
+                _copy_stream(process.stdout, sink)
+            except BaseException as e:
+                # e.g. a broken upload pipe or a full disk; killing the compressor
+                # unblocks the tar writer, which then fails on its input pipe
+                pump_errors.append(e)
+                process.kill()
+
+        if not direct:
+            pump = threading.Thread(target=pump_output, daemon=True)
+            pump.start()
+        try:
+            with tarfile.open(fileobj=process.stdin, mode="w|", **tar_options) as tar:
+                yield tar
+        except BaseException:
+            process.kill()
+            process.wait()
+            if not pump_errors:
+                raise
+        finally:
+            try:
+                if not process.stdin.closed:
+                    process.stdin.close()
+            except OSError:
+                if not pump_errors:
+                    raise
+            if pump is not None:
+                pump.join()
+            if pump_errors:
+                raise pump_errors[0]
+        _finish_process(process, f"{cmd[0]} compression")
+
+
+@contextmanager
+def open_archive_reader(path: Path) -> Iterator[tarfile.TarFile]:
+    """Open a gzip, zstd or uncompressed tar archive for reading.
+
+    The format is detected from the file contents. zstd archives are read as a
+    stream, so members must be processed in archive order.
+
+    Args:
+        path: Archive file
+
+    Yields:
+        TarFile opened for reading
+
+    Raises:
+        OSError: If the archive cannot be read or decompression fails
+    """
+    compression = detect_compression(path)
+    if compression == COMPRESSION_GZIP:
+        with tarfile.open(path, "r:gz") as tar:
+            yield tar
+        return
+    if compression == COMPRESSION_NONE:
+        with tarfile.open(path, "r:") as tar:
+            yield tar
+        return
+
+    process = subprocess.Popen(
+        [_require_zstd(), "-q", "-d", "-c", str(path)],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    try:
+        with tarfile.open(fileobj=process.stdout, mode="r|") as tar:
+            yield tar
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+    if process.poll() is None:
+        # Caller stopped before the end of the archive
+        process.kill()
+        process.wait()
+    else:
+        _finish_process(process, "zstd decompression")
+
+
+def iter_archive_members(path: Path, predicate: Optional[Callable[[str], bool]] = None
+                         ) -> Iterator[Tuple[tarfile.TarFile, tarfile.TarInfo]]:
+    """Iterate over the members of an archive whose name predicate accepts.
+
+    Seekable archives only decompress the frames holding accepted members;
+    other archives are read in full, skipping over the rest.
+
+    Args:
+        path: Archive file
+        predicate: Selects members by name (all members if None)
+
+    Yields:
+        Tuples of (TarFile to extract the member from, member), in archive order.
+        The TarFile's pax_headers are the archive's global headers.
+    """
+    index = None
+    if predicate is not None and detect_compression(path) == COMPRESSION_GZIP:
+        index = read_archive_index(path)
+    if index is not None:
+        yield from index.iter_members(predicate)
+        return
+    with open_archive_reader(path) as tar:
+        for member in tar:
+            if predicate is None or predicate(member.name):
+                yield tar, member
@@ -0,0 +1,347 @@
+"""
+Docker Engine API client for dockertree CLI.
+
+Read-only Docker queries (does a volume exist, which containers are running,
+which containers use a volume) go to the Docker Engine API over a pooled HTTP
+connection to the daemon socket instead of forking a ``docker`` process per
+query. Listing calls accept Engine API filters, so a whole set of containers
+or volumes can be fetched with one request and checked in memory.
+
+The ``docker`` CLI is used as a fallback when the API cannot be reached: the
+docker SDK is not installed, the daemon is behind an ``ssh://`` host, or
+``DOCKERTREE_DOCKER_API=0`` is set.
+"""
+
+import json
+import os
+import re
+import subprocess
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .logging import log_info
+
+# Set to "0" to always use the docker CLI
+DOCKER_API_ENV = "DOCKERTREE_DOCKER_API"
+
+# Timeout for Engine API requests, in seconds
+DOCKER_API_TIMEOUT = 30
+
+# Engine API filters: {"label": ["a=b"], "status": ["running"], ...}
+Filters = Mapping[str, List[str]]
+
+
+@dataclass(frozen=True)
+class ContainerSummary:
+    """A container as listed by ``GET /containers/json`` (or ``docker ps``)."""
+    name: str
+    image: str
+    state: str
+    status: str
+    labels: Mapping[str, str] = field(default_factory=dict)
+    volumes: Tuple[str, ...] = ()
+    ports: str = ""
+
+    @property
+    def running(self) -> bool:
+        return self.state == "running"
+
+    @property
+    def health(self) -> Optional[str]:
+        """Healthcheck state ("starting", "healthy", "unhealthy"), None without a healthcheck."""
+        match = re.search(r"\((?:health: )?(starting|healthy|unhealthy)\)", self.status)
+        return match.group(1) if match else None
+
+
+@dataclass(frozen=True)
+class VolumeSummary:
+    """A volume as listed by ``GET /volumes`` (or ``docker volume ls``)."""
+    name: str
+    driver: str = "local"
+    mountpoint: str = ""
+    labels: Mapping[str, str] = field(default_factory=dict)
+
+
+def _format_ports(ports: List[Dict[str, Any]]) -> str:
+    formatted = []
+    for port in ports or []:
+        private = f"{port.get('PrivatePort')}/{port.get('Type', 'tcp')}"
+        if port.get("PublicPort"):
+            formatted.append(f"{port.get('IP', '0.0.0.0')}:{port['PublicPort']}->{private}")
+        else:
+            formatted.append(private)
+    return ", ".join(formatted)
+
+
+def _parse_label_string(labels: str) -> Dict[str, str]:
+    parsed = {}
+    for item in labels.split(",") if labels else []:
+        key, _, value = item.partition("=")
+        if key:
+            parsed[key] = value
+    return parsed
+
+
+def _container_from_api(data: Dict[str, Any]) -> ContainerSummary:
+    names = data.get("Names") or [""]
+    return ContainerSummary(
+        name=names[0].lstrip("/"),
+        image=data.get("Image", ""),
+        state=data.get("State", ""),
+        status=data.get("Status", ""),
+        labels=data.get("Labels") or {},
+        volumes=tuple(m["Name"] for m in data.get("Mounts") or [] if m.get("Type") == "volume" and m.get("Name")),
+        ports=_format_ports(data.get("Ports")),
+    )
+
+
+def _container_from_cli(data: Dict[str, Any]) -> ContainerSummary:
+    status = data.get("Status", "")
+    state = data.get("State") or ("running" if status.startswith("Up") else "exited")
+    return ContainerSummary(
+        name=data.get("Names", "").split(",")[0],
+        image=data.get("Image", ""),
+        state=state,
+        status=status,
+        labels=_parse_label_string(data.get("Labels", "")),
+        volumes=tuple(name for name in data.get("Mounts", "").split(",") if name),
+        ports=data.get("Ports", ""),
+    )
+
+
+# Decimal units, as printed by the docker CLI (e.g. "1.2GB", "512kB")
+_SIZE_UNITS = {"B": 1, "KB": 1000, "MB": 1000 ** 2, "GB": 1000 ** 3, "TB": 1000 ** 4, "PB": 1000 ** 5}
+
+
+def _parse_human_size(size: str) -> Optional[int]:
+    match = re.match(r"^\s*([0-9.]+)\s*([a-zA-Z]*)\s*$", size or "")
+    if not match:
+        return None
+    unit = _SIZE_UNITS.get(match.group(2).upper() or "B")
+    if unit is None:
+        return None
+    return int(float(match.group(1)) * unit)
+
+
+def _volume_from_api(data: Dict[str, Any]) -> VolumeSummary:
+    return VolumeSummary(
+        name=data["Name"],
+        driver=data.get("Driver", ""),
+        mountpoint=data.get("Mountpoint", ""),
+        labels=data.get("Labels") or {},
+    )
+
+
+def _volume_from_cli(data: Dict[str, Any]) -> VolumeSummary:
+    return VolumeSummary(
+        name=data["Name"],
+        driver=data.get("Driver", ""),
+        mountpoint=data.get("Mountpoint", ""),
+        labels=_parse_label_string(data.get("Labels", "")),
+    )
+
+
+class DockerClient:
+    """Docker queries over the Engine API, falling back to the docker CLI."""
+
+    def __init__(self):
+        """Initialize Docker client (the API connection is opened on first use)."""
+        self._api = None
+        self._api_checked = False
+        self._lock = threading.Lock()
+
+    def _get_api(self):
+        """Get the Engine API client, or None to use the CLI."""
+        if self._api_checked:
+            return self._api
+        with self._lock:
+            if not self._api_checked:
+                self._api = self._connect()
+                self._api_checked = True
+        return self._api
+
+    def _connect(self):
+        if os.environ.get(DOCKER_API_ENV, "1") == "0":
+            return None
+        try:
+            import docker
+            from docker.utils import kwargs_from_env
+        except ImportError:
+            return None
+        try:
+            kwargs = kwargs_from_env()
+            if "base_url" not in kwargs:
+                # Follow the active docker context (e.g. Docker Desktop's socket)
+                from docker.context import ContextAPI
+                context = ContextAPI.get_current_context()
+                if context is not None and context.Host:
+                    kwargs["base_url"] = context.Host
+            if str(kwargs.get("base_url", "")).startswith("ssh://"):
+                return None
+            # version=None negotiates the API version, which also checks the daemon is reachable
+            return docker.APIClient(timeout=DOCKER_API_TIMEOUT, **kwargs)
+        except Exception as e:
+            log_info(f"Docker Engine API unavailable, using docker CLI: {e}")
+            return None
+
+    def reset(self) -> None:
+        """Close the API connection; the next query reconnects."""
+        with self._lock:
+            if self._api is not None:
+                try:
+                    self._api.close()
+                except Exception:
+                    pass
+            self._api = None
+            self._api_checked = False
+
+    def _api_failed(self, error: Exception) -> None:
+        # Stop using the API for the rest of the run rather than failing every query
+        log_info(f"Docker Engine API request failed, using docker CLI: {error}")
+        with self._lock:
+            self._api = None
+            self._api_checked = True
+
+    @staticmethod
+    def _cli_filter_args(filters: Optional[Filters]) -> List[str]:
+        args = []
+        for key, values in (filters or {}).items():
+            for value in values:
+                args.extend(["--filter", f"{key}={value}"])
+        return args
+
+    def list_containers(self, all: bool = False, filters: Optional[Filters] = None) -> Optional[List[ContainerSummary]]:
+        """List containers.
+
+        Args:
+            all: Include stopped containers
+            filters: Engine API filters (same keys as ``docker ps --filter``)
+
+        Returns:
+            List of containers, or None if Docker could not be queried
+        """
+        api = self._get_api()
+        if api is not None:
+            try:
+                return [_container_from_api(data) for data in api.containers(all=all, filters=dict(filters or {}))]
+            except Exception as e:
+                self._api_failed(e)
+        cmd = ["docker", "ps", "--no-trunc", "--format", "{{json .}}"]
+        if all:
+            cmd.insert(2, "-a")
+        try:
+            result = subprocess.run(cmd + self._cli_filter_args(filters), capture_output=True, text=True, check=True)
+            return [_container_from_cli(json.loads(line)) for line in result.stdout.splitlines() if line.strip()]
+        except (subprocess.CalledProcessError, FileNotFoundError, ValueError):
+            return None
+
+    def list_volume_names(self, filters: Optional[Filters] = None) -> Optional[List[str]]:
+        """List volume names.
+
+        Returns:
+            Volume names, or None if Docker could not be queried
+        """
+        api = self._get_api()
+        if api is not None:
+            try:
+                return [volume["Name"] for volume in api.volumes(filters=dict(filters or {})).get("Volumes") or []]
+            except Exception as e:
+                self._api_failed(e)
+        try:
+            result = subprocess.run(["docker", "volume", "ls", "-q"] + self._cli_filter_args(filters),
+                                    capture_output=True, text=True, check=True)
+            return [line.strip() for line in result.stdout.splitlines() if line.strip()]
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            return None
+
+    def list_volumes(self, filters: Optional[Filters] = None) -> Optional[List[VolumeSummary]]:
+        """List volumes with their driver, mountpoint and labels.
+
+        Returns:
+            Volumes, or None if Docker could not be queried
+        """
+        api = self._get_api()
+        if api is not None:
+            try:
+                return [_volume_from_api(data) for data in api.volumes(filters=dict(filters or {})).get("Volumes") or []]
+            except Exception as e:
+                self._api_failed(e)
+        try:
+            result = subprocess.run(["docker", "volume", "ls", "--format", "{{json .}}"] + self._cli_filter_args(filters),
+                                    capture_output=True, text=True, check=True)
+            return [_volume_from_cli(json.loads(line)) for line in result.stdout.splitlines() if line.strip()]
+        except (subprocess.CalledProcessError, FileNotFoundError, ValueError, KeyError):
+            return None
+
+    def volume_usage(self) -> Optional[Dict[str, int]]:
+        """Get the disk usage of every volume, as computed by the daemon.
+
+        Uses ``GET /system/df`` (``docker system df -v``): one request for all
+        volumes instead of a container per volume.
+
+        Returns:
+            Dictionary of volume name to size in bytes (volumes the daemon
+            could not size are left out), or None if Docker could not be queried
+        """
+        api = self._get_api()
+        if api is not None:
+            try:
+                usage = {}
+                for volume in api.df().get("Volumes") or []:
+                    size = (volume.get("UsageData") or {}).get("Size", -1)
+                    if size >= 0:
+                        usage[volume["Name"]] = size
+                return usage
+            except Exception as e:
+                self._api_failed(e)
+        try:
+            result = subprocess.run(["docker", "system", "df", "-v", "--format", "{{json .Volumes}}"],
+                                    capture_output=True, text=True, check=True)
+            usage = {}
+            for volume in json.loads(result.stdout or "[]") or []:
+                size = _parse_human_size(volume.get("Size", ""))
+                if size is not None:
+                    usage[volume["Name"]] = size
+            return usage
+        except (subprocess.CalledProcessError, FileNotFoundError, ValueError, KeyError):
+            return None
+
+    def _inspect(self, kind: str, name: str) -> bool:
+        api = self._get_api()
+        if api is not None:
+            from docker.errors import NotFound
+            try:
+                getattr(api, f"inspect_{kind}")(name)
+                return True
+            except NotFound:
+                return False
+            except Exception as e:
+                self._api_failed(e)
+        try:
+            subprocess.run(["docker", kind, "inspect", name], capture_output=True, check=True)
+            return True
+        except (subprocess.CalledProcessError, Exception):
+            return False
+
+    def volume_exists(self, volume_name: str) -> bool:
+        """Check if a volume exists (False if Docker could not be queried)."""
+        return self._inspect("volume", volume_name)
+
+    def network_exists(self, network_name: str) -> bool:
+        """Check if a network exists (False if Docker could not be queried)."""
+        return self._inspect("network", network_name)
+
+
+_client: Optional[DockerClient] = None
+_client_lock = threading.Lock()
+
+
+def get_docker_client() -> DockerClient:
+    """Get the Docker client shared by all of dockertree."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = DockerClient()
+    return _client
@@ -5,10 +5,14 @@ This module provides colored output and logging functionality that matches
 the bash script's output format.
 """
 
+import threading
+import time
 from datetime import datetime
 from typing import Any, Optional
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import (
+    BarColumn, DownloadColumn, Progress, SpinnerColumn, TaskID, TextColumn, TimeElapsedColumn, TransferSpeedColumn
+)
 from rich.panel import Panel
 from rich.text import Text
 
@@ -174,6 +178,58 @@ def show_progress(message: str) -> Progress:
         transient=True
     )
 
+class TransferProgress:
+    """Combined progress of concurrent transfers: one row per item plus a total row.
+
+    Safe to update from worker threads. Nothing is displayed in MCP mode.
+    """
+    
+    def __init__(self, description: str):
+        self.progress = Progress(
+            TextColumn(f"[{Colors.BLUE}]{{task.description}}[/{Colors.BLUE}]"),
+            BarColumn(),
+            DownloadColumn(),
+            TransferSpeedColumn(),
+            TimeElapsedColumn(),
+            console=console,
+            transient=True,
+            disable=_mcp_mode
+        )
+        self.total_task = self.progress.add_task(description, total=0)
+        self.bytes = 0
+        self.start_time = time.monotonic()
+        self._total: Optional[int] = 0  # None once an item of unknown size is added
+        self._lock = threading.Lock()
+    
+    def __enter__(self) -> "TransferProgress":
+        self.start_time = time.monotonic()
+        self.progress.start()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.progress.stop()
+    
+    def add(self, description: str, total: Optional[int] = None) -> TaskID:
+        """Add an item; total is its size in bytes, if known."""
+        with self._lock:
+            if total is None:
+                self._total = None
+            elif self._total is not None:
+                self._total += total
+            self.progress.update(self.total_task, total=self._total)
+        return self.progress.add_task(description, total=total)
+    
+    def advance(self, task: TaskID, num_bytes: int) -> None:
+        """Record bytes transferred for an item."""
+        with self._lock:
+            self.bytes += num_bytes
+        self.progress.advance(task, num_bytes)
+        self.progress.advance(self.total_task, num_bytes)
+    
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.start_time
+
 def format_elapsed_time(seconds: float) -> str:
     """Format elapsed time in seconds into a readable string.
     
@@ -196,6 +252,36 @@ def format_elapsed_time(seconds: float) -> str:
     mins = int(minutes % 60)
     return f"{hours}h {mins}m {secs}s"
 
+def format_size(num_bytes: float) -> str:
+    """Format a byte count into a readable string.
+
+    Args:
+        num_bytes: Size in bytes
+
+    Returns:
+        Formatted string like "512 B", "1.5 MB" or "2.3 GB"
+    """
+    size = float(num_bytes)
+    units = ("B", "KB", "MB", "GB", "TB")
+    for unit in units:
+        if size < 1024 or unit == units[-1]:
+            return f"{int(size)} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def format_throughput(num_bytes: float, seconds: float) -> str:
+    """Format a transfer rate from a byte count and elapsed time.
+
+    Args:
+        num_bytes: Number of bytes transferred
+        seconds: Elapsed time in seconds
+
+    Returns:
+        Formatted string like "45.2 MB/s"
+    """
+    if seconds <= 0:
+        return "n/a"
+    return f"{format_size(num_bytes / seconds)}/s"
+
 def error_exit(message: str, exit_code: int = 1) -> None:
     """Log an error and exit."""
     log_error(message)
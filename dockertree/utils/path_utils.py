@@ -193,17 +193,15 @@ def detect_execution_context() -> tuple[Optional[Path], Optional[str], bool]:
     # Primary detection: check if we have a local .dockertree/config.yml
     # This indicates we're in a fractal worktree or project root
     if (current_path / ".dockertree" / "config.yml").exists():
-        # Check if this is a worktree by looking at git worktree list
+        # Check if this is a worktree by looking it up in the worktree registry
         # or by checking if we're under a "worktrees" directory
         try:
             import subprocess
-            result = subprocess.run(["git", "worktree", "list"], 
-                                 capture_output=True, text=True, check=True, cwd=current_path)
-            # If we can run git worktree list from here, we're in a git repo
-            # Check if current path is listed as a worktree
-            if f"[{current_path.name}]" in result.stdout:
-                branch_name = get_worktree_branch_name(current_path)
-                return current_path, branch_name, True
+            from .worktree_registry import get_worktree_registry
+            worktree = get_worktree_registry(current_path).get_by_path(current_path)
+            # Linked worktrees check out their own branch (named like the directory)
+            if worktree is not None and worktree.branch == current_path.name:
+                return current_path, worktree.branch, True
         except (subprocess.CalledProcessError, FileNotFoundError):
             pass
         
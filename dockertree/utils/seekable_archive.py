@@ -0,0 +1,269 @@
+"""
+Seekable gzip archives for dockertree.
+
+A gzip stream has to be decompressed from the start to reach any member, so
+restoring one volume or reading the code of a package used to decompress
+everything stored before it. Seekable archives are written as a series of
+independently compressed gzip members ("frames"). Concatenated gzip members
+are still a valid gzip file, so these archives remain ordinary ``.tar.gz``
+files for tar, gunzip and sequential readers.
+
+A new frame starts at every section of the archive (each volume directory and
+each top-level entry of a package directory) and whenever a frame reaches
+FRAME_SIZE. An index of every member (the frame its header is in, its
+offset within the decompressed frame and its size) is stored as the last tar member,
+INDEX_MEMBER_NAME, in a frame of its own. The file ends with an empty gzip
+member whose extra field holds the offset of that frame, so readers find the
+index in the last FOOTER_SIZE bytes and then decompress only the frames they
+need::
+
+    [frame: metadata.json][frames: volume A][frames: volume B][frame: code]...
+    [frame: index member + end of tar][footer: empty gzip member -> index frame]
+
+Frames are compressed on a thread pool, so writing does not need pigz to use
+more than one core.
+"""
+
+import gzip
+import io
+import json
+import os
+import struct
+import tarfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .volume_archive import locate_volume_member, normalize_member_name
+
+INDEX_MEMBER_NAME = ".dockertree-index.json"
+INDEX_VERSION = 1
+
+# Uncompressed size after which a frame is closed even within a section
+FRAME_SIZE = 4 * 1024 * 1024
+
+# Footer: gzip header with FEXTRA set, one "DX" extra subfield holding the
+# offset of the index frame, an empty deflate block, CRC32 and size (both 0)
+_FOOTER_HEADER = b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff"
+_FOOTER_EXTRA = struct.pack("<H", 12) + b"DX" + struct.pack("<H", 8)
+_FOOTER_TRAILER = b"\x03\x00" + b"\x00" * 8
+FOOTER_SIZE = len(_FOOTER_HEADER) + len(_FOOTER_EXTRA) + 8 + len(_FOOTER_TRAILER)
+
+# Index entry: member name, frame number, offset of its header in the decompressed frame, data size
+IndexEntry = Tuple[str, int, int, int]
+
+
+def default_section(name: str) -> str:
+    """Get the section of an archive member: its volume directory or top-level package entry."""
+    location = locate_volume_member(name)
+    if location is not None:
+        return f"volume:{location[0]}"
+    return "/".join(normalize_member_name(name).split("/")[:2])
+
+
+def _footer(index_offset: int) -> bytes:
+    return _FOOTER_HEADER + _FOOTER_EXTRA + struct.pack("<Q", index_offset) + _FOOTER_TRAILER
+
+
+class _FrameWriter:
+    """Write-only stream compressing its data in independent gzip frames."""
+
+    def __init__(self, output: BinaryIO, level: int, max_workers: int):
+        self.output = output
+        self.level = level
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gzip-frame")
+        self.max_pending = max_workers * 2
+        self.pending = deque()
+        self.buffer = bytearray()
+        self.position = 0  # Uncompressed bytes written
+        self.frame = 0  # Number of the frame being filled
+        self.frame_start = 0  # Uncompressed offset where that frame starts
+        self.frame_offsets: List[int] = []  # Compressed offset of each written frame
+        self.compressed_size = 0
+
+    def tell(self) -> int:
+        return self.position
+
+    def write(self, data) -> int:
+        self.buffer += data
+        self.position += len(data)
+        if len(self.buffer) >= FRAME_SIZE:
+            self.end_frame()
+        return len(data)
+
+    def end_frame(self) -> None:
+        """Close the current frame, if it holds any data."""
+        if not self.buffer:
+            return
+        data, self.buffer = bytes(self.buffer), bytearray()
+        self.pending.append(self.executor.submit(gzip.compress, data, self.level, mtime=0))
+        self.frame += 1
+        self.frame_start = self.position
+        while len(self.pending) > self.max_pending:
+            self._write_next()
+
+    def _write_next(self) -> None:
+        data = self.pending.popleft().result()
+        self.frame_offsets.append(self.compressed_size)
+        self.output.write(data)
+        self.compressed_size += len(data)
+
+    def flush(self) -> None:
+        """Write every closed frame to the output."""
+        while self.pending:
+            self._write_next()
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+class _SeekableTarFile(tarfile.TarFile):
+    """TarFile writing to a _FrameWriter that records where each member starts."""
+
+    def __init__(self, *args, section_of: Callable[[str], str] = default_section, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.section_of = section_of
+        self.section = None
+        self.index_entries: List[IndexEntry] = []
+
+    def addfile(self, tarinfo, fileobj=None):
+        section = self.section_of(tarinfo.name)
+        if section != self.section:
+            if self.section is not None:
+                self.fileobj.end_frame()
+            self.section = section
+        self.index_entries.append(
+            (tarinfo.name, self.fileobj.frame, self.offset - self.fileobj.frame_start, tarinfo.size)
+        )
+        super().addfile(tarinfo, fileobj)
+
+
+@contextmanager
+def open_seekable_writer(output: BinaryIO, level: int, pax_headers: Optional[Dict[str, str]] = None,
+                         section_of: Callable[[str], str] = default_section,
+                         max_workers: Optional[int] = None) -> Iterator[tarfile.TarFile]:
+    """Write a seekable gzip tar archive to a stream.
+
+    Args:
+        output: Writable binary stream (left open)
+        level: gzip compression level
+        pax_headers: Optional global PAX headers, also stored in the index
+        section_of: Maps member names to sections; a new frame starts whenever it changes
+        max_workers: Frames compressed at the same time (defaults to the CPU count)
+
+    Yields:
+        TarFile opened for writing; members must be added with add() or addfile()
+    """
+    frames = _FrameWriter(output, level, max_workers or os.cpu_count() or 1)
+    try:
+        tar = _SeekableTarFile(fileobj=frames, mode="w", pax_headers=pax_headers, section_of=section_of)
+        yield tar
+        frames.end_frame()
+        frames.flush()
+        index_frame = frames.frame
+        data = json.dumps({
+            "version": INDEX_VERSION,
+            "pax_headers": tar.pax_headers,
+            "frames": frames.frame_offsets,
+            "members": tar.index_entries,
+        }, separators=(",", ":")).encode("utf-8")
+        info = tarfile.TarInfo(INDEX_MEMBER_NAME)
+        info.size = len(data)
+        info.mode = 0o644
+        # Bypass _SeekableTarFile.addfile: the index does not list itself
+        tarfile.TarFile.addfile(tar, info, io.BytesIO(data))
+        tar.close()
+        frames.end_frame()
+        frames.flush()
+        output.write(_footer(frames.frame_offsets[index_frame]))
+    finally:
+        frames.shutdown()
+
+
+@dataclass
+class ArchiveIndex:
+    """Member index of a seekable archive (see read_archive_index)."""
+    path: Path
+    frames: List[int]
+    members: List[IndexEntry]
+    pax_headers: Dict[str, str]
+
+    def names(self) -> List[str]:
+        return [entry[0] for entry in self.members]
+
+    def size(self, predicate: Callable[[str], bool]) -> int:
+        """Get the total data size of the members whose name predicate accepts."""
+        return sum(size for name, _, _, size in self.members if predicate(name))
+
+    def iter_members(self, predicate: Callable[[str], bool]) -> Iterator[Tuple[tarfile.TarFile, tarfile.TarInfo]]:
+        """Read the members whose name predicate accepts, decompressing only the frames they are in.
+
+        Consecutive accepted members are read as one stream. Members are
+        yielded in archive order together with the TarFile to extract them from;
+        its pax_headers are the archive's global headers.
+
+        Raises:
+            tarfile.ReadError: If the archive does not match its index
+        """
+        runs: List[Tuple[int, int]] = []
+        for position, (name, _, _, _) in enumerate(self.members):
+            if not predicate(name):
+                continue
+            if runs and runs[-1][0] + runs[-1][1] == position:
+                runs[-1] = (runs[-1][0], runs[-1][1] + 1)
+            else:
+                runs.append((position, 1))
+
+        with open(self.path, "rb") as f:
+            for start, count in runs:
+                _, frame, offset, _ = self.members[start]
+                f.seek(self.frames[frame])
+                with gzip.GzipFile(fileobj=f, mode="rb") as gz:
+                    gz.seek(offset)
+                    with tarfile.open(fileobj=gz, mode="r|") as tar:
+                        tar.pax_headers = dict(self.pax_headers)
+                        for _ in range(count):
+                            member = tar.next()
+                            if member is None:
+                                raise tarfile.ReadError(f"Archive index does not match {self.path.name}")
+                            yield tar, member
+
+
+def read_archive_index(path: Path) -> Optional[ArchiveIndex]:
+    """Load the index of a seekable archive.
+
+    Only the footer and the index frame are read.
+
+    Returns:
+        The archive index, or None if the file is not a seekable archive
+    """
+    prefix = _FOOTER_HEADER + _FOOTER_EXTRA
+    try:
+        with open(path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size < FOOTER_SIZE:
+                return None
+            f.seek(size - FOOTER_SIZE)
+            footer = f.read(FOOTER_SIZE)
+            if not footer.startswith(prefix) or not footer.endswith(_FOOTER_TRAILER):
+                return None
+            (index_offset,) = struct.unpack_from("<Q", footer, len(prefix))
+            f.seek(index_offset)
+            with gzip.GzipFile(fileobj=f, mode="rb") as gz, tarfile.open(fileobj=gz, mode="r|") as tar:
+                member = tar.next()
+                if member is None or member.name != INDEX_MEMBER_NAME:
+                    return None
+                data = json.load(tar.extractfile(member))
+        if data.get("version") != INDEX_VERSION:
+            return None
+        return ArchiveIndex(
+            path=Path(path),
+            frames=[int(offset) for offset in data["frames"]],
+            members=[(name, int(frame), int(offset), int(size)) for name, frame, offset, size in data["members"]],
+            pax_headers=dict(data.get("pax_headers") or {}),
+        )
+    except (OSError, EOFError, ValueError, KeyError, TypeError, AttributeError, tarfile.TarError):
+        return None
@@ -9,8 +9,10 @@ import re
 import subprocess
 import sys
 from pathlib import Path
-from typing import Optional, List
+from typing import Iterable, Optional, List, Set
 
+from .docker_client import get_docker_client
+from .volume_inventory import get_volume_inventory
 from .logging import log_error, error_exit
 from ..config.settings import BRANCH_NAME_PATTERN, PROTECTED_BRANCHES
 
@@ -144,9 +146,8 @@ def validate_worktree_exists(branch_name: str, project_root: Optional[Path] = No
         if project_root is None:
             from ..config.settings import get_project_root
             project_root = get_project_root()
-        result = subprocess.run(["git", "worktree", "list"], 
-                              capture_output=True, text=True, check=True, cwd=project_root)
-        return f"[{branch_name}]" in result.stdout
+        from .worktree_registry import get_worktree_registry
+        return get_worktree_registry(project_root).get_by_branch(branch_name) is not None
     except (subprocess.CalledProcessError, Exception):
         return False
 
@@ -200,44 +201,29 @@ def check_prerequisites_no_git() -> None:
 
 def validate_volume_exists(volume_name: str) -> bool:
     """Check if a Docker volume exists."""
-    try:
-        subprocess.run(["docker", "volume", "inspect", volume_name], 
-                      capture_output=True, check=True)
-        return True
-    except (subprocess.CalledProcessError, Exception):
-        return False
+    return get_docker_client().volume_exists(volume_name)
+
+
+def get_existing_volumes(volume_names: Iterable[str]) -> Set[str]:
+    """Find which of the given Docker volumes exist, with a single query."""
+    return get_volume_inventory().existing(volume_names)
 
 
 def validate_network_exists(network_name: str) -> bool:
     """Check if a Docker network exists."""
-    try:
-        subprocess.run(["docker", "network", "inspect", network_name], 
-                      capture_output=True, check=True)
-        return True
-    except (subprocess.CalledProcessError, Exception):
-        return False
+    return get_docker_client().network_exists(network_name)
 
 
 def validate_container_running(container_name: str) -> bool:
     """Check if a Docker container is running."""
-    try:
-        result = subprocess.run(["docker", "ps", "--filter", f"name={container_name}", 
-                               "--format", "{{.Status}}"], 
-                              capture_output=True, text=True, check=True)
-        return "Up" in result.stdout
-    except (subprocess.CalledProcessError, Exception):
-        return False
+    containers = get_docker_client().list_containers(filters={"name": [container_name]})
+    return any(container.running for container in containers or [])
 
 
 def validate_container_exists(container_name: str) -> bool:
     """Check if a Docker container exists (running or stopped)."""
-    try:
-        result = subprocess.run(["docker", "ps", "-a", "--filter", f"name=^/{container_name}$", 
-                               "--format", "{{.Names}}"], 
-                              capture_output=True, text=True, check=True)
-        return container_name in result.stdout.strip()
-    except (subprocess.CalledProcessError, Exception):
-        return False
+    containers = get_docker_client().list_containers(all=True, filters={"name": [f"^/{container_name}$"]})
+    return any(container.name == container_name for container in containers or [])
 
 
 def validate_environment_files(worktree_path: Path) -> bool:
@@ -295,16 +281,8 @@ def ensure_environment_files_exist(worktree_path: Path, branch_name: str, projec
 
 def get_containers_using_volume(volume_name: str) -> List[str]:
     """Find all containers using a specific volume."""
-    try:
-        result = subprocess.run([
-            "docker", "ps", "-a", "--filter", f"volume={volume_name}",
-            "--format", "{{.Names}}"
-        ], capture_output=True, text=True, check=True)
-        
-        containers = result.stdout.strip().split('\n')
-        return [c for c in containers if c.strip()]
-    except (subprocess.CalledProcessError, Exception):
-        return []
+    containers = get_docker_client().list_containers(all=True, filters={"volume": [volume_name]})
+    return [container.name for container in containers or []]
 
 
 def are_containers_running(container_names: List[str]) -> bool:
@@ -312,36 +290,20 @@ def are_containers_running(container_names: List[str]) -> bool:
     if not container_names:
         return False
     
-    try:
-        # Check each container
-        for container_name in container_names:
-            if validate_container_running(container_name):
-                return True
-        return False
-    except Exception:
-        return False
+    # One listing of running containers instead of one query per container
+    running = get_docker_client().list_containers(filters={"status": ["running"]})
+    # Name filters match substrings, as `docker ps --filter name=` does
+    return any(name in container.name for container in running or [] for name in container_names)
 
 
 def get_postgres_container_for_volume(volume_name: str, project_name: str) -> Optional[str]:
     """Find the PostgreSQL container using a volume for a specific project."""
-    try:
-        # Look for containers with postgres in the name and using the volume
-        result = subprocess.run([
-            "docker", "ps", "-a", "--filter", f"volume={volume_name}",
-            "--format", "{{.Names}}|{{.Image}}"
-        ], capture_output=True, text=True, check=True)
-        
-        for line in result.stdout.strip().split('\n'):
-            if line:
-                parts = line.split('|')
-                if len(parts) >= 2:
-                    container_name, image = parts[0], parts[1]
-                    # Check if it's a postgres container and matches project
-                    if ('postgres' in image.lower() or 'postgres' in container_name.lower()) and project_name in container_name:
-                        return container_name
-        return None
-    except (subprocess.CalledProcessError, Exception):
-        return None
+    # Look for containers with postgres in the name and using the volume
+    for container in get_docker_client().list_containers(all=True, filters={"volume": [volume_name]}) or []:
+        # Check if it's a postgres container and matches project
+        if ('postgres' in container.image.lower() or 'postgres' in container.name.lower()) and project_name in container.name:
+            return container.name
+    return None
 
 
 def check_setup_or_prompt(project_root: Optional[Path] = None) -> None:
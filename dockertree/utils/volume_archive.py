@@ -0,0 +1,132 @@
+"""
+Volume archive layout helpers for dockertree.
+
+Volume backups and packages store each volume as a directory of plain tar
+members named after the volume, e.g.::
+
+    backup_feature.tar                     (gzip, zstd or uncompressed tar)
+        myproject-feature_postgres_data/...
+        myproject-feature_redis_data/...
+
+    feature_20240101.dockertree-package.tar.gz
+        feature_20240101.dockertree-package/volumes/myproject-feature_postgres_data/...
+
+Volume contents are streamed straight out of (and back into) a helper
+container, so no per-volume temporary archives are written to disk and data is
+only compressed once. Older backups that nest one ``<volume>.tar.gz`` per
+volume are still recognised so they can be restored.
+"""
+
+import tarfile
+from typing import Optional, Tuple
+
+from ..config.settings import POSTGRES_VOLUME_SUFFIX, REDIS_VOLUME_SUFFIX, MEDIA_VOLUME_SUFFIX
+
+# Directory name suffixes that identify a volume directory inside an archive
+VOLUME_DIR_SUFFIXES = tuple(
+    f"_{suffix}" for suffix in (POSTGRES_VOLUME_SUFFIX, REDIS_VOLUME_SUFFIX, MEDIA_VOLUME_SUFFIX)
+)
+
+# Layout identifiers recorded in package metadata
+LAYOUT_STREAMED = "streamed"
+LAYOUT_LEGACY = "legacy"
+# Incremental backups: a chunk store manifest rather than an archive
+LAYOUT_CHUNKED = "chunked"
+
+# Global PAX header naming the algorithm used for volume tree checksums. Volumes
+# are streamed ahead of metadata.json, so readers need it before the metadata.
+CHECKSUM_ALGORITHM_HEADER = "DOCKERTREE.checksum_algorithm"
+
+
+def normalize_member_name(name: str) -> str:
+    """Strip leading './' and '/' components from a tar member name."""
+    while name.startswith("./"):
+        name = name[2:]
+    name = name.lstrip("/")
+    return "" if name == "." else name.rstrip("/")
+
+
+def is_volume_dir_name(name: str) -> bool:
+    """Check whether a path component names a dockertree volume directory."""
+    return name.endswith(VOLUME_DIR_SUFFIXES)
+
+
+def locate_volume_member(name: str) -> Optional[Tuple[str, str]]:
+    """Find which volume a streamed-layout archive member belongs to.
+
+    Recognises ``<volume>/...`` (volume backups) and
+    ``<package>/volumes/<volume>/...`` (packages).
+
+    Args:
+        name: Tar member name
+
+    Returns:
+        Tuple of (volume directory name, path relative to the volume root),
+        or None if the member is not part of a streamed volume
+    """
+    parts = [part for part in normalize_member_name(name).split("/") if part]
+    if not parts:
+        return None
+    if is_volume_dir_name(parts[0]):
+        return parts[0], "/".join(parts[1:])
+    if len(parts) >= 3 and parts[1] == "volumes" and is_volume_dir_name(parts[2]):
+        return parts[2], "/".join(parts[3:])
+    return None
+
+
+def is_volume_member(name: str, volume_dir: str) -> bool:
+    """Check whether an archive member belongs to the given volume directory."""
+    location = locate_volume_member(name)
+    return location is not None and location[0] == volume_dir
+
+
+def is_legacy_volume_member(name: str) -> bool:
+    """Check whether a member belongs to the legacy nested-archive layout."""
+    basename = normalize_member_name(name).rsplit("/", 1)[-1]
+    if basename.startswith("backup_") and basename.endswith(".tar"):
+        return True
+    return basename.endswith(".tar.gz") and any(
+        basename[:-len(".tar.gz")].endswith(suffix) for suffix in VOLUME_DIR_SUFFIXES
+    )
+
+
+def relocate_member(member: tarfile.TarInfo, name: str, link_prefix: Optional[str] = None) -> tarfile.TarInfo:
+    """Rename a tar member in place so it can be re-emitted into another archive.
+
+    Args:
+        member: Member read from the source archive
+        name: New member name
+        link_prefix: Prefix for hard link targets in the destination archive
+            (hard links refer to other members by name). None keeps the
+            target relative to the volume root.
+
+    Returns:
+        The same member, renamed
+    """
+    member.name = name
+    # PAX path headers take priority over the name fields when writing
+    member.pax_headers.pop("path", None)
+    if member.islnk():
+        target = normalize_member_name(member.linkname)
+        member.linkname = f"{link_prefix}/{target}" if link_prefix else target
+        member.pax_headers.pop("linkpath", None)
+    return member
+
+
+def get_relative_link_target(member: tarfile.TarInfo, volume_dir: Optional[str] = None) -> str:
+    """Get a link target relative to the volume root, for checksumming.
+
+    Args:
+        member: Symbolic or hard link member
+        volume_dir: Volume directory the member was found under, when reading
+            a dockertree archive. None for a raw volume tar stream.
+    """
+    target = member.linkname
+    if not member.islnk():
+        return target
+    if volume_dir is not None:
+        # Hard link targets inside an archive include the volume directory
+        location = locate_volume_member(target)
+        if location is not None and location[0] == volume_dir:
+            return location[1]
+    return normalize_member_name(target)
@@ -0,0 +1,93 @@
+"""
+Shared snapshot of Docker volumes for dockertree CLI.
+
+Checking volumes one at a time meant a ``docker volume inspect`` per volume,
+in loops over every volume of a worktree (or of every worktree). The
+inventory lists all volumes with their driver, mountpoint and labels in one
+query and answers lookups from memory. It is shared by every manager within
+a command and re-read only after dockertree creates or removes volumes (or
+runs compose, which may create them).
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+from .docker_client import DockerClient, VolumeSummary, get_docker_client
+
+
+class VolumeInventory:
+    """All Docker volumes, indexed by name."""
+
+    def __init__(self, client: Optional[DockerClient] = None):
+        """Initialize volume inventory (volumes are listed on first lookup).
+
+        Args:
+            client: Docker client to query (default: the shared client)
+        """
+        self._client = client
+        self._lock = threading.Lock()
+        self._volumes: Optional[Dict[str, VolumeSummary]] = None
+
+    def refresh(self) -> bool:
+        """Re-list the volumes from Docker.
+
+        Returns:
+            True if Docker could be queried, False otherwise
+        """
+        client = self._client or get_docker_client()
+        volumes = client.list_volumes()
+        with self._lock:
+            # A failed listing is not cached, so the next lookup asks again
+            self._volumes = None if volumes is None else {volume.name: volume for volume in volumes}
+            return volumes is not None
+
+    def invalidate(self) -> None:
+        """Drop the snapshot (after creating or removing volumes)."""
+        with self._lock:
+            self._volumes = None
+
+    def _snapshot(self) -> Dict[str, VolumeSummary]:
+        volumes = self._volumes
+        if volumes is None:
+            self.refresh()
+            volumes = self._volumes
+        return volumes or {}
+
+    def __contains__(self, volume_name: str) -> bool:
+        return volume_name in self._snapshot()
+
+    def exists(self, volume_name: str) -> bool:
+        """Check if a volume exists (False if Docker could not be queried)."""
+        return volume_name in self._snapshot()
+
+    def get(self, volume_name: str) -> Optional[VolumeSummary]:
+        """Get a volume's driver, mountpoint and labels."""
+        return self._snapshot().get(volume_name)
+
+    def existing(self, volume_names: Iterable[str]) -> Set[str]:
+        """Find which of the given volumes exist."""
+        snapshot = self._snapshot()
+        return {name for name in volume_names if name in snapshot}
+
+    def names(self) -> List[str]:
+        """List all volume names."""
+        return list(self._snapshot())
+
+
+_inventory: Optional[VolumeInventory] = None
+_inventory_lock = threading.Lock()
+
+
+def get_volume_inventory() -> VolumeInventory:
+    """Get the volume inventory shared by all of dockertree."""
+    global _inventory
+    if _inventory is None:
+        with _inventory_lock:
+            if _inventory is None:
+                _inventory = VolumeInventory()
+    return _inventory
+
+
+def invalidate_volume_inventory() -> None:
+    """Drop the shared volume snapshot (after creating or removing volumes)."""
+    get_volume_inventory().invalidate()
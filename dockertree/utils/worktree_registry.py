@@ -0,0 +1,226 @@
+"""
+Cached registry of git worktrees for dockertree CLI.
+
+Looking up a worktree used to mean running ``git worktree list`` and parsing
+its human-readable output, once per lookup. The registry runs
+``git worktree list --porcelain -z`` once and indexes the result by branch and
+by path. It is shared by every caller working on the same repository and
+re-read when the repository's ``worktrees`` directory changes (git adds or
+removes a subdirectory there for every worktree it adds or removes), or when
+dockertree itself changes the worktrees.
+"""
+
+import os
+import subprocess
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+BRANCH_REF_PREFIX = "refs/heads/"
+DETACHED_BRANCH = "(detached HEAD)"
+
+
+@dataclass(frozen=True)
+class WorktreeInfo:
+    """A git worktree as reported by ``git worktree list --porcelain``."""
+    path: Path
+    commit: str
+    branch: Optional[str]
+    bare: bool = False
+    detached: bool = False
+    locked: bool = False
+    prunable: bool = False
+
+    @property
+    def display_branch(self) -> str:
+        """Branch name, or "(detached HEAD)" for detached worktrees."""
+        return self.branch or DETACHED_BRANCH
+
+
+def parse_worktree_porcelain(output: str, separator: str = "\0") -> List[WorktreeInfo]:
+    """Parse ``git worktree list --porcelain`` output.
+
+    Args:
+        output: Command output
+        separator: "\\0" for ``-z`` output, "\\n" otherwise
+
+    Returns:
+        Worktrees in the order git lists them (main worktree first)
+    """
+    worktrees = []
+    record: Dict[str, str] = {}
+    # Records are separated by an empty field
+    for field in output.split(separator) + [""]:
+        if field:
+            key, _, value = field.partition(" ")
+            record[key] = value
+            continue
+        if "worktree" in record:
+            branch = record.get("branch")
+            if branch and branch.startswith(BRANCH_REF_PREFIX):
+                branch = branch[len(BRANCH_REF_PREFIX):]
+            worktrees.append(WorktreeInfo(
+                path=Path(record["worktree"]),
+                commit=record.get("HEAD", ""),
+                branch=branch or None,
+                bare="bare" in record,
+                detached="detached" in record,
+                locked="locked" in record,
+                prunable="prunable" in record,
+            ))
+        record = {}
+    return worktrees
+
+
+def find_worktrees_dir(path: Path) -> Optional[Path]:
+    """Find the ``worktrees`` directory of the repository containing path.
+
+    Works from the main worktree (``.git`` directory) and from linked
+    worktrees (``.git`` file pointing into ``<common dir>/worktrees/<name>``)
+    without running git. The directory itself may not exist yet.
+
+    Returns:
+        Path to ``<git common dir>/worktrees``, or None outside a repository
+    """
+    for directory in (path, *path.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git / "worktrees"
+        if dot_git.is_file():
+            try:
+                content = dot_git.read_text().strip()
+            except OSError:
+                return None
+            if not content.startswith("gitdir:"):
+                return None
+            git_dir = Path(content[len("gitdir:"):].strip())
+            if not git_dir.is_absolute():
+                git_dir = directory / git_dir
+            try:
+                common_dir = git_dir / (git_dir / "commondir").read_text().strip()
+            except OSError:
+                common_dir = git_dir.parent.parent
+            return Path(os.path.normpath(common_dir)) / "worktrees"
+    return None
+
+
+class WorktreeRegistry:
+    """Worktrees of one repository, indexed by branch and by path."""
+
+    def __init__(self, project_root: Path, worktrees_dir: Optional[Path] = None):
+        """Initialize worktree registry.
+
+        Args:
+            project_root: Any directory in the repository (git runs there)
+            worktrees_dir: The repository's ``worktrees`` directory, watched
+                for changes (see find_worktrees_dir)
+        """
+        self.project_root = Path(project_root)
+        self.worktrees_dir = worktrees_dir
+        self._lock = threading.Lock()
+        self._stamp: Optional[Tuple] = None
+        self._worktrees: Optional[List[WorktreeInfo]] = None
+        self._by_branch: Dict[str, WorktreeInfo] = {}
+        self._by_path: Dict[Path, WorktreeInfo] = {}
+
+    def _get_stamp(self) -> Optional[Tuple]:
+        if self.worktrees_dir is None:
+            return None
+        try:
+            return (self.worktrees_dir.stat().st_mtime_ns,)
+        except OSError:
+            # No linked worktrees yet
+            return (None,)
+
+    def _read_worktrees(self) -> List[WorktreeInfo]:
+        try:
+            result = subprocess.run(["git", "worktree", "list", "--porcelain", "-z"],
+                                    capture_output=True, text=True, check=True, cwd=self.project_root)
+            return parse_worktree_porcelain(result.stdout)
+        except subprocess.CalledProcessError:
+            # git < 2.36 has no -z; paths with newlines are not supported there
+            result = subprocess.run(["git", "worktree", "list", "--porcelain"],
+                                    capture_output=True, text=True, check=True, cwd=self.project_root)
+            return parse_worktree_porcelain(result.stdout, separator="\n")
+
+    def refresh(self) -> List[WorktreeInfo]:
+        """Re-read the worktree list from git.
+
+        Raises:
+            subprocess.CalledProcessError: If git cannot list the worktrees
+        """
+        with self._lock:
+            stamp = self._get_stamp()
+            worktrees = self._read_worktrees()
+            self._worktrees = worktrees
+            self._by_branch = {wt.branch: wt for wt in worktrees if wt.branch}
+            self._by_path = {}
+            for wt in worktrees:
+                self._by_path[wt.path] = wt
+                self._by_path.setdefault(Path(os.path.realpath(wt.path)), wt)
+            # Without a watched directory the list is only valid for this call
+            self._stamp = stamp
+            return worktrees
+
+    def invalidate(self) -> None:
+        """Drop the cached worktree list (after adding or removing worktrees)."""
+        with self._lock:
+            self._worktrees = None
+            self._stamp = None
+
+    def _ensure_current(self) -> None:
+        stamp = self._get_stamp()
+        if self._worktrees is None or stamp is None or stamp != self._stamp:
+            self.refresh()
+
+    def list(self) -> List[WorktreeInfo]:
+        """List all worktrees, main worktree first.
+
+        Raises:
+            subprocess.CalledProcessError: If git cannot list the worktrees
+        """
+        self._ensure_current()
+        return list(self._worktrees)
+
+    def get_by_branch(self, branch_name: str) -> Optional[WorktreeInfo]:
+        """Get the worktree a branch is checked out in."""
+        self._ensure_current()
+        return self._by_branch.get(branch_name)
+
+    def get_by_path(self, path: Path) -> Optional[WorktreeInfo]:
+        """Get the worktree rooted at path."""
+        self._ensure_current()
+        path = Path(path)
+        return self._by_path.get(path) or self._by_path.get(Path(os.path.realpath(path)))
+
+
+_registries: Dict[Path, WorktreeRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_worktree_registry(path: Optional[Path] = None) -> WorktreeRegistry:
+    """Get the shared worktree registry for the repository containing path.
+
+    Args:
+        path: Directory in the repository (default: project root)
+    """
+    if path is None:
+        from ..config.settings import get_project_root
+        path = get_project_root()
+    path = Path(path).resolve()
+    worktrees_dir = find_worktrees_dir(path)
+    key = worktrees_dir if worktrees_dir is not None else path
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = WorktreeRegistry(path, worktrees_dir)
+            _registries[key] = registry
+        return registry
+
+
+def invalidate_worktree_registries() -> None:
+    """Drop every cached worktree list."""
+    with _registries_lock:
+        for registry in _registries.values():
+            registry.invalidate()
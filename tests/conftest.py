@@ -12,6 +12,11 @@ from typing import Generator
 from dockertree.core.docker_manager import DockerManager
 from dockertree.core.git_manager import GitManager
 from dockertree.core.environment_manager import EnvironmentManager
+from dockertree.config.settings import clear_config_cache
+from dockertree.utils.worktree_registry import invalidate_worktree_registries
+from dockertree.utils.docker_client import DOCKER_API_ENV, get_docker_client
+from dockertree.utils.volume_inventory import invalidate_volume_inventory
+from dockertree.core.volume_sizes import get_volume_size_engine
 
 
 @pytest.fixture(scope="session")
@@ -24,6 +29,38 @@ def temp_project_dir() -> Generator[Path, None, None]:
         shutil.rmtree(temp_dir, ignore_errors=True)
 
 
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    """Don't let configs, worktree lists and volume lists cached by one test leak into the next."""
+    clear_config_cache()
+    invalidate_worktree_registries()
+    invalidate_volume_inventory()
+    get_volume_size_engine().clear()
+    yield
+    clear_config_cache()
+    invalidate_worktree_registries()
+    invalidate_volume_inventory()
+    get_volume_size_engine().clear()
+
+
+@pytest.fixture(autouse=True)
+def docker_cli_only(monkeypatch):
+    """Query Docker through the (mockable) CLI rather than a real daemon socket."""
+    monkeypatch.setenv(DOCKER_API_ENV, "0")
+    get_docker_client().reset()
+    yield
+    get_docker_client().reset()
+
+
+@pytest.fixture(autouse=True)
+def user_cache_dir(monkeypatch, tmp_path_factory):
+    """Keep caches written under ~/.cache out of the real home directory."""
+    cache_dir = tmp_path_factory.getbasetemp() / "user-cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_dir))
+    yield cache_dir
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+
 @pytest.fixture(scope="function")
 def test_branch() -> str:
     """Generate a test branch name."""
@@ -0,0 +1,53 @@
+"""
+Unit tests for bulk worktree operations.
+"""
+
+import threading
+
+from dockertree.core.bulk_operations import run_bulk
+
+
+class TestRunBulk:
+    """Test result collection and concurrency."""
+
+    def test_results_keep_branch_order(self):
+        results = run_bulk(["a", "b", "c"], lambda branch: True, action="removed", max_workers=3)
+
+        assert [result.branch for result in results] == ["a", "b", "c"]
+        assert all(result.success and result.action == "removed" for result in results)
+
+    def test_orchestrator_results_and_exceptions(self):
+        def operation(branch):
+            if branch == "ok":
+                return {"success": True, "data": {"action": "already_removed", "message": "nothing to do"}}
+            if branch == "bad":
+                return {"success": False, "error": "boom"}
+            raise RuntimeError("docker went away")
+
+        ok, bad, broken = run_bulk(["ok", "bad", "broken"], operation, action="removed", max_workers=2)
+
+        assert (ok.success, ok.action, ok.message) == (True, "already_removed", "nothing to do")
+        assert (bad.success, bad.action, bad.message) == (False, "failed", "boom")
+        assert (broken.success, broken.action, broken.message) == (False, "error", "docker went away")
+        assert broken.to_dict()["branch"] == "broken"
+
+    def test_operations_overlap_up_to_max_workers(self):
+        # Every operation waits until two are running at once
+        barrier = threading.Barrier(2, timeout=5)
+
+        def operation(branch):
+            barrier.wait()
+            return True
+
+        results = run_bulk(["a", "b", "c", "d"], operation, max_workers=2)
+
+        assert all(result.success for result in results)
+
+    def test_single_worker_runs_sequentially(self):
+        seen = []
+
+        results = run_bulk(["a", "b"], lambda branch: seen.append(threading.current_thread().name) or True,
+                           max_workers=1)
+
+        assert all(result.success for result in results)
+        assert seen == [threading.main_thread().name] * 2
@@ -6,10 +6,15 @@ Tests cover:
 - Label replacement when domain/IP is provided
 - Preserving localhost labels when no domain/IP provided
 - Network configuration
+- configure_caddy_routes() route updates over the admin API
 """
 
 import pytest
-from dockertree.utils.caddy_config import ensure_caddy_labels_and_network
+from unittest.mock import Mock, patch
+
+from dockertree.scripts.caddy_routes import STAGING_CA, get_routes, make_route_id
+from dockertree.utils.caddy_config import configure_caddy_routes, ensure_caddy_labels_and_network
+from dockertree.utils.docker_client import ContainerSummary
 
 
 class TestCaddyConfig:
@@ -335,3 +340,41 @@ class TestCaddyConfig:
         assert 'dockertree_caddy_proxy' in compose_data['networks']
         assert compose_data['networks']['dockertree_caddy_proxy'] == {'external': True}
 
+
+class TestConfigureCaddyRoutes:
+    """Test configuring the global Caddy proxy's routes in-process."""
+
+    @pytest.fixture
+    def session(self):
+        session = Mock()
+        session.request.return_value = Mock(status_code=200, text="")
+        with patch('dockertree.utils.caddy_config._get_admin_session', return_value=session):
+            yield session
+
+    @pytest.fixture
+    def containers(self):
+        with patch('dockertree.utils.caddy_config.get_docker_client') as mock_client:
+            mock_client.return_value.list_containers.return_value = [
+                ContainerSummary(name="app-feature-web-1", image="app", state="running", status="Up",
+                                 labels={"caddy.proxy": "feature.example.com"}),
+            ]
+            yield mock_client
+
+    def test_loads_config_keeping_staging_certificates(self, session, containers):
+        live = {"apps": {"tls": {"automation": {"policies": [{"issuers": [{"ca": STAGING_CA}]}]}}}}
+        session.get.return_value = Mock(status_code=200, json=Mock(return_value=live))
+
+        assert configure_caddy_routes("http://caddy:2019") is True
+
+        method, url = session.request.call_args[0]
+        config = session.request.call_args[1]["json"]
+        assert (method, url) == ("POST", "http://caddy:2019/load")
+        assert get_routes(config)[0]["@id"] == make_route_id("feature.example.com")
+        assert config["apps"]["tls"]["automation"]["policies"][0]["issuers"][0]["ca"] == STAGING_CA
+
+    def test_unreachable_admin_api_falls_back_to_labels(self, session, containers):
+        import requests
+        session.get.side_effect = requests.exceptions.ConnectionError("refused")
+
+        assert configure_caddy_routes() is True
+        session.request.assert_not_called()
@@ -0,0 +1,90 @@
+"""
+Unit tests for the event-driven Caddy Docker monitor script.
+"""
+
+import importlib.util
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from dockertree.config.settings import get_script_dir
+
+pytest.importorskip("docker")
+pytest.importorskip("requests")
+
+
+@pytest.fixture
+def monitor_module(monkeypatch):
+    # The script imports caddy_routes from its own directory
+    monkeypatch.syspath_prepend(str(get_script_dir() / "scripts"))
+    path = get_script_dir() / "scripts" / "caddy-docker-monitor.py"
+    spec = importlib.util.spec_from_file_location("caddy_docker_monitor", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def monitor(monitor_module):
+    with patch.object(monitor_module.docker, "DockerClient"):
+        return monitor_module.CaddyDockerMonitor()
+
+
+def _container(container_id, domain, **labels):
+    return {"ID": container_id, "Names": f"{container_id}-web", "Labels": {"caddy.proxy": domain, **labels}}
+
+
+class TestEventDrivenSync:
+    """Test change coalescing and route syncing."""
+
+    def test_burst_of_events_is_coalesced(self, monitor, monitor_module):
+        monitor._changed.set()
+
+        def more_events():
+            for _ in range(3):
+                time.sleep(monitor_module.EVENT_DEBOUNCE_SECONDS / 3)
+                monitor._changed.set()
+
+        thread = threading.Thread(target=more_events)
+        thread.start()
+        assert monitor.wait_for_changes(timeout=1) is True
+        thread.join()
+
+        # All events were absorbed by one wait
+        assert not monitor._changed.is_set()
+        assert monitor.wait_for_changes(timeout=0.01) is False
+
+    def test_sync_routes_only_when_containers_change(self, monitor):
+        containers = [_container("a", "a.localhost")]
+        with patch.object(monitor, "update_caddy_config", return_value=True) as mock_update:
+            assert monitor.sync_routes(containers)
+            assert monitor.sync_routes(containers)
+            assert mock_update.call_count == 1
+
+            # Same container, different route labels
+            assert monitor.sync_routes([_container("a", "a.localhost", **{"caddy.proxy.path": "/api/*"})])
+            assert mock_update.call_count == 2
+
+    def test_failed_update_is_retried(self, monitor):
+        containers = [_container("a", "a.localhost")]
+        with patch.object(monitor, "update_caddy_config", side_effect=[False, True]) as mock_update:
+            assert not monitor.sync_routes(containers)
+            assert monitor.sync_routes(containers)
+        assert mock_update.call_count == 2
+
+    def test_event_marks_change(self, monitor):
+        monitor.docker_client = Mock()
+        monitor.docker_client.events.return_value = iter([{"Action": "start", "Actor": {"Attributes": {"name": "a"}}}])
+
+        def stop_after_stream(*args):
+            monitor._stop.set()
+            return True
+
+        with patch.object(monitor._stop, "wait", side_effect=stop_after_stream):
+            monitor.watch_events()
+
+        assert monitor._changed.is_set()
+        filters = monitor.docker_client.events.call_args.kwargs["filters"]
+        assert filters["type"] == "container" and "start" in filters["event"]
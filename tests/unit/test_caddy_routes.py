@@ -0,0 +1,153 @@
+"""
+Unit tests for Caddy route generation and incremental route updates.
+"""
+
+import copy
+from unittest.mock import Mock
+
+from dockertree.scripts.caddy_routes import (
+    FALLBACK_ROUTE_ID,
+    ROUTES_PATH,
+    RouteBuilder,
+    apply_route_config,
+    build_route_table,
+    build_routes,
+    find_route_mismatches,
+    diff_routes,
+    make_route_id,
+    routes_match,
+    tag_routes,
+)
+
+ADMIN = "http://caddy:2019"
+
+
+def _route(host, dial):
+    return {"match": [{"host": [host]}], "handle": [{"handler": "reverse_proxy", "upstreams": [{"dial": dial}]}]}
+
+
+def _config(*routes):
+    fallback = {"match": [{"host": ["*"]}], "handle": [{"handler": "static_response", "body": "ready"}]}
+    return {"apps": {"http": {"servers": {"srv0": {"listen": [":80"], "routes": [*routes, fallback]}}}}}
+
+
+def _container(name, host, **labels):
+    labels = {f"caddy.proxy.{key}": value for key, value in labels.items()}
+    return {"ID": name, "Names": name, "Labels": {"caddy.proxy": host, **labels}}
+
+
+def _session(live_config):
+    session = Mock()
+    session.get.return_value = Mock(status_code=200, json=Mock(return_value=live_config))
+    session.request.return_value = Mock(status_code=200, text="")
+    return session
+
+
+class TestRouteDiff:
+    """Test tagging and diffing routes."""
+
+    def test_tags_routes_by_host(self):
+        config = tag_routes(_config(_route("a.localhost", "a-web:8000"), _route("a.localhost", "a-api:8000")))
+        ids = [route["@id"] for route in config["apps"]["http"]["servers"]["srv0"]["routes"]]
+        assert ids == [make_route_id("a.localhost"), make_route_id("a.localhost") + "-2", FALLBACK_ROUTE_ID]
+
+    def test_untagged_live_routes_need_full_load(self):
+        assert diff_routes(_config(_route("a.localhost", "a:8000"))["apps"]["http"]["servers"]["srv0"]["routes"],
+                           []) is None
+
+
+class TestApplyRouteConfig:
+    """Test the requests sent to the admin API."""
+
+    def test_only_changed_routes_are_sent(self):
+        live = tag_routes(_config(_route("a.localhost", "a:8000"), _route("b.localhost", "b:8000"),
+                                  _route("c.localhost", "c:8000")))
+        desired = _config(_route("a.localhost", "a:8000"), _route("b.localhost", "b-new:8000"),
+                          _route("d.localhost", "d:8000"))
+        session = _session(copy.deepcopy(live))
+
+        success, error = apply_route_config(ADMIN, desired, session=session)
+
+        assert success, error
+        calls = [(c.args[0], c.args[1]) for c in session.request.call_args_list]
+        assert calls == [
+            ("DELETE", f"{ADMIN}/id/{make_route_id('c.localhost')}"),
+            ("PATCH", f"{ADMIN}/id/{make_route_id('b.localhost')}"),
+            # Inserted before the catch-all route (index 2 once c is removed)
+            ("PUT", f"{ADMIN}{ROUTES_PATH}/2"),
+        ]
+
+    def test_unchanged_routes_send_nothing(self):
+        live = tag_routes(_config(_route("a.localhost", "a:8000")))
+        session = _session(copy.deepcopy(live))
+
+        assert apply_route_config(ADMIN, _config(_route("a.localhost", "a:8000")), session=session) == (True, "")
+        session.request.assert_not_called()
+
+    def test_non_route_change_loads_full_config(self):
+        live = tag_routes(_config(_route("a.localhost", "a:8000")))
+        desired = _config(_route("a.example.com", "a:8000"))
+        desired["apps"]["http"]["servers"]["srv0"]["listen"].append(":443")
+        session = _session(live)
+
+        assert apply_route_config(ADMIN, desired, session=session)[0]
+        session.request.assert_called_once()
+        assert session.request.call_args.args[:2] == ("POST", f"{ADMIN}/load")
+
+    def test_routes_match_ignores_host_route_order(self):
+        desired = _config(_route("a.localhost", "a:8000"), _route("b.localhost", "b:8000"))
+        live = tag_routes(_config(_route("b.localhost", "b:8000"), _route("a.localhost", "a:8000")))
+        assert routes_match(live, desired)
+
+
+class TestRouteTable:
+    """Test building routes from container labels."""
+
+    def test_routes_are_ordered_by_host_and_path(self):
+        containers = [
+            _container("web-b", "b.localhost"),
+            _container("web-a", "a.localhost"),
+            _container("api-a", "a.localhost", path="/api/*", reverse_proxy="api-a:9000"),
+        ]
+        table = build_route_table(containers)
+        routes = build_routes(table)
+
+        assert list(table) == ["a.localhost", "b.localhost"]
+        assert [entry.container for entry in table["a.localhost"]] == ["api-a", "web-a"]
+        assert [route["@id"] for route in routes] == [
+            make_route_id("a.localhost"), make_route_id("b.localhost"), FALLBACK_ROUTE_ID
+        ]
+        subroutes = routes[0]["handle"][0]["routes"]
+        assert subroutes[0]["match"] == [{"path": ["/api/*"]}]
+        assert routes == build_routes(build_route_table(list(reversed(containers))))
+
+    def test_mismatches_include_subroutes_and_missing_routes(self):
+        containers = [
+            _container("web-a", "a.localhost"),
+            _container("api-a", "a.localhost", path="/api/*"),
+            _container("web-b", "b.localhost"),
+        ]
+        table = build_route_table(containers)
+        routes = build_routes(table)
+        assert find_route_mismatches(routes, table) == []
+
+        routes[0]["handle"][0]["routes"][0]["handle"][0]["upstreams"][0]["dial"] = "old:8000"
+        del routes[1]
+        assert find_route_mismatches(routes, table) == [
+            (("a.localhost", "/api/*"), "old:8000", "api-a:8000"),
+            (("b.localhost", "/"), None, "web-b:8000"),
+        ]
+
+    def test_builder_reuses_routes_until_labels_change(self):
+        health_check = Mock(return_value={"active": {"path": "/health"}})
+        builder = RouteBuilder(health_check=health_check)
+        containers = [_container("web-a", "a.localhost", health_check="/health")]
+
+        _, routes = builder.build(containers)
+        routes[0]["handle"] = []
+        _, again = builder.build(list(containers))
+        assert again[0]["handle"][0]["health_checks"] == {"active": {"path": "/health"}}
+        assert health_check.call_count == 1
+
+        builder.build([_container("web-a", "a.localhost", health_check="/ready")])
+        assert health_check.call_count == 2
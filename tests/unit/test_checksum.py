@@ -0,0 +1,84 @@
+"""
+Unit tests for checksum utilities.
+"""
+
+import hashlib
+import io
+import shutil
+import tarfile
+from unittest.mock import patch
+
+import pytest
+
+from dockertree.utils.checksum import (
+    CHECKSUM_SHA256,
+    calculate_checksums,
+    calculate_file_checksum,
+    new_hasher,
+    select_checksum_algorithm,
+    verify_checksums,
+)
+from dockertree.utils.compression import COMPRESSION_FORMATS, COMPRESSION_ZSTD, open_archive_writer
+
+
+class TestParallelChecksums:
+    """Test hashing several files at once."""
+
+    @pytest.fixture
+    def files(self, tmp_path):
+        paths = []
+        for index in range(5):
+            path = tmp_path / f"file{index}.bin"
+            path.write_bytes(bytes([index]) * (1024 * index + 1))
+            paths.append(path)
+        return paths
+
+    def test_matches_serial_checksums(self, files):
+        checksums = calculate_checksums(files, max_workers=4)
+        assert checksums == {path: hashlib.sha256(path.read_bytes()).hexdigest() for path in files}
+
+    def test_small_buffer_gives_same_digest(self, files):
+        assert calculate_file_checksum(files[3], buffer_size=7) == calculate_file_checksum(files[3])
+
+    def test_verify_reports_failures(self, tmp_path, files):
+        expected = {path.name: digest for path, digest in calculate_checksums(files).items()}
+        files[1].write_bytes(b"changed")
+        expected["missing.bin"] = "0" * 64
+
+        assert sorted(verify_checksums(tmp_path, expected)) == ["file1.bin", "missing.bin"]
+
+
+class TestAlgorithmSelection:
+    """Test checksum algorithm selection."""
+
+    def test_unknown_algorithm(self):
+        with pytest.raises(ValueError):
+            new_hasher("md4")
+
+    def test_unavailable_preference_falls_back_to_sha256(self):
+        with patch('dockertree.utils.checksum.is_checksum_algorithm_available', return_value=False):
+            assert select_checksum_algorithm("blake3") == CHECKSUM_SHA256
+            assert select_checksum_algorithm("auto") == CHECKSUM_SHA256
+
+    def test_reads_config(self):
+        with patch('dockertree.config.settings._get_config_value', return_value="sha256"):
+            assert select_checksum_algorithm() == CHECKSUM_SHA256
+
+
+class TestFusedArchiveHashing:
+    """Test checksumming archives while they are written."""
+
+    @pytest.mark.parametrize("compression", COMPRESSION_FORMATS)
+    def test_writer_digest_matches_file(self, tmp_path, compression):
+        if compression == COMPRESSION_ZSTD and not shutil.which("zstd"):
+            pytest.skip("zstd not installed")
+        path = tmp_path / "archive"
+        hasher = new_hasher()
+        data = b"volume data" * 5000
+
+        with open_archive_writer(path, compression, hasher=hasher) as tar:
+            info = tarfile.TarInfo("data.bin")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+        assert hasher.hexdigest() == calculate_file_checksum(path)
@@ -0,0 +1,127 @@
+"""
+Unit tests for the incremental backup chunk store.
+"""
+
+import io
+import tarfile
+
+import pytest
+
+from dockertree.utils.chunk_store import (
+    ChunkStore,
+    build_package_manifest,
+    entry_from_member,
+    get_manifest_chunks,
+    is_chunk_manifest,
+    load_manifest,
+    member_from_entry,
+    write_package_from_manifest,
+    MANIFEST_FORMAT,
+    MANIFEST_VERSION,
+)
+from dockertree.utils.compression import COMPRESSION_GZIP, detect_compression, open_archive_writer
+
+
+class TestChunkStore:
+    """Test storing and reading chunks."""
+
+    def test_put_chunk_deduplicates(self, tmp_path):
+        store = ChunkStore(tmp_path)
+        digest, is_new = store.put_chunk(b"page" * 1000)
+        assert is_new is True
+        assert store.put_chunk(b"page" * 1000) == (digest, False)
+        assert store.get_chunk(digest) == b"page" * 1000
+
+    def test_corrupt_chunk_is_rejected(self, tmp_path):
+        store = ChunkStore(tmp_path)
+        digest, _ = store.put_chunk(b"data")
+        other, _ = store.put_chunk(b"other")
+        store.chunk_path(digest).write_bytes(store.chunk_path(other).read_bytes())
+        with pytest.raises(ValueError, match="corrupt"):
+            store.get_chunk(digest)
+        assert not store.has_chunk(digest)
+
+    def test_missing_chunk(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            ChunkStore(tmp_path).get_chunk("ab" * 32)
+
+    def test_reader_spans_chunks(self, tmp_path):
+        store = ChunkStore(tmp_path)
+        digests = [store.put_chunk(data)[0] for data in (b"abc", b"defg", b"h")]
+        reader = store.open_chunks(digests)
+        assert reader.read(2) == b"ab"
+        assert reader.read(4) == b"cdef"
+        assert reader.read() == b"gh"
+        assert reader.read(1) == b""
+
+
+class TestManifests:
+    """Test manifest files and entries."""
+
+    def test_write_and_find_manifest(self, tmp_path):
+        store = ChunkStore(tmp_path)
+        path = store.write_manifest("feature", {"format": MANIFEST_FORMAT, "version": MANIFEST_VERSION,
+                                                "volumes": {}})
+        assert store.latest_manifest("feature") == path
+        assert is_chunk_manifest(path)
+        assert load_manifest(path)["volumes"] == {}
+        assert ChunkStore.for_manifest(path).root == tmp_path.resolve()
+
+    def test_other_json_is_not_a_manifest(self, tmp_path):
+        path = tmp_path / "metadata.json"
+        path.write_text('{"package_version": "1.0"}')
+        assert not is_chunk_manifest(path)
+        with pytest.raises(ValueError):
+            load_manifest(path)
+
+    def test_entry_round_trip(self):
+        member = tarfile.TarInfo("./base")
+        member.type = tarfile.SYMTYPE
+        member.linkname = "../shared"
+        member.mode = 0o777
+        member.uid = member.gid = 999
+
+        restored = member_from_entry(entry_from_member(member, "base"))
+
+        assert restored.name == "base"
+        assert restored.issym()
+        assert restored.linkname == "../shared"
+        assert (restored.mode, restored.uid, restored.gid) == (0o777, 999, 999)
+
+
+class TestPackageManifests:
+    """Test chunking packages for delta pushes."""
+
+    @staticmethod
+    def _write_package(path, files):
+        with open_archive_writer(path, COMPRESSION_GZIP, pax_headers={"DOCKERTREE.test": "1"}) as tar:
+            for name, data in files.items():
+                info = tarfile.TarInfo(f"b.dockertree-package/{name}")
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+
+    def test_unchanged_files_reuse_chunks(self, tmp_path):
+        store = ChunkStore(tmp_path / "store")
+        self._write_package(tmp_path / "first.tar.gz", {"volumes/a": b"a" * 3000, "code/b.tar": b"old"})
+        self._write_package(tmp_path / "second.tar.gz", {"volumes/a": b"a" * 3000, "code/b.tar": b"new"})
+
+        first = build_package_manifest(tmp_path / "first.tar.gz", store)
+        second = build_package_manifest(tmp_path / "second.tar.gz", store)
+
+        assert second["new_bytes"] == 3
+        assert len(set(get_manifest_chunks(second)) - set(get_manifest_chunks(first))) == 1
+
+    def test_rebuild_round_trip(self, tmp_path):
+        store = ChunkStore(tmp_path / "store")
+        files = {"metadata.json": b"{}", "volumes/proj-b_media_files/a.png": b"png" * 1000}
+        self._write_package(tmp_path / "b.tar.gz", files)
+        manifest = build_package_manifest(tmp_path / "b.tar.gz", store)
+
+        output = tmp_path / "rebuilt.tar.gz"
+        write_package_from_manifest(manifest, store, output)
+
+        assert detect_compression(output) == COMPRESSION_GZIP
+        with tarfile.open(output, "r:gz") as tar:
+            rebuilt = {m.name: tar.extractfile(m).read() for m in tar}
+            assert tar.pax_headers["DOCKERTREE.test"] == "1"
+        assert rebuilt == {f"b.dockertree-package/{name}": data for name, data in files.items()}
@@ -54,10 +54,12 @@ def test_worktree_first_up_invokes_branch(monkeypatch, runner):
     class FakeWorktreeManager:
         def __init__(self):
             self.env_manager = SimpleNamespace(get_access_url=lambda branch: f"http://{branch}.test")
+            self.last_readiness = None
 
         def start_worktree(self, branch_name, profile=None):
             self.started_branch = branch_name
             self.started_profile = profile
+            self.last_readiness = {"ready": True, "seconds": 1.5, "services": {}}
             return True
 
     manager = FakeWorktreeManager()
@@ -69,6 +71,7 @@ def test_worktree_first_up_invokes_branch(monkeypatch, runner):
     payload = _extract_json(result.output)
     assert payload["success"] is True
     assert payload["data"]["branch_name"] == "feature/up-test"
+    assert payload["data"]["readiness"]["seconds"] == 1.5
 
 
 def test_alias_delete_routes_to_remove(monkeypatch, runner):
@@ -0,0 +1,123 @@
+"""
+Unit tests for archive compression utilities.
+"""
+
+import hashlib
+import io
+import os
+import shutil
+import tarfile
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from dockertree.utils.compression import (
+    COMPRESSION_FORMATS,
+    COMPRESSION_GZIP,
+    COMPRESSION_NONE,
+    COMPRESSION_ZSTD,
+    detect_compression,
+    get_archive_extension,
+    open_archive_reader,
+    open_archive_writer,
+    resolve_level,
+    strip_archive_extension,
+)
+
+
+def _write_sample(path, compression, level=None):
+    data = b"dockertree" * 1000
+    with open_archive_writer(path, compression, level) as tar:
+        info = tarfile.TarInfo("volume/data.bin")
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+    return data
+
+
+class TestArchiveRoundTrip:
+    """Test writing and reading archives in each format."""
+
+    @pytest.mark.parametrize("compression", COMPRESSION_FORMATS)
+    def test_round_trip_with_detection(self, tmp_path, compression):
+        if compression == COMPRESSION_ZSTD and not shutil.which("zstd"):
+            pytest.skip("zstd not installed")
+        path = tmp_path / f"archive{get_archive_extension(compression)}"
+        data = _write_sample(path, compression)
+
+        assert detect_compression(path) == compression
+        with open_archive_reader(path) as tar:
+            members = [(m.name, tar.extractfile(m).read()) for m in tar]
+        assert members == [("volume/data.bin", data)]
+
+    def test_gzip_without_pigz_uses_builtin_compressor(self, tmp_path):
+        path = tmp_path / "archive.tar.gz"
+        with patch('dockertree.utils.compression.shutil.which', return_value=None):
+            _write_sample(path, COMPRESSION_GZIP, level=1)
+        assert detect_compression(path) == COMPRESSION_GZIP
+
+    @pytest.mark.parametrize("compression", COMPRESSION_FORMATS)
+    def test_write_to_stream(self, tmp_path, compression):
+        if compression == COMPRESSION_ZSTD and not shutil.which("zstd"):
+            pytest.skip("zstd not installed")
+        stream = io.BytesIO()
+        data = _write_sample(stream, compression)
+        path = tmp_path / "archive"
+        path.write_bytes(stream.getvalue())
+
+        with open_archive_reader(path) as tar:
+            assert [tar.extractfile(m).read() for m in tar] == [data]
+
+    def test_zstd_without_binary_fails(self, tmp_path):
+        with patch('dockertree.utils.compression.shutil.which', return_value=None):
+            with pytest.raises(OSError, match="zstd"):
+                _write_sample(tmp_path / "archive.tar.zst", COMPRESSION_ZSTD)
+
+    def test_failing_output_stream_fails_instead_of_hanging(self):
+        if not shutil.which("zstd"):
+            pytest.skip("zstd not installed")
+
+        class BrokenPipeStream(io.RawIOBase):
+            def writable(self):
+                return True
+
+            def write(self, data):
+                raise BrokenPipeError("upload pipe closed")
+
+        # Incompressible and larger than the pipe buffers, so the writer would block
+        data = os.urandom(8 * 1024 * 1024)
+        errors = []
+
+        def write():
+            try:
+                with open_archive_writer(BrokenPipeStream(), COMPRESSION_ZSTD, hasher=hashlib.sha256()) as tar:
+                    info = tarfile.TarInfo("volume/data.bin")
+                    info.size = len(data)
+                    tar.addfile(info, io.BytesIO(data))
+            except BaseException as e:
+                errors.append(e)
+
+        writer = threading.Thread(target=write, daemon=True)
+        writer.start()
+        writer.join(timeout=30)
+
+        assert not writer.is_alive()
+        assert len(errors) == 1 and isinstance(errors[0], BrokenPipeError)
+
+
+class TestCompressionOptions:
+    """Test compression level and extension helpers."""
+
+    def test_default_levels(self):
+        assert resolve_level(COMPRESSION_GZIP) == 6
+        assert resolve_level(COMPRESSION_ZSTD) == 3
+        assert resolve_level(COMPRESSION_NONE, 5) is None
+
+    def test_level_out_of_range(self):
+        with pytest.raises(ValueError):
+            resolve_level(COMPRESSION_GZIP, 12)
+
+    def test_strip_archive_extension(self):
+        assert strip_archive_extension("b.dockertree-package.tar.zst") == "b.dockertree-package"
+        assert strip_archive_extension("b.dockertree-package.tar.gz") == "b.dockertree-package"
+        assert strip_archive_extension("b.dockertree-package") == "b.dockertree-package"
@@ -3,12 +3,13 @@ Unit tests for configuration management.
 """
 
 import pytest
+import yaml
 from unittest.mock import patch
 from dockertree.config.settings import (
     VERSION, AUTHOR, CADDY_NETWORK,
     get_project_root, get_worktree_paths, get_volume_names,
     generate_env_compose_content, PROTECTED_BRANCHES, DEFAULT_ENV_VARS,
-    get_project_name, sanitize_project_name
+    get_project_name, sanitize_project_name, load_project_config
 )
 from dockertree.utils.validation import validate_branch_name
 
@@ -122,3 +123,36 @@ class TestConfiguration:
         assert validate_branch_name("test branch") == False
         assert validate_branch_name("") == False
         assert validate_branch_name(None) == False
+
+
+class TestProjectConfigCache:
+    """Test memoized config loading."""
+    
+    @pytest.fixture
+    def project(self, tmp_path):
+        (tmp_path / ".dockertree").mkdir()
+        config_file = tmp_path / ".dockertree" / "config.yml"
+        config_file.write_text("project_name: cached\nvolumes: [postgres_data]\n")
+        return tmp_path
+    
+    def test_parses_once_until_file_changes(self, project):
+        with patch('dockertree.config.settings.yaml.load', wraps=yaml.load) as mock_load:
+            assert load_project_config(project).project_name == "cached"
+            assert load_project_config(project).project_name == "cached"
+            assert mock_load.call_count == 1
+            
+            (project / ".dockertree" / "config.yml").write_text("project_name: changed-name\n")
+            assert load_project_config(project).project_name == "changed-name"
+            assert mock_load.call_count == 2
+    
+    def test_config_is_read_only(self, project):
+        config = load_project_config(project)
+        with pytest.raises(TypeError):
+            config.data["project_name"] = "other"
+        assert config.get_value(["volumes"]) == ("postgres_data",)
+        assert config.to_dict()["volumes"] == ["postgres_data"]
+    
+    def test_missing_config(self, tmp_path):
+        config = load_project_config(tmp_path)
+        assert config.path is None
+        assert config.worktree_dir == "worktrees"
@@ -0,0 +1,101 @@
+"""
+Unit tests for the Docker Engine API client.
+"""
+
+from unittest.mock import Mock, patch
+
+from dockertree.utils.docker_client import DOCKER_API_ENV, DockerClient
+
+
+API_CONTAINER = {
+    "Names": ["/myproject-feature-db"],
+    "Image": "postgres:16",
+    "State": "running",
+    "Status": "Up 5 minutes",
+    "Labels": {"com.docker.compose.project": "myproject-feature"},
+    "Mounts": [
+        {"Type": "volume", "Name": "myproject-feature_postgres_data"},
+        {"Type": "bind", "Source": "/tmp"},
+    ],
+    "Ports": [{"PrivatePort": 5432, "Type": "tcp"}],
+}
+
+
+def _client_with_api(api):
+    client = DockerClient()
+    client._api = api
+    client._api_checked = True
+    return client
+
+
+class TestEngineApi:
+    """Test queries over the Engine API."""
+
+    def test_list_containers(self):
+        api = Mock()
+        api.containers.return_value = [API_CONTAINER]
+        client = _client_with_api(api)
+
+        with patch('subprocess.run') as mock_run:
+            containers = client.list_containers(all=True, filters={"label": ["com.docker.compose.project=myproject-feature"]})
+
+        mock_run.assert_not_called()
+        api.containers.assert_called_once_with(
+            all=True, filters={"label": ["com.docker.compose.project=myproject-feature"]}
+        )
+        container, = containers
+        assert container.name == "myproject-feature-db"
+        assert container.running
+        assert container.volumes == ("myproject-feature_postgres_data",)
+        assert container.ports == "5432/tcp"
+
+    def test_list_volume_names(self):
+        api = Mock()
+        api.volumes.return_value = {"Volumes": [{"Name": "a_postgres_data"}, {"Name": "b_redis_data"}]}
+        client = _client_with_api(api)
+
+        assert client.list_volume_names(filters={"name": ["a_postgres_data"]}) == ["a_postgres_data", "b_redis_data"]
+        api.volumes.assert_called_once_with(filters={"name": ["a_postgres_data"]})
+
+    def test_api_error_falls_back_to_cli(self):
+        api = Mock()
+        api.volumes.side_effect = ConnectionError("socket closed")
+        client = _client_with_api(api)
+
+        with patch('subprocess.run', return_value=Mock(stdout="a_postgres_data\n", returncode=0)) as mock_run:
+            assert client.list_volume_names() == ["a_postgres_data"]
+            assert client.list_volume_names() == ["a_postgres_data"]
+
+        # The API is not retried after it failed once
+        api.volumes.assert_called_once()
+        assert mock_run.call_count == 2
+
+
+class TestCliFallback:
+    """Test queries through the docker CLI."""
+
+    def test_disabled_by_environment(self, monkeypatch):
+        monkeypatch.setenv(DOCKER_API_ENV, "0")
+        assert DockerClient()._get_api() is None
+
+    def test_parses_json_lines(self):
+        stdout = (
+            '{"Names":"web","Image":"app","State":"running","Status":"Up 1 hour",'
+            '"Labels":"com.docker.compose.project=p,com.docker.compose.service=web","Mounts":"p_media_files","Ports":""}\n'
+            '{"Names":"db","Image":"postgres","State":"exited","Status":"Exited (0)","Labels":"","Mounts":"","Ports":""}\n'
+        )
+        with patch('subprocess.run', return_value=Mock(stdout=stdout, returncode=0)) as mock_run:
+            web, db = DockerClient().list_containers(all=True, filters={"label": ["com.docker.compose.project=p"]})
+
+        assert mock_run.call_args[0][0] == [
+            "docker", "ps", "-a", "--no-trunc", "--format", "{{json .}}",
+            "--filter", "label=com.docker.compose.project=p"
+        ]
+        assert web.running and not db.running
+        assert web.labels["com.docker.compose.service"] == "web"
+        assert web.volumes == ("p_media_files",)
+
+    def test_docker_unavailable(self):
+        with patch('subprocess.run', side_effect=FileNotFoundError("docker")):
+            assert DockerClient().list_containers() is None
+            assert DockerClient().volume_exists("a_postgres_data") is False
@@ -2,12 +2,29 @@
 Unit tests for DockerManager high-level functions.
 """
 
+import hashlib
+import io
+import json
 import pytest
 import subprocess
+import tarfile
+import threading
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 
 from dockertree.core.docker_manager import DockerManager
+from dockertree.utils.checksum import TreeChecksum
+from dockertree.utils.seekable_archive import open_seekable_writer
+from dockertree.utils.docker_client import ContainerSummary, VolumeSummary
+from dockertree.utils.volume_inventory import VolumeInventory
+from dockertree.utils.volume_archive import LAYOUT_CHUNKED, LAYOUT_STREAMED
+
+
+def _inventory(*volume_names):
+    """Volume inventory holding the given volumes."""
+    client = Mock()
+    client.list_volumes.return_value = [VolumeSummary(name) for name in volume_names]
+    return VolumeInventory(client)
 
 
 class TestDockerManager:
@@ -51,57 +68,50 @@ class TestDockerManager:
         mock_validate.assert_called_once_with(network_name)
         mock_run.assert_called_once()
     
-    @patch('dockertree.core.docker_manager.validate_volume_exists')
+    @patch('dockertree.core.docker_manager.get_volume_inventory', return_value=_inventory())
     @patch('subprocess.run')
-    def test_copy_volume_source_not_exists(self, mock_run, mock_validate, docker_manager):
+    def test_copy_volume_source_not_exists(self, mock_run, mock_inventory, docker_manager):
         """Test copy_volume when source volume doesn't exist."""
         source_volume = "source-volume"
         target_volume = "target-volume"
         
-        mock_validate.return_value = False
         mock_run.return_value = Mock(returncode=0)
         
         result = docker_manager.copy_volume(source_volume, target_volume)
         
         assert result == True
-        mock_validate.assert_called_once_with(source_volume)
         mock_run.assert_called_once_with(
             ["docker", "volume", "create", target_volume],
             check=True,
             capture_output=True
         )
     
-    @patch('dockertree.core.docker_manager.validate_volume_exists')
+    @patch('dockertree.core.docker_manager.get_volume_inventory', return_value=_inventory("source-volume"))
     @patch('subprocess.run')
-    def test_copy_volume_success(self, mock_run, mock_validate, docker_manager):
+    def test_copy_volume_success(self, mock_run, mock_inventory, docker_manager):
         """Test successful volume copy."""
         source_volume = "source-volume"
         target_volume = "target-volume"
         
-        mock_validate.return_value = True
         mock_run.return_value = Mock(returncode=0)
         
         result = docker_manager.copy_volume(source_volume, target_volume)
         
         assert result == True
-        mock_validate.assert_called_once_with(source_volume)
         assert mock_run.call_count == 2  # create target volume + copy data
     
-    @patch('dockertree.core.docker_manager.validate_volume_exists')
+    @patch('dockertree.core.docker_manager.get_volume_inventory', return_value=_inventory("source-volume"))
     @patch('subprocess.run')
-    def test_copy_volume_copy_failure(self, mock_run, mock_validate, docker_manager):
+    def test_copy_volume_copy_failure(self, mock_run, mock_inventory, docker_manager):
         """Test volume copy with copy operation failure."""
         source_volume = "source-volume"
         target_volume = "target-volume"
         
-        mock_validate.return_value = True
         # First call (create volume) succeeds, second call (copy) fails
         mock_run.side_effect = [Mock(returncode=0), Exception("Copy failed")]
         
         with pytest.raises(Exception, match="Copy failed"):
             docker_manager.copy_volume(source_volume, target_volume)
-        
-        mock_validate.assert_called_once_with(source_volume)
     
     @patch('dockertree.core.docker_manager.get_volume_names')
     @patch.object(DockerManager, 'copy_volume')
@@ -148,10 +158,93 @@ class TestDockerManager:
         mock_get_volume_names.assert_called_once_with(branch_name)
         assert mock_copy_volume.call_count == 3
     
+    def test_concurrent_worktree_creation_does_not_overlap_source_database_copies(self, docker_manager):
+        """Test that bulk creation never restarts the source database during another copy."""
+        events = []
+        
+        def fake_stop(volume_name, project_name, operation_type="operation"):
+            events.append("stop")
+            return "proj-db"
+        
+        def fake_copy(source_volume, target_volume, project_name=None):
+            events.append("copy")
+            threading.Event().wait(0.05)
+            events.append("copied")
+            return True
+        
+        def fake_restart(container_name):
+            events.append("restart")
+            return True
+        
+        with patch('dockertree.core.docker_manager.get_source_volume_names',
+                   return_value={"postgres": "proj_postgres_data"}), \
+             patch('dockertree.core.docker_manager.get_volume_names',
+                   side_effect=lambda branch: {"postgres": f"proj-{branch}_postgres_data"}), \
+             patch('dockertree.core.docker_manager.get_volume_inventory', return_value=_inventory()), \
+             patch.object(docker_manager, '_get_clone_backend', return_value=Mock()), \
+             patch.object(docker_manager, '_ensure_containers_stopped_for_volume_operation', side_effect=fake_stop), \
+             patch.object(docker_manager, 'copy_volume', side_effect=fake_copy), \
+             patch.object(docker_manager, '_restart_container', side_effect=fake_restart):
+            threads = [threading.Thread(target=docker_manager.create_worktree_volumes, args=(branch, "proj"))
+                       for branch in ("a", "b", "c")]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=10)
+        
+        assert events == ["stop", "copy", "copied", "restart"] * 3
+    
+    def test_copy_volumes_concurrently_restarts_postgres_container_early(self, docker_manager):
+        """Test that the stopped database container restarts when its own copy finishes."""
+        import threading
+        
+        media_release = threading.Event()
+        events = []
+        
+        def fake_copy(source_volume, target_volume, project_name=None):
+            if "media" in target_volume:
+                # Media copy only completes once the database container is back up
+                assert media_release.wait(timeout=5)
+            events.append(f"copied:{target_volume}")
+            return True
+        
+        def fake_restart(container_name):
+            events.append(f"restarted:{container_name}")
+            media_release.set()
+            return True
+        
+        copy_jobs = [
+            ("postgres", "proj_postgres_data", "proj-b_postgres_data"),
+            ("media", "proj_media_files", "proj-b_media_files"),
+        ]
+        with patch.object(docker_manager, 'copy_volume', side_effect=fake_copy), \
+             patch.object(docker_manager, '_restart_container', side_effect=fake_restart) as mock_restart:
+            result = docker_manager._copy_volumes_concurrently(
+                copy_jobs, "proj", restart_after={"postgres": "proj-db"}
+            )
+        
+        assert result == True
+        mock_restart.assert_called_once_with("proj-db")
+        assert events.index("restarted:proj-db") < events.index("copied:proj-b_media_files")
+    
+    def test_copy_volumes_concurrently_restarts_container_on_failure(self, docker_manager):
+        """Test that the database container is restarted even if its copy fails."""
+        copy_jobs = [("postgres", "proj_postgres_data", "proj-b_postgres_data")]
+        with patch.object(docker_manager, 'copy_volume', side_effect=Exception("copy failed")), \
+             patch.object(docker_manager, '_restart_container', return_value=True) as mock_restart:
+            result = docker_manager._copy_volumes_concurrently(
+                copy_jobs, "proj", restart_after={"postgres": "proj-db"}
+            )
+        
+        assert result == False
+        mock_restart.assert_called_once_with("proj-db")
+    
     @patch('dockertree.core.docker_manager.get_volume_names')
-    @patch('dockertree.core.docker_manager.validate_volume_exists')
+    @patch('dockertree.core.docker_manager.get_volume_inventory',
+           return_value=_inventory("test-branch_postgres_data", "test-branch_redis_data", "test-branch_media_files"))
+    @patch('dockertree.core.docker_manager.remove_orphaned_helpers', return_value=0)
     @patch('subprocess.run')
-    def test_remove_volumes_success(self, mock_run, mock_validate, mock_get_volume_names, docker_manager):
+    def test_remove_volumes_success(self, mock_run, mock_remove_orphans, mock_inventory, mock_get_volume_names, docker_manager):
         """Test successful volume removal.
         
         Note: Only removes postgres, redis, and media volumes.
@@ -164,20 +257,20 @@ class TestDockerManager:
             "redis": "test-branch_redis_data",
             "media": "test-branch_media_files",
         }
-        mock_validate.return_value = True
         mock_run.return_value = Mock(returncode=0)
         
         result = docker_manager.remove_volumes(branch_name)
         
         assert result == True
         mock_get_volume_names.assert_called_once_with(branch_name)
-        assert mock_validate.call_count == 3
         assert mock_run.call_count == 3
     
     @patch('dockertree.core.docker_manager.get_volume_names')
-    @patch('dockertree.core.docker_manager.validate_volume_exists')
+    @patch('dockertree.core.docker_manager.get_volume_inventory',
+           return_value=_inventory("test-branch_postgres_data", "test-branch_redis_data", "test-branch_media_files"))
+    @patch('dockertree.core.docker_manager.remove_orphaned_helpers', return_value=0)
     @patch('subprocess.run')
-    def test_remove_volumes_partial_failure(self, mock_run, mock_validate, mock_get_volume_names, docker_manager):
+    def test_remove_volumes_partial_failure(self, mock_run, mock_remove_orphans, mock_inventory, mock_get_volume_names, docker_manager):
         """Test volume removal with partial failure."""
         branch_name = "test-branch"
         
@@ -186,7 +279,6 @@ class TestDockerManager:
             "redis": "test-branch_redis_data",
             "media": "test-branch_media_files",
         }
-        mock_validate.return_value = True
         # First two succeed, third fails with CalledProcessError
         mock_run.side_effect = [Mock(returncode=0), Mock(returncode=0), subprocess.CalledProcessError(1, "docker", "Remove failed")]
         
@@ -194,28 +286,24 @@ class TestDockerManager:
         
         assert result == False
         mock_get_volume_names.assert_called_once_with(branch_name)
-        assert mock_validate.call_count == 3
         assert mock_run.call_count == 3
     
+    @patch('dockertree.core.docker_manager.get_volume_inventory',
+           return_value=_inventory("test-branch_postgres_data", "test-branch_redis_data", "test-branch_media_files"))
     @patch('dockertree.core.docker_manager.get_volume_names')
-    @patch('subprocess.run')
-    def test_backup_volumes_success(self, mock_run, mock_get_volume_names, docker_manager):
+    def test_backup_volumes_success(self, mock_get_volume_names, mock_inventory, docker_manager, tmp_path):
         """Test successful volume backup."""
         branch_name = "test-branch"
-        backup_dir = Path("/test/backups")
+        backup_dir = tmp_path / "backups"
         
         mock_get_volume_names.return_value = {
             "postgres": "test-branch_postgres_data",
             "redis": "test-branch_redis_data",
             "media": "test-branch_media_files",
         }
-        mock_run.return_value = Mock(returncode=0)
         
-        # Mock the backup file creation
-        with patch('pathlib.Path.mkdir'), \
-             patch('pathlib.Path.exists', return_value=True), \
-             patch('pathlib.Path.unlink'), \
-             patch('shutil.rmtree'):
+        with patch.object(docker_manager, '_is_worktree_running', return_value=False), \
+             patch.object(docker_manager, '_stream_volume_to_archive', return_value="abc") as mock_stream:
             
             result = docker_manager.backup_volumes(branch_name, backup_dir)
         
@@ -224,7 +312,245 @@ class TestDockerManager:
         assert result.name.startswith("backup_test-branch")
         assert result.name.endswith(".tar")
         assert result.suffix == ".tar"
+        assert result.exists()
         mock_get_volume_names.assert_called_once_with(branch_name)
+        # Each volume is written into the single backup archive under its own name
+        assert [c.args[2] for c in mock_stream.call_args_list] == [
+            "test-branch_postgres_data", "test-branch_redis_data", "test-branch_media_files"
+        ]
+    
+    @patch('dockertree.core.docker_manager.get_volume_inventory', return_value=_inventory("test-branch_postgres_data"))
+    def test_backup_volumes_failure_removes_partial_backup(self, mock_inventory, docker_manager, tmp_path):
+        """Test that a failed volume stream fails the backup and leaves no file behind."""
+        with patch.object(docker_manager, '_is_worktree_running', return_value=False), \
+             patch.object(docker_manager, '_stream_volume_to_archive', return_value=None):
+            
+            result = docker_manager.backup_volumes("test-branch", tmp_path, volume_names=["test-branch_postgres_data"])
+        
+        assert result is None
+        assert not (tmp_path / "backup_test-branch.tar").exists()
+    
+    @staticmethod
+    def _make_volume_tar(files):
+        """Build an uncompressed tar stream like `tar cf - -C /data .` produces."""
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w") as tar:
+            root = tarfile.TarInfo(".")
+            root.type = tarfile.DIRTYPE
+            tar.addfile(root)
+            for name, data in files.items():
+                info = tarfile.TarInfo(f"./{name}")
+                info.size = len(data)
+                info.uname = "postgres"
+                info.uid = 999
+                tar.addfile(info, io.BytesIO(data))
+        return buffer.getvalue()
+    
+    def test_stream_volume_to_archive(self, docker_manager, tmp_path):
+        """Test streaming a volume's tar output into an archive under the volume name."""
+        files = {"PG_VERSION": b"16\n", "base/1/1259": b"x" * 5000}
+        process = Mock(stdout=io.BytesIO(self._make_volume_tar(files)), stderr=io.BytesIO(b""))
+        process.wait.return_value = 0
+        archive_path = tmp_path / "backup.tar"
+        
+        with patch('subprocess.Popen', return_value=process) as mock_popen, \
+             tarfile.open(archive_path, "w:gz") as tar:
+            checksum = docker_manager._stream_volume_to_archive("proj-b_postgres_data", tar, "proj-b_postgres_data")
+        
+        assert "proj-b_postgres_data:/volumes/proj-b_postgres_data:ro" in mock_popen.call_args[0][0]
+        expected = TreeChecksum()
+        for name, data in files.items():
+            expected.add_file(name, hashlib.sha256(data).hexdigest())
+        assert checksum == expected.hexdigest()
+        
+        with tarfile.open(archive_path, "r:gz") as tar:
+            assert tar.getnames() == [
+                "proj-b_postgres_data", "proj-b_postgres_data/PG_VERSION", "proj-b_postgres_data/base/1/1259"
+            ]
+            assert tar.extractfile("proj-b_postgres_data/base/1/1259").read() == files["base/1/1259"]
+    
+    def test_stream_volume_to_archive_container_failure(self, docker_manager, tmp_path):
+        """Test that a failing backup container is reported as a failure."""
+        process = Mock(stdout=io.BytesIO(self._make_volume_tar({})), stderr=io.BytesIO(b"no such volume"))
+        process.wait.return_value = 1
+        
+        with patch('subprocess.Popen', return_value=process), \
+             tarfile.open(tmp_path / "backup.tar", "w:gz") as tar:
+            assert docker_manager._stream_volume_to_archive("missing_postgres_data", tar, "missing_postgres_data") is None
+    
+    def test_restore_streamed_volumes(self, docker_manager, tmp_path):
+        """Test restoring a streamed backup by piping members into a container."""
+        backup_file = tmp_path / "backup_feature.tar"
+        with tarfile.open(backup_file, "w:gz") as tar:
+            for name, data in {"other-feature_postgres_data/PG_VERSION": b"16\n",
+                               "other-feature_postgres_data/base/1": b"data"}.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                info.uname = "postgres"
+                tar.addfile(info, io.BytesIO(data))
+        
+        class CapturedStdin(io.BytesIO):
+            def close(self):
+                pass
+        
+        process = Mock(stdin=CapturedStdin(), stderr=io.BytesIO(b""))
+        process.wait.return_value = 0
+        volume_names = {
+            "postgres": "proj-feature_postgres_data",
+            "redis": "proj-feature_redis_data",
+            "media": "proj-feature_media_files",
+        }
+        
+        assert docker_manager._detect_backup_layout(backup_file) == LAYOUT_STREAMED
+        with patch.object(docker_manager, '_prepare_volume_for_restore', return_value="ready") as mock_prepare, \
+             patch('subprocess.Popen', return_value=process) as mock_popen:
+            result = docker_manager._restore_streamed_volumes(backup_file, volume_names)
+        
+        # Restored postgres (mapped by suffix), redis and media missing from the archive
+        assert result == (1, 2, 0, 1)
+        mock_prepare.assert_called_once_with("postgres", "proj-feature_postgres_data")
+        assert "proj-feature_postgres_data:/volumes/proj-feature_postgres_data" in mock_popen.call_args[0][0]
+        with tarfile.open(fileobj=io.BytesIO(process.stdin.getvalue()), mode="r") as tar:
+            members = tar.getmembers()
+            assert [m.name for m in members] == ["PG_VERSION", "base/1"]
+            assert all(m.uname == "" for m in members)
+    
+    def test_restore_streamed_volumes_single_pass_hooks(self, docker_manager, tmp_path):
+        """Test that other members are handed over and volumes checksummed while they are piped."""
+        package = tmp_path / "feature.dockertree-package.tar.gz"
+        files = {"feature.dockertree-package/metadata.json": b"{}",
+                 "feature.dockertree-package/volumes/other-feature_postgres_data/PG_VERSION": b"16\n",
+                 "feature.dockertree-package/volumes/other-feature_redis_data/dump.rdb": b"REDIS",
+                 "feature.dockertree-package/environment/.env": b"DEBUG=1\n"}
+        with tarfile.open(package, "w:gz") as tar:
+            for name, data in files.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        
+        class CapturedStdin(io.BytesIO):
+            def close(self):
+                pass
+        
+        process = Mock(stdin=CapturedStdin(), stderr=io.BytesIO(b""))
+        process.wait.return_value = 0
+        handled = []
+        checksums = {}
+        
+        def prepare(volume_type, volume_name):
+            return "ready" if volume_type == "postgres" else "skipped"
+        
+        with patch.object(docker_manager, '_prepare_volume_for_restore', side_effect=prepare), \
+             patch('subprocess.Popen', return_value=process):
+            result = docker_manager._restore_streamed_volumes(
+                package, {"postgres": "proj-feature_postgres_data", "redis": "proj-feature_redis_data"},
+                member_handler=lambda archive, member: handled.append(member.name),
+                volume_checksums=checksums
+            )
+        
+        assert result == (1, 1, 0, 2)
+        assert handled == ["feature.dockertree-package/metadata.json", "feature.dockertree-package/environment/.env"]
+        # Skipped volumes are checksummed too
+        for volume_dir, name, data in (("other-feature_postgres_data", "PG_VERSION", b"16\n"),
+                                       ("other-feature_redis_data", "dump.rdb", b"REDIS")):
+            expected = TreeChecksum()
+            expected.add_file(name, hashlib.sha256(data).hexdigest())
+            assert checksums[volume_dir] == expected.hexdigest()
+    
+    def test_restore_seekable_volumes_in_parallel(self, docker_manager, tmp_path):
+        """Test that volumes of a seekable package are prepared and restored concurrently."""
+        package = tmp_path / "feature.dockertree-package.tar.gz"
+        files = {"feature.dockertree-package/metadata.json": b"{}",
+                 "feature.dockertree-package/volumes/other-feature_postgres_data/PG_VERSION": b"16\n",
+                 "feature.dockertree-package/volumes/other-feature_redis_data/dump.rdb": b"REDIS",
+                 "feature.dockertree-package/volumes/other-feature_media_files/logo.png": b"PNG",
+                 "feature.dockertree-package/environment/.env": b"DEBUG=1\n"}
+        with open(package, "wb") as output, open_seekable_writer(output, 6) as tar:
+            for name, data in files.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        
+        class CapturedStdin(io.BytesIO):
+            def close(self):
+                pass
+        
+        processes = {}
+        
+        def open_container(volume_name):
+            process = processes[volume_name] = Mock(stdin=CapturedStdin(), stderr=io.BytesIO(b""))
+            process.wait.return_value = 0
+            return process
+        
+        # Both volumes must be prepared at the same time to get past the barrier
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def prepare(volume_type, volume_name):
+            barrier.wait()
+            return "ready"
+        
+        handled = []
+        checksums = {}
+        with patch.object(docker_manager, '_prepare_volume_for_restore', side_effect=prepare), \
+             patch.object(docker_manager, '_open_restore_container', side_effect=open_container):
+            result = docker_manager._restore_streamed_volumes(
+                package, {"postgres": "proj-feature_postgres_data", "redis": "proj-feature_redis_data"},
+                member_handler=lambda archive, member: handled.append(member.name),
+                volume_checksums=checksums
+            )
+        
+        # media has no target: skipped without being read
+        assert result == (2, 1, 0, 3)
+        assert handled == ["feature.dockertree-package/metadata.json", "feature.dockertree-package/environment/.env"]
+        assert set(checksums) == {"other-feature_postgres_data", "other-feature_redis_data"}
+        with tarfile.open(fileobj=io.BytesIO(processes["proj-feature_redis_data"].stdin.getvalue())) as tar:
+            assert tar.extractfile("dump.rdb").read() == b"REDIS"
+    
+    def test_inspect_volume_for_restore_uses_one_container(self, docker_manager):
+        """Test that the PostgreSQL and size checks run in a single helper container."""
+        with patch('subprocess.run', return_value=Mock(stdout="empty_init\n512\n", stderr="")) as mock_run:
+            assert docker_manager._inspect_volume_for_restore("proj-feature_postgres_data") == (False, 512)
+        
+        mock_run.assert_called_once()
+    
+    @patch('dockertree.core.docker_manager.get_volume_inventory', return_value=_inventory("proj-feature_postgres_data"))
+    def test_incremental_backup_and_restore(self, mock_inventory, docker_manager, tmp_path):
+        """Test that a repeated incremental backup stores no new chunks and restores from its manifest."""
+        files = {"PG_VERSION": b"16\n", "base/1/1259": b"x" * 5000}
+        store_dir = tmp_path / "store"
+        
+        def volume_stream(*args, **kwargs):
+            process = Mock(stdout=io.BytesIO(self._make_volume_tar(files)), stderr=io.BytesIO(b""))
+            process.wait.return_value = 0
+            return process
+        
+        with patch.object(docker_manager, '_is_worktree_running', return_value=False), \
+             patch('subprocess.Popen', side_effect=volume_stream):
+            first = docker_manager.backup_volumes_incremental("feature", store_dir, ["proj-feature_postgres_data"])
+            second = docker_manager.backup_volumes_incremental("feature", store_dir, ["proj-feature_postgres_data"])
+        
+        assert first.parent == store_dir / "manifests" / "feature"
+        manifest = json.loads(second.read_text())
+        volume = manifest["volumes"]["proj-feature_postgres_data"]
+        assert volume["bytes"] == 5003
+        assert volume["new_bytes"] == 0
+        assert len(list((store_dir / "chunks").rglob("*"))) == 4  # 2 chunks in 2 prefix directories
+        
+        class CapturedStdin(io.BytesIO):
+            def close(self):
+                pass
+        
+        process = Mock(stdin=CapturedStdin(), stderr=io.BytesIO(b""))
+        process.wait.return_value = 0
+        assert docker_manager._detect_backup_layout(second) == LAYOUT_CHUNKED
+        with patch.object(docker_manager, '_prepare_volume_for_restore', return_value="ready"), \
+             patch('subprocess.Popen', return_value=process):
+            result = docker_manager._restore_chunked_volumes(second, {"postgres": "proj-other_postgres_data"})
+        
+        assert result == (1, 0, 0, 1)
+        with tarfile.open(fileobj=io.BytesIO(process.stdin.getvalue()), mode="r") as tar:
+            assert [m.name for m in tar.getmembers()] == [".", "PG_VERSION", "base/1/1259"]
+            assert tar.extractfile("base/1/1259").read() == files["base/1/1259"]
     
     @patch('dockertree.core.docker_manager.get_volume_names')
     @patch('subprocess.run')
@@ -423,19 +749,28 @@ class TestDockerManager:
     
     @patch('subprocess.run')
     def test_get_volume_sizes_success(self, mock_run, docker_manager):
-        """Test successful volume size retrieval."""
-        # First call returns volume list, subsequent calls return size for each volume
-        mock_run.side_effect = [
-            Mock(returncode=0, stdout="test-volume_postgres_data\ntest-volume_redis_data"),
-            Mock(returncode=0, stdout="1.2GB\t/data"),
-            Mock(returncode=0, stdout="800MB\t/data")
-        ]
+        """Test that volume sizes come from one system df query rather than a container per volume."""
+        outputs = {
+            ("volume", "ls", "-q"): "test-volume_postgres_data\ntest-volume_redis_data\nother_volume",
+            ("volume", "ls", "--format"): (
+                '{"Name":"test-volume_postgres_data","Mountpoint":"/nonexistent/a"}\n'
+                '{"Name":"test-volume_redis_data","Mountpoint":"/nonexistent/b"}\n'
+            ),
+            ("system", "df", "-v"): (
+                '[{"Name":"test-volume_postgres_data","Size":"1.5GB"},'
+                '{"Name":"test-volume_redis_data","Size":"N/A"}]'
+            ),
+        }
+        mock_run.side_effect = lambda cmd, **kwargs: Mock(returncode=0, stdout=outputs[tuple(cmd[1:4])])
         
         result = docker_manager.get_volume_sizes()
         
-        assert "test-volume_postgres_data" in result
-        assert result["test-volume_postgres_data"] == "1.2GB"
+        assert result == {"test-volume_postgres_data": "1.4 GB", "test-volume_redis_data": "unknown"}
         assert mock_run.call_count == 3
+        
+        # Sizes are cached for a while
+        docker_manager.get_volume_sizes()
+        assert mock_run.call_count == 4
     
     @patch('subprocess.run')
     def test_get_volume_sizes_failure(self, mock_run, docker_manager):
@@ -446,5 +781,38 @@ class TestDockerManager:
         with patch.object(docker_manager, 'list_volumes', return_value=["test-volume"]):
             result = docker_manager.get_volume_sizes()
         
-        assert result == {}
-        mock_run.assert_called_once()
+        assert result == {"test-volume": "unknown"}
+        # Volume listing and system df, no per-volume containers
+        assert mock_run.call_count == 2
+    
+    @patch('dockertree.core.readiness.time.sleep')
+    @patch('dockertree.core.readiness.get_docker_client')
+    def test_wait_for_containers_ready(self, mock_client, mock_sleep, docker_manager):
+        """Test waiting until healthchecks pass, ignoring exited one-off containers."""
+        starting = [
+            ContainerSummary(name="web", image="app", state="running", status="Up 1 second (health: starting)"),
+            ContainerSummary(name="migrate", image="app", state="exited", status="Exited (0) 1 second ago"),
+        ]
+        healthy = [
+            ContainerSummary(name="web", image="app", state="running", status="Up 3 seconds (healthy)"),
+            starting[1],
+        ]
+        mock_client.return_value.list_containers.side_effect = [starting, healthy]
+        
+        report = docker_manager.wait_for_containers_ready("project-feature")
+        assert report.ready
+        assert set(report.results) == {"web", "migrate"}
+        assert mock_sleep.call_count == 1
+    
+    @patch('dockertree.core.readiness.time.sleep')
+    @patch('dockertree.core.readiness.get_docker_client')
+    def test_wait_for_containers_ready_unhealthy(self, mock_client, mock_sleep, docker_manager):
+        """Test that unhealthy containers end the wait."""
+        mock_client.return_value.list_containers.return_value = [
+            ContainerSummary(name="web", image="app", state="running", status="Up 1 minute (unhealthy)"),
+        ]
+        
+        report = docker_manager.wait_for_containers_ready("project-feature")
+        assert not report.ready
+        assert report.describe() == "web: unhealthy"
+        mock_sleep.assert_not_called()
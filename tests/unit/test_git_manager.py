@@ -221,18 +221,19 @@ class TestGitManager:
         """Test successful worktree listing."""
         mock_run.return_value = Mock(
             returncode=0,
-            stdout="/test/worktrees/branch1 abc123 [branch1]\n/test/worktrees/branch2 def456 [branch2]"
+            stdout="worktree /test/worktrees/branch1\0HEAD abc1234def\0branch refs/heads/branch1\0\0"
+                   "worktree /test/worktrees/branch2\0HEAD def4567abc\0branch refs/heads/branch2\0\0"
         )
         
         result = git_manager.list_worktrees()
         
         expected = [
-            ("/test/worktrees/branch1", "abc123", "branch1"),
-            ("/test/worktrees/branch2", "def456", "branch2")
+            ("/test/worktrees/branch1", "abc1234", "branch1"),
+            ("/test/worktrees/branch2", "def4567", "branch2")
         ]
         assert result == expected
         mock_run.assert_called_once_with(
-            ["git", "worktree", "list"],
+            ["git", "worktree", "list", "--porcelain", "-z"],
             capture_output=True,
             text=True,
             check=True,
@@ -247,7 +248,8 @@ class TestGitManager:
         result = git_manager.list_worktrees()
         
         assert result == []
-        mock_run.assert_called_once()
+        # Retried without -z for older git versions
+        assert mock_run.call_count == 2
     
     @patch('subprocess.run')
     def test_prune_worktrees_success(self, mock_run, git_manager):
@@ -268,7 +270,7 @@ class TestGitManager:
         result = git_manager.prune_worktrees()
         
         assert result == 0  # Should return 0 on failure
-        mock_run.assert_called_once()
+        assert mock_run.call_count == 2
     
     @patch('dockertree.core.git_manager.validate_worktree_exists')
     def test_validate_worktree_exists_true(self, mock_validate_func, git_manager):
@@ -298,14 +300,14 @@ class TestGitManager:
         branch_name = "test-branch"
         mock_run.return_value = Mock(
             returncode=0,
-            stdout="/test/worktrees/test-branch abc123 [test-branch]"
+            stdout="worktree /test/worktrees/test-branch\0HEAD abc123\0branch refs/heads/test-branch\0\0"
         )
         
         result = git_manager.find_worktree_path(branch_name)
         
         assert result == Path("/test/worktrees/test-branch")
         mock_run.assert_called_once_with(
-            ["git", "worktree", "list"],
+            ["git", "worktree", "list", "--porcelain", "-z"],
             capture_output=True,
             text=True,
             check=True,
@@ -335,7 +337,7 @@ class TestGitManager:
         result = git_manager.find_worktree_path(branch_name)
         
         assert result is None
-        mock_run.assert_called_once()
+        assert mock_run.call_count == 2
     
     @patch('dockertree.core.git_manager.validate_branch_protection')
     @patch('dockertree.core.git_manager.validate_current_branch')
@@ -0,0 +1,228 @@
+"""
+Unit tests for package metadata reading, listing and streaming verification.
+"""
+
+import io
+import json
+import tarfile
+from unittest.mock import Mock, patch
+
+import pytest
+
+from dockertree.core.package_manager import METADATA_FILE, VOLUME_CHECKSUMS_FILE, PackageManager
+from dockertree.utils.seekable_archive import INDEX_MEMBER_NAME, read_archive_index
+from dockertree.utils.checksum import TreeChecksum
+
+VOLUME = "proj-feature_postgres_data"
+
+
+def _add_bytes(tar, name, data):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    tar.addfile(info, io.BytesIO(data))
+
+
+def _backup_volumes(branch_name, volume_names, tar, arc_prefix, checksum_algorithm):
+    tree = TreeChecksum(checksum_algorithm)
+    tree.add_fileobj("PG_VERSION", io.BytesIO(b"16\n"))
+    _add_bytes(tar, f"{arc_prefix}/{VOLUME}/PG_VERSION", b"16\n")
+    return {VOLUME: tree.hexdigest()}
+
+
+class TestPackageListing:
+    """Test the metadata-first package layout."""
+
+    @pytest.fixture
+    def package_manager(self, tmp_path):
+        with patch('dockertree.core.package_manager.get_project_root', return_value=tmp_path), \
+             patch('dockertree.core.docker_manager.validate_docker_running'), \
+             patch('dockertree.core.docker_manager.get_compose_command'):
+            manager = PackageManager(project_root=tmp_path)
+        manager.docker_manager.backup_volumes_to_archive = _backup_volumes
+        return manager
+
+    def _export(self, package_manager, tmp_path, name="feature_20240101-000000"):
+        staged = tmp_path / f"{name}.dockertree-package"
+        (staged / "environment").mkdir(parents=True)
+        (staged / "environment" / ".env").write_text("DEBUG=1\n")
+        output = tmp_path / "packages" / f"{name}.dockertree-package.tar.gz"
+        output.parent.mkdir(exist_ok=True)
+        with patch('dockertree.core.package_manager.get_project_name', return_value="proj"):
+            generate_metadata = lambda **kwargs: package_manager._generate_metadata(
+                "feature", staged, False, **kwargs
+            )
+            metadata = package_manager._compress_package(
+                staged, output, branch_name="feature", volume_names=[VOLUME],
+                generate_metadata=generate_metadata
+            )
+        return output, metadata
+
+    def test_metadata_is_first_and_volume_checksums_last(self, package_manager, tmp_path):
+        package, metadata = self._export(package_manager, tmp_path)
+
+        with tarfile.open(package) as tar:
+            names = [member.name.split("/", 1)[1] for member in tar.getmembers()
+                     if member.isfile() and member.name != INDEX_MEMBER_NAME]
+        assert names[0] == METADATA_FILE
+        assert names[-1] == VOLUME_CHECKSUMS_FILE
+        assert VOLUME in metadata["volume_checksums"]
+
+    def test_list_reads_only_metadata(self, package_manager, tmp_path):
+        self._export(package_manager, tmp_path)
+
+        with patch.object(PackageManager, "_verify_package_archive") as verify:
+            packages = package_manager.list_packages(tmp_path / "packages")
+
+        verify.assert_not_called()
+        assert packages[0]["metadata"]["branch_name"] == "feature"
+        assert packages[0]["valid"] is None
+
+    def test_verify_streams_whole_package(self, package_manager, tmp_path):
+        self._export(package_manager, tmp_path)
+
+        packages = package_manager.list_packages(tmp_path / "packages", verify=True)
+
+        assert packages[0]["valid"] is True
+        assert VOLUME in packages[0]["metadata"]["volume_checksums"]
+
+    def test_verify_detects_modified_file(self, package_manager, tmp_path):
+        package, _ = self._export(package_manager, tmp_path)
+        tampered = tmp_path / "tampered.dockertree-package.tar.gz"
+        with tarfile.open(package) as source, tarfile.open(tampered, "w:gz") as target:
+            for member in source.getmembers():
+                data = source.extractfile(member).read() if member.isfile() else None
+                if member.name.endswith("environment/.env"):
+                    data = b"DEBUG=0\n"
+                    member.size = len(data)
+                target.addfile(member, io.BytesIO(data) if data is not None else None)
+
+        result = package_manager.validate_package(tampered)
+
+        assert result["success"] and not result["valid"]
+
+    def test_verify_requires_volume_checksums(self, package_manager, tmp_path):
+        package, _ = self._export(package_manager, tmp_path)
+        truncated = tmp_path / "truncated.dockertree-package.tar.gz"
+        with tarfile.open(package) as source, tarfile.open(truncated, "w:gz") as target:
+            for member in source.getmembers():
+                if not member.name.endswith(VOLUME_CHECKSUMS_FILE):
+                    target.addfile(member, source.extractfile(member) if member.isfile() else None)
+
+        assert package_manager.validate_package(truncated)["valid"] is False
+
+    def test_gzip_package_is_seekable(self, package_manager, tmp_path):
+        package, metadata = self._export(package_manager, tmp_path)
+
+        index = read_archive_index(package)
+        assert metadata["package_version"] == "2.0"
+        assert f"feature_20240101-000000.dockertree-package/volumes/{VOLUME}/PG_VERSION" in index.names()
+        # Sections are verified in parallel from the index
+        assert package_manager.validate_package(package)["valid"] is True
+
+    def test_extract_seekable_package_checksums_volumes_without_extracting_them(self, package_manager, tmp_path):
+        package, metadata = self._export(package_manager, tmp_path)
+
+        extract_dir, volume_checksums = package_manager._extract_package(package, tmp_path / "extract")
+
+        package_dir = extract_dir / "feature_20240101-000000.dockertree-package"
+        assert volume_checksums == metadata["volume_checksums"]
+        assert (package_dir / "environment" / ".env").read_text() == "DEBUG=1\n"
+        assert not (package_dir / "volumes").exists()
+
+    def test_reads_metadata_of_older_layout(self, package_manager, tmp_path):
+        package = tmp_path / "old.dockertree-package.tar.gz"
+        with tarfile.open(package, "w:gz") as tar:
+            _add_bytes(tar, f"old.dockertree-package/volumes/{VOLUME}/PG_VERSION", b"16\n")
+            _add_bytes(tar, "old.dockertree-package/metadata.json", json.dumps({"branch_name": "old"}).encode())
+
+        assert package_manager.read_package_metadata(package) == {"branch_name": "old"}
+
+    def test_stream_import_restores_and_verifies_in_one_pass(self, package_manager, tmp_path):
+        package, _ = self._export(package_manager, tmp_path)
+        restore = package_manager.docker_manager.restore_volumes = Mock(side_effect=_restore_volumes)
+
+        temp_dir, package_dir, metadata = package_manager._stream_import(package, "feature")
+
+        restore.assert_called_once()
+        assert (package_dir / "environment" / ".env").read_text() == "DEBUG=1\n"
+        assert VOLUME in metadata["volume_checksums"]
+        assert package_manager._get_streamable_metadata(package)["branch_name"] == "feature"
+
+    def _normal_import(self, package_manager, package, existing_volumes, create_status="created"):
+        orchestrator = package_manager.orchestrator = Mock()
+        orchestrator.create_worktree.return_value = {"success": True, "data": {"status": create_status}}
+        orchestrator.remove_worktree.return_value = {"success": True}
+        package_manager.git_manager = Mock()
+        package_manager.git_manager.validate_worktree_exists.return_value = False
+        with patch('dockertree.utils.validation.validate_git_repository', return_value=True), \
+             patch('dockertree.utils.validation.validate_branch_exists', return_value=False), \
+             patch('dockertree.utils.validation.get_existing_volumes', return_value=set(existing_volumes)), \
+             patch('dockertree.config.settings.get_volume_names', return_value={"postgres": VOLUME}):
+            return package_manager._normal_import(package, "feature")
+
+    def test_existing_volumes_are_not_restored_from_corrupt_package(self, package_manager, tmp_path):
+        package, _ = self._export(package_manager, tmp_path)
+        restore = package_manager.docker_manager.restore_volumes = Mock()
+
+        with patch.object(package_manager, '_verify_package_checksums', return_value=False):
+            result = self._normal_import(package_manager, package, existing_volumes=[VOLUME])
+
+        # Verified before anything was created or restored
+        assert not result["success"] and "integrity check failed" in result["error"]
+        package_manager.orchestrator.create_worktree.assert_not_called()
+        restore.assert_not_called()
+
+    def test_corrupt_volume_in_seekable_package_is_not_restored_over_existing_volumes(
+            self, package_manager, tmp_path):
+        def corrupt_backup(*args, **kwargs):
+            _backup_volumes(*args, **kwargs)
+            return {VOLUME: "0" * 64}
+
+        package_manager.docker_manager.backup_volumes_to_archive = corrupt_backup
+        package, _ = self._export(package_manager, tmp_path)
+        restore = package_manager.docker_manager.restore_volumes = Mock()
+
+        assert read_archive_index(package) is not None
+        assert package_manager.validate_package(package)["valid"] is False
+        result = self._normal_import(package_manager, package, existing_volumes=[VOLUME])
+
+        assert not result["success"] and "integrity check failed" in result["error"]
+        package_manager.orchestrator.create_worktree.assert_not_called()
+        restore.assert_not_called()
+
+    def test_failed_stream_import_removes_what_it_created(self, package_manager, tmp_path):
+        package, _ = self._export(package_manager, tmp_path)
+        package_manager.docker_manager.restore_volumes = Mock(side_effect=_restore_volumes)
+
+        with patch.object(package_manager, '_verify_package_checksums', return_value=False):
+            result = self._normal_import(package_manager, package, existing_volumes=[])
+
+        assert not result["success"]
+        package_manager.orchestrator.remove_worktree.assert_called_once_with("feature", force=True, delete_branch=True)
+
+    def test_failed_stream_import_into_existing_worktree_removes_volumes(self, package_manager, tmp_path):
+        package, _ = self._export(package_manager, tmp_path)
+        package_manager.docker_manager.restore_volumes = Mock(side_effect=_restore_volumes)
+        remove_volumes = package_manager.docker_manager.remove_volumes = Mock(return_value=True)
+
+        with patch.object(package_manager, '_verify_package_checksums', return_value=False):
+            result = self._normal_import(package_manager, package, existing_volumes=[],
+                                         create_status="already_exists")
+
+        assert not result["success"]
+        remove_volumes.assert_called_once_with("feature")
+        package_manager.orchestrator.remove_worktree.assert_not_called()
+
+
+def _restore_volumes(branch_name, backup_file, layout=None, member_handler=None, volume_checksums=None):
+    """Single pass like DockerManager._restore_streamed_volumes, without containers."""
+    with tarfile.open(backup_file) as archive:
+        tree = TreeChecksum()
+        for member in archive:
+            if f"/volumes/{VOLUME}/" in member.name:
+                tree.add_fileobj(member.name.rsplit("/", 1)[1], archive.extractfile(member))
+            else:
+                member_handler(archive, member)
+    volume_checksums[VOLUME] = tree.hexdigest()
+    return True
+
@@ -0,0 +1,91 @@
+"""
+Unit tests for the host port allocation index.
+"""
+
+import threading
+from unittest.mock import Mock
+
+from dockertree.core.port_index import PortIndex
+
+RANGES = {"DB_PORT": (100, 104), "WEB_PORT": (200, 204)}
+
+
+def _index(tmp_path, port_available=None):
+    return PortIndex(tmp_path, RANGES, port_available=port_available or (lambda port: True))
+
+
+class TestPortIndex:
+    """Test allocation, release and persistence."""
+
+    def test_allocates_lowest_free_ports_and_reuses_released_ones(self, tmp_path):
+        index = _index(tmp_path)
+
+        assert index.allocate("alpha") == {"DB_PORT": 100, "WEB_PORT": 200}
+        assert index.allocate("beta") == {"DB_PORT": 101, "WEB_PORT": 201}
+        assert index.release("alpha") == {"DB_PORT": 100, "WEB_PORT": 200}
+        assert index.allocate("gamma") == {"DB_PORT": 100, "WEB_PORT": 200}
+        # Assignments persist across instances
+        assert _index(tmp_path).get("beta") == {"DB_PORT": 101, "WEB_PORT": 201}
+
+    def test_allocation_is_stable_for_a_branch(self, tmp_path):
+        index = _index(tmp_path)
+        first = index.allocate("alpha")
+        index.allocate("beta")
+
+        assert index.allocate("alpha") == first
+
+    def test_only_candidate_ports_are_bind_checked(self, tmp_path):
+        port_available = Mock(side_effect=lambda port: port not in (101, 200))
+        index = _index(tmp_path, port_available)
+
+        index.allocate("alpha")
+        index.allocate("beta")
+
+        assert index.get("alpha") == {"DB_PORT": 100, "WEB_PORT": 201}
+        assert index.get("beta") == {"DB_PORT": 102, "WEB_PORT": 202}
+        checked = [call.args[0] for call in port_available.call_args_list]
+        assert checked == [100, 200, 201, 101, 102, 200, 202]
+
+    def test_existing_ports_are_kept_and_seed_builds_index_once(self, tmp_path):
+        seed = Mock(return_value={"old": {"DB_PORT": 100, "WEB_PORT": 200}})
+        index = _index(tmp_path)
+
+        ports = index.allocate("alpha", existing={"DB_PORT": 150}, seed=seed)
+        index.allocate("beta", seed=seed)
+
+        assert ports == {"DB_PORT": 150, "WEB_PORT": 201}
+        assert index.get("beta") == {"DB_PORT": 101, "WEB_PORT": 202}
+        seed.assert_called_once()
+
+    def test_exhausted_range_rebuilds_from_seed(self, tmp_path):
+        index = _index(tmp_path)
+        for branch in ("a", "b", "c", "d", "e"):
+            index.allocate(branch)
+        # Only "e" still has a worktree on disk
+        seed = Mock(return_value={"e": {"DB_PORT": 104, "WEB_PORT": 204}})
+
+        assert index.allocate("f", seed=seed) == {"DB_PORT": 100, "WEB_PORT": 200}
+        assert index.get("a") == {}
+
+    def test_no_free_port_returns_zero(self, tmp_path):
+        index = _index(tmp_path, port_available=lambda port: port >= 200)
+
+        assert index.allocate("alpha") == {"DB_PORT": 0, "WEB_PORT": 200}
+        assert index.get("alpha") == {"WEB_PORT": 200}
+
+    def test_concurrent_allocations_never_collide(self, tmp_path):
+        ranges = {"DB_PORT": (1000, 1099)}
+        results = {}
+
+        def allocate(branch):
+            # Separate instances, as in separate dockertree processes
+            results[branch] = PortIndex(tmp_path, ranges, port_available=lambda port: True).allocate(branch)
+
+        threads = [threading.Thread(target=allocate, args=(f"b{i}",)) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        ports = [ports["DB_PORT"] for ports in results.values()]
+        assert sorted(ports) == list(range(1000, 1020))
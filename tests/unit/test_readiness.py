@@ -0,0 +1,134 @@
+"""
+Unit tests for readiness polling.
+"""
+
+from unittest.mock import Mock, patch
+
+from dockertree.core.readiness import (
+    FAILED,
+    PENDING,
+    READY,
+    compose_probe,
+    http_probe,
+    wait_until_ready,
+)
+from dockertree.utils.docker_client import ContainerSummary
+
+
+class FakeClock:
+    """Clock advanced by the sleeps of wait_until_ready."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _wait(probes, timeout=10, **kwargs):
+    clock = FakeClock()
+    report = wait_until_ready(probes, timeout, clock=clock, sleep=clock.sleep, **kwargs)
+    return report, clock
+
+
+class TestWaitUntilReady:
+    """Test polling, backoff and timings."""
+
+    def test_backs_off_and_records_time_to_ready(self):
+        states = iter([PENDING, PENDING, PENDING, READY])
+        report, clock = _wait([lambda: {"web": (next(states), "")}])
+
+        assert report.ready
+        assert clock.sleeps == [0.1, 0.2, 0.4]
+        assert round(report.results["web"].seconds, 2) == 0.7
+
+    def test_ready_services_are_not_polled_again(self):
+        fast = Mock(return_value={"db": (READY, "")})
+        slow_states = iter([PENDING, READY])
+        report, _ = _wait([fast, lambda: {"web": (next(slow_states), "")}])
+
+        assert report.ready
+        assert fast.call_count == 1
+
+    def test_deadline_reports_pending_services(self):
+        report, clock = _wait([lambda: {"web": (PENDING, "HTTP 502")}], timeout=1, max_delay=0.5)
+
+        assert not report.ready
+        assert sum(clock.sleeps) == 1
+        assert report.describe() == "web: HTTP 502"
+        assert report.to_dict()["services"]["web"]["state"] == PENDING
+
+    def test_failed_service_ends_wait(self):
+        report, clock = _wait([lambda: {"web": (FAILED, "unhealthy")}])
+
+        assert not report.ready
+        assert clock.sleeps == []
+
+
+class TestComposeProbe:
+    """Test container states per compose service."""
+
+    def _container(self, name, state, status, service=None):
+        labels = {"com.docker.compose.service": service} if service else {}
+        return ContainerSummary(name=name, image="app", state=state, status=status, labels=labels)
+
+    def test_placeholder_until_containers_appear(self):
+        client = Mock()
+        client.list_containers.side_effect = [
+            [],
+            [self._container("p-web-1", "running", "Up 2 seconds", service="web")],
+        ]
+        report, _ = _wait([compose_probe("p", client=client)])
+
+        assert report.ready
+        assert list(report.results) == ["web"]
+
+    def test_worst_replica_wins_and_failed_jobs_fail(self):
+        client = Mock()
+        client.list_containers.return_value = [
+            self._container("p-web-1", "running", "Up 1 minute (healthy)", service="web"),
+            self._container("p-web-2", "running", "Up 1 second (health: starting)", service="web"),
+            self._container("p-migrate-1", "exited", "Exited (1) 5 seconds ago", service="migrate"),
+        ]
+        statuses = compose_probe("p", client=client)()
+
+        assert statuses["web"] == (PENDING, "health: starting")
+        assert statuses["migrate"][0] == FAILED
+
+
+class TestHttpProbe:
+    """Test HTTP statuses and redirects."""
+
+    def _probe(self, responses, url="http://localhost/", **kwargs):
+        with patch("dockertree.core.readiness.requests.Session") as session_class:
+            session_class.return_value.get.side_effect = [
+                Mock(status_code=status, headers=headers) for status, headers in responses
+            ]
+            return http_probe("web", url, **kwargs)
+
+    def test_https_redirect_is_pending(self):
+        probe = self._probe([(308, {"Location": "https://app.example.com/"}), (302, {"Location": "/login"})])
+
+        assert probe()["web"][0] == PENDING
+        assert probe()["web"] == (READY, "HTTP 302")
+
+    def test_persistent_server_error_fails(self):
+        probe = self._probe([(502, {}), (500, {}), (500, {}), (500, {})], max_server_errors=3)
+
+        assert [probe()["web"][0] for _ in range(4)] == [PENDING, PENDING, PENDING, FAILED]
+
+    def test_server_hostname_mounts_adapter_without_verification(self):
+        with patch("dockertree.core.readiness.requests.Session") as session_class:
+            session = session_class.return_value
+            session.get.return_value = Mock(status_code=200, headers={})
+            probe = http_probe("web", "https://localhost/", server_hostname="app.example.com")
+
+            assert probe()["web"][0] == READY
+        adapter = session.mount.call_args[0][1]
+        assert adapter.server_hostname == "app.example.com"
+        assert session.get.call_args.kwargs["verify"] is False
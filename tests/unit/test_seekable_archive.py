@@ -0,0 +1,87 @@
+"""
+Unit tests for seekable gzip archives.
+"""
+
+import io
+import subprocess
+import tarfile
+
+import pytest
+
+from dockertree.utils import seekable_archive
+from dockertree.utils.compression import iter_archive_members, open_archive_writer
+from dockertree.utils.seekable_archive import INDEX_MEMBER_NAME, open_seekable_writer, read_archive_index
+
+PACKAGE = "feature.dockertree-package"
+
+
+def _write(path, files, **kwargs):
+    with open(path, "wb") as output, open_seekable_writer(output, 6, **kwargs) as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+@pytest.fixture
+def files():
+    return {
+        f"{PACKAGE}/metadata.json": b"{}",
+        f"{PACKAGE}/volumes/proj-feature_postgres_data/PG_VERSION": b"16\n",
+        f"{PACKAGE}/volumes/proj-feature_postgres_data/base/1": b"p" * 3000,
+        f"{PACKAGE}/volumes/proj-feature_redis_data/dump.rdb": b"REDIS",
+        f"{PACKAGE}/environment/.env": b"DEBUG=1\n",
+    }
+
+
+class TestSeekableArchive:
+    """Test writing seekable archives and reading selected members."""
+
+    def test_is_an_ordinary_gzip_tar(self, tmp_path, files):
+        archive = tmp_path / "package.tar.gz"
+        _write(archive, files, pax_headers={"DOCKERTREE.checksum_algorithm": "blake2b"})
+
+        with tarfile.open(archive, "r:gz") as tar:
+            names = tar.getnames()
+            assert tar.pax_headers["DOCKERTREE.checksum_algorithm"] == "blake2b"
+        assert names == list(files) + [INDEX_MEMBER_NAME]
+        assert subprocess.run(["gzip", "-t", str(archive)]).returncode == 0
+
+    def test_reads_only_selected_members(self, tmp_path, files):
+        archive = tmp_path / "package.tar.gz"
+        _write(archive, files, pax_headers={"DOCKERTREE.checksum_algorithm": "blake2b"})
+        index = read_archive_index(archive)
+
+        selected = [
+            (member.name, tar.extractfile(member).read(), tar.pax_headers["DOCKERTREE.checksum_algorithm"])
+            for tar, member in index.iter_members(lambda name: "redis" in name or name.endswith(".env"))
+        ]
+
+        assert selected == [
+            (f"{PACKAGE}/volumes/proj-feature_redis_data/dump.rdb", b"REDIS", "blake2b"),
+            (f"{PACKAGE}/environment/.env", b"DEBUG=1\n", "blake2b"),
+        ]
+        # One frame per section
+        assert [frame for _, frame, _, _ in index.members] == [0, 1, 1, 2, 3]
+        assert index.size(lambda name: "postgres" in name) == 3003
+
+    def test_large_sections_are_split_into_frames(self, tmp_path, files, monkeypatch):
+        monkeypatch.setattr(seekable_archive, "FRAME_SIZE", 1024)
+        archive = tmp_path / "package.tar.gz"
+        _write(archive, files)
+
+        index = read_archive_index(archive)
+        members = {member.name: tar.extractfile(member).read()
+                   for tar, member in index.iter_members(lambda name: "base/1" in name or "redis" in name)}
+
+        assert members == {name: data for name, data in files.items() if "base/1" in name or "redis" in name}
+        assert len(index.frames) > 4
+
+    def test_other_archives_have_no_index(self, tmp_path, files):
+        archive = tmp_path / "package.tar.gz"
+        with open_archive_writer(archive) as tar:
+            info = tarfile.TarInfo("a")
+            tar.addfile(info, io.BytesIO(b""))
+
+        assert read_archive_index(archive) is None
+        assert [member.name for _, member in iter_archive_members(archive, lambda name: True)] == ["a"]
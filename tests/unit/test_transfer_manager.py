@@ -0,0 +1,91 @@
+"""
+Unit tests for package transfer.
+"""
+
+import hashlib
+import io
+import json
+import tarfile
+from unittest.mock import Mock, patch
+
+from dockertree.commands.push.transfer_manager import TransferManager
+from dockertree.utils.chunk_store import ChunkStore
+from dockertree.utils.compression import COMPRESSION_NONE, open_archive_writer
+from dockertree.utils.ssh_manager import SCPTarget
+
+
+class CapturedStdin(io.BytesIO):
+    def close(self):
+        pass
+
+
+class TestDeltaTransfer:
+    """Test uploading only missing package chunks."""
+
+    def test_uploads_missing_chunks_and_rebuilds(self, tmp_path):
+        package = tmp_path / "b_1.dockertree-package.tar"
+        with open_archive_writer(package, COMPRESSION_NONE) as tar:
+            for name, data in {"volumes/a": b"a" * 100, "code/b.tar": b"code"}.items():
+                info = tarfile.TarInfo(f"b_1.dockertree-package/{name}")
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        store = ChunkStore(tmp_path / "store")
+        existing, _ = store.put_chunk(b"a" * 100)
+
+        upload = Mock(stdin=CapturedStdin(), stderr=io.BytesIO(b""))
+        upload.wait.return_value = 0
+        run_results = [Mock(returncode=0, stdout=f"{existing}\n", stderr=""), Mock(returncode=0, stdout="", stderr="")]
+        manager = TransferManager()
+        target = SCPTarget("root@example.com:/srv/packages")
+
+        with patch('dockertree.commands.push.transfer_manager.add_ssh_host_key'), \
+             patch('subprocess.run', side_effect=run_results) as mock_run, \
+             patch('subprocess.Popen', return_value=upload):
+            remote_path = manager.transfer_package_delta(package, target, store)
+
+        assert remote_path == "/srv/packages/b_1.dockertree-package.tar"
+        with tarfile.open(fileobj=io.BytesIO(upload.stdin.getvalue()), mode="r") as tar:
+            names = tar.getnames()
+            manifest = json.load(tar.extractfile(names[-1]))
+        assert len(names) == 2
+        assert names[0].startswith("chunks/") and existing not in names[0]
+        assert names[1] == "manifests/packages/b_1.dockertree-package.json"
+        assert manifest["package_name"] == package.name
+        assert "packages rebuild" in mock_run.call_args[0][0][-1]
+
+    def test_remote_listing_failure(self, tmp_path):
+        manager = TransferManager()
+        with patch('subprocess.run', return_value=Mock(returncode=255, stdout="", stderr="refused")):
+            assert manager.list_remote_chunks(SCPTarget("root@example.com:/srv"), "/srv/.dockertree-chunks") is None
+
+
+class TestStreamingTransfer:
+    """Test uploading a package while it is written."""
+
+    def _stream(self, remote_digest, package_name="b_1.dockertree-package.tar.gz"):
+        upload = Mock(stdin=CapturedStdin(), returncode=0)
+        upload.communicate.side_effect = lambda: (f"{remote_digest(upload)}  -\n".encode(), b"")
+        manager = TransferManager()
+        target = SCPTarget("root@example.com:/srv/packages")
+
+        def write_package(stream):
+            stream.write(b"package data")
+            return package_name
+
+        with patch('dockertree.commands.push.transfer_manager.add_ssh_host_key'), \
+             patch('subprocess.run', return_value=Mock(returncode=0, stdout="", stderr="")) as mock_run, \
+             patch('subprocess.Popen', return_value=upload):
+            return manager.stream_package(target, write_package), mock_run
+
+    def test_moves_package_into_place_when_checksums_match(self):
+        remote_path, mock_run = self._stream(lambda upload: hashlib.sha256(upload.stdin.getvalue()).hexdigest())
+
+        assert remote_path == "/srv/packages/b_1.dockertree-package.tar.gz"
+        command = mock_run.call_args[0][0][-1]
+        assert command.startswith("'mv ") and ".part" in command
+
+    def test_checksum_mismatch_removes_partial_upload(self):
+        remote_path, mock_run = self._stream(lambda upload: "0" * 64)
+
+        assert remote_path is None
+        assert "rm -f" in mock_run.call_args[0][0][-1]
@@ -133,11 +133,13 @@ class TestValidation:
     @patch('subprocess.run')
     def test_validate_worktree_exists_success(self, mock_run):
         """Test worktree exists validation success."""
-        mock_run.return_value = Mock(stdout="[test-branch] /path/to/worktree abc123", returncode=0)
+        mock_run.return_value = Mock(
+            stdout="worktree /path/to/worktree\0HEAD abc123\0branch refs/heads/test-branch\0\0", returncode=0
+        )
         assert validate_worktree_exists("test-branch") == True
         from dockertree.config.settings import get_project_root
         project_root = get_project_root()
-        mock_run.assert_called_once_with(["git", "worktree", "list"], 
+        mock_run.assert_called_once_with(["git", "worktree", "list", "--porcelain", "-z"],
                                         capture_output=True, text=True, check=True, cwd=project_root)
     
     @patch('subprocess.run')
@@ -209,17 +211,19 @@ class TestValidation:
     @patch('subprocess.run')
     def test_validate_container_running_success(self, mock_run):
         """Test container running validation success."""
-        mock_run.return_value = Mock(stdout="Up 2 hours", returncode=0)
+        mock_run.return_value = Mock(stdout='{"Names":"test-container","Status":"Up 2 hours","State":"running"}\n',
+                                     returncode=0)
         assert validate_container_running("test-container") == True
         mock_run.assert_called_once_with(
-            ["docker", "ps", "--filter", "name=test-container", "--format", "{{.Status}}"],
+            ["docker", "ps", "--no-trunc", "--format", "{{json .}}", "--filter", "name=test-container"],
             capture_output=True, text=True, check=True
         )
     
     @patch('subprocess.run')
     def test_validate_container_running_failure(self, mock_run):
         """Test container running validation failure."""
-        mock_run.return_value = Mock(stdout="Exited", returncode=0)
+        mock_run.return_value = Mock(stdout='{"Names":"test-container","Status":"Exited (0) 1 minute ago","State":"exited"}\n',
+                                     returncode=0)
         assert validate_container_running("test-container") == False
     
     @patch('dockertree.utils.validation.validate_git_repository')
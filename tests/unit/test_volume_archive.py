@@ -0,0 +1,70 @@
+"""
+Unit tests for volume archive layout helpers.
+"""
+
+import tarfile
+
+from dockertree.utils.checksum import TreeChecksum
+from dockertree.utils.volume_archive import (
+    is_legacy_volume_member,
+    locate_volume_member,
+    relocate_member,
+)
+
+
+class TestLocateVolumeMember:
+    """Test mapping archive members to volumes."""
+
+    def test_backup_layout(self):
+        assert locate_volume_member("proj-b_postgres_data/base/1") == ("proj-b_postgres_data", "base/1")
+        assert locate_volume_member("./proj-b_redis_data") == ("proj-b_redis_data", "")
+
+    def test_package_layout(self):
+        name = "b_20240101.dockertree-package/volumes/proj-b_media_files/uploads/a.png"
+        assert locate_volume_member(name) == ("proj-b_media_files", "uploads/a.png")
+
+    def test_non_volume_members(self):
+        assert locate_volume_member("b.dockertree-package/code/b.tar.gz") is None
+        assert locate_volume_member("b.dockertree-package/volumes/backup_b.tar") is None
+        assert locate_volume_member("") is None
+
+    def test_legacy_members(self):
+        assert is_legacy_volume_member("b.dockertree-package/volumes/backup_b.tar")
+        assert is_legacy_volume_member("./proj-b_postgres_data.tar.gz")
+        assert not is_legacy_volume_member("b.dockertree-package/code/b.tar.gz")
+
+
+class TestRelocateMember:
+    """Test renaming members for re-emission."""
+
+    def test_hard_link_target_is_prefixed(self):
+        member = tarfile.TarInfo("./b")
+        member.type = tarfile.LNKTYPE
+        member.linkname = "./a"
+        member.pax_headers = {"path": "./b", "linkpath": "./a"}
+
+        relocate_member(member, "vol_media_files/b", "vol_media_files")
+
+        assert member.name == "vol_media_files/b"
+        assert member.linkname == "vol_media_files/a"
+        assert member.pax_headers == {}
+
+
+class TestTreeChecksum:
+    """Test order-independent tree checksums."""
+
+    def test_order_independent(self):
+        first = TreeChecksum()
+        first.add_file("a", "1")
+        first.add_link("b", "a")
+        second = TreeChecksum()
+        second.add_link("b", "a")
+        second.add_file("a", "1")
+        assert first.hexdigest() == second.hexdigest()
+
+    def test_content_sensitive(self):
+        first = TreeChecksum()
+        first.add_file("a", "1")
+        second = TreeChecksum()
+        second.add_file("a", "2")
+        assert first.hexdigest() != second.hexdigest()
@@ -0,0 +1,97 @@
+"""
+Unit tests for volume clone backends.
+"""
+
+import pytest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from dockertree.core.volume_clone import (
+    ReflinkCloneBackend,
+    get_filesystem_type,
+    select_clone_backend,
+)
+
+
+class TestFilesystemDetection:
+    """Test filesystem type detection from the mount table."""
+
+    def test_longest_mount_point_wins(self, tmp_path):
+        mounts = tmp_path / "mounts"
+        mounts.write_text(
+            "/dev/sda1 / ext4 rw 0 0\n"
+            "/dev/sdb1 /var/lib/docker btrfs rw 0 0\n"
+            "/dev/sdc1 /var/lib/dockerish xfs rw 0 0\n"
+        )
+
+        assert get_filesystem_type(Path("/var/lib/docker/volumes"), mounts) == "btrfs"
+        assert get_filesystem_type(Path("/var/lib/dockerish/volumes"), mounts) == "xfs"
+        assert get_filesystem_type(Path("/home/user"), mounts) == "ext4"
+
+    def test_missing_mount_table(self, tmp_path):
+        assert get_filesystem_type(Path("/"), tmp_path / "missing") is None
+
+
+class TestReflinkCloneBackend:
+    """Test the reflink clone backend."""
+
+    @pytest.fixture
+    def data_root(self, tmp_path):
+        for volume in ("src_postgres_data", "dst_postgres_data"):
+            (tmp_path / "volumes" / volume / "_data").mkdir(parents=True)
+        return tmp_path
+
+    def test_unavailable_on_non_reflink_filesystem(self, data_root):
+        backend = ReflinkCloneBackend(data_root=data_root)
+        with patch('dockertree.core.volume_clone.get_filesystem_type', return_value="ext4"):
+            assert backend.is_available() is False
+            assert backend.clone("src_postgres_data", "dst_postgres_data") is False
+
+    def test_unavailable_without_data_root(self):
+        backend = ReflinkCloneBackend(data_root=None)
+        backend.data_root = None
+        assert backend.is_available() is False
+
+    @patch('dockertree.core.volume_clone.sys.platform', 'linux')
+    @patch('dockertree.core.volume_clone.subprocess.run')
+    def test_clone_uses_reflink_copy(self, mock_run, data_root):
+        mock_run.return_value = Mock(returncode=0, stderr="")
+        backend = ReflinkCloneBackend(data_root=data_root)
+
+        with patch('dockertree.core.volume_clone.get_filesystem_type', return_value="btrfs"):
+            assert backend.clone("src_postgres_data", "dst_postgres_data") is True
+
+        cmd = mock_run.call_args[0][0]
+        assert cmd[:3] == ["cp", "-a", "--reflink=always"]
+        assert cmd[3] == f"{data_root / 'volumes' / 'src_postgres_data' / '_data'}/."
+
+    @patch('dockertree.core.volume_clone.sys.platform', 'linux')
+    @patch('dockertree.core.volume_clone.subprocess.run')
+    def test_unsupported_reflink_disables_backend(self, mock_run, data_root):
+        mock_run.return_value = Mock(returncode=1, stderr="cp: failed to clone: Operation not supported")
+        backend = ReflinkCloneBackend(data_root=data_root)
+
+        with patch('dockertree.core.volume_clone.get_filesystem_type', return_value="xfs"):
+            assert backend.clone("src_postgres_data", "dst_postgres_data") is False
+            assert backend.is_available() is False
+
+    @patch('dockertree.core.volume_clone.sys.platform', 'linux')
+    def test_missing_volume_mountpoint_falls_back(self, data_root):
+        backend = ReflinkCloneBackend(data_root=data_root)
+        with patch('dockertree.core.volume_clone.get_filesystem_type', return_value="btrfs"):
+            assert backend.clone("src_postgres_data", "not_a_local_volume") is False
+
+
+class TestSelectCloneBackend:
+    """Test clone backend selection."""
+
+    def test_copy_preference_disables_cloning(self):
+        assert select_clone_backend("copy") is None
+
+    def test_unknown_backend(self):
+        assert select_clone_backend("lvm-magic") is None
+
+    def test_auto_returns_available_backend(self):
+        with patch.object(ReflinkCloneBackend, 'is_available', return_value=True):
+            backend = select_clone_backend("auto")
+        assert isinstance(backend, ReflinkCloneBackend)
@@ -0,0 +1,223 @@
+"""
+Unit tests for the volume helper container.
+"""
+
+import io
+import os
+import socket
+import tarfile
+import threading
+from contextlib import contextmanager
+from unittest.mock import Mock, patch
+
+import pytest
+
+from dockertree.core import volume_helper
+from dockertree.core.docker_manager import DockerManager
+from dockertree.core.volume_helper import VolumeHelper, open_volume_helper, volume_command
+from dockertree.utils.docker_client import ContainerSummary, VolumeSummary
+from dockertree.utils.volume_inventory import VolumeInventory
+
+IMAGE = volume_helper.VOLUME_HELPER_IMAGE
+
+
+@pytest.fixture(autouse=True)
+def image_cache():
+    volume_helper._available_images.clear()
+    volume_helper._orphans_checked = True
+    yield
+    volume_helper._available_images.clear()
+    volume_helper._orphans_checked = False
+
+
+class TestVolumeCommand:
+    """Test where volume steps run."""
+
+    def test_without_helper_runs_one_off_container(self):
+        command = volume_command(["tar", "cf", "-", "-C", "/volumes/a", "."], {"a": True}, interactive=True)
+
+        assert command == ["docker", "run", "--rm", "-i", "-v", "a:/volumes/a:ro", IMAGE,
+                           "tar", "cf", "-", "-C", "/volumes/a", "."]
+
+    def test_helper_runs_steps_for_volumes_it_mounts(self):
+        helper = VolumeHelper({"a": True, "b": False})
+        helper.running = True
+
+        assert volume_command(["du"], {"a": True, "b": False}, helper)[:3] == ["docker", "exec", helper.container_name]
+        # A read-only mount cannot be written, and "c" is not mounted
+        assert volume_command(["du"], {"a": False}, helper)[:3] == ["docker", "run", "--rm"]
+        assert volume_command(["du"], {"c": True}, helper)[:3] == ["docker", "run", "--rm"]
+
+    def test_open_volume_helper_starts_and_removes_one_container(self):
+        calls = []
+
+        def run(command, **kwargs):
+            calls.append(command)
+            return Mock(returncode=0, stdout="", stderr="")
+
+        with patch("subprocess.run", side_effect=run), \
+             patch("dockertree.core.volume_helper.invalidate_volume_inventory"):
+            with open_volume_helper({"a": True, "b": False}) as helper:
+                assert helper.running
+            with open_volume_helper({"a": True}) as second:
+                pass
+
+        assert calls[0] == ["docker", "image", "inspect", IMAGE]
+        assert calls[1][:3] == ["docker", "run", "-d"]
+        assert "a:/volumes/a:ro" in calls[1] and "b:/volumes/b" in calls[1]
+        assert calls[2] == ["docker", "rm", "-f", helper.container_name]
+        # The image is only checked once
+        assert [call[:3] for call in calls[3:]] == [["docker", "run", "-d"], ["docker", "rm", "-f"]]
+        assert not helper.running and not second.running
+
+    def test_unavailable_helper_yields_none(self):
+        with patch("subprocess.run", return_value=Mock(returncode=1, stdout="", stderr="no daemon")):
+            with open_volume_helper({"a": True}) as helper:
+                assert helper is None
+
+
+class TestOrphanedHelpers:
+    """Test removal of helpers left behind by killed commands."""
+
+    def _helper(self, name, owner):
+        labels = {volume_helper.HELPER_LABEL: "1"}
+        if owner is not None:
+            labels[volume_helper.HELPER_OWNER_LABEL] = owner
+        return ContainerSummary(name=name, image=IMAGE, state="running", status="Up 1 hour", labels=labels)
+
+    def test_removes_helpers_whose_owner_is_gone(self):
+        host = socket.gethostname()
+        client = Mock()
+        client.list_containers.return_value = [
+            self._helper("alive", f"{host}:{os.getpid()}"),
+            self._helper("killed", f"{host}:999999999"),
+            self._helper("unowned", None),
+            self._helper("elsewhere", "other-host:1"),
+        ]
+
+        with patch("dockertree.core.volume_helper.get_docker_client", return_value=client), \
+             patch("subprocess.run", return_value=Mock(returncode=0, stderr="")) as mock_run:
+            assert volume_helper.remove_orphaned_helpers() == 2
+
+        assert [call[0][0] for call in mock_run.call_args_list] == [
+            ["docker", "rm", "-f", "killed"], ["docker", "rm", "-f", "unowned"],
+        ]
+        assert client.list_containers.call_args.kwargs["filters"] == {"label": [volume_helper.HELPER_LABEL]}
+
+    def test_first_helper_of_process_removes_orphans_once(self):
+        volume_helper._orphans_checked = False
+        with patch("dockertree.core.volume_helper.remove_orphaned_helpers") as mock_remove, \
+             patch("dockertree.core.volume_helper.VolumeHelper.start", return_value=False):
+            for _ in range(2):
+                with open_volume_helper({"a": True}):
+                    pass
+
+        mock_remove.assert_called_once()
+
+    def test_helper_records_its_owner(self):
+        with patch("subprocess.run", return_value=Mock(returncode=0, stdout="", stderr="")) as mock_run, \
+             patch("dockertree.core.volume_helper.invalidate_volume_inventory"):
+            VolumeHelper({"a": True}).start()
+
+        command = mock_run.call_args[0][0]
+        assert f"{volume_helper.HELPER_OWNER_LABEL}={socket.gethostname()}:{os.getpid()}" in command
+
+
+class TestDockerManagerVolumeHelper:
+    """Test that DockerManager batches volume steps in one helper container."""
+
+    @pytest.fixture
+    def docker_manager(self):
+        with patch('dockertree.core.docker_manager.validate_docker_running'), \
+             patch('dockertree.core.docker_manager.get_compose_command'):
+            return DockerManager()
+
+    def test_backup_streams_every_volume_through_one_helper(self, docker_manager):
+        volumes = ["proj-feature_postgres_data", "proj-feature_media_files"]
+        client = Mock()
+        client.list_volumes.return_value = [VolumeSummary(name) for name in volumes]
+        streamed = []
+
+        def volume_stream(command, **kwargs):
+            streamed.append(command)
+            data = io.BytesIO()
+            with tarfile.open(fileobj=data, mode="w") as tar:
+                info = tarfile.TarInfo("./file")
+                info.size = 1
+                tar.addfile(info, io.BytesIO(b"x"))
+            process = Mock(stdout=io.BytesIO(data.getvalue()), stderr=io.BytesIO(b""))
+            process.wait.return_value = 0
+            return process
+
+        runs = []
+
+        def run(command, **kwargs):
+            runs.append(command)
+            return Mock(returncode=0, stdout="", stderr="")
+
+        with patch('dockertree.core.docker_manager.get_volume_inventory', return_value=VolumeInventory(client)), \
+             patch('dockertree.core.volume_helper.invalidate_volume_inventory'), \
+             patch.object(docker_manager, '_is_worktree_running', return_value=False), \
+             patch('subprocess.run', side_effect=run), \
+             patch('subprocess.Popen', side_effect=volume_stream):
+            with tarfile.open(fileobj=io.BytesIO(), mode="w") as tar:
+                checksums = docker_manager.backup_volumes_to_archive("feature", volumes, tar)
+
+        assert set(checksums) == set(volumes)
+        started = [command for command in runs if command[:3] == ["docker", "run", "-d"]]
+        assert len(started) == 1
+        helper_name = started[0][started[0].index("--name") + 1]
+        assert [command[:3] for command in streamed] == [["docker", "exec", helper_name]] * 2
+        assert runs[-1] == ["docker", "rm", "-f", helper_name]
+        assert docker_manager._volume_helper is None
+
+    def test_sessions_from_other_threads_wait_for_the_current_helper(self, docker_manager):
+        events = []
+        started = threading.Event()
+        release = threading.Event()
+
+        @contextmanager
+        def fake_open(volumes):
+            name = min(volumes)
+            events.append(f"start:{name}")
+            yield VolumeHelper(volumes)
+            events.append(f"stop:{name}")
+
+        def first():
+            with docker_manager._volume_helper_session({"a": True, "b": True}):
+                started.set()
+                release.wait(timeout=5)
+
+        def second():
+            with docker_manager._volume_helper_session({"c": True, "d": True}) as helper:
+                events.append(f"use:{min(helper.volumes)}")
+
+        with patch('dockertree.core.docker_manager.open_volume_helper', side_effect=fake_open):
+            one = threading.Thread(target=first)
+            one.start()
+            assert started.wait(timeout=5)
+            two = threading.Thread(target=second)
+            two.start()
+            two.join(timeout=0.1)
+            release.set()
+            one.join(timeout=5)
+            two.join(timeout=5)
+
+        # The second batch starts its own helper once the first one is stopped
+        assert events == ["start:a", "stop:a", "start:c", "use:c", "stop:c"]
+
+    def test_restore_keeps_volume_held_by_helper(self, docker_manager):
+        volume = "proj-feature_postgres_data"
+        helper = docker_manager._volume_helper = VolumeHelper({volume: False})
+        helper.running = True
+        client = Mock()
+        client.list_volumes.return_value = [VolumeSummary(volume)]
+
+        with patch('dockertree.core.docker_manager.get_volume_inventory', return_value=VolumeInventory(client)), \
+             patch('dockertree.core.docker_manager.get_containers_using_volume', return_value=[helper.container_name]), \
+             patch('subprocess.run', return_value=Mock(stdout="has_data\n5000000\n", stderr="")) as mock_run:
+            assert docker_manager._prepare_volume_for_restore("postgres", volume) == "ready"
+
+        # Inspected in the helper; not removed, since the restore step empties it in place
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0][:3] == ["docker", "exec", helper.container_name]
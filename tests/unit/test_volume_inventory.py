@@ -0,0 +1,60 @@
+"""
+Unit tests for the volume inventory.
+"""
+
+from unittest.mock import Mock, patch
+
+from dockertree.utils.docker_client import DockerClient, VolumeSummary
+from dockertree.utils.volume_inventory import VolumeInventory
+
+
+def _client(*volumes):
+    client = Mock(spec=DockerClient)
+    client.list_volumes.return_value = list(volumes)
+    return client
+
+
+class TestVolumeInventory:
+    """Test lookups, caching and invalidation."""
+
+    def test_lookups_share_one_listing(self):
+        client = _client(VolumeSummary("p-feature_postgres_data", mountpoint="/var/lib/docker/volumes/a/_data"),
+                         VolumeSummary("p-feature_redis_data"))
+        inventory = VolumeInventory(client)
+
+        assert "p-feature_postgres_data" in inventory
+        assert not inventory.exists("p-feature_media_files")
+        assert inventory.existing(["p-feature_redis_data", "p-feature_media_files"]) == {"p-feature_redis_data"}
+        assert inventory.get("p-feature_postgres_data").mountpoint == "/var/lib/docker/volumes/a/_data"
+        client.list_volumes.assert_called_once_with()
+
+    def test_invalidate_relists(self):
+        client = _client(VolumeSummary("a_postgres_data"))
+        inventory = VolumeInventory(client)
+
+        assert inventory.names() == ["a_postgres_data"]
+        client.list_volumes.return_value = []
+        assert inventory.names() == ["a_postgres_data"]
+        inventory.invalidate()
+        assert inventory.names() == []
+        assert client.list_volumes.call_count == 2
+
+    def test_docker_unavailable_is_not_cached(self):
+        client = _client()
+        client.list_volumes.return_value = None
+        inventory = VolumeInventory(client)
+
+        assert not inventory.exists("a_postgres_data")
+        assert inventory.names() == []
+        assert client.list_volumes.call_count == 2
+
+    def test_cli_listing(self):
+        stdout = ('{"Name":"a_postgres_data","Driver":"local","Mountpoint":"/data/a","Labels":"com.docker.compose.project=a"}\n'
+                  '{"Name":"b_media_files","Driver":"local","Mountpoint":"/data/b","Labels":""}\n')
+        with patch('subprocess.run', return_value=Mock(stdout=stdout, returncode=0)) as mock_run:
+            inventory = VolumeInventory(DockerClient())
+            volume = inventory.get("a_postgres_data")
+
+        assert mock_run.call_args[0][0] == ["docker", "volume", "ls", "--format", "{{json .}}"]
+        assert volume.labels == {"com.docker.compose.project": "a"}
+        assert inventory.existing(["b_media_files"]) == {"b_media_files"}
@@ -0,0 +1,72 @@
+"""
+Unit tests for volume size accounting.
+"""
+
+import json
+import os
+from unittest.mock import Mock
+
+from dockertree.core.volume_sizes import VolumeSizeEngine, measure_directory
+from dockertree.utils.docker_client import DockerClient, VolumeSummary
+from dockertree.utils.volume_inventory import VolumeInventory
+
+
+def _engine(tmp_path, volumes, usage, ttl=60):
+    client = Mock(spec=DockerClient)
+    client.list_volumes.return_value = volumes
+    client.volume_usage.return_value = usage
+    engine = VolumeSizeEngine(client, VolumeInventory(client), ttl=ttl, cache_path=tmp_path / "sizes.json")
+    return engine, client
+
+
+class TestMeasureDirectory:
+    """Test walking volume directories."""
+
+    def test_counts_hard_links_once(self, tmp_path):
+        (tmp_path / "base").mkdir()
+        (tmp_path / "base" / "1259").write_bytes(b"x" * 100000)
+        single = measure_directory(tmp_path)
+        os.link(tmp_path / "base" / "1259", tmp_path / "base" / "link")
+
+        assert single >= 100000
+        assert measure_directory(tmp_path) == single
+
+    def test_missing_directory(self, tmp_path):
+        assert measure_directory(tmp_path / "missing") is None
+
+
+class TestVolumeSizeEngine:
+    """Test size sources and caching."""
+
+    def test_readable_mountpoints_are_walked(self, tmp_path):
+        mountpoint = tmp_path / "a_postgres_data"
+        mountpoint.mkdir()
+        (mountpoint / "PG_VERSION").write_bytes(b"16\n")
+        engine, client = _engine(tmp_path, [VolumeSummary("a_postgres_data", mountpoint=str(mountpoint))], {})
+
+        sizes = engine.get_sizes(["a_postgres_data"])
+
+        assert sizes["a_postgres_data"] == measure_directory(mountpoint)
+        client.volume_usage.assert_not_called()
+
+    def test_unreadable_volumes_use_daemon_usage(self, tmp_path):
+        volumes = [VolumeSummary("a_postgres_data", mountpoint="/nonexistent/a"), VolumeSummary("b_redis_data")]
+        engine, client = _engine(tmp_path, volumes, {"a_postgres_data": 2048, "b_redis_data": 512})
+
+        assert engine.get_sizes(["a_postgres_data", "b_redis_data", "c_media_files"]) == {
+            "a_postgres_data": 2048, "b_redis_data": 512, "c_media_files": None
+        }
+        client.volume_usage.assert_called_once()
+
+    def test_cache_is_shared_across_engines_until_ttl(self, tmp_path):
+        engine, client = _engine(tmp_path, [], {"a_postgres_data": 2048})
+        engine.get_sizes(["a_postgres_data"])
+        assert json.loads((tmp_path / "sizes.json").read_text())["sizes"]["a_postgres_data"][1] == 2048
+
+        second, second_client = _engine(tmp_path, [], {"a_postgres_data": 4096})
+        assert second.get_sizes(["a_postgres_data"]) == {"a_postgres_data": 2048}
+        second_client.volume_usage.assert_not_called()
+        assert second.get_sizes(["a_postgres_data"], refresh=True) == {"a_postgres_data": 4096}
+
+        expired, expired_client = _engine(tmp_path, [], {"a_postgres_data": 8192}, ttl=0)
+        assert expired.get_sizes(["a_postgres_data"]) == {"a_postgres_data": 8192}
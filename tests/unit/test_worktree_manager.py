@@ -180,3 +180,37 @@ class TestWorktreeManager:
 
         assert ok is False
 
+
+    def test_stop_worktrees_by_pattern_skips_current_branch(self, manager):
+        manager.git_manager.list_worktrees.return_value = [
+            ("/tmp/wt/feature/foo", "abc123", "feature/foo"),
+            ("/tmp/wt/feature/bar", "def456", "feature/bar"),
+            ("/tmp/wt/other", "0123ab", "other"),
+        ]
+        manager.git_manager.get_current_branch.return_value = "feature/bar"
+        manager.orchestrator.stop_worktree.return_value = {"success": True, "data": {}}
+
+        ok = manager.stop_worktrees_by_pattern("feature/*", max_workers=2)
+
+        assert ok is True
+        assert [result.branch for result in manager.last_bulk_results] == ["feature/foo"]
+        manager.orchestrator.stop_worktree.assert_called_once_with("feature/foo", False)
+
+    def test_start_worktrees_by_pattern_reports_failures(self, manager):
+        manager.git_manager.list_worktrees.return_value = [
+            ("/tmp/wt/feature/foo", "abc123", "feature/foo"),
+            ("/tmp/wt/feature/bar", "def456", "feature/bar"),
+        ]
+        manager.git_manager.get_current_branch.return_value = "main"
+        manager.orchestrator.start_worktree.side_effect = lambda branch, profile=None: (
+            {"success": True, "data": {"domain_name": "foo.localhost"}} if branch == "feature/foo" else {"success": False, "error": "boom"}
+        )
+        with patch("dockertree.commands.caddy.CaddyManager") as caddy_cls:
+            caddy_cls.return_value.is_caddy_running.return_value = True
+            ok = manager.start_worktrees_by_pattern("feature/*")
+
+        assert ok is False
+        assert [(result.branch, result.success) for result in manager.last_bulk_results] == [
+            ("feature/foo", True),
+            ("feature/bar", False),
+        ]
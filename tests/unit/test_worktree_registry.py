@@ -0,0 +1,72 @@
+"""
+Unit tests for the worktree registry.
+"""
+
+import os
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from dockertree.utils.worktree_registry import (
+    WorktreeRegistry,
+    find_worktrees_dir,
+    parse_worktree_porcelain,
+)
+
+PORCELAIN = (
+    "worktree /repo\0HEAD 1111111\0branch refs/heads/main\0\0"
+    "worktree /repo/worktrees/feature\0HEAD 2222222\0branch refs/heads/feature\0\0"
+    "worktree /repo/worktrees/old\0HEAD 3333333\0detached\0prunable gitdir file points to non-existent location\0\0"
+)
+
+
+class TestPorcelainParsing:
+    """Test parsing git worktree list --porcelain output."""
+
+    def test_parses_branches_and_flags(self):
+        main, feature, old = parse_worktree_porcelain(PORCELAIN)
+
+        assert (main.path, main.branch) == (Path("/repo"), "main")
+        assert (feature.commit, feature.branch) == ("2222222", "feature")
+        assert old.branch is None and old.detached and old.prunable
+        assert old.display_branch == "(detached HEAD)"
+
+    def test_newline_separated_output(self):
+        worktrees = parse_worktree_porcelain(PORCELAIN.replace("\0", "\n"), separator="\n")
+        assert [wt.branch for wt in worktrees] == ["main", "feature", None]
+
+
+class TestWorktreeRegistry:
+    """Test caching and invalidation."""
+
+    def _registry(self, tmp_path):
+        git_dir = tmp_path / ".git"
+        git_dir.mkdir()
+        return WorktreeRegistry(tmp_path, find_worktrees_dir(tmp_path))
+
+    def test_lookups_share_one_git_call(self, tmp_path):
+        registry = self._registry(tmp_path)
+        with patch('subprocess.run', return_value=Mock(stdout=PORCELAIN, returncode=0)) as mock_run:
+            assert registry.get_by_branch("feature").path == Path("/repo/worktrees/feature")
+            assert registry.get_by_path(Path("/repo")).branch == "main"
+            assert len(registry.list()) == 3
+        mock_run.assert_called_once()
+
+    def test_worktrees_dir_change_invalidates(self, tmp_path):
+        registry = self._registry(tmp_path)
+        with patch('subprocess.run', return_value=Mock(stdout=PORCELAIN, returncode=0)) as mock_run:
+            registry.list()
+            (tmp_path / ".git" / "worktrees").mkdir()
+            registry.list()
+            registry.invalidate()
+            registry.list()
+        assert mock_run.call_count == 3
+
+    def test_finds_common_dir_from_linked_worktree(self, tmp_path):
+        (tmp_path / ".git" / "worktrees" / "feature").mkdir(parents=True)
+        (tmp_path / ".git" / "worktrees" / "feature" / "commondir").write_text("../..\n")
+        linked = tmp_path / "worktrees" / "feature"
+        linked.mkdir(parents=True)
+        (linked / ".git").write_text(f"gitdir: {tmp_path / '.git' / 'worktrees' / 'feature'}\n")
+        (linked / "src").mkdir()
+
+        assert find_worktrees_dir(linked / "src") == Path(os.path.normpath(tmp_path / ".git" / "worktrees"))